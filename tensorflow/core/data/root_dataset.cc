@@ -41,6 +41,7 @@ constexpr char kDatasetType[] = "Root";
 constexpr char kAlgorithm[] = "algorithm";
 constexpr char kCpuBudget[] = "cpu_budget";
 constexpr char kExperiments[] = "experiments";
+constexpr char kHostWide[] = "host_wide";
 constexpr char kInjectPrefetchEligibleOpt[] = "inject_prefetch_eligible";
 constexpr char kIntraOpParallelism[] = "intra_op_parallelism";
 constexpr char kMemBandwidth[] = "mem_bw_used_megabytes_per_sec";
@@ -72,6 +73,11 @@ void SetRootDatasetParams(const Options& options, RootDataset::Params* params) {
         experiments.contains("stage_based_autotune_v2")) {
       params->autotune_algorithm = model::AutotuneAlgorithm::STAGE_BASED;
     }
+    params->autotune_host_wide = options.autotune_options().host_wide();
+    if (params->autotune_host_wide) {
+      // The default algorithm does not respect the CPU budget.
+      params->autotune_algorithm = model::AutotuneAlgorithm::HILL_CLIMB;
+    }
     if (options.autotune_options().optional_autotune_algorithm_case() ==
         AutotuneOptions::kAutotuneAlgorithm) {
       params->autotune_algorithm =
@@ -97,6 +103,8 @@ void AddTraceMetadata(const RootDataset::Params& params, const Options& options,
         kRamBudget,
         strings::Printf("%lld", static_cast<long long>(
                                     params.autotune_ram_budget / 1.0e6))));
+    trace_metadata->push_back(std::make_pair(
+        kHostWide, params.autotune_host_wide ? "true" : "false"));
   }
   if (params.max_intra_op_parallelism >= 0) {
     trace_metadata->push_back(std::make_pair(
@@ -176,6 +184,8 @@ class RootDataset::Iterator : public DatasetIterator<RootDataset> {
 
   bool SymbolicCheckpointCompatible() const override { return true; }
 
+  std::shared_ptr<model::Model> model() const override { return model_; }
+
   Status Initialize(IteratorContext* ctx) override {
     IteratorContext iter_ctx(CreateParams(ctx));
     TF_RETURN_IF_ERROR(dataset()->input_->MakeIterator(&iter_ctx, this,
@@ -281,6 +291,7 @@ class RootDataset::Iterator : public DatasetIterator<RootDataset> {
             model_->OptimizeLoop(dataset()->params_.autotune_algorithm,
                                  dataset()->params_.autotune_cpu_budget,
                                  dataset()->params_.autotune_ram_budget,
+                                 dataset()->params_.autotune_host_wide,
                                  cancellation_manager_.get());
         if (!status.ok()) {
           LOG(WARNING) << "Optimization loop failed: " << status.ToString();
@@ -32,6 +32,7 @@ class RootDataset : public DatasetBase {
     model::AutotuneAlgorithm autotune_algorithm;
     int64_t autotune_cpu_budget = 0;
     int64_t autotune_ram_budget = 0;
+    bool autotune_host_wide = false;
     int64_t max_intra_op_parallelism = 1;
     int64_t private_threadpool_size = 0;
   };
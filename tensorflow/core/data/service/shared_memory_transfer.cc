@@ -0,0 +1,426 @@
+/* Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+#include "tensorflow/core/data/service/shared_memory_transfer.h"
+
+#include <cstring>
+#include <functional>
+#include <memory>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "grpcpp/client_context.h"
+#include "grpcpp/create_channel.h"
+#include "grpcpp/security/credentials.h"
+#include "grpcpp/security/server_credentials.h"
+#include "grpcpp/server.h"
+#include "grpcpp/server_builder.h"
+#include "grpcpp/server_context.h"
+#include "absl/container/flat_hash_set.h"
+#include "absl/strings/str_cat.h"
+#include "tensorflow/core/data/service/data_transfer.h"
+#include "tensorflow/core/data/service/grpc_util.h"
+#include "tensorflow/core/data/service/worker.grpc.pb.h"
+#include "tensorflow/core/data/service/worker.pb.h"
+#include "tensorflow/core/distributed_runtime/rpc/grpc_util.h"
+#include "tensorflow/core/framework/dataset.pb.h"
+#include "tensorflow/core/framework/tensor.h"
+#include "tensorflow/core/framework/tensor.pb.h"
+#include "tensorflow/core/framework/tensor_shape.h"
+#include "tensorflow/core/framework/types.h"
+#include "tensorflow/core/framework/variant.h"
+#include "tensorflow/core/lib/gtl/cleanup.h"
+#include "tensorflow/core/lib/io/path.h"
+#include "tensorflow/core/platform/env.h"
+#include "tensorflow/core/platform/errors.h"
+#include "tensorflow/core/platform/host_info.h"
+#include "tensorflow/core/platform/mutex.h"
+#include "tensorflow/core/platform/random.h"
+#include "tensorflow/core/platform/status.h"
+#include "tensorflow/core/platform/thread_annotations.h"
+
+namespace tensorflow {
+namespace data {
+namespace {
+
+constexpr char kSharedMemoryDirectory[] = "/dev/shm";
+constexpr char kElementFilePrefix[] = "tf_data_service_element_";
+
+// Returns the directory to write elements to, preferring a shared memory file
+// system so that the element data never reaches a disk.
+std::string ElementDirectory() {
+  Env* env = Env::Default();
+  if (env->IsDirectory(kSharedMemoryDirectory).ok()) {
+    return kSharedMemoryDirectory;
+  }
+  std::vector<std::string> directories;
+  env->GetLocalTempDirectories(&directories);
+  if (directories.empty()) {
+    return "/tmp";
+  }
+  return directories.front();
+}
+
+Status WriteComponents(std::vector<Tensor>&& element, WritableFile& file,
+                       SharedMemoryElement& output) {
+  if (element.size() == 1 && element[0].dtype() == DT_VARIANT &&
+      TensorShapeUtils::IsScalar(element[0].shape())) {
+    const Variant& variant = element[0].scalar<Variant>()();
+    const CompressedElement* compressed = variant.get<CompressedElement>();
+    if (compressed == nullptr) {
+      return errors::FailedPrecondition(
+          "Expected dataset to produce a CompressedElement variant tensor, but "
+          "it produced ",
+          variant.TypeName());
+    }
+    output.set_compressed(true);
+    return file.Append(compressed->SerializeAsString());
+  }
+  for (const Tensor& component : element) {
+    SharedMemoryElement::Component* metadata = output.add_components();
+    metadata->set_dtype(component.dtype());
+    component.shape().AsProto(metadata->mutable_shape());
+    if (DataTypeCanUseMemcpy(component.dtype())) {
+      StringPiece data = component.tensor_data();
+      metadata->set_size_bytes(data.size());
+      TF_RETURN_IF_ERROR(file.Append(data));
+      continue;
+    }
+    TensorProto proto;
+    component.AsProtoTensorContent(&proto);
+    std::string serialized = proto.SerializeAsString();
+    metadata->set_size_bytes(serialized.size());
+    metadata->set_is_tensor_proto(true);
+    TF_RETURN_IF_ERROR(file.Append(serialized));
+  }
+  return OkStatus();
+}
+
+Status ReadComponents(const SharedMemoryElement& element, const char* data,
+                      uint64 size, std::vector<Tensor>& output) {
+  if (element.compressed()) {
+    CompressedElement compressed;
+    if (!compressed.ParseFromArray(data, size)) {
+      return errors::DataLoss("Failed to parse compressed element from ",
+                              element.path());
+    }
+    Tensor tensor(DT_VARIANT, TensorShape{});
+    tensor.scalar<Variant>()() = std::move(compressed);
+    output.push_back(std::move(tensor));
+    return OkStatus();
+  }
+  uint64 offset = 0;
+  for (const auto& component : element.components()) {
+    if (component.size_bytes() < 0 ||
+        offset + component.size_bytes() > size) {
+      return errors::DataLoss("Shared memory element file ", element.path(),
+                              " is truncated: expected at least ",
+                              offset + component.size_bytes(),
+                              " bytes, but the file has ", size, " bytes.");
+    }
+    const char* component_data = data + offset;
+    offset += component.size_bytes();
+    if (component.is_tensor_proto()) {
+      TensorProto proto;
+      if (!proto.ParseFromArray(component_data, component.size_bytes())) {
+        return errors::DataLoss("Failed to parse tensor from ",
+                                element.path());
+      }
+      output.emplace_back();
+      if (!output.back().FromProto(proto)) {
+        return errors::Internal("Failed to parse tensor.");
+      }
+      continue;
+    }
+    TF_ASSIGN_OR_RETURN(TensorShape shape,
+                        TensorShape::BuildTensorShape(component.shape()));
+    Tensor tensor(component.dtype(), shape);
+    if (tensor.TotalBytes() != component.size_bytes()) {
+      return errors::DataLoss("Expected ", tensor.TotalBytes(),
+                              " bytes for a tensor of shape ",
+                              shape.DebugString(), ", but got ",
+                              component.size_bytes(), " bytes.");
+    }
+    if (component.size_bytes() > 0) {
+      std::memcpy(tensor.data(), component_data, component.size_bytes());
+    }
+    output.push_back(std::move(tensor));
+  }
+  return OkStatus();
+}
+
+// Worker service that only implements `GetElement`, returning elements through
+// shared memory files.
+class SharedMemoryWorkerService : public WorkerService::Service {
+ public:
+  // Element files are named with a prefix unique to this service, so that the
+  // files of a worker can be told apart from those of other workers sharing
+  // `directory`.
+  SharedMemoryWorkerService(DataTransferServer::GetElementT get_element,
+                            const std::string& directory)
+      : get_element_(std::move(get_element)),
+        path_prefix_(io::JoinPath(
+            directory, absl::StrCat(kElementFilePrefix,
+                                    absl::Hex(random::New64()), "_"))) {}
+
+  ::grpc::Status GetElement(::grpc::ServerContext* context,
+                            const GetElementRequest* request,
+                            GetElementResponse* response) override {
+    Status s = GetElementInternal(*request, *response);
+    if (s.ok() && context->IsCancelled()) {
+      s = errors::Cancelled("The shm GetElement request was cancelled.");
+    }
+    if (!s.ok() && response->has_shared_memory()) {
+      // The client does not receive the response, so it can not delete the
+      // element file.
+      Env::Default()
+          ->DeleteFile(response->shared_memory().path())
+          .IgnoreError();
+    }
+    return ToGrpcStatus(s);
+  }
+
+  // Deletes the element files which have not been read by a client. They are
+  // left behind by requests that fail after the element is written, but which
+  // the service can not observe, such as when the response can not be sent.
+  void DeleteElementFiles() {
+    Env* env = Env::Default();
+    std::vector<std::string> paths;
+    Status s = env->GetMatchingPaths(absl::StrCat(path_prefix_, "*"), &paths);
+    if (!s.ok()) {
+      LOG(WARNING) << "Failed to list the shm element files with prefix "
+                   << path_prefix_ << ": " << s;
+      return;
+    }
+    for (const std::string& path : paths) {
+      env->DeleteFile(path).IgnoreError();
+    }
+  }
+
+ private:
+  Status GetElementInternal(const GetElementRequest& request,
+                            GetElementResponse& response) {
+    VLOG(3) << "Received shm GetElement request for task "
+            << request.task_id();
+    GetElementResult result;
+    TF_RETURN_IF_ERROR(get_element_(&request, &result));
+    response.set_end_of_sequence(result.end_of_sequence);
+    response.set_skip_task(result.skip);
+    if (result.end_of_sequence || result.skip) {
+      return OkStatus();
+    }
+    return WriteSharedMemoryElement(path_prefix_,
+                                    std::move(result.components),
+                                    *response.mutable_shared_memory());
+  }
+
+  const DataTransferServer::GetElementT get_element_;
+  const std::string path_prefix_;
+};
+
+class SharedMemoryDataTransferServer : public DataTransferServer {
+ public:
+  SharedMemoryDataTransferServer(GetElementT get_element,
+                                 const std::string& directory)
+      : service_(std::move(get_element), directory) {}
+
+  ~SharedMemoryDataTransferServer() override {
+    if (server_) {
+      // Waits for the in-flight requests, so no element file is written after
+      // the files are deleted.
+      server_->Shutdown();
+    }
+    service_.DeleteElementFiles();
+  }
+
+  Status Start() override {
+    ::grpc::ServerBuilder builder;
+    // Clients must run on the same host, so the server only listens on the
+    // loopback interface.
+    builder.AddListeningPort("localhost:0",
+                             ::grpc::InsecureServerCredentials(), &port_);
+    builder.RegisterService(&service_);
+    server_ = builder.BuildAndStart();
+    if (!server_) {
+      return errors::Unavailable(
+          "Failed to start the shm data transfer server.");
+    }
+    VLOG(1) << "Started shm data transfer server on port " << port_;
+    return OkStatus();
+  }
+
+  int get_port() override { return port_; }
+
+  // The clients use the host name to verify that they run on the same host.
+  StatusOr<std::string> GetCompatibilityInfo() const override {
+    return port::Hostname();
+  }
+
+ private:
+  SharedMemoryWorkerService service_;
+  std::unique_ptr<::grpc::Server> server_;
+  int port_ = -1;
+};
+
+class SharedMemoryDataTransferClient : public DataTransferClient {
+ public:
+  explicit SharedMemoryDataTransferClient(const std::string& address) {
+    VLOG(2) << "Create SharedMemoryDataTransferClient for worker " << address
+            << ".";
+    auto channel = ::grpc::CreateChannel(
+        address, ::grpc::InsecureChannelCredentials());
+    stub_ = WorkerService::NewStub(channel);
+  }
+
+  Status GetElement(const GetElementRequest& req,
+                    GetElementResult& result) override {
+    VLOG(3) << "GetElement for task " << req.task_id() << " from shm worker "
+            << "server.";
+    {
+      mutex_lock l(mu_);
+      if (cancelled_) {
+        return errors::Cancelled("Client was cancelled.");
+      }
+    }
+    ::grpc::ClientContext ctx;
+    gtl::Cleanup<std::function<void()>> cleanup;
+    {
+      mutex_lock l(mu_);
+      active_contexts_.insert(&ctx);
+      cleanup = gtl::MakeCleanup([this, &ctx] {
+        mutex_lock l(mu_);
+        active_contexts_.erase(&ctx);
+      });
+    }
+    GetElementResponse resp;
+    ::grpc::Status s = stub_->GetElement(&ctx, req, &resp);
+    if (!s.ok()) {
+      return grpc_util::WrapError("Failed to get element", s);
+    }
+    result.end_of_sequence = resp.end_of_sequence();
+    result.skip = resp.skip_task();
+    if (resp.has_shared_memory()) {
+      TF_RETURN_IF_ERROR(
+          ReadSharedMemoryElement(resp.shared_memory(), result.components));
+    }
+    return OkStatus();
+  }
+
+  void TryCancel() override {
+    VLOG(2) << "Cancel SharedMemoryDataTransferClient.";
+    mutex_lock l(mu_);
+    cancelled_ = true;
+    for (const auto& ctx : active_contexts_) {
+      ctx->TryCancel();
+    }
+  }
+
+  Status CheckCompatibility(
+      const std::string& compatibility_info) const override {
+    const std::string hostname = port::Hostname();
+    if (compatibility_info != hostname) {
+      return errors::FailedPrecondition(
+          "The shm data transfer protocol requires the tf.data service worker "
+          "to run on the same host as the client, but the worker runs on '",
+          compatibility_info, "' and the client runs on '", hostname, "'.");
+    }
+    return OkStatus();
+  }
+
+ private:
+  mutex mu_;
+  std::unique_ptr<WorkerService::Stub> stub_;
+  // Set of all currently active clients contexts. Used to support
+  // cancellation.
+  absl::flat_hash_set<::grpc::ClientContext*> active_contexts_
+      TF_GUARDED_BY(mu_);
+  // Indicates that the client has been cancelled, so no further requests should
+  // be accepted.
+  bool cancelled_ TF_GUARDED_BY(mu_) = false;
+};
+
+class SharedMemoryTransferRegistrar {
+ public:
+  SharedMemoryTransferRegistrar() {
+    DataTransferServer::Register(
+        kSharedMemoryTransferProtocol,
+        [](DataTransferServer::GetElementT get_element,
+           std::shared_ptr<DataTransferServer>* out) {
+          *out = NewSharedMemoryDataTransferServer(std::move(get_element),
+                                                   ElementDirectory());
+          return OkStatus();
+        });
+    DataTransferClient::Register(
+        kSharedMemoryTransferProtocol,
+        [](DataTransferClient::Config config,
+           std::unique_ptr<DataTransferClient>* out) {
+          *out = std::make_unique<SharedMemoryDataTransferClient>(
+              config.address);
+          return OkStatus();
+        });
+  }
+};
+static SharedMemoryTransferRegistrar shared_memory_transfer_registrar;
+
+}  // namespace
+
+std::shared_ptr<DataTransferServer> NewSharedMemoryDataTransferServer(
+    DataTransferServer::GetElementT get_element, const std::string& directory) {
+  return std::make_shared<SharedMemoryDataTransferServer>(
+      std::move(get_element), directory);
+}
+
+Status WriteSharedMemoryElement(const std::string& path_prefix,
+                                std::vector<Tensor>&& element,
+                                SharedMemoryElement& output) {
+  Env* env = Env::Default();
+  std::string path = path_prefix;
+  if (!env->CreateUniqueFileName(&path, "")) {
+    return errors::Internal("Failed to create a unique file name with prefix ",
+                            path_prefix);
+  }
+  std::unique_ptr<WritableFile> file;
+  TF_RETURN_IF_ERROR(env->NewWritableFile(path, &file));
+  output.set_path(path);
+  Status s = WriteComponents(std::move(element), *file, output);
+  if (s.ok()) {
+    s = file->Close();
+  }
+  if (!s.ok()) {
+    env->DeleteFile(path).IgnoreError();
+  }
+  return s;
+}
+
+Status ReadSharedMemoryElement(const SharedMemoryElement& element,
+                               std::vector<Tensor>& output) {
+  Env* env = Env::Default();
+  auto cleanup = gtl::MakeCleanup(
+      [env, &element] { env->DeleteFile(element.path()).IgnoreError(); });
+  uint64 size = 0;
+  TF_RETURN_IF_ERROR(env->GetFileSize(element.path(), &size));
+  if (size == 0) {
+    // Empty files can not be memory-mapped.
+    return ReadComponents(element, /*data=*/"", size, output);
+  }
+  std::unique_ptr<ReadOnlyMemoryRegion> region;
+  TF_RETURN_IF_ERROR(
+      env->NewReadOnlyMemoryRegionFromFile(element.path(), &region));
+  return ReadComponents(element, static_cast<const char*>(region->data()),
+                        region->length(), output);
+}
+
+}  // namespace data
+}  // namespace tensorflow
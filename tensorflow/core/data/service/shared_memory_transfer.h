@@ -0,0 +1,57 @@
+/* Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+#ifndef TENSORFLOW_CORE_DATA_SERVICE_SHARED_MEMORY_TRANSFER_H_
+#define TENSORFLOW_CORE_DATA_SERVICE_SHARED_MEMORY_TRANSFER_H_
+
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "tensorflow/core/data/service/data_transfer.h"
+#include "tensorflow/core/data/service/worker.pb.h"
+#include "tensorflow/core/framework/tensor.h"
+#include "tensorflow/core/platform/status.h"
+
+namespace tensorflow {
+namespace data {
+
+// The "shm" data transfer protocol transfers elements between a tf.data service
+// worker and clients running on the same host. Requests and small responses
+// are sent over a gRPC connection to a loopback address, while the element data
+// is written to a file in a shared memory file system (`/dev/shm` when it
+// exists) and read back by the client. This avoids serializing the tensors
+// into protos and sending them through the network stack.
+constexpr const char kSharedMemoryTransferProtocol[] = "shm";
+
+// Creates a "shm" data transfer server which writes element files to
+// `directory`. Element files that no client reads, e.g. because their request
+// was cancelled, are deleted at the latest when the server is destroyed.
+std::shared_ptr<DataTransferServer> NewSharedMemoryDataTransferServer(
+    DataTransferServer::GetElementT get_element, const std::string& directory);
+
+// Writes `element` to a new file whose path starts with `path_prefix` and
+// describes it in `output`.
+Status WriteSharedMemoryElement(const std::string& path_prefix,
+                                std::vector<Tensor>&& element,
+                                SharedMemoryElement& output);
+
+// Reads the element described by `element` and deletes its file.
+Status ReadSharedMemoryElement(const SharedMemoryElement& element,
+                               std::vector<Tensor>& output);
+
+}  // namespace data
+}  // namespace tensorflow
+
+#endif  // TENSORFLOW_CORE_DATA_SERVICE_SHARED_MEMORY_TRANSFER_H_
@@ -0,0 +1,179 @@
+/* Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+#include "tensorflow/core/data/service/shared_memory_transfer.h"
+
+#include <memory>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "absl/strings/str_cat.h"
+#include "tensorflow/core/data/compression_utils.h"
+#include "tensorflow/core/data/service/data_transfer.h"
+#include "tensorflow/core/data/service/worker.pb.h"
+#include "tensorflow/core/framework/dataset.pb.h"
+#include "tensorflow/core/framework/tensor.h"
+#include "tensorflow/core/framework/tensor_shape.h"
+#include "tensorflow/core/framework/tensor_testutil.h"
+#include "tensorflow/core/framework/variant.h"
+#include "tensorflow/core/lib/core/status_test_util.h"
+#include "tensorflow/core/lib/io/path.h"
+#include "tensorflow/core/platform/env.h"
+#include "tensorflow/core/platform/errors.h"
+#include "tensorflow/core/platform/notification.h"
+#include "tensorflow/core/platform/status.h"
+#include "tensorflow/core/platform/test.h"
+
+namespace tensorflow {
+namespace data {
+namespace {
+
+std::vector<Tensor> TestElement() {
+  Tensor ints(DT_INT64, TensorShape({2, 3}));
+  ints.flat<int64_t>().setValues({1, 2, 3, 4, 5, 6});
+  Tensor strings(DT_STRING, TensorShape({2}));
+  strings.flat<tstring>().setValues({"hello", "world"});
+  Tensor empty(DT_FLOAT, TensorShape({0}));
+  return {ints, strings, empty};
+}
+
+std::string PathPrefix() { return io::JoinPath(testing::TmpDir(), "element_"); }
+
+TEST(SharedMemoryTransferTest, WriteAndRead) {
+  std::vector<Tensor> element = TestElement();
+  SharedMemoryElement shared_memory;
+  TF_ASSERT_OK(
+      WriteSharedMemoryElement(PathPrefix(), TestElement(), shared_memory));
+  EXPECT_FALSE(shared_memory.compressed());
+  ASSERT_EQ(shared_memory.components_size(), 3);
+  EXPECT_FALSE(shared_memory.components(0).is_tensor_proto());
+  EXPECT_TRUE(shared_memory.components(1).is_tensor_proto());
+
+  std::vector<Tensor> result;
+  TF_ASSERT_OK(ReadSharedMemoryElement(shared_memory, result));
+  ASSERT_EQ(result.size(), element.size());
+  for (int i = 0; i < element.size(); ++i) {
+    test::ExpectEqual(result[i], element[i]);
+  }
+  // The file is deleted after reading it.
+  EXPECT_TRUE(errors::IsNotFound(
+      Env::Default()->FileExists(shared_memory.path())));
+}
+
+TEST(SharedMemoryTransferTest, WriteAndReadCompressed) {
+  CompressedElement compressed;
+  TF_ASSERT_OK(CompressElement(TestElement(), &compressed));
+  Tensor tensor(DT_VARIANT, TensorShape({}));
+  tensor.scalar<Variant>()() = compressed;
+  SharedMemoryElement shared_memory;
+  TF_ASSERT_OK(
+      WriteSharedMemoryElement(PathPrefix(), {tensor}, shared_memory));
+  EXPECT_TRUE(shared_memory.compressed());
+
+  std::vector<Tensor> result;
+  TF_ASSERT_OK(ReadSharedMemoryElement(shared_memory, result));
+  ASSERT_EQ(result.size(), 1);
+  const CompressedElement* read =
+      result[0].scalar<Variant>()().get<CompressedElement>();
+  ASSERT_NE(read, nullptr);
+  std::vector<Tensor> uncompressed;
+  TF_ASSERT_OK(UncompressElement(*read, &uncompressed));
+  std::vector<Tensor> element = TestElement();
+  ASSERT_EQ(uncompressed.size(), element.size());
+  for (int i = 0; i < element.size(); ++i) {
+    test::ExpectEqual(uncompressed[i], element[i]);
+  }
+}
+
+TEST(SharedMemoryTransferTest, ReadTruncatedElement) {
+  SharedMemoryElement shared_memory;
+  TF_ASSERT_OK(
+      WriteSharedMemoryElement(PathPrefix(), TestElement(), shared_memory));
+  shared_memory.mutable_components(0)->set_size_bytes(1 << 20);
+  std::vector<Tensor> result;
+  EXPECT_TRUE(errors::IsDataLoss(
+      ReadSharedMemoryElement(shared_memory, result)));
+}
+
+TEST(SharedMemoryTransferTest, ProtocolIsRegistered) {
+  std::shared_ptr<DataTransferServer> server;
+  TF_ASSERT_OK(DataTransferServer::Build(
+      kSharedMemoryTransferProtocol,
+      [](const GetElementRequest*, GetElementResult* result) {
+        result->end_of_sequence = true;
+        return OkStatus();
+      },
+      &server));
+  TF_ASSERT_OK(server->Start());
+  EXPECT_GT(server->get_port(), 0);
+  TF_ASSERT_OK_AND_ASSIGN(std::string compatibility_info,
+                          server->GetCompatibilityInfo());
+
+  std::unique_ptr<DataTransferClient> client;
+  TF_ASSERT_OK(DataTransferClient::Build(
+      kSharedMemoryTransferProtocol,
+      {"grpc", absl::StrCat("localhost:", server->get_port())}, &client));
+  TF_ASSERT_OK(client->CheckCompatibility(compatibility_info));
+  EXPECT_TRUE(errors::IsFailedPrecondition(
+      client->CheckCompatibility("another_host")));
+  GetElementResult result;
+  TF_ASSERT_OK(client->GetElement(GetElementRequest(), result));
+  EXPECT_TRUE(result.end_of_sequence);
+}
+
+TEST(SharedMemoryTransferTest, CancelledGetElementDeletesElementFile) {
+  const std::string directory =
+      io::JoinPath(testing::TmpDir(), "cancelled_get_element");
+  TF_ASSERT_OK(Env::Default()->RecursivelyCreateDir(directory));
+  Notification get_element_called;
+  Notification client_cancelled;
+  std::shared_ptr<DataTransferServer> server =
+      NewSharedMemoryDataTransferServer(
+          [&](const GetElementRequest*, GetElementResult* result) {
+            get_element_called.Notify();
+            client_cancelled.WaitForNotification();
+            result->components = TestElement();
+            return OkStatus();
+          },
+          directory);
+  TF_ASSERT_OK(server->Start());
+
+  std::unique_ptr<DataTransferClient> client;
+  TF_ASSERT_OK(DataTransferClient::Build(
+      kSharedMemoryTransferProtocol,
+      {"grpc", absl::StrCat("localhost:", server->get_port())}, &client));
+  Status status;
+  std::unique_ptr<Thread> thread(Env::Default()->StartThread(
+      ThreadOptions(), "get_element", [&client, &status] {
+        GetElementResult result;
+        status = client->GetElement(GetElementRequest(), result);
+      }));
+  get_element_called.WaitForNotification();
+  client->TryCancel();
+  thread.reset();
+  EXPECT_TRUE(errors::IsCancelled(status)) << status;
+
+  // The element is written after the client has given up on the request.
+  client_cancelled.Notify();
+  // Destroying the server waits for the request to finish.
+  server.reset();
+  std::vector<std::string> files;
+  TF_ASSERT_OK(Env::Default()->GetChildren(directory, &files));
+  EXPECT_TRUE(files.empty());
+}
+
+}  // namespace
+}  // namespace data
+}  // namespace tensorflow
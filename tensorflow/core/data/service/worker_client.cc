@@ -144,6 +144,9 @@ class GrpcDataTransferClient : public DataTransferClient {
           }
         }
         break;
+      case GetElementResponse::kSharedMemory:
+        return errors::Internal(
+            "Received a shared memory element from the gRPC worker server.");
       case GetElementResponse::ELEMENT_NOT_SET:
         break;
     }
@@ -1027,6 +1027,11 @@ class IteratorBase : public Checkpointable {
     return 0;
   }
 
+  // Returns the performance model owned by this iterator. Only the root
+  // iterator of an input pipeline owns a model, and only if autotuning is
+  // enabled; other iterators return `nullptr`.
+  virtual std::shared_ptr<model::Model> model() const { return nullptr; }
+
  protected:
   // Returns a node that models this iterator.
   virtual std::shared_ptr<model::Node> CreateNode(
@@ -2382,7 +2382,7 @@ bool Model::ShouldStop(int64_t cpu_budget, int64_t ram_budget,
 
 // TODO(jsimsa): Add support for tracking and using the model input time.
 Status Model::OptimizeLoop(AutotuneAlgorithm algorithm, int64_t cpu_budget,
-                           int64_t ram_budget,
+                           int64_t ram_budget, bool host_wide,
                            CancellationManager* cancellation_manager) {
   std::function<void()> unused;
   TF_RETURN_IF_ERROR(RegisterCancellationCallback(
@@ -2393,6 +2393,15 @@ Status Model::OptimizeLoop(AutotuneAlgorithm algorithm, int64_t cpu_budget,
       },
       /*deregister_fn=*/&unused));
 
+  if (host_wide) {
+    HostWideBudget::Global()->Register(this, cpu_budget, ram_budget);
+  }
+  auto unregister = gtl::MakeCleanup([this, host_wide]() {
+    if (host_wide) {
+      HostWideBudget::Global()->Unregister(this);
+    }
+  });
+
   int64_t last_optimization_ms = 0;
   int64_t current_time_ms = EnvTime::NowMicros() / EnvTime::kMillisToMicros;
   while (true) {
@@ -2414,14 +2423,26 @@ Status Model::OptimizeLoop(AutotuneAlgorithm algorithm, int64_t cpu_budget,
     int64_t start_ms = EnvTime::NowMicros() / EnvTime::kMillisToMicros;
     double model_input_time = 0.0;
     // Model input time is set to 0 for all optimization algorithms except for
-    // stage-based optimization algorithm for historical reason. In stage-based
-    // optimization algorithm, the model input time is used as a target
-    // optimization time of all stages in the pipeline.
-    if (algorithm == AutotuneAlgorithm::STAGE_BASED) {
+    // stage-based optimization algorithm and host-wide autotuning for
+    // historical reason. In both cases, the model input time is used as a
+    // target optimization time of the pipeline.
+    if (algorithm == AutotuneAlgorithm::STAGE_BASED || host_wide) {
       model_input_time = ComputeTargetTimeNsec();
     }
-    Optimize(algorithm, cpu_budget, ram_budget, model_input_time,
-             cancellation_manager);
+    int64_t optimization_cpu_budget = cpu_budget;
+    int64_t optimization_ram_budget = ram_budget;
+    ModelProto::HostWideBudget host_wide_budget;
+    if (host_wide) {
+      HostWideBudget::Global()->Allocate(
+          this, ComputeCpuDemand(model_input_time), &optimization_cpu_budget,
+          &optimization_ram_budget, &host_wide_budget);
+    }
+    Optimize(algorithm, optimization_cpu_budget, optimization_ram_budget,
+             model_input_time, cancellation_manager);
+    if (host_wide) {
+      mutex_lock l(mu_);
+      *optimization_params_.mutable_host_wide_budget() = host_wide_budget;
+    }
     int64_t end_ms = EnvTime::NowMicros() / EnvTime::kMillisToMicros;
     VLOG(2) << "Optimized for " << end_ms - start_ms << " ms.";
 
@@ -2608,6 +2629,17 @@ double Model::ComputeTargetTimeNsec() {
          1.0e3;
 }
 
+double Model::ComputeCpuDemand(double target_time_nsec) {
+  if (target_time_nsec <= 0) {
+    return 0.0;
+  }
+  std::shared_ptr<Node> output_node = output();
+  if (!output_node) {
+    return 0.0;
+  }
+  return TotalProcessingTime(output_node) / target_time_nsec;
+}
+
 void Model::OptimizeStageBased(std::shared_ptr<Node> snapshot,
                                const OptimizationParams& optimization_params,
                                CancellationManager* cancellation_manager) {
@@ -2881,6 +2913,12 @@ void Model::OptimizeHillClimb(std::shared_ptr<Node> snapshot,
         output_time < processing_time / optimization_params.cpu_budget();
     const bool ram_budget_exceeded =
         buffered_bytes > optimization_params.ram_budget();
+    // The model input time is only set if it is the target time of the
+    // optimization. There is no need to produce elements faster than they are
+    // consumed.
+    const bool target_time_reached =
+        optimization_params.model_input_time() > 0 &&
+        output_time <= optimization_params.model_input_time();
     if (all_max) {
       metrics::RecordTFDataAutotuneStoppingCriteria("all_max");
     }
@@ -2890,7 +2928,11 @@ void Model::OptimizeHillClimb(std::shared_ptr<Node> snapshot,
     if (ram_budget_exceeded) {
       metrics::RecordTFDataAutotuneStoppingCriteria("max_buffered_bytes");
     }
-    return all_max || output_time_budget_exceeded || ram_budget_exceeded;
+    if (target_time_reached) {
+      metrics::RecordTFDataAutotuneStoppingCriteria("target_time");
+    }
+    return all_max || output_time_budget_exceeded || ram_budget_exceeded ||
+           target_time_reached;
   };
   OptimizeHillClimbHelper(snapshot, optimization_params, cancellation_manager,
                           should_stop);
@@ -2947,9 +2989,22 @@ double Model::TotalProcessingTime(std::shared_ptr<Node> node) {
 }
 
 Status Model::ToProto(ModelProto* model_proto) {
-  tf_shared_lock l(mu_);
-  model_proto->set_id_counter(id_counter_);
-  return ModelToProtoHelper(output_, model_proto);
+  {
+    tf_shared_lock l(mu_);
+    model_proto->set_id_counter(id_counter_);
+    // The model has no nodes until the input pipeline iterators are created.
+    if (output_ != nullptr) {
+      TF_RETURN_IF_ERROR(ModelToProtoHelper(output_, model_proto));
+    }
+    // The optimization parameters are set once an optimization has run.
+    if (snapshot_ != nullptr) {
+      *model_proto->mutable_optimization_params() = optimization_params_;
+    }
+  }
+  tf_shared_lock l(gap_mu_);
+  *model_proto->mutable_gap_times() = {gap_times_usec_.begin(),
+                                       gap_times_usec_.end()};
+  return OkStatus();
 }
 
 Status Model::FromProto(ModelProto model_proto, std::unique_ptr<Model>* model) {
@@ -3038,6 +3093,84 @@ Node::NodeVector ModelTiming::CollectNodes(
   return nodes;
 }
 
+HostWideBudget* HostWideBudget::Global() {
+  static HostWideBudget* budget = new HostWideBudget();
+  return budget;
+}
+
+void HostWideBudget::Register(const Model* model, int64_t cpu_budget,
+                              int64_t ram_budget) {
+  mutex_lock l(mu_);
+  Share& share = shares_[model];
+  share.cpu_budget = cpu_budget;
+  share.ram_budget = ram_budget;
+}
+
+void HostWideBudget::Unregister(const Model* model) {
+  mutex_lock l(mu_);
+  shares_.erase(model);
+}
+
+void HostWideBudget::Allocate(const Model* model, double cpu_demand,
+                              int64_t* cpu_budget, int64_t* ram_budget,
+                              ModelProto::HostWideBudget* state) {
+  mutex_lock l(mu_);
+  auto it = shares_.find(model);
+  if (it == shares_.end()) {
+    return;
+  }
+  it->second.cpu_demand = cpu_demand;
+
+  int64_t total_cpu_budget = 0;
+  int64_t total_ram_budget = 0;
+  double total_cpu_demand = 0.0;
+  // Unknown demands are treated as unbounded.
+  std::vector<double> demands;
+  demands.reserve(shares_.size());
+  for (const auto& entry : shares_) {
+    const Share& share = entry.second;
+    total_cpu_budget = std::max(total_cpu_budget, share.cpu_budget);
+    total_ram_budget = std::max(total_ram_budget, share.ram_budget);
+    total_cpu_demand += share.cpu_demand;
+    demands.push_back(share.cpu_demand > 0
+                          ? share.cpu_demand
+                          : std::numeric_limits<double>::infinity());
+  }
+
+  // Computes the max-min fair level: demands below the level are met, and all
+  // other models are granted the level.
+  std::sort(demands.begin(), demands.end());
+  double remaining = total_cpu_budget;
+  double level = std::numeric_limits<double>::infinity();
+  for (size_t i = 0; i < demands.size(); ++i) {
+    const double equal_share = remaining / (demands.size() - i);
+    if (demands[i] >= equal_share) {
+      level = equal_share;
+      remaining = 0.0;
+      break;
+    }
+    remaining -= demands[i];
+  }
+  const double unused_share = remaining / demands.size();
+  const double demand = cpu_demand > 0
+                            ? cpu_demand
+                            : std::numeric_limits<double>::infinity();
+  const double cpu_share = std::min(demand, level) + unused_share;
+
+  // The CPU shares of all models add up to the total CPU budget.
+  *cpu_budget = std::max<int64_t>(1, std::ceil(cpu_share));
+  const double cpu_fraction =
+      cpu_share / std::max<int64_t>(1, total_cpu_budget);
+  *ram_budget = std::max<int64_t>(1, total_ram_budget * cpu_fraction);
+  if (state != nullptr) {
+    state->set_cpu_budget(total_cpu_budget);
+    state->set_ram_budget(total_ram_budget);
+    state->set_num_models(shares_.size());
+    state->set_cpu_demand(cpu_demand);
+    state->set_total_cpu_demand(total_cpu_demand);
+  }
+}
+
 const ModelTiming::NodeTiming* ModelTiming::GetTiming(const Node* node) const {
   if (timing_nodes_.find(node) == timing_nodes_.end()) {
     return nullptr;
@@ -813,10 +813,15 @@ class Model {
   // Uses the given algorithm and resource budgets to periodically perform the
   // autotuning optimization.
   //
+  // If `host_wide` is set, the budgets are shared with the models of all other
+  // iterators of the process that use host-wide autotuning (see
+  // `HostWideBudget`), and the optimization targets the measured time between
+  // consecutive `GetNext()` calls of the consumer.
+  //
   // To terminate the execution of the optimization loop, the caller needs to
   // invoke `cancellation_mgr->StartCancel()`.
   Status OptimizeLoop(AutotuneAlgorithm algorithm, int64_t cpu_budget,
-                      int64_t ram_budget,
+                      int64_t ram_budget, bool host_wide,
                       CancellationManager* cancellation_manager);
 
   // Uses the given algorithm and resource budgets to perform the autotuning
@@ -840,7 +845,8 @@ class Model {
   // Removes the given node.
   void RemoveNode(std::shared_ptr<Node> node) TF_LOCKS_EXCLUDED(mu_);
 
-  // Produces a proto for this model.
+  // Produces a proto for this model, including the parameters of the latest
+  // optimization and the recently recorded iterator gap times.
   Status ToProto(ModelProto* model_proto);
 
   // Restores a model from the proto.
@@ -864,6 +870,10 @@ class Model {
   // algorithm.
   double ComputeTargetTimeNsec();
 
+  // Computes the number of logical threads needed to produce an element every
+  // `target_time_nsec` nanoseconds. Returns 0 if it can not be estimated yet.
+  double ComputeCpuDemand(double target_time_nsec);
+
  private:
   // Determines whether optimization should stop given total processing time,
   // estimated output time, and estimated number of buffers bytes.
@@ -1027,6 +1037,47 @@ class Model {
   OptimizationParams optimization_params_ TF_GUARDED_BY(mu_);
 };
 
+// Divides CPU and RAM budgets among the models of all iterators of the process
+// that use host-wide autotuning.
+//
+// Each model reports its CPU demand, i.e. the number of logical threads it
+// needs to produce elements as fast as its consumer requests them. The CPU
+// budget is divided by max-min fairness: models demanding less than an equal
+// share are granted their demand, and the rest of the budget is divided equally
+// among the other models, including those whose demand is not known yet. If all
+// demands can be met, the unused budget is divided equally among all models.
+// The RAM budget is divided in proportion to the CPU grants.
+class HostWideBudget {
+ public:
+  // Returns the budgets shared by the models of the process.
+  static HostWideBudget* Global();
+
+  // Adds `model` to the models sharing the budgets. The shared budgets are the
+  // largest budgets of the models sharing them.
+  void Register(const Model* model, int64_t cpu_budget, int64_t ram_budget)
+      TF_LOCKS_EXCLUDED(mu_);
+
+  // Removes `model` from the models sharing the budgets.
+  void Unregister(const Model* model) TF_LOCKS_EXCLUDED(mu_);
+
+  // Records the CPU demand of `model`, or 0 if it is not known, and returns the
+  // budgets granted to `model`. If `state` is not `nullptr`, also returns the
+  // state of the shared budgets.
+  void Allocate(const Model* model, double cpu_demand, int64_t* cpu_budget,
+                int64_t* ram_budget, ModelProto::HostWideBudget* state)
+      TF_LOCKS_EXCLUDED(mu_);
+
+ private:
+  struct Share {
+    int64_t cpu_budget;
+    int64_t ram_budget;
+    double cpu_demand = 0.0;
+  };
+
+  mutex mu_;
+  absl::flat_hash_map<const Model*, Share> shares_ TF_GUARDED_BY(mu_);
+};
+
 // Class to compute timing information for a model.
 class ModelTiming {
  public:
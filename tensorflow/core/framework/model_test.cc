@@ -3144,6 +3144,98 @@ TEST_F(ModelTimingTest, SelfTime) {
   EXPECT_DOUBLE_EQ(910, node_2->ComputeSelfTime());
 }
 
+TEST(HostWideBudgetTest, UnknownDemandGetsRemainingBudget) {
+  HostWideBudget budget;
+  Model model_a, model_b;
+  budget.Register(&model_a, /*cpu_budget=*/8, /*ram_budget=*/800);
+  budget.Register(&model_b, /*cpu_budget=*/8, /*ram_budget=*/800);
+  int64_t cpu_budget = 0;
+  int64_t ram_budget = 0;
+  ModelProto::HostWideBudget state;
+  budget.Allocate(&model_a, /*cpu_demand=*/2.0, &cpu_budget, &ram_budget,
+                  &state);
+  EXPECT_EQ(cpu_budget, 2);
+  EXPECT_EQ(ram_budget, 200);
+  EXPECT_EQ(state.cpu_budget(), 8);
+  EXPECT_EQ(state.ram_budget(), 800);
+  EXPECT_EQ(state.num_models(), 2);
+  EXPECT_DOUBLE_EQ(state.cpu_demand(), 2.0);
+  EXPECT_DOUBLE_EQ(state.total_cpu_demand(), 2.0);
+
+  budget.Allocate(&model_b, /*cpu_demand=*/0.0, &cpu_budget, &ram_budget,
+                  /*state=*/nullptr);
+  EXPECT_EQ(cpu_budget, 6);
+  EXPECT_EQ(ram_budget, 600);
+}
+
+TEST(HostWideBudgetTest, ContendedDemandsAreSharedEqually) {
+  HostWideBudget budget;
+  Model model_a, model_b, model_c;
+  budget.Register(&model_a, /*cpu_budget=*/8, /*ram_budget=*/800);
+  budget.Register(&model_b, /*cpu_budget=*/8, /*ram_budget=*/800);
+  budget.Register(&model_c, /*cpu_budget=*/8, /*ram_budget=*/800);
+  int64_t cpu_budget = 0;
+  int64_t ram_budget = 0;
+  budget.Allocate(&model_a, /*cpu_demand=*/2.0, &cpu_budget, &ram_budget,
+                  /*state=*/nullptr);
+  budget.Allocate(&model_b, /*cpu_demand=*/10.0, &cpu_budget, &ram_budget,
+                  /*state=*/nullptr);
+  EXPECT_EQ(cpu_budget, 3);
+  EXPECT_EQ(ram_budget, 300);
+  budget.Allocate(&model_c, /*cpu_demand=*/20.0, &cpu_budget, &ram_budget,
+                  /*state=*/nullptr);
+  EXPECT_EQ(cpu_budget, 3);
+  EXPECT_EQ(ram_budget, 300);
+}
+
+TEST(HostWideBudgetTest, UnusedBudgetIsSharedEqually) {
+  HostWideBudget budget;
+  Model model_a, model_b;
+  budget.Register(&model_a, /*cpu_budget=*/8, /*ram_budget=*/800);
+  budget.Register(&model_b, /*cpu_budget=*/8, /*ram_budget=*/800);
+  int64_t cpu_budget = 0;
+  int64_t ram_budget = 0;
+  budget.Allocate(&model_a, /*cpu_demand=*/1.0, &cpu_budget, &ram_budget,
+                  /*state=*/nullptr);
+  budget.Allocate(&model_b, /*cpu_demand=*/2.0, &cpu_budget, &ram_budget,
+                  /*state=*/nullptr);
+  EXPECT_EQ(cpu_budget, 5);
+  EXPECT_EQ(ram_budget, 450);
+
+  budget.Unregister(&model_a);
+  budget.Allocate(&model_b, /*cpu_demand=*/2.0, &cpu_budget, &ram_budget,
+                  /*state=*/nullptr);
+  EXPECT_EQ(cpu_budget, 8);
+  EXPECT_EQ(ram_budget, 800);
+}
+
+TEST(HostWideBudgetTest, SharedBudgetsAreTheLargestBudgets) {
+  HostWideBudget budget;
+  Model model_a, model_b;
+  budget.Register(&model_a, /*cpu_budget=*/4, /*ram_budget=*/400);
+  budget.Register(&model_b, /*cpu_budget=*/8, /*ram_budget=*/100);
+  int64_t cpu_budget = 0;
+  int64_t ram_budget = 0;
+  ModelProto::HostWideBudget state;
+  budget.Allocate(&model_a, /*cpu_demand=*/0.0, &cpu_budget, &ram_budget,
+                  &state);
+  EXPECT_EQ(state.cpu_budget(), 8);
+  EXPECT_EQ(state.ram_budget(), 400);
+  EXPECT_EQ(cpu_budget, 4);
+  EXPECT_EQ(ram_budget, 200);
+}
+
+TEST(HostWideBudgetTest, UnregisteredModel) {
+  HostWideBudget budget;
+  Model model;
+  int64_t cpu_budget = 3;
+  int64_t ram_budget = 30;
+  budget.Allocate(&model, /*cpu_demand=*/1.0, &cpu_budget, &ram_budget,
+                  /*state=*/nullptr);
+  EXPECT_EQ(cpu_budget, 3);
+  EXPECT_EQ(ram_budget, 30);
+}
+
 }  // namespace
 }  // namespace model
 }  // namespace data
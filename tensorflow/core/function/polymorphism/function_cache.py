@@ -15,7 +15,11 @@
 """Cache to manage concrete functions and their signatures."""
 
 import collections
-from typing import Any, NamedTuple, Optional
+import enum
+import hashlib
+import os
+import tempfile
+from typing import Any, List, NamedTuple, Optional
 
 from tensorflow.core.function.polymorphism import function_type as function_type_lib
 from tensorflow.core.function.polymorphism import type_dispatch
@@ -26,18 +30,103 @@ class FunctionContext(NamedTuple):
   context: Any
 
 
+class EvictionPolicy(enum.Enum):
+  """Selects the function evicted from a FunctionCache over its limits."""
+  # Evicts the function which was looked up least recently.
+  LRU = "lru"
+  # Evicts the function which was looked up least often, breaking ties by
+  # recency. New functions count as looked up once, and the counts are halved
+  # on each eviction so that functions which are no longer used are evicted.
+  LFU = "lfu"
+
+
 class FunctionCache:
-  """A container for managing concrete functions."""
+  """A container for managing concrete functions.
+
+  The cache can be bounded by a number of entries and by an estimate of the
+  bytes held by its functions. Once a new function makes the cache exceed a
+  bound, other functions are evicted following an EvictionPolicy.
+  """
 
-  __slots__ = ["_primary", "_dispatch_dict", "_garbage_collectors"]
+  __slots__ = [
+      "_primary", "_dispatch_dict", "_garbage_collectors",
+      "_dispatch_cache_size", "_max_entries", "_max_bytes",
+      "_eviction_policy", "_bounded", "_sizes", "_total_bytes",
+      "_lookup_counts", "_evictions", "_deleted_dispatch_stats"
+  ]
 
-  def __init__(self):
-    # Maps (FunctionContext, FunctionType) to a concrete function.
+  def __init__(self,
+               dispatch_cache_size: Optional[int] = None,
+               max_entries: Optional[int] = None,
+               max_bytes: Optional[int] = None,
+               eviction_policy: EvictionPolicy = EvictionPolicy.LRU):
+    """Creates a FunctionCache.
+
+    Args:
+      dispatch_cache_size: The maximum number of dispatch lookups cached by the
+        TypeDispatchTable of each FunctionContext. Uses the TypeDispatchTable
+        default if None.
+      max_entries: The maximum number of functions held, or None for no limit.
+      max_bytes: The maximum total size of the functions held, as estimated by
+        the `size_bytes` passed to `add`, or None for no limit.
+      eviction_policy: The EvictionPolicy selecting which function to evict
+        when a limit is exceeded.
+
+    Raises:
+      ValueError: If a limit is not positive.
+    """
+    if max_entries is not None and max_entries < 1:
+      raise ValueError(
+          f"max_entries must be a positive integer, got {max_entries}.")
+    if max_bytes is not None and max_bytes < 1:
+      raise ValueError(
+          f"max_bytes must be a positive integer, got {max_bytes}.")
+
+    # Maps (FunctionContext, FunctionType) to a concrete function, ordered from
+    # least to most recently used when the cache is bounded.
     self._primary = collections.OrderedDict()
 
     # Maps FunctionContext to a TypeDispatchTable containing FunctionTypes of
-    # that particular context.
+    # that particular context. Tables are deleted once they are empty.
     self._dispatch_dict = {}
+    # The summed DispatchStats of the deleted TypeDispatchTables.
+    self._deleted_dispatch_stats = type_dispatch.DispatchStats()
+
+    self._dispatch_cache_size = dispatch_cache_size
+    self._max_entries = max_entries
+    self._max_bytes = max_bytes
+    self._eviction_policy = EvictionPolicy(eviction_policy)
+    # Unbounded caches skip the bookkeeping of lookups.
+    self._bounded = max_entries is not None or max_bytes is not None
+    # Maps the keys of _primary to the sizes passed to add.
+    self._sizes = {}
+    self._total_bytes = 0
+    # Maps the keys of _primary to the number of lookups which returned them,
+    # halved on each eviction.
+    self._lookup_counts = collections.Counter()
+    self._evictions = 0
+
+  @property
+  def max_entries(self) -> Optional[int]:
+    return self._max_entries
+
+  @property
+  def max_bytes(self) -> Optional[int]:
+    return self._max_bytes
+
+  @property
+  def eviction_policy(self) -> EvictionPolicy:
+    return self._eviction_policy
+
+  @property
+  def total_bytes(self) -> int:
+    """The sum of the sizes of the functions held."""
+    return self._total_bytes
+
+  @property
+  def evictions(self) -> int:
+    """The number of functions evicted to keep the cache within its limits."""
+    return self._evictions
 
   def lookup(self, context: FunctionContext,
              function_type: function_type_lib.FunctionType) -> Optional[Any]:
@@ -45,42 +134,96 @@ class FunctionCache:
     if context in self._dispatch_dict:
       dispatch_type = self._dispatch_dict[context].dispatch(function_type)
       if dispatch_type:
-        return self._primary[(context, dispatch_type)]
+        key = (context, dispatch_type)
+        if self._bounded:
+          self._primary.move_to_end(key)
+          self._lookup_counts[key] += 1
+        return self._primary[key]
 
     return None
 
   def delete(self, context: FunctionContext,
              function_type: function_type_lib.FunctionType) -> bool:
     """Deletes a concrete function given the context and type."""
-    if (context, function_type) not in self._primary:
+    key = (context, function_type)
+    if key not in self._primary:
       return False
 
-    del self._primary[(context, function_type)]
-    self._dispatch_dict[context].delete(function_type)
+    del self._primary[key]
+    self._total_bytes -= self._sizes.pop(key, 0)
+    self._lookup_counts.pop(key, None)
+    dispatch_table = self._dispatch_dict[context]
+    dispatch_table.delete(function_type)
+    if not dispatch_table.targets:
+      del self._dispatch_dict[context]
+      self._deleted_dispatch_stats = type_dispatch.DispatchStats(
+          *map(sum, zip(self._deleted_dispatch_stats,
+                        dispatch_table.dispatch_stats)))
 
     return True
 
   def add(self, context: FunctionContext,
           function_type: function_type_lib.FunctionType,
-          concrete_fn: Any):
+          concrete_fn: Any,
+          size_bytes: int = 0):
     """Adds a new concrete function alongside its key.
 
+    If the cache then exceeds one of its limits, functions other than
+    `concrete_fn` are evicted until it does not.
+
     Args:
       context: A FunctionContext representing the current context.
       function_type: A FunctionType representing concrete_fn signature.
       concrete_fn: The concrete function to be added to the cache.
+      size_bytes: An estimate of the memory held by concrete_fn, counted
+        against `max_bytes`.
     """
-    self._primary[(context, function_type)] = concrete_fn
+    key = (context, function_type)
+    self._primary[key] = concrete_fn
     if context not in self._dispatch_dict:
-      self._dispatch_dict[context] = type_dispatch.TypeDispatchTable()
+      self._dispatch_dict[context] = type_dispatch.TypeDispatchTable(
+          self._dispatch_cache_size)
 
     self._dispatch_dict[context].add_target(function_type)
 
+    if self._bounded:
+      self._primary.move_to_end(key)
+      self._total_bytes += size_bytes - self._sizes.get(key, 0)
+      self._sizes[key] = size_bytes
+      while len(self._primary) > 1 and self._exceeds_limits():
+        self.delete(*self._eviction_candidate(key))
+        self._evictions += 1
+        if self._eviction_policy is EvictionPolicy.LFU:
+          for other_key in self._lookup_counts:
+            if other_key != key:
+              self._lookup_counts[other_key] //= 2
+      # New functions count as looked up once, so that the next function added
+      # does not evict them before they are looked up.
+      self._lookup_counts[key] = max(self._lookup_counts[key], 1)
+
+  def _exceeds_limits(self) -> bool:
+    return ((self._max_entries is not None and
+             len(self._primary) > self._max_entries) or
+            (self._max_bytes is not None and
+             self._total_bytes > self._max_bytes))
+
+  def _eviction_candidate(self, added_key):
+    """Returns the key of the function to evict, other than `added_key`."""
+    candidates = (key for key in self._primary if key != added_key)
+    if self._eviction_policy is EvictionPolicy.LRU:
+      return next(candidates)
+    # Keys are ordered by recency, and min returns the first minimal key.
+    return min(candidates, key=self._lookup_counts.__getitem__)
+
   def generalize(
       self, context: FunctionContext,
       function_type: function_type_lib.FunctionType
   ) -> function_type_lib.FunctionType:
-    """Try to generalize a FunctionType within a FunctionContext."""
+    """Try to generalize a FunctionType within a FunctionContext.
+
+    Only the FunctionTypes of functions still held by the cache are considered,
+    as evicted functions are removed from the dispatch tables.
+    """
     if context in self._dispatch_dict:
       return self._dispatch_dict[context].try_generalizing_function_type(
           function_type)
@@ -92,7 +235,93 @@ class FunctionCache:
     """Removes all concrete functions from the cache."""
     self._primary.clear()
     self._dispatch_dict.clear()
+    self._sizes.clear()
+    self._total_bytes = 0
+    self._lookup_counts.clear()
 
   def values(self):
     """Returns a list of all `ConcreteFunction` instances held by this cache."""
     return list(self._primary.values())
+
+  def function_types(
+      self,
+      context: FunctionContext) -> List[function_type_lib.FunctionType]:
+    """Returns the FunctionTypes of the functions cached for `context`."""
+    return [
+        function_type for entry_context, function_type in self._primary
+        if entry_context == context
+    ]
+
+  def dispatch_stats(self) -> type_dispatch.DispatchStats:
+    """Returns the dispatch lookup counts summed over all contexts."""
+    return type_dispatch.DispatchStats(*(
+        sum(counts) for counts in zip(
+            self._deleted_dispatch_stats,
+            *(table.dispatch_stats for table in self._dispatch_dict.values()))))
+
+
+class PersistentFunctionCache:
+  """An on-disk cache of serialized concrete functions.
+
+  The cache lets processes reuse functions traced by earlier processes. Entries
+  are keyed by a fingerprint of the traced Python function, the FunctionType
+  of the trace (including the types of its captures) and a version string which
+  identifies the runtime that produced them. Entries are written atomically, so
+  the cache directory can be shared by processes running concurrently.
+  """
+
+  __slots__ = ["_directory", "_version"]
+
+  def __init__(self, directory: str, version: str):
+    self._directory = directory
+    self._version = version
+
+  @property
+  def directory(self) -> str:
+    return self._directory
+
+  def make_key(
+      self, fingerprint: str,
+      function_type: function_type_lib.FunctionType) -> Optional[str]:
+    """Returns the key for a trace, or None if the trace can not be cached.
+
+    Args:
+      fingerprint: A string identifying the source code of the traced function
+        and the options it is traced with.
+      function_type: A FunctionType representing the trace signature.
+
+    Returns:
+      A string key, or None if `function_type` contains types which can not be
+      serialized, and hence can not be identified across processes.
+    """
+    try:
+      function_type_proto = function_type.to_proto()
+    except ValueError:
+      return None
+    hasher = hashlib.sha256()
+    for part in (self._version.encode("utf-8"), fingerprint.encode("utf-8"),
+                 function_type_proto.SerializeToString(deterministic=True)):
+      # Length-prefix the parts so that the concatenation is unambiguous.
+      hasher.update(len(part).to_bytes(8, "little"))
+      hasher.update(part)
+    return hasher.hexdigest()
+
+  def lookup(self, key: str) -> Optional[bytes]:
+    """Returns the serialized function stored under `key`, if any."""
+    try:
+      with open(os.path.join(self._directory, key), "rb") as f:
+        return f.read()
+    except OSError:
+      return None
+
+  def add(self, key: str, serialized_function: bytes):
+    """Stores a serialized function under `key`."""
+    os.makedirs(self._directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=self._directory, prefix=key + ".tmp")
+    try:
+      with os.fdopen(fd, "wb") as f:
+        f.write(serialized_function)
+      os.replace(temp_path, os.path.join(self._directory, key))
+    finally:
+      if os.path.exists(temp_path):
+        os.remove(temp_path)
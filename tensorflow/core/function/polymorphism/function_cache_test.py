@@ -276,6 +276,171 @@ class FunctionCacheTest(test.TestCase):
           cache.lookup(ctx, make_single_param_type(MockShape(2, 2, 2))), "d"
       )
 
+  def testFunctionTypesAreListedPerContext(self):
+    cache = function_cache.FunctionCache()
+    f_type_1 = make_type(1)
+    f_type_2 = make_type(2)
+    cache.add(function_cache.FunctionContext(0), f_type_1, "test_1")
+    cache.add(function_cache.FunctionContext(0), f_type_2, "test_2")
+    cache.add(function_cache.FunctionContext(1), f_type_1, "test_3")
+
+    self.assertEqual(
+        cache.function_types(function_cache.FunctionContext(0)),
+        [f_type_1, f_type_2])
+    self.assertEqual(
+        cache.function_types(function_cache.FunctionContext(1)), [f_type_1])
+    self.assertEmpty(cache.function_types(function_cache.FunctionContext(2)))
+
+  def testLruEvictsLeastRecentlyUsedFunction(self):
+    ctx = make_none_context()
+    cache = function_cache.FunctionCache(max_entries=2)
+    cache.add(ctx, make_type(1), "test_1")
+    cache.add(ctx, make_type(2), "test_2")
+    self.assertEqual(cache.lookup(ctx, make_type(1)), "test_1")
+
+    cache.add(ctx, make_type(3), "test_3")
+    self.assertEqual(cache.evictions, 1)
+    self.assertEqual(cache.lookup(ctx, make_type(1)), "test_1")
+    self.assertIsNone(cache.lookup(ctx, make_type(2)))
+    self.assertEqual(cache.lookup(ctx, make_type(3)), "test_3")
+    self.assertCountEqual(cache.values(), ["test_1", "test_3"])
+
+  def testLfuEvictsLeastFrequentlyUsedFunction(self):
+    ctx = make_none_context()
+    cache = function_cache.FunctionCache(
+        max_entries=2, eviction_policy=function_cache.EvictionPolicy.LFU)
+    cache.add(ctx, make_type(1), "test_1")
+    cache.add(ctx, make_type(2), "test_2")
+    cache.lookup(ctx, make_type(1))
+    cache.lookup(ctx, make_type(1))
+    cache.lookup(ctx, make_type(2))
+
+    cache.add(ctx, make_type(3), "test_3")
+    self.assertCountEqual(cache.values(), ["test_1", "test_3"])
+
+    for _ in range(3):
+      cache.lookup(ctx, make_type(3))
+    cache.lookup(ctx, make_type(1))
+    # The least frequently used function is evicted, although it was used
+    # last.
+    cache.add(ctx, make_type(4), "test_4")
+    self.assertCountEqual(cache.values(), ["test_3", "test_4"])
+
+  def testLfuEvictsFunctionsNoLongerUsed(self):
+    ctx = make_none_context()
+    cache = function_cache.FunctionCache(
+        max_entries=2, eviction_policy=function_cache.EvictionPolicy.LFU)
+    for value in (1, 2):
+      cache.add(ctx, make_type(value), value)
+      for _ in range(100):
+        cache.lookup(ctx, make_type(value))
+
+    # The workload switches to other types. Their functions are evicted by
+    # each other at first, until the counts of the old functions decay.
+    for _ in range(20):
+      for value in (3, 4):
+        if cache.lookup(ctx, make_type(value)) is None:
+          cache.add(ctx, make_type(value), value)
+    self.assertCountEqual(cache.values(), [3, 4])
+
+  def testMaxBytesEvictsFunctions(self):
+    ctx = make_none_context()
+    cache = function_cache.FunctionCache(max_bytes=100)
+    cache.add(ctx, make_type(1), "test_1", size_bytes=40)
+    cache.add(ctx, make_type(2), "test_2", size_bytes=40)
+    self.assertEqual(cache.total_bytes, 80)
+
+    cache.add(ctx, make_type(3), "test_3", size_bytes=40)
+    self.assertEqual(cache.total_bytes, 80)
+    self.assertCountEqual(cache.values(), ["test_2", "test_3"])
+
+    # A function larger than the limit evicts all others, but is kept.
+    cache.add(ctx, make_type(4), "test_4", size_bytes=200)
+    self.assertEqual(cache.total_bytes, 200)
+    self.assertEqual(cache.values(), ["test_4"])
+    self.assertEqual(cache.evictions, 3)
+
+    cache.delete(ctx, make_type(4))
+    self.assertEqual(cache.total_bytes, 0)
+
+  def testEvictionAcrossContexts(self):
+    cache = function_cache.FunctionCache(max_entries=1)
+    cache.add(function_cache.FunctionContext(0), make_type(1), "test_1")
+    cache.add(function_cache.FunctionContext(1), make_type(1), "test_2")
+    self.assertIsNone(
+        cache.lookup(function_cache.FunctionContext(0), make_type(1)))
+    self.assertEqual(
+        cache.lookup(function_cache.FunctionContext(1), make_type(1)),
+        "test_2")
+
+  def testEvictionDeletesEmptyDispatchTables(self):
+    cache = function_cache.FunctionCache(max_entries=1)
+    for i in range(100):
+      cache.add(function_cache.FunctionContext(i), make_type(i), i)
+      cache.lookup(function_cache.FunctionContext(i), make_type(i))
+    self.assertLen(cache._dispatch_dict, 1)  # pylint: disable=protected-access
+    # The lookups of the deleted tables are still counted.
+    self.assertEqual(cache.dispatch_stats().exact_hits, 100)
+
+  def testInvalidLimits(self):
+    with self.assertRaisesRegex(ValueError, "max_entries"):
+      function_cache.FunctionCache(max_entries=0)
+    with self.assertRaisesRegex(ValueError, "max_bytes"):
+      function_cache.FunctionCache(max_bytes=-1)
+    with self.assertRaises(ValueError):
+      function_cache.FunctionCache(max_entries=1, eviction_policy="fifo")
+
+  def testDispatchStatsAreSummedOverContexts(self):
+    cache = function_cache.FunctionCache(dispatch_cache_size=0)
+    for ctx in (function_cache.FunctionContext(0),
+                function_cache.FunctionContext(1)):
+      cache.add(ctx, make_single_param_type(MockShape(None)), "a")
+      cache.lookup(ctx, make_single_param_type(MockShape(None)))
+      cache.lookup(ctx, make_single_param_type(MockShape(1)))
+      cache.lookup(ctx, make_single_param_type(MockShape(1)))
+
+    stats = cache.dispatch_stats()
+    self.assertEqual(stats.exact_hits, 2)
+    # Lookups are not cached, so repeated lookups use the dispatch index.
+    self.assertEqual(stats.cache_hits, 0)
+    self.assertEqual(stats.index_hits, 4)
+    self.assertEqual(stats.misses, 0)
+
+
+class PersistentFunctionCacheTest(test.TestCase):
+
+  def testAddAndLookup(self):
+    cache = function_cache.PersistentFunctionCache(
+        self.get_temp_dir(), "version")
+    key = cache.make_key("fingerprint", make_type(1))
+    self.assertIsNone(cache.lookup(key))
+    cache.add(key, b"serialized")
+    self.assertEqual(cache.lookup(key), b"serialized")
+
+    # Entries are shared by caches using the same directory.
+    other_cache = function_cache.PersistentFunctionCache(
+        self.get_temp_dir(), "version")
+    self.assertEqual(other_cache.lookup(key), b"serialized")
+
+  def testKeysDependOnAllParts(self):
+    cache = function_cache.PersistentFunctionCache(
+        self.get_temp_dir(), "version")
+    key = cache.make_key("fingerprint", make_type(1))
+    self.assertEqual(key, cache.make_key("fingerprint", make_type(1)))
+    self.assertNotEqual(key, cache.make_key("fingerprint", make_type(2)))
+    self.assertNotEqual(key, cache.make_key("other", make_type(1)))
+    other_version_cache = function_cache.PersistentFunctionCache(
+        self.get_temp_dir(), "other_version")
+    self.assertNotEqual(
+        key, other_version_cache.make_key("fingerprint", make_type(1)))
+
+  def testUnserializableTypeHasNoKey(self):
+    cache = function_cache.PersistentFunctionCache(
+        self.get_temp_dir(), "version")
+    self.assertIsNone(
+        cache.make_key("fingerprint",
+                       make_single_param_type(MockGenericType(1))))
+
 
 class FunctionCacheBenchmark(test.Benchmark):
 
@@ -329,6 +494,40 @@ class FunctionCacheBenchmark(test.Benchmark):
         ],
     )
 
+  def benchmarkCacheMissManyShapes(self):
+    # If there are 500 keys differing in their shapes and we get a new key
+    # that the cache has no concrete functions for.
+
+    cache = function_cache.FunctionCache(dispatch_cache_size=0)
+    num_total_checks = 500
+
+    for i in range(num_total_checks):
+      cache.add(make_none_context(), make_type(array_ops.zeros([8, i])),
+                "testing")
+
+    iterations = 10000
+    lookup_key = make_type(array_ops.zeros([8, num_total_checks]))
+    lookup_time = timeit.timeit(
+        lambda: cache.lookup(make_none_context(), lookup_key),
+        number=iterations,
+    )
+
+    self.report_benchmark(
+        name="cache_miss_500_shapes",
+        iters=iterations,
+        wall_time=lookup_time,
+        metrics=[
+            {
+                "name": "cache_miss_500_shapes_avg_ms",
+                "value": lookup_time / iterations * 1000,
+            },
+            {
+                "name": "cache_miss_500_shapes_candidates_checked",
+                "value": cache.dispatch_stats().candidates_checked / iterations,
+            },
+        ],
+    )
+
   def benchmarkCacheHit50thKeyEqual(self):
     # If there are 50 keys and we get a new key that is equal to a key that is
     # in the cache.
@@ -16,7 +16,7 @@
 
 import collections
 import inspect
-from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
 
 from absl import logging
 
@@ -340,6 +340,41 @@ class FunctionType(inspect.Signature):
             f"captures={self.captures})")
 
 
+def describe_differences(previous: FunctionType,
+                         current: FunctionType) -> List[str]:
+  """Describes how the types of `current` differ from those of `previous`.
+
+  Used to explain why a function was traced again for `current` when it had
+  already been traced for `previous`. Captures are only compared when they are
+  held by both types, since a trace only holds the captures it uses.
+
+  Args:
+    previous: The FunctionType of an existing trace.
+    current: The FunctionType which could not be dispatched to it.
+
+  Returns:
+    One description per parameter or capture whose type differs, in the order
+    of the parameters of `current`.
+  """
+  differences = []
+  for name, parameter in current.parameters.items():
+    if name not in previous.parameters:
+      differences.append(
+          f"{name}: new parameter of type {parameter.type_constraint}")
+    elif previous.parameters[name] != parameter:
+      differences.append(
+          f"{name}: {previous.parameters[name].type_constraint} -> "
+          f"{parameter.type_constraint}")
+  for name in previous.parameters:
+    if name not in current.parameters:
+      differences.append(f"{name}: parameter removed")
+  for name, capture_type in current.captures.items():
+    if name in previous.captures and previous.captures[name] != capture_type:
+      differences.append(
+          f"capture {name}: {previous.captures[name]} -> {capture_type}")
+  return differences
+
+
 MAX_SANITIZATION_WARNINGS = 5
 sanitization_warnings_given = 0
 
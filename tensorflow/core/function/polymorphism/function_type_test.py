@@ -696,6 +696,46 @@ class CapturesTest(test.TestCase):
     self.assertEmpty(supertype_5.captures)
 
 
+class DescribeDifferencesTest(test.TestCase):
+
+  def _make_type(self, parameters, captures=None):
+    return function_type.FunctionType([
+        function_type.Parameter(name,
+                                function_type.Parameter.POSITIONAL_OR_KEYWORD,
+                                False, trace_type.from_value(value))
+        for name, value in parameters.items()
+    ], collections.OrderedDict(
+        (name, trace_type.from_value(value))
+        for name, value in (captures or {}).items()))
+
+  def testSameType(self):
+    foo_type = self._make_type({"x": 1, "y": 2})
+    self.assertEmpty(function_type.describe_differences(foo_type, foo_type))
+
+  def testParameterTypes(self):
+    previous = self._make_type({"x": 1, "y": 2})
+    current = self._make_type({"x": 1, "y": 3})
+    self.assertEqual(
+        function_type.describe_differences(previous, current),
+        ["y: Literal(value=2) -> Literal(value=3)"])
+
+  def testAddedAndRemovedParameters(self):
+    previous = self._make_type({"x": 1, "y": 2})
+    current = self._make_type({"x": 1, "z": 2})
+    self.assertEqual(
+        function_type.describe_differences(previous, current), [
+            "z: new parameter of type Literal(value=2)",
+            "y: parameter removed"
+        ])
+
+  def testCaptures(self):
+    previous = self._make_type({}, {"a": 1, "b": 1})
+    current = self._make_type({}, {"a": 2, "c": 1})
+    self.assertEqual(
+        function_type.describe_differences(previous, current),
+        ["capture a: Literal(value=1) -> Literal(value=2)"])
+
+
 class SanitizationTest(test.TestCase):
 
   def testRename(self):
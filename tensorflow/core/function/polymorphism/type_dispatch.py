@@ -15,13 +15,175 @@
 """Polymorphic Type Dispatch."""
 
 import collections
-from typing import Optional, Iterable
+import itertools
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional, Type
 
 from tensorflow.core.function.polymorphism import function_type
+from tensorflow.core.function.trace_type import default_types
+from tensorflow.python.types import trace
 
 # The maximum number of dispatch lookups to cache.
 _MAX_DISPATCH_CACHE = 1024
 
+# An atom of a dispatch key which matches any atom of a request key.
+WILDCARD = object()
+
+# Maps TraceType classes to functions appending their dispatch key atoms.
+_DISPATCH_KEY_FNS = {}
+
+
+def register_dispatch_key_fn(
+    trace_type_class: Type[trace.TraceType],
+    dispatch_key_fn: Callable[[trace.TraceType, List[Any]], bool]) -> None:
+  """Registers a function computing dispatch keys for a TraceType class.
+
+  TypeDispatchTable indexes its targets by their dispatch keys to avoid
+  checking every target when dispatching a request. The dispatch key of a type
+  is a list of hashable atoms. `dispatch_key_fn(trace_type, key)` appends the
+  atoms of `trace_type` to `key`, recursing into component types with
+  `append_dispatch_key`, and returns False if it stopped early, i.e. if the
+  appended atoms only describe part of `trace_type`.
+
+  The atoms must be a necessary condition for subtyping: if A is a subtype of
+  B then the keys of A and B must be equal, except that an atom of B may be
+  `WILDCARD` (which matches any atom of A) and that the key of either type may
+  stop early. The function is only used for `trace_type_class` itself, not for
+  its subclasses.
+
+  Args:
+    trace_type_class: The TraceType class.
+    dispatch_key_fn: The function appending the atoms of a `trace_type_class`
+      instance to a key.
+  """
+  _DISPATCH_KEY_FNS[trace_type_class] = dispatch_key_fn
+
+
+def append_dispatch_key(trace_type: Any, key: List[Any]) -> bool:
+  """Appends the dispatch key of `trace_type` to `key`.
+
+  Args:
+    trace_type: A TraceType.
+    key: The list of atoms to append to.
+
+  Returns:
+    False if only part of `trace_type` is described by the appended atoms,
+    e.g. because the class of one of its components has no registered dispatch
+    key function.
+  """
+  dispatch_key_fn = _DISPATCH_KEY_FNS.get(type(trace_type))
+  if dispatch_key_fn is None:
+    return False
+  return dispatch_key_fn(trace_type, key)
+
+
+def _append_equality_key(trace_type, key):
+  # These types are only subtypes of the types they are equal to.
+  key.append(trace_type)
+  return True
+
+
+def _append_tuple_key(trace_type, key):
+  key.append((default_types.Tuple, len(trace_type.components)))
+  return all(
+      append_dispatch_key(component, key)
+      for component in trace_type.components)
+
+
+def _append_list_key(trace_type, key):
+  key.append(default_types.List)
+  return append_dispatch_key(trace_type.components_tuple, key)
+
+
+def _append_named_tuple_key(trace_type, key):
+  key.append((default_types.NamedTuple, trace_type.type_name,
+              trace_type.attribute_names))
+  return append_dispatch_key(trace_type.attributes, key)
+
+
+def _append_attrs_key(trace_type, key):
+  key.append(default_types.Attrs)
+  return append_dispatch_key(trace_type.named_attributes, key)
+
+
+def _append_dict_key(trace_type, key):
+  try:
+    # The keys of the mapping are ordered canonically, since subtyping ignores
+    # their insertion order.
+    mapping_keys = tuple(sorted(trace_type.mapping))
+  except TypeError:
+    return False
+  key.append((default_types.Dict, mapping_keys))
+  return all(
+      append_dispatch_key(trace_type.mapping[mapping_key], key)
+      for mapping_key in mapping_keys)
+
+
+register_dispatch_key_fn(default_types.Literal, _append_equality_key)
+register_dispatch_key_fn(default_types.Weakref, _append_equality_key)
+register_dispatch_key_fn(default_types.Tuple, _append_tuple_key)
+register_dispatch_key_fn(default_types.List, _append_list_key)
+register_dispatch_key_fn(default_types.NamedTuple, _append_named_tuple_key)
+register_dispatch_key_fn(default_types.Attrs, _append_attrs_key)
+register_dispatch_key_fn(default_types.Dict, _append_dict_key)
+
+
+def _dispatch_key(func_type: function_type.FunctionType):
+  """Returns the dispatch key of a FunctionType and whether it is complete."""
+  # Captures are not part of the key: a request may have more captures than
+  # the targets it dispatches to.
+  key = [len(func_type.parameters)]
+  for parameter in func_type.parameters.values():
+    key.append((parameter.name, parameter.kind, parameter.optional))
+    if not append_dispatch_key(parameter.type_constraint, key):
+      return key, False
+  return key, True
+
+
+def _parameter_signature(func_type: function_type.FunctionType):
+  return tuple((parameter.name, parameter.kind, parameter.optional)
+               for parameter in func_type.parameters.values())
+
+
+class DispatchStats(NamedTuple):
+  """Counts the results of the dispatch lookups of a TypeDispatchTable.
+
+  Attributes:
+    exact_hits: Lookups of a request which is a target.
+    cache_hits: Lookups answered by the dispatch cache.
+    index_hits: Lookups which found a target with the dispatch index.
+    misses: Lookups which found no target.
+    candidates_checked: The number of targets whose type was compared to a
+      request by lookups which used the dispatch index.
+  """
+  exact_hits: int = 0
+  cache_hits: int = 0
+  index_hits: int = 0
+  misses: int = 0
+  candidates_checked: int = 0
+
+
+class _DispatchIndexNode:
+  """A node of the trie indexing dispatch targets by their dispatch keys."""
+
+  __slots__ = ["children", "targets", "prefix_targets"]
+
+  def __init__(self):
+    # Maps the next atom of a key to the child node.
+    self.children = {}
+    # Targets whose complete key ends at this node.
+    self.targets = set()
+    # Targets whose key stops early at this node.
+    self.prefix_targets = set()
+
+  def collect(self, candidates):
+    """Adds the targets of this node and its descendants to `candidates`."""
+    nodes = [self]
+    while nodes:
+      node = nodes.pop()
+      candidates.update(node.targets)
+      candidates.update(node.prefix_targets)
+      nodes.extend(node.children.values())
+
 
 class TypeDispatchTable:
   """Type dispatch table implementation.
@@ -33,22 +195,56 @@ class TypeDispatchTable:
        supertype of T (in other words, T is the closest to R, within list L).
     3. If the above two rules are satisfied by multiple targets, the earliest
        inserted one is chosen.
+
+  Targets are indexed by their dispatch keys (see `register_dispatch_key_fn`)
+  in a trie, so that a lookup only compares the request to the targets whose
+  keys match the key of the request rather than to every target.
   """
 
-  def __init__(self):
-    """Creates a TypeDispatchTable object."""
-    # Holds all inserted types as keys mapping to None.
+  def __init__(self, max_dispatch_cache_size: Optional[int] = None):
+    """Creates a TypeDispatchTable object.
+
+    Args:
+      max_dispatch_cache_size: The maximum number of non-exact dispatch results
+        to cache. Defaults to 1024.
+    """
+    # Maps all inserted types to their insertion index.
     # (Using OrderedDict as a set for determinism)
     self._dispatch_table = collections.OrderedDict()
+    self._insertion_counter = itertools.count()
 
     # LRU cache for dispatch results.
     # Maps request types to target types (see class description).
     # Does not contain exact matches, i.e, if cache[a] is b then a is not b.
     self._dispatch_cache = collections.OrderedDict()
+    if max_dispatch_cache_size is None:
+      max_dispatch_cache_size = _MAX_DISPATCH_CACHE
+    if max_dispatch_cache_size < 0:
+      raise ValueError("max_dispatch_cache_size must be non-negative, got "
+                       f"{max_dispatch_cache_size}.")
+    self._max_dispatch_cache_size = max_dispatch_cache_size
+
+    # Trie indexing the targets by their dispatch keys, and the path of
+    # (node, atom) edges from the root to the node holding each target.
+    self._index = _DispatchIndexNode()
+    self._index_nodes = {}
+
+    # Targets grouped by the names, kinds and optionality of their parameters,
+    # which must match for targets to be generalized together.
+    self._parameter_groups = collections.defaultdict(set)
+
+    # Counters of the dispatch lookup results, see DispatchStats.
+    self._exact_hits = 0
+    self._cache_hits = 0
+    self._index_hits = 0
+    self._misses = 0
+    self._candidates_checked = 0
 
   def add_target(self, target: function_type.FunctionType) -> None:
     """Adds a new target type."""
-    self._dispatch_table[target] = None
+    if target not in self._dispatch_table:
+      self._dispatch_table[target] = next(self._insertion_counter)
+      self._index_target(target)
     for request in self._dispatch_cache:
       if target.is_supertype_of(self._dispatch_cache[request]):
         self._dispatch_cache[request] = target
@@ -62,6 +258,7 @@ class TypeDispatchTable:
     """Deletes a target in the table if it exists."""
     if target in self._dispatch_table:
       del self._dispatch_table[target]
+      self._unindex_target(target)
       for request in list(self._dispatch_cache.keys()):
         if self._dispatch_cache[request] == target:
           del self._dispatch_cache[request]
@@ -71,6 +268,85 @@ class TypeDispatchTable:
     """Deletes all targets in the table."""
     self._dispatch_table.clear()
     self._dispatch_cache.clear()
+    self._index = _DispatchIndexNode()
+    self._index_nodes.clear()
+    self._parameter_groups.clear()
+
+  @property
+  def max_dispatch_cache_size(self) -> int:
+    """The maximum number of non-exact dispatch results to cache."""
+    return self._max_dispatch_cache_size
+
+  @property
+  def dispatch_stats(self) -> DispatchStats:
+    """Counts of the results of the dispatch lookups so far."""
+    return DispatchStats(self._exact_hits, self._cache_hits, self._index_hits,
+                         self._misses, self._candidates_checked)
+
+  def _index_target(self, target):
+    """Adds `target` to the dispatch index."""
+    key, complete = _dispatch_key(target)
+    node = self._index
+    path = []
+    for atom in key:
+      if atom not in node.children:
+        node.children[atom] = _DispatchIndexNode()
+      path.append((node, atom))
+      node = node.children[atom]
+    if complete:
+      node.targets.add(target)
+    else:
+      node.prefix_targets.add(target)
+    self._index_nodes[target] = path
+    self._parameter_groups[_parameter_signature(target)].add(target)
+
+  def _unindex_target(self, target):
+    """Removes `target` from the dispatch index."""
+    path = self._index_nodes.pop(target)
+    if path:
+      parent, atom = path[-1]
+      node = parent.children[atom]
+    else:
+      node = self._index
+    node.targets.discard(target)
+    node.prefix_targets.discard(target)
+    # Prunes the nodes left without targets, so that the index does not grow
+    # with the number of distinct targets ever added.
+    for parent, atom in reversed(path):
+      child = parent.children[atom]
+      if child.targets or child.prefix_targets or child.children:
+        break
+      del parent.children[atom]
+    signature = _parameter_signature(target)
+    self._parameter_groups[signature].discard(target)
+    if not self._parameter_groups[signature]:
+      del self._parameter_groups[signature]
+
+  def _dispatch_candidates(self, request):
+    """Returns the targets which `request` may dispatch to, in order."""
+    key, complete = _dispatch_key(request)
+    candidates = set()
+    nodes = [self._index]
+    for atom in key:
+      next_nodes = []
+      for node in nodes:
+        # Targets whose keys stop early match any continuation of the key.
+        candidates.update(node.prefix_targets)
+        if atom in node.children:
+          next_nodes.append(node.children[atom])
+        if atom is not WILDCARD and WILDCARD in node.children:
+          next_nodes.append(node.children[WILDCARD])
+      nodes = next_nodes
+      if not nodes:
+        break
+    for node in nodes:
+      if complete:
+        candidates.update(node.targets)
+        candidates.update(node.prefix_targets)
+      else:
+        # The rest of the request key is unknown, so any target below matches.
+        node.collect(candidates)
+    return sorted(candidates, key=self._dispatch_table.__getitem__)
 
   def dispatch(
       self, request: function_type.FunctionType
@@ -78,6 +354,7 @@ class TypeDispatchTable:
     """Returns the most specific supertype target if it exists in the table."""
     # For known exact matches.
     if request in self._dispatch_table:
+      self._exact_hits += 1
       return request
 
     # For known non-exact matches.
@@ -86,23 +363,30 @@ class TypeDispatchTable:
       # Move to the front of LRU cache.
       result = self._dispatch_cache.pop(request)
       self._dispatch_cache[request] = result
+      self._cache_hits += 1
       return result
 
+    candidates = self._dispatch_candidates(request)
     most_specific_supertype = None
-    for other in self._dispatch_table:
+    for other in candidates:
       if request.is_supertype_of(other):
         if most_specific_supertype is None or other.is_supertype_of(
             most_specific_supertype):
           most_specific_supertype = other
 
+    self._candidates_checked += len(candidates)
+    if most_specific_supertype is None:
+      self._misses += 1
+    else:
+      self._index_hits += 1
     self._cache_dispatch(request, most_specific_supertype)
     return most_specific_supertype
 
   def _cache_dispatch(self, request, target):
     """Caches the dispatch lookup result for a target."""
-    if target is not None:
+    if target is not None and self._max_dispatch_cache_size:
       # LRU Cache removes oldest item
-      if len(self._dispatch_cache) > _MAX_DISPATCH_CACHE:
+      if len(self._dispatch_cache) >= self._max_dispatch_cache_size:
         self._dispatch_cache.popitem(last=False)
       self._dispatch_cache[request] = target
 
@@ -123,8 +407,17 @@ class TypeDispatchTable:
     Args:
       target: The FunctionType to generalize
     """
+    # Only targets whose leading parameters match those of `target` can be
+    # generalized with it.
+    signature = _parameter_signature(target)
+    candidates = []
+    for other_signature, others in self._parameter_groups.items():
+      if other_signature[:len(signature)] == signature:
+        candidates.extend(others)
+    candidates.sort(key=self._dispatch_table.__getitem__)
+
     relaxed = target
-    for other in self._dispatch_table:
+    for other in candidates:
       subtype = relaxed.most_specific_common_subtype([other])
       if subtype is not None:
         relaxed = subtype
@@ -14,10 +14,13 @@
 # ==============================================================================
 """Tests for type_dispatch."""
 
+import itertools
+import random
 from typing import Optional
 
 from tensorflow.core.function.polymorphism import function_type
 from tensorflow.core.function.polymorphism import type_dispatch
+from tensorflow.core.function.trace_type import default_types
 from tensorflow.python.platform import test
 from tensorflow.python.types import trace
 
@@ -60,6 +63,24 @@ class MockShape(trace.TraceType):
     return self.shape == other.shape
 
 
+class IndexedMockShape(MockShape):
+
+  def most_specific_common_supertype(self, others):
+    supertype = super().most_specific_common_supertype(others)
+    return IndexedMockShape(*supertype.shape) if supertype else None
+
+
+def _append_indexed_mock_shape_key(mock_shape, key):
+  key.append(len(mock_shape.shape))
+  key.extend(type_dispatch.WILDCARD if dim is None else dim
+             for dim in mock_shape.shape)
+  return True
+
+
+type_dispatch.register_dispatch_key_fn(IndexedMockShape,
+                                       _append_indexed_mock_shape_key)
+
+
 def make_shape_function_type(*shape):
   return function_type.FunctionType([
       function_type.Parameter("x", function_type.Parameter.POSITIONAL_ONLY,
@@ -67,6 +88,25 @@ def make_shape_function_type(*shape):
   ])
 
 
+def make_indexed_function_type(*shapes):
+  return function_type.FunctionType([
+      function_type.Parameter(f"x{i}", function_type.Parameter.POSITIONAL_ONLY,
+                              False, IndexedMockShape(*shape))
+      for i, shape in enumerate(shapes)
+  ])
+
+
+def linear_dispatch(targets, request):
+  """Reference implementation of dispatch, checking every target."""
+  most_specific_supertype = None
+  for other in targets:
+    if request.is_supertype_of(other):
+      if most_specific_supertype is None or other.is_supertype_of(
+          most_specific_supertype):
+        most_specific_supertype = other
+  return most_specific_supertype
+
+
 class TypeDispatchTableTest(test.TestCase):
 
   def testVertical(self):
@@ -312,6 +352,173 @@ class TypeDispatchTableTest(test.TestCase):
             make_shape_function_type(None, 4, 3)),
         make_shape_function_type(None, 4, 3))
 
+  def testDispatchIndexMatchesLinearScan(self):
+    rng = random.Random(0)
+    dims = [None, 1, 2]
+
+    def random_shape():
+      return tuple(rng.choice(dims) for _ in range(rng.randint(1, 3)))
+
+    table = type_dispatch.TypeDispatchTable(max_dispatch_cache_size=0)
+    targets = []
+    for _ in range(50):
+      target = make_indexed_function_type(random_shape(), random_shape())
+      table.add_target(target)
+      if target not in targets:
+        targets.append(target)
+
+    for _ in range(200):
+      request = make_indexed_function_type(random_shape(), random_shape())
+      self.assertEqual(
+          table.dispatch(request), linear_dispatch(targets, request))
+
+  def testDispatchIndexNarrowsCandidates(self):
+    table = type_dispatch.TypeDispatchTable()
+    for i in range(100):
+      table.add_target(make_indexed_function_type((i, None)))
+    table.add_target(make_indexed_function_type((None, None)))
+
+    self.assertEqual(
+        table.dispatch(make_indexed_function_type((7, 3))),
+        make_indexed_function_type((7, None)))
+    # Only the (7, None) and (None, None) targets are compared to the request.
+    self.assertEqual(table.dispatch_stats.candidates_checked, 2)
+
+  def testDispatchIndexWithUnindexedTypes(self):
+
+    def make_unindexed_function_type(*shape):
+      return function_type.FunctionType([
+          function_type.Parameter("x0",
+                                  function_type.Parameter.POSITIONAL_ONLY,
+                                  False, MockShape(*shape))
+      ])
+
+    table = type_dispatch.TypeDispatchTable()
+    table.add_target(make_indexed_function_type((1, None)))
+    table.add_target(make_unindexed_function_type(None, None))
+
+    # Targets without a complete dispatch key match any indexed request.
+    self.assertEqual(
+        table.dispatch(make_indexed_function_type((2, 2))),
+        make_unindexed_function_type(None, None))
+    # Requests without a complete dispatch key match any indexed target.
+    self.assertEqual(
+        table.dispatch(make_unindexed_function_type(1, 2)),
+        make_indexed_function_type((1, None)))
+    self.assertEqual(
+        table.dispatch(make_unindexed_function_type(2, 2)),
+        make_unindexed_function_type(None, None))
+
+  def testDispatchIndexDeletion(self):
+    table = type_dispatch.TypeDispatchTable()
+    table.add_target(make_indexed_function_type((None, None)))
+    table.add_target(make_indexed_function_type((1, None)))
+    table.delete(make_indexed_function_type((1, None)))
+    self.assertEqual(
+        table.dispatch(make_indexed_function_type((1, 2))),
+        make_indexed_function_type((None, None)))
+    table.delete(make_indexed_function_type((None, None)))
+    self.assertIsNone(table.dispatch(make_indexed_function_type((1, 2))))
+
+  def testDispatchIndexDeletionPrunesNodes(self):
+
+    def count_index_nodes(table):
+      nodes = [table._index]  # pylint: disable=protected-access
+      count = 0
+      while nodes:
+        node = nodes.pop()
+        count += 1
+        nodes.extend(node.children.values())
+      return count
+
+    table = type_dispatch.TypeDispatchTable()
+    table.add_target(make_indexed_function_type((None, 1)))
+    num_nodes = count_index_nodes(table)
+    for i in range(2, 102):
+      # Shares the nodes of the (None, 1) target but the last one.
+      target = make_indexed_function_type((None, i))
+      table.add_target(target)
+      table.delete(target)
+    self.assertEqual(count_index_nodes(table), num_nodes)
+    self.assertEqual(
+        table.dispatch(make_indexed_function_type((2, 1))),
+        make_indexed_function_type((None, 1)))
+
+  def testDispatchDefaultTypes(self):
+
+    def make_function_type(value):
+      return function_type.FunctionType([
+          function_type.Parameter("x", function_type.Parameter.POSITIONAL_ONLY,
+                                  False, value)
+      ])
+
+    table = type_dispatch.TypeDispatchTable()
+    for a, b in itertools.product([1, 2], [None, 3]):
+      table.add_target(
+          make_function_type(
+              default_types.Dict({
+                  "a": default_types.Literal(a),
+                  "b": default_types.List(IndexedMockShape(b))
+              })))
+
+    request = make_function_type(
+        default_types.Dict({
+            "b": default_types.List(IndexedMockShape(4)),
+            "a": default_types.Literal(2)
+        }))
+    self.assertEqual(
+        table.dispatch(request),
+        make_function_type(
+            default_types.Dict({
+                "a": default_types.Literal(2),
+                "b": default_types.List(IndexedMockShape(None))
+            })))
+    # Only the target with a == 2 and b == [None] is compared to the request.
+    self.assertEqual(table.dispatch_stats.candidates_checked, 1)
+
+  def testGeneralizedIgnoresOtherParameters(self):
+    table = type_dispatch.TypeDispatchTable()
+    table.add_target(make_indexed_function_type((1,)))
+    table.add_target(make_indexed_function_type((1,), (1,)))
+    self.assertEqual(
+        table.try_generalizing_function_type(
+            make_indexed_function_type((2,), (1,))),
+        make_indexed_function_type((None,), (1,)))
+
+  def testDispatchStats(self):
+    table = type_dispatch.TypeDispatchTable()
+    table.add_target(make_shape_function_type(None, None))
+    table.add_target(make_shape_function_type(None, 1))
+
+    table.dispatch(make_shape_function_type(None, 1))
+    table.dispatch(make_shape_function_type(2, 1))
+    table.dispatch(make_shape_function_type(2, 1))
+    table.dispatch(make_shape_function_type(2))
+    self.assertEqual(
+        table.dispatch_stats,
+        type_dispatch.DispatchStats(
+            exact_hits=1,
+            cache_hits=1,
+            index_hits=1,
+            misses=1,
+            candidates_checked=4))
+
+  def testDispatchCacheSize(self):
+    table = type_dispatch.TypeDispatchTable(max_dispatch_cache_size=2)
+    self.assertEqual(table.max_dispatch_cache_size, 2)
+    table.add_target(make_shape_function_type(None))
+    for i in range(3):
+      table.dispatch(make_shape_function_type(i))
+    # The least recently used lookup was evicted.
+    table.dispatch(make_shape_function_type(0))
+    self.assertEqual(table.dispatch_stats.cache_hits, 0)
+    table.dispatch(make_shape_function_type(2))
+    self.assertEqual(table.dispatch_stats.cache_hits, 1)
+
+  def testInvalidDispatchCacheSize(self):
+    with self.assertRaisesRegex(ValueError, "must be non-negative"):
+      type_dispatch.TypeDispatchTable(max_dispatch_cache_size=-1)
+
 
 if __name__ == "__main__":
   test.main()
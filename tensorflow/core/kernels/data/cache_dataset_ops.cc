@@ -14,18 +14,23 @@ limitations under the License.
 ==============================================================================*/
 #include "tensorflow/core/kernels/data/cache_dataset_ops.h"
 
+#include <algorithm>
 #include <memory>
 #include <string>
 #include <utility>
 #include <vector>
 
+#include "absl/strings/numbers.h"
+#include "absl/strings/str_split.h"
 #include "tensorflow/core/data/name_utils.h"
 #include "tensorflow/core/data/serialization_utils.h"
+#include "tensorflow/core/framework/allocation_description.pb.h"
 #include "tensorflow/core/framework/dataset.h"
 #include "tensorflow/core/framework/dataset_options.pb.h"
 #include "tensorflow/core/framework/partial_tensor_shape.h"
 #include "tensorflow/core/framework/resource_mgr.h"
 #include "tensorflow/core/framework/tensor.h"
+#include "tensorflow/core/framework/types.h"
 #include "tensorflow/core/kernels/data/cache_ops.h"
 #include "tensorflow/core/kernels/data/iterator_ops.h"
 #include "tensorflow/core/lib/core/errors.h"
@@ -46,6 +51,7 @@ namespace data {
 /* static */ constexpr const char* const CacheDatasetOp::kFileName;
 /* static */ constexpr const char* const CacheDatasetOp::kOutputTypes;
 /* static */ constexpr const char* const CacheDatasetOp::kOutputShapes;
+/* static */ constexpr const char* const CacheDatasetOp::kFileFormat;
 
 namespace {
 
@@ -64,6 +70,15 @@ constexpr char kCacheCompleted[] = "cache_completed";
 constexpr char kIndex[] = "index";
 constexpr char kImpl[] = "Impl";
 constexpr char kCacheDataset[] = "CacheDataset";
+constexpr char kMemoryMappedFileDatasetPrefix[] = "MemoryMappedFile";
+constexpr char kMemoryMappedFileFormat[] = "mmap";
+constexpr char kMemoryMappedDataSuffix[] = ".mmap_data";
+constexpr char kMemoryMappedIndexSuffix[] = ".mmap_index";
+constexpr char kMemoryMappedAllocatorName[] = "MemoryMappedCache";
+constexpr int64_t kMemoryMappedVersion = 1;
+// Components are aligned to the largest alignment required by Eigen so that
+// tensors can alias the mapped region directly.
+constexpr int64_t kMemoryMappedAlignment = 64;
 constexpr char kIncompleteCacheErrorMessage[] =
     "The calling iterator did not fully read the dataset being cached. In "
     "order to avoid unexpected truncation of the dataset, the partially cached "
@@ -723,6 +738,493 @@ class CacheDatasetOp::FileDatasetV2 : public CacheDatasetOp::FileDatasetBase {
   const Tensor resource_handle_;
 };
 
+namespace {
+
+// A tensor buffer that points into the memory region of a memory-mapped cache.
+// Each buffer holds a reference to the region so that the mapping outlives all
+// tensors read from it.
+class MemoryMappedBuffer : public TensorBuffer {
+ public:
+  MemoryMappedBuffer(std::shared_ptr<ReadOnlyMemoryRegion> region,
+                     const char* data, size_t size)
+      : TensorBuffer(const_cast<char*>(data)),
+        region_(std::move(region)),
+        size_(size) {}
+
+  size_t size() const override { return size_; }
+
+  TensorBuffer* root_buffer() override { return this; }
+
+  void FillAllocationDescription(AllocationDescription* proto) const override {
+    proto->set_requested_bytes(static_cast<int64_t>(size_));
+    proto->set_allocator_name(kMemoryMappedAllocatorName);
+  }
+
+  // The region is mapped read-only, so the buffer must never be forwarded to
+  // kernels that update their inputs in place.
+  bool OwnsMemory() const override { return false; }
+
+ private:
+  const std::shared_ptr<ReadOnlyMemoryRegion> region_;
+  const size_t size_;
+};
+
+}  // namespace
+
+// Caches the elements of its input in a file with a fixed-stride layout, and
+// reads them back through a read-only memory mapping.
+//
+// The cache consists of a data file `<filename>.mmap_data`, which stores the
+// elements back to back, and an index file `<filename>.mmap_index`, which is
+// written once all elements have been cached. Each component of an element
+// starts at a fixed, `kMemoryMappedAlignment`-aligned offset within its record
+// and all records have the same size, so the element at position `i` starts
+// at byte `i * record_stride_`. This requires all components to have fully
+// defined shapes and trivially copyable types.
+//
+// Elements read from the cache alias the mapped region and are not copied,
+// and the operating system shares the mapped pages between all processes
+// reading the same cache.
+class CacheDatasetOp::MemoryMappedFileDatasetBase : public DatasetBase {
+ public:
+  MemoryMappedFileDatasetBase(OpKernelContext* ctx, const DatasetBase* input,
+                              string filename, Env* env)
+      : DatasetBase(DatasetContext(ctx)),
+        input_(input),
+        filename_(std::move(filename)),
+        env_(env),
+        data_filename_(strings::StrCat(filename_, kMemoryMappedDataSuffix)),
+        index_filename_(strings::StrCat(filename_, kMemoryMappedIndexSuffix)),
+        lockfile_(strings::StrCat(filename_, kMemoryMappedDataSuffix,
+                                  kLockFileSuffix)) {
+    input_->Ref();
+    int64_t offset = 0;
+    for (const PartialTensorShape& shape : input_->output_shapes()) {
+      TensorShape tensor_shape;
+      shape.AsTensorShape(&tensor_shape);
+      shapes_.push_back(tensor_shape);
+    }
+    for (size_t i = 0; i < shapes_.size(); ++i) {
+      offsets_.push_back(offset);
+      sizes_.push_back(shapes_[i].num_elements() *
+                       DataTypeSize(input_->output_dtypes()[i]));
+      offset += RoundUp(sizes_[i]);
+    }
+    record_stride_ = std::max(offset, kMemoryMappedAlignment);
+  }
+
+  ~MemoryMappedFileDatasetBase() override { input_->Unref(); }
+
+  // Returns an error if elements with the given types and shapes can not be
+  // stored in a memory-mapped cache.
+  static Status ValidateElementSpec(
+      const DataTypeVector& dtypes,
+      const std::vector<PartialTensorShape>& shapes) {
+    for (size_t i = 0; i < dtypes.size(); ++i) {
+      if (!DataTypeCanUseMemcpy(dtypes[i])) {
+        return errors::InvalidArgument(
+            "The memory-mapped cache only supports numeric and boolean "
+            "components, but component ",
+            i, " has type ", DataTypeString(dtypes[i]), ".");
+      }
+      if (!shapes[i].IsFullyDefined()) {
+        return errors::InvalidArgument(
+            "The memory-mapped cache requires all components to have fully "
+            "defined shapes, but component ",
+            i, " has shape ", shapes[i].DebugString(), ".");
+      }
+    }
+    return OkStatus();
+  }
+
+  std::unique_ptr<IteratorBase> MakeIteratorInternal(
+      const string& prefix) const override {
+    name_utils::IteratorPrefixParams params;
+    params.dataset_prefix = kMemoryMappedFileDatasetPrefix;
+    return std::make_unique<MemoryMappedFileIterator>(
+        MemoryMappedFileIterator::Params{
+            this, name_utils::IteratorPrefix(kDatasetType, prefix, params)});
+  }
+
+  const DataTypeVector& output_dtypes() const override {
+    return input_->output_dtypes();
+  }
+
+  const std::vector<PartialTensorShape>& output_shapes() const override {
+    return input_->output_shapes();
+  }
+
+  string DebugString() const override {
+    name_utils::DatasetDebugStringParams params;
+    params.dataset_prefix = kMemoryMappedFileDatasetPrefix;
+    return name_utils::DatasetDebugString(kDatasetType, params);
+  }
+
+  int64_t CardinalityInternal(CardinalityOptions options) const override {
+    return input_->Cardinality(options);
+  }
+
+  // Reads the element at `index` from the cache in constant time. Elements
+  // are read from the input until the cache has been completely written.
+  Status Get(OpKernelContext* ctx, int64 index,
+             std::vector<Tensor>* out_tensors) const override {
+    std::shared_ptr<const MappedCache> cache;
+    Status s = GetMappedCache(&cache);
+    if (errors::IsNotFound(s)) {
+      return input_->Get(ctx, index, out_tensors);
+    }
+    TF_RETURN_IF_ERROR(s);
+    if (index < 0 || index >= cache->num_elements) {
+      return errors::OutOfRange("Index out of range [0, ", cache->num_elements,
+                                "):", index);
+    }
+    ReadElement(*cache, index, out_tensors);
+    return OkStatus();
+  }
+
+  Status InputDatasets(std::vector<const DatasetBase*>* inputs) const override {
+    inputs->push_back(input_);
+    return OkStatus();
+  }
+
+  Status CheckExternalState() const override {
+    return input_->CheckExternalState();
+  }
+
+ protected:
+  const DatasetBase* const input_;
+  const tstring filename_;
+
+ private:
+  // A completely written cache, mapped into memory.
+  struct MappedCache {
+    std::shared_ptr<ReadOnlyMemoryRegion> region;
+    int64_t num_elements = 0;
+  };
+
+  static int64_t RoundUp(int64_t size) {
+    return (size + kMemoryMappedAlignment - 1) / kMemoryMappedAlignment *
+           kMemoryMappedAlignment;
+  }
+
+  // Maps the cache into memory the first time it is needed. Returns a
+  // `NotFound` error if the cache has not been completely written yet.
+  Status GetMappedCache(std::shared_ptr<const MappedCache>* cache) const
+      TF_LOCKS_EXCLUDED(mu_) {
+    mutex_lock l(mu_);
+    if (mapped_cache_) {
+      *cache = mapped_cache_;
+      return OkStatus();
+    }
+    string contents;
+    TF_RETURN_IF_ERROR(ReadFileToString(env_, index_filename_, &contents));
+    std::vector<absl::string_view> fields = absl::StrSplit(contents, ' ');
+    int64_t version, num_elements, record_stride;
+    if (fields.size() != 3 || !absl::SimpleAtoi(fields[0], &version) ||
+        !absl::SimpleAtoi(fields[1], &num_elements) ||
+        !absl::SimpleAtoi(fields[2], &record_stride) ||
+        version != kMemoryMappedVersion || num_elements < 0) {
+      return errors::DataLoss("Invalid memory-mapped cache index file ",
+                              index_filename_, ": \"", contents, "\".");
+    }
+    if (record_stride != record_stride_) {
+      return errors::FailedPrecondition(
+          "The memory-mapped cache ", data_filename_,
+          " was written for elements with a different structure. To rebuild "
+          "the cache, delete ",
+          index_filename_, " and ", data_filename_, ".");
+    }
+    auto mapped_cache = std::make_shared<MappedCache>();
+    mapped_cache->num_elements = num_elements;
+    // Empty files can not be mapped.
+    if (num_elements > 0) {
+      std::unique_ptr<ReadOnlyMemoryRegion> region;
+      TF_RETURN_IF_ERROR(
+          env_->NewReadOnlyMemoryRegionFromFile(data_filename_, &region));
+      if (static_cast<int64_t>(region->length()) <
+          num_elements * record_stride_) {
+        return errors::DataLoss("The memory-mapped cache ", data_filename_,
+                                " is truncated: expected at least ",
+                                num_elements * record_stride_,
+                                " bytes, but found ", region->length(), ".");
+      }
+      mapped_cache->region = std::move(region);
+    }
+    mapped_cache_ = std::move(mapped_cache);
+    *cache = mapped_cache_;
+    return OkStatus();
+  }
+
+  void ReadElement(const MappedCache& cache, int64_t index,
+                   std::vector<Tensor>* out_tensors) const {
+    const char* record = static_cast<const char*>(cache.region->data()) +
+                         index * record_stride_;
+    out_tensors->clear();
+    out_tensors->reserve(shapes_.size());
+    for (size_t i = 0; i < shapes_.size(); ++i) {
+      out_tensors->emplace_back(
+          output_dtypes()[i], shapes_[i],
+          core::RefCountPtr<TensorBuffer>(new MemoryMappedBuffer(
+              cache.region, record + offsets_[i], sizes_[i])));
+    }
+  }
+
+  class MemoryMappedFileIterator
+      : public DatasetIterator<MemoryMappedFileDatasetBase> {
+   public:
+    explicit MemoryMappedFileIterator(const Params& params)
+        : DatasetIterator<MemoryMappedFileDatasetBase>(params) {
+      if (params.dataset->env_->FileExists(params.dataset->index_filename_)
+              .ok()) {
+        mode_ = Mode::read;
+      } else {
+        mode_ = Mode::write;
+      }
+    }
+
+    ~MemoryMappedFileIterator() override {
+      if (mode_ == Mode::write && !iteration_completed_ && lockfile_created_) {
+        LOG(WARNING) << kIncompleteCacheErrorMessage;
+        writer_.reset();
+        for (const string& path :
+             {dataset()->data_filename_, dataset()->lockfile_}) {
+          Status s = dataset()->env_->DeleteFile(path);
+          if (!s.ok()) {
+            LOG(WARNING) << "Failed to delete " << path << " : "
+                         << s.ToString();
+          }
+        }
+      }
+    }
+
+    Status Initialize(IteratorContext* ctx) override {
+      mutex_lock l(mu_);
+      if (mode_ == Mode::read) {
+        return dataset()->GetMappedCache(&cache_);
+      }
+      return dataset()->input_->MakeIterator(ctx, this, prefix(),
+                                             &input_impl_);
+    }
+
+    Status GetNextInternal(IteratorContext* ctx,
+                           std::vector<Tensor>* out_tensors,
+                           bool* end_of_sequence) override {
+      mutex_lock l(mu_);
+      if (mode_ == Mode::read) {
+        if (cur_index_ >= cache_->num_elements) {
+          *end_of_sequence = true;
+          return OkStatus();
+        }
+        dataset()->ReadElement(*cache_, cur_index_++, out_tensors);
+        *end_of_sequence = false;
+        return OkStatus();
+      }
+      if (iteration_completed_) {
+        *end_of_sequence = true;
+        return OkStatus();
+      }
+      TF_RETURN_IF_ERROR(EnsureLockFileExists());
+      TF_RETURN_IF_ERROR(
+          input_impl_->GetNext(ctx, out_tensors, end_of_sequence));
+      if (*end_of_sequence) {
+        return Finish();
+      }
+      TF_RETURN_IF_ERROR(WriteElement(*out_tensors));
+      cur_index_++;
+      return OkStatus();
+    }
+
+   protected:
+    std::shared_ptr<model::Node> CreateNode(
+        IteratorContext* ctx, model::Node::Args args) const override {
+      return model::MakeKnownRatioNode(std::move(args),
+                                       /*ratio=*/1);
+    }
+
+    Status SaveInternal(SerializationContext* ctx,
+                        IteratorStateWriter* writer) override {
+      mutex_lock l(mu_);
+      if (mode_ == Mode::write && !iteration_completed_) {
+        return errors::Unimplemented(
+            "Checkpointing an iterator that is writing a memory-mapped cache "
+            "is not supported. Iterate through the cached dataset once "
+            "before checkpointing.");
+      }
+      return writer->WriteScalar(full_name(kCurIndex), cur_index_);
+    }
+
+    Status RestoreInternal(IteratorContext* ctx,
+                           IteratorStateReader* reader) override {
+      mutex_lock l(mu_);
+      if (mode_ == Mode::write) {
+        return errors::FailedPrecondition(
+            "Failed to restore an iterator over a memory-mapped cache: the "
+            "cache ",
+            dataset()->index_filename_, " does not exist.");
+      }
+      TF_RETURN_IF_ERROR(reader->ReadScalar(full_name(kCurIndex), &cur_index_));
+      return OkStatus();
+    }
+
+   private:
+    // Performs the same rudimentary locking as the tensor bundle cache to
+    // help catch concurrent writes to the same cache files.
+    Status EnsureLockFileExists() TF_EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+      if (lockfile_created_) {
+        return OkStatus();
+      }
+      Env* env = dataset()->env_;
+      if (env->FileExists(dataset()->index_filename_).ok()) {
+        return errors::AlreadyExists(
+            "Existing cache files found: \n", dataset()->index_filename_, "\n",
+            dataset()->data_filename_, "\nTo continue delete the above files.");
+      }
+      if (env->FileExists(dataset()->lockfile_).ok()) {
+        return errors::AlreadyExists(
+            "There appears to be a concurrent caching iterator running - "
+            "cache lockfile already exists ('",
+            dataset()->lockfile_,
+            "'). If you are sure no other running TF computations are using "
+            "this cache prefix, delete the lockfile and re-initialize the "
+            "iterator.");
+      }
+      std::unique_ptr<WritableFile> lockfile;
+      TF_RETURN_IF_ERROR(env->NewWritableFile(dataset()->lockfile_, &lockfile));
+      TF_RETURN_IF_ERROR(lockfile->Append(
+          strings::StrCat(kCreatedAt, ": ", EnvTime::NowSeconds())));
+      TF_RETURN_IF_ERROR(lockfile->Close());
+      lockfile_created_ = true;
+      return env->NewWritableFile(dataset()->data_filename_, &writer_);
+    }
+
+    Status WriteElement(const std::vector<Tensor>& element)
+        TF_EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+      if (element.size() != dataset()->shapes_.size()) {
+        return errors::Internal(
+            "Upstream iterator returned invalid number of tensors. Expected ",
+            dataset()->shapes_.size(), " got: ", element.size());
+      }
+      int64_t written = 0;
+      for (size_t i = 0; i < element.size(); ++i) {
+        if (!element[i].shape().IsSameSize(dataset()->shapes_[i])) {
+          return errors::InvalidArgument(
+              "The memory-mapped cache expected component ", i,
+              " to have shape ", dataset()->shapes_[i].DebugString(),
+              ", but got ", element[i].shape().DebugString(), ".");
+        }
+        TF_RETURN_IF_ERROR(WritePadding(dataset()->offsets_[i] - written));
+        TF_RETURN_IF_ERROR(writer_->Append(element[i].tensor_data()));
+        written = dataset()->offsets_[i] + dataset()->sizes_[i];
+      }
+      return WritePadding(dataset()->record_stride_ - written);
+    }
+
+    Status WritePadding(int64_t size) TF_EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+      static const char kZeros[kMemoryMappedAlignment] = {0};
+      DCHECK_LE(size, kMemoryMappedAlignment);
+      if (size <= 0) {
+        return OkStatus();
+      }
+      return writer_->Append(StringPiece(kZeros, size));
+    }
+
+    // Flushes the data file and publishes the cache by writing the index file.
+    Status Finish() TF_EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+      iteration_completed_ = true;
+      Env* env = dataset()->env_;
+      TF_RETURN_IF_ERROR(writer_->Close());
+      writer_.reset();
+      string tmp_index_filename =
+          strings::StrCat(dataset()->index_filename_, ".tmp");
+      TF_RETURN_IF_ERROR(WriteStringToFile(
+          env, tmp_index_filename,
+          strings::StrCat(kMemoryMappedVersion, " ", cur_index_, " ",
+                          dataset()->record_stride_)));
+      TF_RETURN_IF_ERROR(
+          env->RenameFile(tmp_index_filename, dataset()->index_filename_));
+      return env->DeleteFile(dataset()->lockfile_);
+    }
+
+    enum class Mode { read, write };
+
+    mutex mu_;
+    Mode mode_;
+    int64_t cur_index_ TF_GUARDED_BY(mu_) = 0;
+    // Used in `read` mode.
+    std::shared_ptr<const MappedCache> cache_ TF_GUARDED_BY(mu_);
+    // Used in `write` mode.
+    std::unique_ptr<IteratorBase> input_impl_ TF_GUARDED_BY(mu_);
+    std::unique_ptr<WritableFile> writer_ TF_GUARDED_BY(mu_);
+    bool lockfile_created_ TF_GUARDED_BY(mu_) = false;
+    bool iteration_completed_ TF_GUARDED_BY(mu_) = false;
+  };  // MemoryMappedFileIterator
+
+  Env* const env_;
+  const string data_filename_;
+  const string index_filename_;
+  const string lockfile_;
+  std::vector<TensorShape> shapes_;
+  // The offset and size of each component within a record.
+  std::vector<int64_t> offsets_;
+  std::vector<int64_t> sizes_;
+  int64_t record_stride_;
+
+  mutable mutex mu_;
+  mutable std::shared_ptr<const MappedCache> mapped_cache_ TF_GUARDED_BY(mu_);
+};  // MemoryMappedFileDatasetBase
+
+class CacheDatasetOp::MemoryMappedFileDataset
+    : public CacheDatasetOp::MemoryMappedFileDatasetBase {
+ public:
+  using MemoryMappedFileDatasetBase::MemoryMappedFileDatasetBase;
+
+ protected:
+  Status AsGraphDefInternal(SerializationContext* ctx,
+                            DatasetGraphDefBuilder* b,
+                            Node** output) const override {
+    Node* input_graph = nullptr;
+    TF_RETURN_IF_ERROR(b->AddInputDataset(ctx, input_, &input_graph));
+    Node* filename = nullptr;
+    TF_RETURN_IF_ERROR(b->AddScalar(filename_, &filename));
+    AttrValue file_format;
+    b->BuildAttrValue(string(kMemoryMappedFileFormat), &file_format);
+    TF_RETURN_IF_ERROR(b->AddDataset(this, {input_graph, filename},
+                                     {{kFileFormat, file_format}}, output));
+    return OkStatus();
+  }
+};
+
+class CacheDatasetOp::MemoryMappedFileDatasetV2
+    : public CacheDatasetOp::MemoryMappedFileDatasetBase {
+ public:
+  explicit MemoryMappedFileDatasetV2(OpKernelContext* ctx,
+                                     const DatasetBase* input, string filename,
+                                     Env* env, const Tensor& resource_handle)
+      : MemoryMappedFileDatasetBase(ctx, input, filename, env),
+        resource_handle_(resource_handle) {}
+
+ protected:
+  Status AsGraphDefInternal(SerializationContext* ctx,
+                            DatasetGraphDefBuilder* b,
+                            Node** output) const override {
+    Node* input_node = nullptr;
+    TF_RETURN_IF_ERROR(b->AddInputDataset(ctx, input_, &input_node));
+    Node* filename_node = nullptr;
+    TF_RETURN_IF_ERROR(b->AddScalar(filename_, &filename_node));
+    Node* resource_handle_node = nullptr;
+    TF_RETURN_IF_ERROR(b->AddTensor(resource_handle_, &resource_handle_node));
+    AttrValue file_format;
+    b->BuildAttrValue(string(kMemoryMappedFileFormat), &file_format);
+    TF_RETURN_IF_ERROR(
+        b->AddDataset(this, {input_node, filename_node, resource_handle_node},
+                      {{kFileFormat, file_format}}, output));
+    return OkStatus();
+  }
+
+ private:
+  const Tensor resource_handle_;
+};
+
 class CacheDatasetOp::MemoryDatasetBase : public DatasetBase {
  public:
   explicit MemoryDatasetBase(OpKernelContext* ctx, const DatasetBase* input,
@@ -1110,13 +1612,22 @@ class CacheDatasetOp::MemoryDatasetV2
 
 CacheDatasetOp::CacheDatasetOp(OpKernelConstruction* ctx)
     : UnaryDatasetOpKernel(ctx),
-      op_version_(ctx->def().op() == kCacheDataset ? 1 : 2) {}
+      op_version_(ctx->def().op() == kCacheDataset ? 1 : 2) {
+  OP_REQUIRES_OK(ctx, ctx->GetAttr(kFileFormat, &file_format_));
+  OP_REQUIRES(
+      ctx, file_format_.empty() || file_format_ == kMemoryMappedFileFormat,
+      errors::InvalidArgument("Unsupported cache file format: \"",
+                              file_format_, "\"."));
+}
 
 void CacheDatasetOp::MakeDataset(OpKernelContext* ctx, DatasetBase* input,
                                  DatasetBase** output) {
   // Parse out the filenames tensor.
   tstring filename;
   OP_REQUIRES_OK(ctx, ParseScalarArgument<tstring>(ctx, kFileName, &filename));
+  OP_REQUIRES(ctx, !filename.empty() || file_format_.empty(),
+              errors::InvalidArgument(
+                  "A filename is required to cache to a memory-mapped file."));
   if (filename.empty()) {
     static std::atomic<int64_t> resource_id_counter(0);
     const string& container = ctx->resource_manager()->default_container();
@@ -1157,6 +1668,15 @@ void CacheDatasetOp::MakeDataset(OpKernelContext* ctx, DatasetBase* input,
       // Ownership of manager is transferred onto `MemoryDataset`.
       *output = new MemoryDataset(ctx, input, manager, std::move(handle));
     }
+  } else if (file_format_ == kMemoryMappedFileFormat) {
+    OP_REQUIRES_OK(ctx, MemoryMappedFileDatasetBase::ValidateElementSpec(
+                            input->output_dtypes(), input->output_shapes()));
+    if (op_version_ == 2) {
+      *output = new MemoryMappedFileDatasetV2(ctx, input, filename, ctx->env(),
+                                              ctx->input(2));
+    } else {
+      *output = new MemoryMappedFileDataset(ctx, input, filename, ctx->env());
+    }
   } else {
     if (op_version_ == 2) {
       *output =
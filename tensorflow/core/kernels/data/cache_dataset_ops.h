@@ -24,12 +24,14 @@ class CacheDatasetOp : public UnaryDatasetOpKernel {
  public:
   class FileDatasetBase;
   class MemoryDatasetBase;
+  class MemoryMappedFileDatasetBase;
 
   static constexpr const char* const kDatasetType = "Cache";
   static constexpr const char* const kInputDataset = "input_dataset";
   static constexpr const char* const kFileName = "filename";
   static constexpr const char* const kOutputTypes = "output_types";
   static constexpr const char* const kOutputShapes = "output_shapes";
+  static constexpr const char* const kFileFormat = "file_format";
 
   explicit CacheDatasetOp(OpKernelConstruction* ctx);
 
@@ -42,8 +44,11 @@ class CacheDatasetOp : public UnaryDatasetOpKernel {
   class FileDatasetV2;
   class MemoryDataset;
   class MemoryDatasetV2;
+  class MemoryMappedFileDataset;
+  class MemoryMappedFileDatasetV2;
 
   const int op_version_;
+  std::string file_format_;
 };
 
 }  // namespace data
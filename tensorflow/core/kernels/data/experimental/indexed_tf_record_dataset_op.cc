@@ -0,0 +1,389 @@
+/* Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+#include "tensorflow/core/kernels/data/experimental/indexed_tf_record_dataset_op.h"
+
+#include <algorithm>
+
+#include "absl/strings/str_cat.h"
+#include "tensorflow/core/data/name_utils.h"
+#include "tensorflow/core/data/utils.h"
+#include "tensorflow/core/framework/metrics.h"
+#include "tensorflow/core/framework/partial_tensor_shape.h"
+#include "tensorflow/core/framework/tensor.h"
+#include "tensorflow/core/lib/core/coding.h"
+#include "tensorflow/core/lib/io/record_reader.h"
+
+namespace tensorflow {
+namespace data {
+namespace experimental {
+
+/* static */ constexpr const char* const IndexedTFRecordDatasetOp::kDatasetType;
+/* static */ constexpr const char* const IndexedTFRecordDatasetOp::kFileNames;
+/* static */ constexpr const char* const IndexedTFRecordDatasetOp::kBufferSize;
+/* static */ constexpr const char* const IndexedTFRecordDatasetOp::kStart;
+/* static */ constexpr const char* const IndexedTFRecordDatasetOp::kStop;
+/* static */ constexpr const char* const IndexedTFRecordDatasetOp::kStep;
+/* static */ constexpr const char* const
+    IndexedTFRecordDatasetOp::kIndexFileSuffix;
+
+constexpr char kNextIndex[] = "next_index";
+constexpr int64_t kOffsetBytes = sizeof(uint64);
+
+class IndexedTFRecordDatasetOp::Dataset : public DatasetBase {
+ public:
+  // `first_record_index` holds the global index of the first record of each
+  // file, followed by the total number of records.
+  explicit Dataset(OpKernelContext* ctx, std::vector<string> filenames,
+                   std::vector<int64_t> first_record_index,
+                   int64_t buffer_size, int64_t start, int64_t stop,
+                   int64_t step)
+      : DatasetBase(DatasetContext(ctx)),
+        env_(ctx->env()),
+        filenames_(std::move(filenames)),
+        first_record_index_(std::move(first_record_index)),
+        buffer_size_(buffer_size),
+        start_(start),
+        stop_(stop),
+        step_(step),
+        data_files_(filenames_.size()),
+        index_files_(filenames_.size()) {
+    const int64_t num_records = first_record_index_.back();
+    const int64_t effective_stop =
+        stop_ < 0 ? num_records : std::min(stop_, num_records);
+    num_elements_ = start_ >= effective_stop
+                        ? 0
+                        : (effective_stop - start_ - 1) / step_ + 1;
+  }
+
+  std::unique_ptr<IteratorBase> MakeIteratorInternal(
+      const string& prefix) const override {
+    return std::make_unique<Iterator>(Iterator::Params{
+        this, name_utils::IteratorPrefix(kDatasetType, prefix)});
+  }
+
+  const DataTypeVector& output_dtypes() const override {
+    static DataTypeVector* dtypes = new DataTypeVector({DT_STRING});
+    return *dtypes;
+  }
+
+  const std::vector<PartialTensorShape>& output_shapes() const override {
+    static std::vector<PartialTensorShape>* shapes =
+        new std::vector<PartialTensorShape>({{}});
+    return *shapes;
+  }
+
+  string DebugString() const override {
+    return name_utils::DatasetDebugString(kDatasetType);
+  }
+
+  int64_t CardinalityInternal(CardinalityOptions options) const override {
+    return num_elements_;
+  }
+
+  Status InputDatasets(std::vector<const DatasetBase*>* inputs) const override {
+    return OkStatus();
+  }
+
+  Status CheckExternalState() const override { return OkStatus(); }
+
+  Status Get(OpKernelContext* ctx, int64 index,
+             std::vector<Tensor>* out_tensors) const override {
+    TF_RETURN_IF_ERROR(CheckRandomAccessCompatible(index));
+    const int64_t record_index = start_ + index * step_;
+    const size_t file_index = FileIndex(record_index);
+    uint64 offset;
+    TF_RETURN_IF_ERROR(ReadOffset(file_index, record_index, &offset));
+    RandomAccessFile* file;
+    TF_RETURN_IF_ERROR(GetFile(file_index, /*index_file=*/false, &file));
+    // A reader without buffering is cheap to create and reads the record with
+    // two positional reads.
+    io::RecordReader reader(file);
+    Tensor record_tensor(ctx->get_allocator({}), DT_STRING, {});
+    TF_RETURN_IF_ERROR(
+        reader.ReadRecord(&offset, &record_tensor.scalar<tstring>()()));
+    static monitoring::CounterCell* bytes_counter =
+        metrics::GetTFDataBytesReadCounter(kDatasetType);
+    bytes_counter->IncrementBy(record_tensor.scalar<tstring>()().size());
+    out_tensors->clear();
+    out_tensors->emplace_back(std::move(record_tensor));
+    return OkStatus();
+  }
+
+ protected:
+  Status AsGraphDefInternal(SerializationContext* ctx,
+                            DatasetGraphDefBuilder* b,
+                            Node** output) const override {
+    Node* filenames = nullptr;
+    TF_RETURN_IF_ERROR(b->AddVector(filenames_, &filenames));
+    Node* buffer_size = nullptr;
+    TF_RETURN_IF_ERROR(b->AddScalar(buffer_size_, &buffer_size));
+    Node* start = nullptr;
+    TF_RETURN_IF_ERROR(b->AddScalar(start_, &start));
+    Node* stop = nullptr;
+    TF_RETURN_IF_ERROR(b->AddScalar(stop_, &stop));
+    Node* step = nullptr;
+    TF_RETURN_IF_ERROR(b->AddScalar(step_, &step));
+    TF_RETURN_IF_ERROR(b->AddDataset(
+        this, {filenames, buffer_size, start, stop, step}, output));
+    return OkStatus();
+  }
+
+ private:
+  class Iterator : public DatasetIterator<Dataset> {
+   public:
+    explicit Iterator(const Params& params)
+        : DatasetIterator<Dataset>(params) {}
+
+    bool SymbolicCheckpointCompatible() const override { return true; }
+
+    Status GetNextInternal(IteratorContext* ctx,
+                           std::vector<Tensor>* out_tensors,
+                           bool* end_of_sequence) override {
+      mutex_lock l(mu_);
+      if (next_index_ >= dataset()->num_elements_) {
+        *end_of_sequence = true;
+        return OkStatus();
+      }
+      const int64_t record_index =
+          dataset()->start_ + next_index_ * dataset()->step_;
+      // The position is advanced even if reading the record fails, so that the
+      // iterator works with `ignore_errors`.
+      ++next_index_;
+      const size_t file_index = dataset()->FileIndex(record_index);
+      if (!reader_ || file_index != current_file_index_) {
+        reader_.reset();
+        file_.reset();
+        TF_RETURN_IF_ERROR(ctx->env()->NewRandomAccessFile(
+            TranslateFileName(dataset()->filenames_[file_index]), &file_));
+        io::RecordReaderOptions options;
+        // Buffering only pays off if consecutive records are read.
+        if (dataset()->step_ == 1) {
+          options.buffer_size = dataset()->buffer_size_;
+        }
+        reader_ = std::make_unique<io::RecordReader>(file_.get(), options);
+        current_file_index_ = file_index;
+        offset_record_index_ = -1;
+      }
+      // The offset of the next record is known after reading a record, so the
+      // index is only consulted when records are skipped.
+      if (offset_record_index_ != record_index) {
+        TF_RETURN_IF_ERROR(
+            dataset()->ReadOffset(file_index, record_index, &offset_));
+      }
+      out_tensors->emplace_back(ctx->allocator({}), DT_STRING,
+                                TensorShape({}));
+      tstring& record = out_tensors->back().scalar<tstring>()();
+      Status s = reader_->ReadRecord(&offset_, &record);
+      if (!s.ok()) {
+        out_tensors->pop_back();
+        offset_record_index_ = -1;
+        return s;
+      }
+      static monitoring::CounterCell* bytes_counter =
+          metrics::GetTFDataBytesReadCounter(kDatasetType);
+      bytes_counter->IncrementBy(record.size());
+      offset_record_index_ = record_index + 1;
+      *end_of_sequence = false;
+      return OkStatus();
+    }
+
+    Status SkipInternal(IteratorContext* ctx, int num_to_skip,
+                        bool* end_of_sequence, int* num_skipped) override {
+      mutex_lock l(mu_);
+      // Skipping only moves the position, the records are never read.
+      const int64_t remaining = dataset()->num_elements_ - next_index_;
+      *num_skipped = static_cast<int>(
+          std::min<int64_t>(num_to_skip, std::max<int64_t>(remaining, 0)));
+      next_index_ += *num_skipped;
+      *end_of_sequence = *num_skipped < num_to_skip;
+      return OkStatus();
+    }
+
+   protected:
+    std::shared_ptr<model::Node> CreateNode(
+        IteratorContext* ctx, model::Node::Args args) const override {
+      return model::MakeSourceNode(std::move(args));
+    }
+
+    Status SaveInternal(SerializationContext* ctx,
+                        IteratorStateWriter* writer) override {
+      mutex_lock l(mu_);
+      TF_RETURN_IF_ERROR(
+          writer->WriteScalar(full_name(kNextIndex), next_index_));
+      return OkStatus();
+    }
+
+    Status RestoreInternal(IteratorContext* ctx,
+                           IteratorStateReader* reader) override {
+      mutex_lock l(mu_);
+      TF_RETURN_IF_ERROR(
+          reader->ReadScalar(full_name(kNextIndex), &next_index_));
+      reader_.reset();
+      file_.reset();
+      return OkStatus();
+    }
+
+   private:
+    mutex mu_;
+    int64_t next_index_ TF_GUARDED_BY(mu_) = 0;
+    size_t current_file_index_ TF_GUARDED_BY(mu_) = 0;
+    // The global index of the record at `offset_`, or -1 if unknown.
+    int64_t offset_record_index_ TF_GUARDED_BY(mu_) = -1;
+    uint64 offset_ TF_GUARDED_BY(mu_) = 0;
+
+    // `reader_` borrows the object that `file_` points to, so `reader_` must
+    // be destroyed before `file_`.
+    std::unique_ptr<RandomAccessFile> file_ TF_GUARDED_BY(mu_);
+    std::unique_ptr<io::RecordReader> reader_ TF_GUARDED_BY(mu_);
+  };
+
+  // Returns the index of the file that holds the record with the given global
+  // index.
+  size_t FileIndex(int64_t record_index) const {
+    // Files without records share their first record index with the next
+    // file, so the last file whose first record index is not greater than
+    // `record_index` is the one holding the record.
+    return std::upper_bound(first_record_index_.begin(),
+                            first_record_index_.end(), record_index) -
+           first_record_index_.begin() - 1;
+  }
+
+  // Reads the offset of the record with the given global index from the index
+  // of the file that holds it.
+  Status ReadOffset(size_t file_index, int64_t record_index,
+                    uint64* offset) const {
+    RandomAccessFile* index_file;
+    TF_RETURN_IF_ERROR(GetFile(file_index, /*index_file=*/true, &index_file));
+    char scratch[kOffsetBytes];
+    StringPiece result;
+    TF_RETURN_IF_ERROR(index_file->Read(
+        (record_index - first_record_index_[file_index]) * kOffsetBytes,
+        kOffsetBytes, &result, scratch));
+    *offset = core::DecodeFixed64(result.data());
+    return OkStatus();
+  }
+
+  // Returns the data or index file of the file with the given index. Files are
+  // opened on first use and shared by all callers. `RandomAccessFile::Read` is
+  // thread-safe, so the files are read without holding the lock.
+  Status GetFile(size_t file_index, bool index_file,
+                 RandomAccessFile** file) const TF_LOCKS_EXCLUDED(mu_) {
+    mutex_lock l(mu_);
+    std::unique_ptr<RandomAccessFile>& cached_file =
+        index_file ? index_files_[file_index] : data_files_[file_index];
+    if (!cached_file) {
+      const string filename =
+          index_file ? absl::StrCat(filenames_[file_index], kIndexFileSuffix)
+                     : filenames_[file_index];
+      TF_RETURN_IF_ERROR(
+          env_->NewRandomAccessFile(TranslateFileName(filename), &cached_file));
+    }
+    *file = cached_file.get();
+    return OkStatus();
+  }
+
+  Env* const env_;
+  const std::vector<string> filenames_;
+  const std::vector<int64_t> first_record_index_;
+  const int64_t buffer_size_;
+  const int64_t start_;
+  const int64_t stop_;
+  const int64_t step_;
+  int64_t num_elements_;  // Set by the constructor.
+
+  mutable mutex mu_;
+  // Files opened for random access.
+  mutable std::vector<std::unique_ptr<RandomAccessFile>> data_files_
+      TF_GUARDED_BY(mu_);
+  mutable std::vector<std::unique_ptr<RandomAccessFile>> index_files_
+      TF_GUARDED_BY(mu_);
+};
+
+void IndexedTFRecordDatasetOp::MakeDataset(OpKernelContext* ctx,
+                                           DatasetBase** output) {
+  const Tensor* filenames_tensor;
+  OP_REQUIRES_OK(ctx, ctx->input(kFileNames, &filenames_tensor));
+  OP_REQUIRES(
+      ctx, filenames_tensor->dims() <= 1,
+      errors::InvalidArgument("`filenames` must be a scalar or a vector."));
+
+  std::vector<string> filenames;
+  filenames.reserve(filenames_tensor->NumElements());
+  // The number of records of each file is determined by the size of its index,
+  // so the files themselves are not read here.
+  std::vector<int64_t> first_record_index;
+  first_record_index.reserve(filenames_tensor->NumElements() + 1);
+  int64_t num_records = 0;
+  for (int i = 0; i < filenames_tensor->NumElements(); ++i) {
+    filenames.push_back(filenames_tensor->flat<tstring>()(i));
+    metrics::RecordTFDataFilename(kDatasetType, filenames[i]);
+    const string index_filename =
+        absl::StrCat(filenames[i], kIndexFileSuffix);
+    uint64 index_size;
+    Status s = ctx->env()->GetFileSize(index_filename, &index_size);
+    if (errors::IsNotFound(s)) {
+      s = errors::NotFound("Failed to find the record index ", index_filename,
+                           " of TFRecord file ", filenames[i],
+                           ". Record indices are written by "
+                           "`tf.data.experimental.TFRecordWriter` with "
+                           "`write_index=True`.");
+    }
+    OP_REQUIRES_OK(ctx, s);
+    OP_REQUIRES(ctx, index_size % kOffsetBytes == 0,
+                errors::DataLoss("The record index ", index_filename,
+                                 " has size ", index_size,
+                                 ", which is not a multiple of ", kOffsetBytes,
+                                 " bytes."));
+    first_record_index.push_back(num_records);
+    num_records += index_size / kOffsetBytes;
+  }
+  first_record_index.push_back(num_records);
+
+  int64_t buffer_size = -1;
+  OP_REQUIRES_OK(ctx,
+                 ParseScalarArgument<int64_t>(ctx, kBufferSize, &buffer_size));
+  OP_REQUIRES(ctx, buffer_size >= 0,
+              errors::InvalidArgument(
+                  "`buffer_size` must be >= 0 (0 == no buffering)"));
+
+  int64_t start = 0;
+  OP_REQUIRES_OK(ctx, ParseScalarArgument<int64_t>(ctx, kStart, &start));
+  OP_REQUIRES(ctx, start >= 0,
+              errors::InvalidArgument("`start` must be >= 0, but got ", start));
+
+  int64_t stop = -1;
+  OP_REQUIRES_OK(ctx, ParseScalarArgument<int64_t>(ctx, kStop, &stop));
+  OP_REQUIRES(ctx, stop >= -1,
+              errors::InvalidArgument(
+                  "`stop` must be >= 0 or -1 (read to the end), but got ",
+                  stop));
+
+  int64_t step = 1;
+  OP_REQUIRES_OK(ctx, ParseScalarArgument<int64_t>(ctx, kStep, &step));
+  OP_REQUIRES(ctx, step > 0,
+              errors::InvalidArgument("`step` must be > 0, but got ", step));
+
+  *output = new Dataset(ctx, std::move(filenames),
+                        std::move(first_record_index), buffer_size, start,
+                        stop, step);
+}
+
+namespace {
+REGISTER_KERNEL_BUILDER(Name("IndexedTFRecordDataset").Device(DEVICE_CPU),
+                        IndexedTFRecordDatasetOp);
+}  // namespace
+}  // namespace experimental
+}  // namespace data
+}  // namespace tensorflow
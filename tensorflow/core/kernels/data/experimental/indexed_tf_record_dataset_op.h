@@ -0,0 +1,53 @@
+/* Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+#ifndef TENSORFLOW_CORE_KERNELS_DATA_EXPERIMENTAL_INDEXED_TF_RECORD_DATASET_OP_H_
+#define TENSORFLOW_CORE_KERNELS_DATA_EXPERIMENTAL_INDEXED_TF_RECORD_DATASET_OP_H_
+
+#include "tensorflow/core/framework/dataset.h"
+
+namespace tensorflow {
+namespace data {
+namespace experimental {
+
+// Reads the records of TFRecord files that have a record index.
+//
+// The index of a TFRecord file `<filename>` is stored in the file
+// `<filename><kIndexFileSuffix>` and holds the byte offset of every record of
+// the file, encoded as little-endian 64-bit integers. The index makes it
+// possible to read any subset of the records of a file without scanning it.
+class IndexedTFRecordDatasetOp : public DatasetOpKernel {
+ public:
+  static constexpr const char* const kDatasetType = "IndexedTFRecord";
+  static constexpr const char* const kFileNames = "filenames";
+  static constexpr const char* const kBufferSize = "buffer_size";
+  static constexpr const char* const kStart = "start";
+  static constexpr const char* const kStop = "stop";
+  static constexpr const char* const kStep = "step";
+  static constexpr const char* const kIndexFileSuffix = ".index";
+
+  using DatasetOpKernel::DatasetOpKernel;
+
+ protected:
+  void MakeDataset(OpKernelContext* ctx, DatasetBase** output) override;
+
+ private:
+  class Dataset;
+};
+
+}  // namespace experimental
+}  // namespace data
+}  // namespace tensorflow
+
+#endif  // TENSORFLOW_CORE_KERNELS_DATA_EXPERIMENTAL_INDEXED_TF_RECORD_DATASET_OP_H_
@@ -12,6 +12,7 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 ==============================================================================*/
+#include "absl/strings/str_cat.h"
 #include "tensorflow/core/data/dataset_utils.h"
 #include "tensorflow/core/data/root_dataset.h"
 #include "tensorflow/core/framework/dataset.h"
@@ -19,7 +20,9 @@ limitations under the License.
 #include "tensorflow/core/framework/op_kernel.h"
 #include "tensorflow/core/framework/resource_mgr.h"
 #include "tensorflow/core/framework/types.h"
+#include "tensorflow/core/kernels/data/experimental/indexed_tf_record_dataset_op.h"
 #include "tensorflow/core/kernels/ops_util.h"
+#include "tensorflow/core/lib/core/coding.h"
 #include "tensorflow/core/lib/core/threadpool.h"
 #include "tensorflow/core/lib/io/record_writer.h"
 #include "tensorflow/core/platform/file_system.h"
@@ -30,11 +33,20 @@ namespace data {
 namespace experimental {
 namespace {
 
+constexpr char kWriteIndex[] = "write_index";
+// The size of the index buffer that triggers a write to the index file.
+constexpr size_t kIndexFlushBytes = 1 << 20;
+
 class ToTFRecordOp : public AsyncOpKernel {
  public:
   explicit ToTFRecordOp(OpKernelConstruction* ctx)
       : AsyncOpKernel(ctx),
-        background_worker_(ctx->env(), "tf_data_to_tf_record") {}
+        background_worker_(ctx->env(), "tf_data_to_tf_record") {
+    // `ExperimentalDatasetToTFRecord` does not have the attribute.
+    if (ctx->HasAttr(kWriteIndex)) {
+      OP_REQUIRES_OK(ctx, ctx->GetAttr(kWriteIndex, &write_index_));
+    }
+  }
 
   template <typename T>
   Status ParseScalarArgument(OpKernelContext* ctx,
@@ -68,8 +80,23 @@ class ToTFRecordOp : public AsyncOpKernel {
     tstring compression_type;
     TF_RETURN_IF_ERROR(ParseScalarArgument<tstring>(ctx, "compression_type",
                                                     &compression_type));
+    if (write_index_ && !compression_type.empty()) {
+      return errors::InvalidArgument(
+          "Writing a record index is not supported for compressed files, but "
+          "got compression type ", compression_type, ".");
+    }
     std::unique_ptr<WritableFile> file;
     TF_RETURN_IF_ERROR(ctx->env()->NewWritableFile(filename, &file));
+    // The index holds the offset of every record as a little-endian 64-bit
+    // integer. Without compression, the offsets follow from the record sizes.
+    std::unique_ptr<WritableFile> index_file;
+    if (write_index_) {
+      TF_RETURN_IF_ERROR(ctx->env()->NewWritableFile(
+          absl::StrCat(filename, IndexedTFRecordDatasetOp::kIndexFileSuffix),
+          &index_file));
+    }
+    uint64 offset = 0;
+    std::string index_buffer;
     auto writer = std::make_unique<io::RecordWriter>(
         file.get(),
         io::RecordWriterOptions::CreateRecordWriterOptions(compression_type));
@@ -114,15 +141,29 @@ class ToTFRecordOp : public AsyncOpKernel {
           iterator->GetNext(&iter_ctx, &components, &end_of_sequence));
 
       if (!end_of_sequence) {
-        TF_RETURN_IF_ERROR(
-            writer->WriteRecord(components[0].scalar<tstring>()()));
+        const tstring& record = components[0].scalar<tstring>()();
+        TF_RETURN_IF_ERROR(writer->WriteRecord(record));
+        if (index_file) {
+          core::PutFixed64(&index_buffer, offset);
+          offset += io::RecordWriter::kHeaderSize + record.size() +
+                    io::RecordWriter::kFooterSize;
+          if (index_buffer.size() >= kIndexFlushBytes) {
+            TF_RETURN_IF_ERROR(index_file->Append(index_buffer));
+            index_buffer.clear();
+          }
+        }
       }
       components.clear();
     } while (!end_of_sequence);
+    if (index_file) {
+      TF_RETURN_IF_ERROR(index_file->Append(index_buffer));
+      TF_RETURN_IF_ERROR(index_file->Close());
+    }
     return OkStatus();
   }
 
   BackgroundWorker background_worker_;
+  bool write_index_ = false;
 };
 
 REGISTER_KERNEL_BUILDER(Name("DatasetToTFRecord").Device(DEVICE_CPU),
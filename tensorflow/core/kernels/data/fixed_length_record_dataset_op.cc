@@ -14,6 +14,8 @@ limitations under the License.
 ==============================================================================*/
 #include "tensorflow/core/kernels/data/fixed_length_record_dataset_op.h"
 
+#include <algorithm>
+
 #include "tensorflow/core/data/name_utils.h"
 #include "tensorflow/core/data/utils.h"
 #include "tensorflow/core/framework/metrics.h"
@@ -55,6 +57,7 @@ class FixedLengthRecordDatasetOp::Dataset : public DatasetBase {
                    int64_t footer_bytes, int64_t buffer_size,
                    const string& compression_type, int op_version)
       : DatasetBase(DatasetContext(ctx)),
+        env_(ctx->env()),
         filenames_(std::move(filenames)),
         header_bytes_(header_bytes),
         record_bytes_(record_bytes),
@@ -100,6 +103,66 @@ class FixedLengthRecordDatasetOp::Dataset : public DatasetBase {
 
   Status CheckExternalState() const override { return OkStatus(); }
 
+  int64_t CardinalityInternal(CardinalityOptions options) const override {
+    // Counting the records requires the sizes of all files, which is too
+    // expensive for the default compute level. The sizes of compressed files
+    // do not determine the number of records.
+    if (!compression_type_.empty() ||
+        options.compute_level() <
+            CardinalityOptions::CARDINALITY_COMPUTE_MODERATE) {
+      return kUnknownCardinality;
+    }
+    mutex_lock l(mu_);
+    Status s = InitializeRandomAccess();
+    if (!s.ok()) {
+      VLOG(2) << "Failed to compute the cardinality of " << DebugString()
+              << ": " << s;
+      return kUnknownCardinality;
+    }
+    return first_record_index_.back();
+  }
+
+  Status Get(OpKernelContext* ctx, int64 index,
+             std::vector<Tensor>* out_tensors) const override {
+    TF_RETURN_IF_ERROR(CheckRandomAccessCompatible(index));
+    RandomAccessFile* file;
+    uint64 offset;
+    {
+      mutex_lock l(mu_);
+      TF_RETURN_IF_ERROR(InitializeRandomAccess());
+      // Files without records share their first record index with the next
+      // file, so the last file whose first record index is not greater than
+      // `index` is the one containing the record.
+      const size_t file_index =
+          std::upper_bound(first_record_index_.begin(),
+                           first_record_index_.end(), index) -
+          first_record_index_.begin() - 1;
+      if (!files_[file_index]) {
+        TF_RETURN_IF_ERROR(env_->NewRandomAccessFile(
+            TranslateFileName(filenames_[file_index]), &files_[file_index]));
+      }
+      file = files_[file_index].get();
+      offset = header_bytes_ +
+               (index - first_record_index_[file_index]) * record_bytes_;
+    }
+    tstring record;
+    record.resize_uninitialized(record_bytes_);
+    StringPiece result;
+    // `RandomAccessFile::Read` is thread-safe, so the record is read without
+    // holding the lock.
+    TF_RETURN_IF_ERROR(
+        file->Read(offset, record_bytes_, &result, record.mdata()));
+    static monitoring::CounterCell* bytes_counter =
+        metrics::GetTFDataBytesReadCounter(kDatasetType);
+    bytes_counter->IncrementBy(record_bytes_);
+    Tensor record_tensor(ctx->get_allocator({}), DT_STRING, {});
+    record_tensor.scalar<tstring>()() =
+        result.data() == record.data() ? std::move(record) : tstring(result);
+    out_tensors->clear();
+    out_tensors->emplace_back(std::move(record_tensor));
+    return OkStatus();
+  }
+
  protected:
   Status AsGraphDefInternal(SerializationContext* ctx,
                             DatasetGraphDefBuilder* b,
@@ -450,6 +513,39 @@ class FixedLengthRecordDatasetOp::Dataset : public DatasetBase {
     tstring lookahead_cache_ TF_GUARDED_BY(mu_);
   };
 
+  // Computes the index of the first record of each file from the file sizes,
+  // the first time random access is needed.
+  Status InitializeRandomAccess() const TF_EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+    if (!first_record_index_.empty()) {
+      return OkStatus();
+    }
+    std::vector<int64_t> first_record_index;
+    first_record_index.reserve(filenames_.size() + 1);
+    int64_t num_records = 0;
+    for (const string& filename : filenames_) {
+      uint64 file_size;
+      TF_RETURN_IF_ERROR(env_->GetFileSize(filename, &file_size));
+      const int64_t body_size =
+          static_cast<int64_t>(file_size) - (header_bytes_ + footer_bytes_);
+      if (body_size < 0 || body_size % record_bytes_ != 0) {
+        return errors::InvalidArgument(
+            "Excluding the header (", header_bytes_, " bytes) and footer (",
+            footer_bytes_, " bytes), input file \"", filename,
+            "\" has body length ", body_size,
+            " bytes, which is not an exact multiple of the record length (",
+            record_bytes_, " bytes).");
+      }
+      first_record_index.push_back(num_records);
+      num_records += body_size / record_bytes_;
+    }
+    // The last entry holds the total number of records.
+    first_record_index.push_back(num_records);
+    first_record_index_ = std::move(first_record_index);
+    files_.resize(filenames_.size());
+    return OkStatus();
+  }
+
+  Env* const env_;
   const std::vector<string> filenames_;
   const int64_t header_bytes_;
   const int64_t record_bytes_;
@@ -457,6 +553,12 @@ class FixedLengthRecordDatasetOp::Dataset : public DatasetBase {
   const int64_t buffer_size_;
   const tstring compression_type_;
   const int op_version_;
+
+  mutable mutex mu_;
+  // State used for random access, which is initialized lazily.
+  mutable std::vector<int64_t> first_record_index_ TF_GUARDED_BY(mu_);
+  mutable std::vector<std::unique_ptr<RandomAccessFile>> files_
+      TF_GUARDED_BY(mu_);
 };
 
 FixedLengthRecordDatasetOp::FixedLengthRecordDatasetOp(
@@ -34,6 +34,8 @@ limitations under the License.
 #include "tensorflow/core/framework/cancellation.h"
 #include "tensorflow/core/framework/dataset_options.pb.h"
 #include "tensorflow/core/framework/function.h"
+#include "tensorflow/core/framework/model.h"
+#include "tensorflow/core/framework/model.pb.h"
 #include "tensorflow/core/framework/op_kernel.h"
 #include "tensorflow/core/framework/tensor.h"
 #include "tensorflow/core/framework/types.h"
@@ -144,6 +146,32 @@ Status IteratorResource::GetNext(OpKernelContext* ctx,
   return status;
 }
 
+Status IteratorResource::GetModelProto(std::string* model_proto) {
+  std::shared_ptr<State> captured_state;
+  {
+    tf_shared_lock l(mu_);
+    captured_state = iterator_state_;
+  }
+  auto iterator = captured_state->iterator();
+  if (!iterator) {
+    return errors::FailedPrecondition(
+        "GetModelProto() failed because the iterator has not been "
+        "initialized. Ensure that you have run the initializer operation for "
+        "this iterator before getting its model.");
+  }
+  model_proto->clear();
+  std::shared_ptr<model::Model> model = iterator->model();
+  if (model == nullptr) {
+    return OkStatus();
+  }
+  model::ModelProto proto;
+  TF_RETURN_IF_ERROR(model->ToProto(&proto));
+  if (!proto.SerializeToString(model_proto)) {
+    return errors::Internal("Failed to serialize the tf.data model.");
+  }
+  return OkStatus();
+}
+
 Status IteratorResource::Save(OpKernelContext* ctx,
                               ExternalStatePolicy external_state_policy,
                               IteratorStateWriter* writer) {
@@ -970,6 +998,18 @@ void IteratorToStringHandleOp::Compute(OpKernelContext* ctx) {
       resource_handle_t.scalar<ResourceHandle>()().SerializeAsString();
 }
 
+void IteratorGetModelProtoOp::Compute(OpKernelContext* ctx) {
+  IteratorResource* iterator_resource;
+  OP_REQUIRES_OK(
+      ctx, LookupResource(ctx, HandleFromInput(ctx, 0), &iterator_resource));
+  core::ScopedUnref unref_iterator(iterator_resource);
+  std::string model_proto;
+  OP_REQUIRES_OK(ctx, iterator_resource->GetModelProto(&model_proto));
+  Tensor* model_proto_t;
+  OP_REQUIRES_OK(ctx, ctx->allocate_output(0, TensorShape({}), &model_proto_t));
+  model_proto_t->scalar<tstring>()() = model_proto;
+}
+
 IteratorFromStringHandleOp::IteratorFromStringHandleOp(
     OpKernelConstruction* ctx)
     : OpKernel(ctx) {
@@ -1153,6 +1193,14 @@ REGISTER_KERNEL_BUILDER(Name("IteratorFromStringHandleV2")
                             .HostMemory("string_handle")
                             .Priority(1),
                         IteratorFromStringHandleOp);
+REGISTER_KERNEL_BUILDER(
+    Name("IteratorGetModelProto").Device(DEVICE_CPU).Priority(2),
+    IteratorGetModelProtoOp);
+REGISTER_KERNEL_BUILDER(Name("IteratorGetModelProto")
+                            .Device(DEVICE_GPU)
+                            .HostMemory("model_proto")
+                            .Priority(1),
+                        IteratorGetModelProtoOp);
 REGISTER_KERNEL_BUILDER(Name("SerializeIterator").Device(DEVICE_CPU),
                         SerializeIteratorOp);
 REGISTER_KERNEL_BUILDER(Name("DeserializeIterator").Device(DEVICE_CPU),
@@ -62,6 +62,11 @@ class IteratorResource : public ResourceBase {
   // Restores the state of the iterator from a checkpoint created by `Save`.
   Status Restore(OpKernelContext* ctx, IteratorStateReader* reader);
 
+  // Serializes the performance model of the input pipeline into
+  // `*model_proto`. Stores an empty string if the pipeline is not modeled,
+  // e.g. because autotuning is disabled.
+  Status GetModelProto(std::string* model_proto);
+
   // Creates an iterator for `dataset`, and associates the iterator with this
   // iterator resource.
   //
@@ -311,6 +316,13 @@ class IteratorFromStringHandleOp : public OpKernel {
   std::vector<PartialTensorShape> output_shapes_;
 };
 
+class IteratorGetModelProtoOp : public OpKernel {
+ public:
+  explicit IteratorGetModelProtoOp(OpKernelConstruction* ctx)
+      : OpKernel(ctx) {}
+  void Compute(OpKernelContext* ctx) override;
+};
+
 class SerializeIteratorOp : public OpKernel {
  public:
   static constexpr const char* const kExternalStatePolicy =
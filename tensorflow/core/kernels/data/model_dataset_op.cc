@@ -191,7 +191,8 @@ class ModelDatasetOp::Dataset : public DatasetBase {
         model_thread_ = ctx->StartThread("tf_data_model", [this]() {
           Status status =
               model_->OptimizeLoop(dataset()->algorithm_, cpu_budget_,
-                                   ram_budget_, cancellation_manager_.get());
+                                   ram_budget_, /*host_wide=*/false,
+                                   cancellation_manager_.get());
           if (!status.ok()) {
             LOG(WARNING) << "Optimization loop failed: " << status.ToString();
           }
@@ -731,6 +731,7 @@ REGISTER_OP("CacheDataset")
     .Attr("output_types: list(type) >= 1")
     .Attr("output_shapes: list(shape) >= 1")
     .Attr("metadata: string = ''")
+    .Attr("file_format: string = ''")
     // TODO(mdan): Should these use type inference instead?
     .SetTypeConstructor(full_type::VariadicTensorContainer(TFT_DATASET,
                                                            "output_types"))
@@ -749,6 +750,7 @@ REGISTER_OP("CacheDatasetV2")
     .Attr("output_types: list(type) >= 1")
     .Attr("output_shapes: list(shape) >= 1")
     .Attr("metadata: string = ''")
+    .Attr("file_format: string = ''")
     .SetTypeConstructor(full_type::VariadicTensorContainer(TFT_DATASET,
                                                            "output_types"))
     .SetShapeFn([](shape_inference::InferenceContext* c) {
@@ -985,6 +987,11 @@ REGISTER_OP("IteratorFromStringHandleV2")
     .Attr("output_shapes: list(shape) >= 0 = []")
     .SetShapeFn(shape_inference::ScalarShape);
 
+REGISTER_OP("IteratorGetModelProto")
+    .Input("resource_handle: resource")
+    .Output("model_proto: string")
+    .SetShapeFn(shape_inference::ScalarShape);
+
 REGISTER_OP("SerializeIterator")
     .Input("resource_handle: resource")
     .Attr("external_state_policy: int = 0")
@@ -342,6 +342,7 @@ REGISTER_OP("DatasetToTFRecord")
     .Input("input_dataset: variant")
     .Input("filename: string")
     .Input("compression_type: string")
+    .Attr("write_index: bool = false")
     .SetIsStateful()
     .SetShapeFn(shape_inference::NoOutputs);
 
@@ -522,6 +523,28 @@ REGISTER_OP("ExperimentalIgnoreErrorsDataset")
                                                            "output_types"))
     .SetShapeFn(shape_inference::ScalarShape);
 
+REGISTER_OP("IndexedTFRecordDataset")
+    .Input("filenames: string")
+    .Input("buffer_size: int64")
+    .Input("start: int64")
+    .Input("stop: int64")
+    .Input("step: int64")
+    .Output("handle: variant")
+    .Attr("metadata: string = ''")
+    .SetDoNotOptimize()  // TODO(b/123753214): See comment in dataset_ops.cc.
+    .SetTypeConstructor(full_type::UnaryTensorContainer(TFT_DATASET,
+                                                        TFT_STRING))
+    .SetShapeFn([](shape_inference::InferenceContext* c) {
+      shape_inference::ShapeHandle unused;
+      // `filenames` must be a scalar or a vector.
+      TF_RETURN_IF_ERROR(c->WithRankAtMost(c->input(0), 1, &unused));
+      // `buffer_size`, `start`, `stop` and `step` must be scalars.
+      for (int i = 1; i < 5; ++i) {
+        TF_RETURN_IF_ERROR(c->WithRank(c->input(i), 0, &unused));
+      }
+      return shape_inference::ScalarShape(c);
+    });
+
 REGISTER_OP("IteratorGetDevice")
     .Input("resource: resource")
     .Output("device: string")
@@ -16,9 +16,8 @@
 
 from tensorflow.python.autograph.core import converter
 from tensorflow.python.autograph.pyct import anno
-from tensorflow.python.autograph.pyct import qual_names
 from tensorflow.python.autograph.pyct import templates
-from tensorflow.python.autograph.pyct.static_analysis import activity
+from tensorflow.python.autograph.pyct.static_analysis import incremental
 from tensorflow.python.autograph.pyct.static_analysis.annos import NodeAnno
 
 
@@ -177,8 +176,7 @@ class BreakTransformer(converter.Base):
 
 
 def transform(node, ctx):
-  node = qual_names.resolve(node)
-  node = activity.resolve(node, ctx, None)
+  node, _ = incremental.resolve(node, ctx, incremental.AnalysisLevel.ACTIVITY)
 
   transformer = BreakTransformer(ctx)
   node = transformer.visit(node)
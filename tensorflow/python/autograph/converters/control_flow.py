@@ -19,16 +19,12 @@ import gast
 from tensorflow.python.autograph.core import converter
 from tensorflow.python.autograph.lang import directives
 from tensorflow.python.autograph.pyct import anno
-from tensorflow.python.autograph.pyct import cfg
 from tensorflow.python.autograph.pyct import origin_info
 from tensorflow.python.autograph.pyct import parser
-from tensorflow.python.autograph.pyct import qual_names
 from tensorflow.python.autograph.pyct import templates
-from tensorflow.python.autograph.pyct.static_analysis import activity
 from tensorflow.python.autograph.pyct.static_analysis import annos
-from tensorflow.python.autograph.pyct.static_analysis import liveness
+from tensorflow.python.autograph.pyct.static_analysis import incremental
 from tensorflow.python.autograph.pyct.static_analysis import reaching_definitions
-from tensorflow.python.autograph.pyct.static_analysis import reaching_fndefs
 
 
 class _Function(object):
@@ -402,12 +398,7 @@ class AnnotatedDef(reaching_definitions.Definition):
 
 
 def transform(node, ctx):
-  graphs = cfg.build(node)
-  node = qual_names.resolve(node)
-  node = activity.resolve(node, ctx, None)
-  node = reaching_definitions.resolve(node, ctx, graphs)
-  node = reaching_fndefs.resolve(node, ctx, graphs)
-  node = liveness.resolve(node, ctx, graphs)
+  node, _ = incremental.resolve(node, ctx, incremental.AnalysisLevel.LIVENESS)
 
   node = ControlFlowTransformer(ctx).visit(node)
   return node
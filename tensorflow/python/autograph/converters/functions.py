@@ -19,10 +19,9 @@ import gast
 from tensorflow.python.autograph.core import converter
 from tensorflow.python.autograph.pyct import anno
 from tensorflow.python.autograph.pyct import parser
-from tensorflow.python.autograph.pyct import qual_names
 from tensorflow.python.autograph.pyct import templates
-from tensorflow.python.autograph.pyct.static_analysis import activity
 from tensorflow.python.autograph.pyct.static_analysis import annos
+from tensorflow.python.autograph.pyct.static_analysis import incremental
 
 
 class _Function(object):
@@ -128,7 +127,6 @@ class FunctionTransformer(converter.Base):
 
 
 def transform(node, ctx):
-  node = qual_names.resolve(node)
-  node = activity.resolve(node, ctx, None)
+  node, _ = incremental.resolve(node, ctx, incremental.AnalysisLevel.ACTIVITY)
 
   return FunctionTransformer(ctx).visit(node)
@@ -32,9 +32,8 @@ from tensorflow.python.autograph.core import converter
 from tensorflow.python.autograph.lang import directives
 from tensorflow.python.autograph.pyct import anno
 from tensorflow.python.autograph.pyct import parser
-from tensorflow.python.autograph.pyct import qual_names
 from tensorflow.python.autograph.pyct import templates
-from tensorflow.python.autograph.pyct.static_analysis import activity
+from tensorflow.python.autograph.pyct.static_analysis import incremental
 from tensorflow.python.autograph.pyct.static_analysis.annos import NodeAnno
 
 
@@ -233,7 +232,6 @@ class ListTransformer(converter.Base):
 
 
 def transform(node, ctx):
-  node = qual_names.resolve(node)
-  node = activity.resolve(node, ctx, None)
+  node, _ = incremental.resolve(node, ctx, incremental.AnalysisLevel.ACTIVITY)
 
   return ListTransformer(ctx).visit(node)
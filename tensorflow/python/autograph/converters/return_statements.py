@@ -19,9 +19,8 @@ import gast
 from tensorflow.python.autograph.core import converter
 from tensorflow.python.autograph.pyct import anno
 from tensorflow.python.autograph.pyct import parser
-from tensorflow.python.autograph.pyct import qual_names
 from tensorflow.python.autograph.pyct import templates
-from tensorflow.python.autograph.pyct.static_analysis import activity
+from tensorflow.python.autograph.pyct.static_analysis import incremental
 from tensorflow.python.autograph.pyct.static_analysis.annos import NodeAnno
 
 
@@ -387,15 +386,13 @@ class ReturnStatementsTransformer(converter.Base):
 
 def transform(node, ctx, default_to_null_return=True):
   """Ensure a function has only a single return, at the end."""
-  node = qual_names.resolve(node)
-  node = activity.resolve(node, ctx, None)
+  node, _ = incremental.resolve(node, ctx, incremental.AnalysisLevel.ACTIVITY)
 
   # Note: Technically, these two could be merged into a single walk, but
   # keeping them separate helps with readability.
   node = ConditionalReturnRewriter(ctx).visit(node)
 
-  node = qual_names.resolve(node)
-  node = activity.resolve(node, ctx, None)
+  node, _ = incremental.resolve(node, ctx, incremental.AnalysisLevel.ACTIVITY)
   transformer = ReturnStatementsTransformer(
       ctx, allow_missing_return=default_to_null_return)
   node = transformer.visit(node)
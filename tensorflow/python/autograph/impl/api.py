@@ -20,6 +20,8 @@ import inspect
 import os
 import sys
 import textwrap
+import threading
+import time
 import traceback
 
 from tensorflow.python.autograph import operators
@@ -45,18 +47,18 @@ from tensorflow.python.autograph.impl import conversion
 from tensorflow.python.autograph.lang import special_functions
 from tensorflow.python.autograph.operators import py_builtins
 from tensorflow.python.autograph.pyct import anno
-from tensorflow.python.autograph.pyct import cfg
+from tensorflow.python.autograph.pyct import cache
 from tensorflow.python.autograph.pyct import error_utils
 from tensorflow.python.autograph.pyct import errors
 from tensorflow.python.autograph.pyct import inspect_utils
 from tensorflow.python.autograph.pyct import origin_info
-from tensorflow.python.autograph.pyct import qual_names
 from tensorflow.python.autograph.pyct import transpiler
-from tensorflow.python.autograph.pyct.static_analysis import activity
-from tensorflow.python.autograph.pyct.static_analysis import reaching_definitions
+from tensorflow.python.autograph.pyct.static_analysis import incremental
 from tensorflow.python.autograph.utils import ag_logging as logging
+from tensorflow.python.eager import monitoring
 from tensorflow.python.eager.polymorphic_function import tf_method_target
 from tensorflow.python.framework import errors_impl
+from tensorflow.python.framework import versions
 from tensorflow.python.util import tf_decorator
 from tensorflow.python.util import tf_inspect
 from tensorflow.python.util import tf_stack
@@ -219,11 +221,18 @@ class PyToTF(transpiler.PyToPy):
   def get_caching_key(self, ctx):
     return ctx.options
 
+  def get_persistent_caching_key(self, ctx):
+    options = ctx.options
+    # The generated code depends on the TensorFlow version through the
+    # converters.
+    return repr((options.recursive, options.user_requested,
+                 options.internal_convert_user_code,
+                 sorted(feature.value for feature in options.optional_features),
+                 versions.__version__, versions.__git_version__))
+
   def initial_analysis(self, node, ctx):
-    graphs = cfg.build(node)
-    node = qual_names.resolve(node)
-    node = activity.resolve(node, ctx, None)
-    node = reaching_definitions.resolve(node, ctx, graphs)
+    node, _ = incremental.resolve(
+        node, ctx, incremental.AnalysisLevel.DEFINEDNESS)
     anno.dup(
         node,
         {
@@ -234,28 +243,74 @@ class PyToTF(transpiler.PyToPy):
 
   def transform_ast(self, node, ctx):
     unsupported_features_checker.verify(node)
-    node = self.initial_analysis(node, ctx)
+    with ctx.timed_pass('initial_analysis'):
+      node = self.initial_analysis(node, ctx)
 
-    node = functions.transform(node, ctx)
-    node = directives.transform(node, ctx)
-    node = break_statements.transform(node, ctx)
+    node = self._run_converter(functions, node, ctx)
+    node = self._run_converter(directives, node, ctx)
+    node = self._run_converter(break_statements, node, ctx)
     if ctx.user.options.uses(converter.Feature.ASSERT_STATEMENTS):
-      node = asserts.transform(node, ctx)
+      node = self._run_converter(asserts, node, ctx)
     # Note: sequencing continue canonicalization before for loop one avoids
     # dealing with the extra loop increment operation that the for
     # canonicalization creates.
-    node = continue_statements.transform(node, ctx)
-    node = return_statements.transform(node, ctx)
+    node = self._run_converter(continue_statements, node, ctx)
+    node = self._run_converter(return_statements, node, ctx)
     if ctx.user.options.uses(converter.Feature.LISTS):
-      node = lists.transform(node, ctx)
-      node = slices.transform(node, ctx)
-    node = call_trees.transform(node, ctx)
-    node = control_flow.transform(node, ctx)
-    node = conditional_expressions.transform(node, ctx)
-    node = logical_expressions.transform(node, ctx)
-    node = variables.transform(node, ctx)
+      node = self._run_converter(lists, node, ctx)
+      node = self._run_converter(slices, node, ctx)
+    node = self._run_converter(call_trees, node, ctx)
+    node = self._run_converter(control_flow, node, ctx)
+    node = self._run_converter(conditional_expressions, node, ctx)
+    node = self._run_converter(logical_expressions, node, ctx)
+    node = self._run_converter(variables, node, ctx)
+
+    _report_pass_times(ctx)
     return node
 
+  def _run_converter(self, converter_module, node, ctx):
+    name = converter_module.__name__.rsplit('.', 1)[-1]
+    with ctx.timed_pass(name):
+      return converter_module.transform(node, ctx)
+
+
+_pass_time_counter = monitoring.Counter(
+    '/tensorflow/core/autograph/pass_time_usecs',
+    'Time spent by AutoGraph in each conversion pass (us).', 'pass')
+
+
+def _report_pass_times(ctx):
+  """Exports the time spent in each pass while converting an entity.
+
+  The time of each converter includes the time of the analyses it ran, which
+  are also reported separately.
+
+  Args:
+    ctx: transformer.Context, the context of the converted entity.
+  """
+  for name, seconds in ctx.pass_times.items():
+    _pass_time_counter.get_cell(name).increase_by(int(seconds * 1e6))
+  if logging.has_verbosity(1):
+    logging.log(
+        1, 'Pass times for %s (ms):\n%s\nSkipped analyses: %s', ctx.info.name,
+        '\n'.join('    %s: %.3f' % (name, seconds * 1e3)
+                  for name, seconds in ctx.pass_times.items()),
+        dict(ctx.skipped_passes))
+
+
+_conversion_time_counter = monitoring.Counter(
+    '/tensorflow/core/autograph/conversion_time_usecs',
+    'Time spent by AutoGraph converting functions (us).')
+
+# Per-thread total time spent in _convert_actual, which tf.function reads
+# around each trace to attribute conversion time to the traced function.
+_conversion_time = threading.local()
+
+
+def conversion_time_usecs():
+  """Returns the time this thread spent converting functions, in us."""
+  return getattr(_conversion_time, 'usecs', 0)
+
 
 def _convert_actual(entity, program_ctx):
   """Applies AutoGraph to entity."""
@@ -266,7 +321,14 @@ def _convert_actual(entity, program_ctx):
                      'expose a __code__ object. If this is a @tf.function,'
                      ' try passing f.python_function instead.')
 
-  transformed, module, source_map = _TRANSPILER.transform(entity, program_ctx)
+  start_time = time.time()
+  try:
+    transformed, module, source_map = _TRANSPILER.transform(
+        entity, program_ctx)
+  finally:
+    elapsed_usecs = int((time.time() - start_time) * 1000000)
+    _conversion_time.usecs = conversion_time_usecs() + elapsed_usecs
+    _conversion_time_counter.get_cell().increase_by(elapsed_usecs)
 
   assert not hasattr(transformed, 'ag_module')
   assert not hasattr(transformed, 'ag_source_map')
@@ -292,6 +354,14 @@ def is_autograph_artifact(entity):
   return hasattr(entity, 'autograph_info__')
 
 
+_converted_call_counter = monitoring.Counter(
+    '/tensorflow/core/autograph/converted_call_count',
+    'Calls made through converted_call, by whether they took the fast path.',
+    'path')
+_fast_path_calls = _converted_call_counter.get_cell('fast')
+_slow_path_calls = _converted_call_counter.get_cell('slow')
+
+
 def converted_call(f, args, kwargs, caller_fn_scope=None, options=None):
   """Converts a function call inline.
 
@@ -326,6 +396,13 @@ def converted_call(f, args, kwargs, caller_fn_scope=None, options=None):
       raise ValueError('either caller_fn_scope or options must have a value')
     options = caller_fn_scope.callopts
 
+  if not options.user_requested and conversion.is_fast_path(f):
+    _fast_path_calls.increase_by(1)
+    return _call_unconverted(f, args, kwargs, options, False)
+  _slow_path_calls.increase_by(1)
+  if logging.has_verbosity(1):
+    conversion.record_slow_path(f)
+
   if conversion.is_in_allowlist_cache(f, options):
     logging.log(2, 'Allowlisted %s: from cache', f)
     return _call_unconverted(f, args, kwargs, options, False)
@@ -621,6 +698,45 @@ def _log_callargs(f, args, kwargs):
 #
 
 
+@tf_export('autograph.experimental.enable_persistent_conversion_cache')
+def enable_persistent_conversion_cache(directory):
+  """Enables caching the code generated by AutoGraph on disk.
+
+  AutoGraph parses, analyzes and converts each function it converts. With the
+  persistent conversion cache enabled, the generated code is also stored in
+  `directory`, and later processes converting the same functions load it
+  instead of converting them again. This speeds up the startup of programs
+  which run the same `tf.function`s in many processes, such as the workers of
+  a distributed job.
+
+  ```
+  tf.autograph.experimental.enable_persistent_conversion_cache(
+      "/tmp/autograph")
+
+  @tf.function
+  def f(x):
+    if x > 0:  # Converted, or loaded from a previous process.
+      x = -x
+    return x
+  ```
+
+  Entries are keyed by the source code and location of the converted function,
+  the names visible to it, the conversion options and the versions of Python
+  and TensorFlow, so they are not reused after any of these change.
+
+  Args:
+    directory: The directory which holds the generated code. It can be shared
+      by processes running concurrently.
+  """
+  _TRANSPILER.set_persistent_cache(cache.PersistentCodeCache(directory))
+
+
+@tf_export('autograph.experimental.disable_persistent_conversion_cache')
+def disable_persistent_conversion_cache():
+  """Disables the cache enabled by `enable_persistent_conversion_cache`."""
+  _TRANSPILER.set_persistent_cache(None)
+
+
 @tf_export('autograph.experimental.do_not_convert')
 def do_not_convert(func=None):
   """Decorator that suppresses the conversion of a function.
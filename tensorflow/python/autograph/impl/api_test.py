@@ -35,6 +35,7 @@ from tensorflow.python.autograph.core import converter
 from tensorflow.python.autograph.core import converter_testing
 from tensorflow.python.autograph.impl import api
 from tensorflow.python.autograph.impl import conversion
+from tensorflow.python.autograph.pyct import cache
 from tensorflow.python.autograph.pyct import errors
 from tensorflow.python.autograph.pyct import inspect_utils
 from tensorflow.python.autograph.pyct import parser
@@ -687,6 +688,33 @@ class ApiTest(test.TestCase):
 
     self.assertAllEqual(self.evaluate(x), 2)
 
+  def test_converted_call_fast_path(self):
+
+    def test_fn(x):
+      return x + 1
+
+    def slow_path_count(f):
+      return conversion.slow_path_counts().get(f.__code__, 0)
+
+    # Calls are only counted by callable at AutoGraph verbosity 1 or higher.
+    self.addCleanup(ag_logging.set_verbosity, 0)
+    ag_logging.set_verbosity(0)
+    api.converted_call(test_fn, (1,), None, options=DEFAULT_RECURSIVE)
+    self.assertEqual(slow_path_count(test_fn), 0)
+
+    ag_logging.set_verbosity(1)
+    add_count = slow_path_count(math_ops.add)
+    fn_count = slow_path_count(test_fn)
+
+    x = api.converted_call(
+        math_ops.add, (1, 1), None, options=DEFAULT_RECURSIVE)
+    y = api.converted_call(test_fn, (1,), None, options=DEFAULT_RECURSIVE)
+
+    self.assertAllEqual(self.evaluate(x), 2)
+    self.assertEqual(y, 2)
+    self.assertEqual(slow_path_count(math_ops.add), add_count)
+    self.assertEqual(slow_path_count(test_fn), fn_count + 1)
+
   def test_converted_call_exec_generated_code(self):
 
     temp_mod = imp.new_module('test_module')
@@ -948,6 +976,29 @@ class ApiTest(test.TestCase):
 
     unspecified_fn()
 
+  def test_persistent_conversion_cache(self):
+    directory = self.get_temp_dir()
+    api.enable_persistent_conversion_cache(directory)
+    self.addCleanup(api.disable_persistent_conversion_cache)
+
+    def test_fn(x):
+      if x > 0:
+        x = -x
+      return x
+
+    self.assertEqual(api.to_graph(test_fn)(1), -1)
+    self.assertLen(os.listdir(directory), 1)
+
+    # A new transpiler, e.g. in another process, loads the generated code
+    # instead of converting the function again.
+    transpiler = api.PyToTF()
+    transpiler.set_persistent_cache(cache.PersistentCodeCache(directory))
+    patch = test.mock.patch
+    with patch.object(api, '_TRANSPILER', transpiler), \
+         patch.object(api.PyToTF, 'transform_ast') as transform_ast_mock:
+      self.assertEqual(api.to_graph(test_fn)(2), -2)
+      transform_ast_mock.assert_not_called()
+
   def test_to_graph_basic(self):
 
     def test_fn(x, s):
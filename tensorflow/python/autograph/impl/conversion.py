@@ -17,6 +17,7 @@
 import functools
 import inspect
 import sys
+import types
 import unittest
 
 from tensorflow.python.autograph.core import config
@@ -29,6 +30,26 @@ from tensorflow.python.util import tf_inspect
 
 _ALLOWLIST_CACHE = cache.UnboundInstanceCache()
 
+# Code objects of functions which converted_call always calls unconverted.
+_FAST_PATH_CODE = set()
+
+# Rules of the modules registered with register_fast_path_module. They are
+# consulted after config.CONVERSION_RULES.
+_FAST_PATH_MODULE_RULES = [
+    config.DoNotConvert('math'),
+    config.DoNotConvert('operator'),
+]
+
+# Maps module names to whether their members take the fast path. Computed
+# lazily from _fast_path_rules, which is reset whenever the rules change.
+_fast_path_modules = {}
+_fast_path_rules = None
+
+# Counts the calls which did not take the fast path, by code object. Holds at
+# most _SLOW_PATH_COUNTS_MAX_SIZE entries.
+_SLOW_PATH_COUNTS = {}
+_SLOW_PATH_COUNTS_MAX_SIZE = 1000
+
 
 def _is_of_known_loaded_module(f, module_name):
   mod = sys.modules.get(module_name, None)
@@ -225,3 +246,113 @@ def cache_allowlisted(entity, options):
   except TypeError:
     # Catch-all for entities that are unhashable or don't allow weakrefs.
     pass
+
+
+def register_fast_path_function(f):
+  """Makes converted_call always call `f` (or its code) unconverted.
+
+  The registration is keyed by the code object of `f`, so it also covers
+  other functions and methods sharing that code.
+
+  Args:
+    f: A function or method.
+
+  Raises:
+    ValueError: if `f` has no code object.
+  """
+  if inspect.ismethod(f):
+    f = f.__func__
+  if not isinstance(f, types.FunctionType):
+    raise ValueError(
+        'only functions and methods can be registered, got {}'.format(f))
+  _FAST_PATH_CODE.add(f.__code__)
+
+
+def register_fast_path_module(module_name):
+  """Makes converted_call always call members of a module unconverted.
+
+  Submodules are included, unless a `config.Convert` rule in
+  `config.CONVERSION_RULES` matches them.
+
+  Args:
+    module_name: Str, the name of the module, e.g. "scipy".
+
+  Raises:
+    ValueError: if module_name is "builtins", whose functions have overloads
+      that must not be skipped.
+  """
+  if module_name == 'builtins':
+    raise ValueError('builtins can not take the fast path')
+  _FAST_PATH_MODULE_RULES.append(config.DoNotConvert(module_name))
+  _fast_path_modules.clear()
+
+
+def _module_takes_fast_path(module_name):
+  for rule in config.CONVERSION_RULES + tuple(_FAST_PATH_MODULE_RULES):
+    if rule.matches(module_name):
+      return isinstance(rule, config.DoNotConvert)
+  return False
+
+
+def is_fast_path(f):
+  """Checks whether converted_call can call `f` unconverted right away.
+
+  This is the case for functions registered with register_fast_path_function
+  and for members of modules that are never converted, like those of numpy
+  or tensorflow. Unlike is_allowlisted, this only looks up `f.__code__` and
+  `f.__module__`, in constant time.
+
+  Args:
+    f: A Python callable.
+
+  Returns:
+    Boolean
+  """
+  global _fast_path_rules
+
+  if isinstance(f, (types.FunctionType, types.MethodType)):
+    if f.__code__ in _FAST_PATH_CODE:
+      return True
+  elif isinstance(f, functools.partial):
+    # Partials are unwrapped by converted_call and may wrap user code.
+    return False
+
+  module_name = getattr(f, '__module__', None)
+  # Like is_allowlisted, only consider the rules if the module is loaded.
+  if not isinstance(module_name, str) or module_name not in sys.modules:
+    return False
+
+  if _fast_path_rules is not config.CONVERSION_RULES:
+    _fast_path_modules.clear()
+    _fast_path_rules = config.CONVERSION_RULES
+  takes_fast_path = _fast_path_modules.get(module_name)
+  if takes_fast_path is None:
+    takes_fast_path = _module_takes_fast_path(module_name)
+    _fast_path_modules[module_name] = takes_fast_path
+  return takes_fast_path
+
+
+def record_slow_path(f):
+  """Counts a call of `f` which did not take the fast path.
+
+  Calls are counted by the code object of `f`, or by its type if it has none.
+  Once `_SLOW_PATH_COUNTS_MAX_SIZE` callables are counted, calls of other
+  callables are ignored.
+
+  Args:
+    f: the callable called by converted_call.
+  """
+  key = getattr(f, '__code__', None)
+  if key is None:
+    key = type(f)
+  count = _SLOW_PATH_COUNTS.get(key)
+  if count is None:
+    if len(_SLOW_PATH_COUNTS) >= _SLOW_PATH_COUNTS_MAX_SIZE:
+      return
+    count = 0
+  _SLOW_PATH_COUNTS[key] = count + 1
+
+
+def slow_path_counts():
+  """Returns the number of calls which did not take the fast path, by code."""
+  return dict(_SLOW_PATH_COUNTS)
@@ -14,9 +14,12 @@
 # ==============================================================================
 """Tests for conversion module."""
 
+import functools
 import imp
+import math
 import sys
 import types
+from unittest import mock
 import weakref
 
 from tensorflow.python.autograph import utils
@@ -115,6 +118,105 @@ class ConversionTest(test.TestCase):
       # Note: currently, native bindings are allowlisted by a separate check.
       self.assertFalse(conversion.is_allowlisted(test_object.method))
 
+  def test_is_fast_path(self):
+
+    def test_fn():
+      pass
+
+    self.assertFalse(conversion.is_fast_path(test_fn))
+    self.assertTrue(conversion.is_fast_path(constant_op.constant))
+    self.assertTrue(conversion.is_fast_path(math.sqrt))
+    self.assertFalse(conversion.is_fast_path(len))
+    self.assertFalse(
+        conversion.is_fast_path(functools.partial(constant_op.constant, 1)))
+
+  def test_is_fast_path_follows_conversion_rules(self):
+    with test.mock.patch.object(config, 'CONVERSION_RULES', ()):
+      self.assertFalse(conversion.is_fast_path(constant_op.constant))
+    self.assertTrue(conversion.is_fast_path(constant_op.constant))
+
+  def _restore_fast_path_registrations(self):
+    """Undoes the fast path registrations made by the test when it ends."""
+    patcher = mock.patch.multiple(
+        conversion,
+        _FAST_PATH_CODE=set(conversion._FAST_PATH_CODE),
+        _FAST_PATH_MODULE_RULES=list(conversion._FAST_PATH_MODULE_RULES),
+        _fast_path_modules={})
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+  def test_register_fast_path_function(self):
+    self._restore_fast_path_registrations()
+
+    class TestClass:
+
+      def method(self):
+        pass
+
+    def test_fn():
+      pass
+
+    self.assertFalse(conversion.is_fast_path(test_fn))
+    self.assertFalse(conversion.is_fast_path(TestClass().method))
+
+    conversion.register_fast_path_function(test_fn)
+    conversion.register_fast_path_function(TestClass.method)
+
+    self.assertTrue(conversion.is_fast_path(test_fn))
+    self.assertTrue(conversion.is_fast_path(TestClass().method))
+
+    with self.assertRaises(ValueError):
+      conversion.register_fast_path_function(TestClass)
+
+  def test_register_fast_path_module(self):
+    self._restore_fast_path_registrations()
+    fast_path_mod = imp.new_module('test_fast_path_module')
+
+    def test_fn():
+      pass
+
+    test_fn.__module__ = 'test_fast_path_module.submodule'
+    modules_patcher = mock.patch.dict(
+        sys.modules, {
+            'test_fast_path_module': fast_path_mod,
+            'test_fast_path_module.submodule': fast_path_mod
+        })
+    modules_patcher.start()
+    self.addCleanup(modules_patcher.stop)
+
+    self.assertFalse(conversion.is_fast_path(test_fn))
+    conversion.register_fast_path_module('test_fast_path_module')
+    self.assertTrue(conversion.is_fast_path(test_fn))
+
+    with self.assertRaises(ValueError):
+      conversion.register_fast_path_module('builtins')
+
+  def test_record_slow_path(self):
+
+    def test_fn():
+      pass
+
+    count = conversion.slow_path_counts().get(test_fn.__code__, 0)
+    conversion.record_slow_path(test_fn)
+    conversion.record_slow_path(test_fn)
+    self.assertEqual(
+        conversion.slow_path_counts()[test_fn.__code__], count + 2)
+
+  def test_record_slow_path_max_size(self):
+
+    def test_fn():
+      pass
+
+    def other_test_fn():
+      pass
+
+    with mock.patch.multiple(
+        conversion, _SLOW_PATH_COUNTS={}, _SLOW_PATH_COUNTS_MAX_SIZE=1):
+      conversion.record_slow_path(test_fn)
+      conversion.record_slow_path(other_test_fn)
+      conversion.record_slow_path(test_fn)
+      self.assertEqual(conversion.slow_path_counts(), {test_fn.__code__: 2})
+
 
 if __name__ == '__main__':
   test.main()
@@ -14,7 +14,11 @@
 # ==============================================================================
 """Caching utilities."""
 
+import hashlib
 import inspect
+import json
+import os
+import tempfile
 import weakref
 
 
@@ -91,3 +95,58 @@ class UnboundInstanceCache(_TransformedFnCache):
     return entity
 
 
+class PersistentCodeCache(object):
+  """An on-disk cache of transformed code, which processes can share.
+
+  Entries are JSON-serializable dicts, stored under a key derived from all the
+  inputs of the transformation, see `make_key`. Entries are written atomically,
+  so the cache directory can be shared by processes running concurrently.
+  """
+
+  __slots__ = ('_directory',)
+
+  def __init__(self, directory):
+    self._directory = directory
+
+  @property
+  def directory(self):
+    return self._directory
+
+  def make_key(self, *parts):
+    """Returns the key of an entry, given a sequence of strings identifying it.
+
+    Args:
+      *parts: Text, the inputs of the transformation, such as the source code
+        of the transformed entity and the transformation options.
+
+    Returns:
+      Text, a key which is suitable as a file name.
+    """
+    hasher = hashlib.sha256()
+    for part in parts:
+      encoded = part.encode('utf-8')
+      # Prefixing each part with its length makes the key unambiguous.
+      hasher.update(str(len(encoded)).encode('utf-8'))
+      hasher.update(b':')
+      hasher.update(encoded)
+    return hasher.hexdigest()
+
+  def lookup(self, key):
+    """Returns the entry stored under `key`, or None if it can't be read."""
+    try:
+      with open(os.path.join(self._directory, key), 'r', encoding='utf-8') as f:
+        return json.load(f)
+    except (OSError, ValueError):
+      return None
+
+  def add(self, key, entry):
+    """Stores `entry` under `key`."""
+    os.makedirs(self._directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=self._directory, prefix=key + '.tmp')
+    try:
+      with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(entry, f)
+      os.replace(temp_path, os.path.join(self._directory, key))
+    finally:
+      if os.path.exists(temp_path):
+        os.remove(temp_path)
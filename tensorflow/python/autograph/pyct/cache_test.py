@@ -70,6 +70,23 @@ class CacheTest(test.TestCase):
     self.assertIs(c[o2.method][1], dummy)
     self.assertEqual(len(c), 1)
 
+  def test_persistent_code_cache(self):
+    c = cache.PersistentCodeCache(self.get_temp_dir())
+    key = c.make_key('source', 'options')
+
+    self.assertIsNone(c.lookup(key))
+    c.add(key, {'source': 'x = 1'})
+    self.assertEqual(c.lookup(key), {'source': 'x = 1'})
+    self.assertEqual(
+        cache.PersistentCodeCache(self.get_temp_dir()).lookup(key),
+        {'source': 'x = 1'})
+
+  def test_persistent_code_cache_keys(self):
+    c = cache.PersistentCodeCache(self.get_temp_dir())
+    self.assertEqual(c.make_key('a', 'b'), c.make_key('a', 'b'))
+    self.assertNotEqual(c.make_key('a', 'b'), c.make_key('a', 'c'))
+    self.assertNotEqual(c.make_key('ab', 'c'), c.make_key('a', 'bc'))
+
 
 if __name__ == '__main__':
   test.main()
@@ -0,0 +1,151 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Runs static analyses only when their results are out of date.
+
+Converters typically re-run the analyses they depend on before transforming a
+node, because the converters which ran before them may have changed the AST.
+Often they have not, in which case the annotations left by the previous run are
+still valid. `resolve` detects this by comparing a fingerprint of the AST to
+the one taken when the analyses last ran, and skips the analyses that are up
+to date.
+"""
+
+import gast
+
+from tensorflow.python.autograph.pyct import cfg
+from tensorflow.python.autograph.pyct import qual_names
+from tensorflow.python.autograph.pyct import transformer
+from tensorflow.python.autograph.pyct.static_analysis import activity
+from tensorflow.python.autograph.pyct.static_analysis import liveness
+from tensorflow.python.autograph.pyct.static_analysis import reaching_definitions
+from tensorflow.python.autograph.pyct.static_analysis import reaching_fndefs
+
+
+AnalysisLevel = transformer.AnalysisLevel
+
+_PRIMITIVE_TYPES = (str, bytes, int, float, complex, bool, type(None))
+
+
+def fingerprint(node):
+  """Returns a value which changes whenever the AST under node changes.
+
+  The fingerprint records the identity of each node and the values of its
+  primitive fields, so that two fingerprints compare equal only if the tree
+  has the same structure and holds the same node objects. Annotations are not
+  part of the fingerprint. The fingerprint references the nodes, which keeps
+  their ids from being reused while it is alive.
+
+  Args:
+    node: ast.AST, or a list of ast.AST.
+
+  Returns:
+    A hashable value.
+  """
+  parts = []
+  to_visit = [node]
+  while to_visit:
+    n = to_visit.pop()
+    if isinstance(n, gast.AST):
+      parts.append(n)
+      for field in reversed(n._fields):
+        to_visit.append(getattr(n, field, None))
+    elif isinstance(n, (list, tuple)):
+      parts.append(len(n))
+      to_visit.extend(reversed(n))
+    elif isinstance(n, _PRIMITIVE_TYPES):
+      parts.append((type(n), n))
+    elif isinstance(n, dict):
+      # Annotations are stored in dict fields, see anno.setanno.
+      continue
+    else:
+      # Unknown values can not be compared, so they always invalidate the
+      # fingerprint.
+      parts.append(object())
+  return tuple(parts)
+
+
+class _AnalysisState(object):
+  """The analyses last run on an AST.
+
+  Attributes:
+    node: ast.AST, the root of the analyzed AST.
+    fingerprint: The fingerprint of node after the analyses ran.
+    level: AnalysisLevel, the analyses whose results are up to date.
+    graphs: Dict[ast.FunctionDef, cfg.Graph], the control flow graphs used by
+      the analyses, if level includes DEFINEDNESS.
+  """
+
+  def __init__(self, node, fingerprint_, level, graphs):
+    self.node = node
+    self.fingerprint = fingerprint_
+    self.level = level
+    self.graphs = graphs
+
+
+def resolve(node, ctx, level):
+  """Runs the analyses of level on node, unless they are up to date.
+
+  The analyses run by each level include those of the lower levels:
+    * ACTIVITY runs qual_names and activity
+    * DEFINEDNESS also runs reaching_definitions
+    * LIVENESS also runs reaching_fndefs and liveness
+
+  Analyses are considered up to date if they ran on the same node, and the AST
+  did not change since. Each analysis that runs is timed in `ctx.pass_times`,
+  and each analysis that is skipped is counted in `ctx.skipped_passes`.
+
+  Args:
+    node: ast.AST, the root of the AST to analyze.
+    ctx: transformer.Context
+    level: AnalysisLevel
+
+  Returns:
+    Tuple[ast.AST, Dict[ast.FunctionDef, cfg.Graph]], the analyzed node and
+    its control flow graphs. The graphs are None if level does not include
+    DEFINEDNESS.
+  """
+  state = ctx.analysis_state
+  if (state is None or state.node is not node or
+      state.fingerprint != fingerprint(node)):
+    state = _AnalysisState(node, None, AnalysisLevel.NONE, None)
+
+  def run(pass_level, name, analysis):
+    nonlocal node
+    if pass_level > level:
+      return
+    if pass_level <= state.level:
+      ctx.skipped_passes[name] += 1
+      return
+    with ctx.timed_pass(name):
+      node = analysis()
+
+  run(AnalysisLevel.ACTIVITY, 'qual_names', lambda: qual_names.resolve(node))
+  run(AnalysisLevel.ACTIVITY, 'activity',
+      lambda: activity.resolve(node, ctx, None))
+
+  if level >= AnalysisLevel.DEFINEDNESS and state.graphs is None:
+    with ctx.timed_pass('cfg'):
+      state.graphs = cfg.build(node)
+  graphs = state.graphs
+  run(AnalysisLevel.DEFINEDNESS, 'reaching_definitions',
+      lambda: reaching_definitions.resolve(node, ctx, graphs))
+  run(AnalysisLevel.LIVENESS, 'reaching_fndefs',
+      lambda: reaching_fndefs.resolve(node, ctx, graphs))
+  run(AnalysisLevel.LIVENESS, 'liveness',
+      lambda: liveness.resolve(node, ctx, graphs))
+
+  if level > state.level:
+    ctx.analysis_state = _AnalysisState(node, fingerprint(node), level, graphs)
+  return node, graphs
@@ -0,0 +1,132 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for incremental module."""
+
+import gast
+
+from tensorflow.python.autograph.pyct import anno
+from tensorflow.python.autograph.pyct import naming
+from tensorflow.python.autograph.pyct import parser
+from tensorflow.python.autograph.pyct import transformer
+from tensorflow.python.autograph.pyct.static_analysis import annos
+from tensorflow.python.autograph.pyct.static_analysis import incremental
+from tensorflow.python.platform import test
+
+
+AnalysisLevel = transformer.AnalysisLevel
+
+
+def test_fn(a):
+  b = a + 1
+  while b > 0:
+    b -= 1
+  return b
+
+
+class IncrementalTest(test.TestCase):
+
+  def _parse(self, fn):
+    node, source = parser.parse_entity(fn, future_features=())
+    entity_info = transformer.EntityInfo(
+        name=fn.__name__,
+        source_code=source,
+        source_file=None,
+        future_features=(),
+        namespace={})
+    ctx = transformer.Context(entity_info, naming.Namer({}), None)
+    return node, ctx
+
+  def test_fingerprint_unchanged(self):
+    node, _ = self._parse(test_fn)
+    self.assertEqual(incremental.fingerprint(node),
+                     incremental.fingerprint(node))
+
+  def test_fingerprint_changes_with_the_tree(self):
+    node, _ = self._parse(test_fn)
+    before = incremental.fingerprint(node)
+    node.body[0].targets[0].id = 'c'
+    self.assertNotEqual(before, incremental.fingerprint(node))
+
+    before = incremental.fingerprint(node)
+    node.body.append(gast.Pass())
+    self.assertNotEqual(before, incremental.fingerprint(node))
+
+    before = incremental.fingerprint(node)
+    node.body[-1] = gast.Pass()
+    self.assertNotEqual(before, incremental.fingerprint(node))
+
+  def test_fingerprint_ignores_annotations(self):
+    node, _ = self._parse(test_fn)
+    before = incremental.fingerprint(node)
+    anno.setanno(node.body[0], 'foo', 'bar')
+    self.assertEqual(before, incremental.fingerprint(node))
+
+  def test_resolve_runs_requested_analyses(self):
+    node, ctx = self._parse(test_fn)
+
+    node, graphs = incremental.resolve(node, ctx, AnalysisLevel.LIVENESS)
+
+    self.assertIn(node, graphs)
+    self.assertTrue(anno.hasanno(node, annos.NodeAnno.ARGS_AND_BODY_SCOPE))
+    self.assertTrue(anno.hasanno(node.body[1], anno.Static.DEFINED_VARS_IN))
+    self.assertTrue(anno.hasanno(node.body[1], anno.Static.LIVE_VARS_OUT))
+    self.assertCountEqual(
+        ctx.pass_times,
+        ('qual_names', 'activity', 'cfg', 'reaching_definitions',
+         'reaching_fndefs', 'liveness'))
+    self.assertEmpty(ctx.skipped_passes)
+
+  def test_resolve_skips_up_to_date_analyses(self):
+    node, ctx = self._parse(test_fn)
+
+    incremental.resolve(node, ctx, AnalysisLevel.DEFINEDNESS)
+    _, graphs = incremental.resolve(node, ctx, AnalysisLevel.LIVENESS)
+
+    self.assertIsNotNone(graphs)
+    self.assertEqual(
+        dict(ctx.skipped_passes), {
+            'qual_names': 1,
+            'activity': 1,
+            'reaching_definitions': 1,
+        })
+    self.assertIn('liveness', ctx.pass_times)
+
+    incremental.resolve(node, ctx, AnalysisLevel.ACTIVITY)
+
+    self.assertEqual(ctx.skipped_passes['activity'], 2)
+    self.assertEqual(ctx.skipped_passes['liveness'], 0)
+
+  def test_resolve_reruns_analyses_after_change(self):
+    node, ctx = self._parse(test_fn)
+    incremental.resolve(node, ctx, AnalysisLevel.ACTIVITY)
+
+    node.body.insert(0, parser.parse('c = 1'))
+    node, _ = incremental.resolve(node, ctx, AnalysisLevel.ACTIVITY)
+
+    self.assertEmpty(ctx.skipped_passes)
+    self.assertTrue(anno.hasanno(node.body[0], anno.Static.SCOPE))
+
+  def test_resolve_reruns_analyses_on_other_node(self):
+    node, ctx = self._parse(test_fn)
+    incremental.resolve(node, ctx, AnalysisLevel.ACTIVITY)
+
+    other_node, _ = self._parse(test_fn)
+    incremental.resolve(other_node, ctx, AnalysisLevel.ACTIVITY)
+
+    self.assertEmpty(ctx.skipped_passes)
+
+
+if __name__ == '__main__':
+  test.main()
@@ -15,7 +15,9 @@
 """A node transformer that includes utilities for SCT."""
 
 import collections
+import contextlib
 import enum
+import time
 
 import gast
 
@@ -46,6 +48,13 @@ class Context(object):
       AST node to be processed successfully. Useful for error handling.
     user: An user-supplied context object. The object is opaque to the
       infrastructure, but will pe passed through to all custom transformations.
+    pass_times: Dict[Text, float], the total time spent in each pass timed by
+      `timed_pass`, in seconds, in the order in which the passes first ran.
+    skipped_passes: collections.Counter, the number of times each analysis was
+      skipped because its results were up to date. See
+      `static_analysis.incremental`.
+    analysis_state: The state of the analyses run by
+      `static_analysis.incremental`.
   """
 
   def __init__(self, info, namer, user_context):
@@ -53,6 +62,19 @@ class Context(object):
     self.namer = namer
     self.current_origin = None
     self.user = user_context
+    self.pass_times = {}
+    self.skipped_passes = collections.Counter()
+    self.analysis_state = None
+
+  @contextlib.contextmanager
+  def timed_pass(self, name):
+    """Adds the time spent in the context to the time of pass `name`."""
+    start_time = time.time()
+    try:
+      yield
+    finally:
+      self.pass_times[name] = (
+          self.pass_times.get(name, 0.0) + time.time() - start_time)
 
 
 # TODO(mdan): Move to a standalone file.
@@ -15,6 +15,7 @@
 """Generic source code transformation infrastructure."""
 
 import inspect
+import sys
 import threading
 import types
 
@@ -140,6 +141,28 @@ def _wrap_into_factory(nodes, entity_name, inner_factory_name,
       outer_factory_name=outer_factory_name)
 
 
+def _serialize_source_map(source_map):
+  """Converts a source map to a JSON-serializable list."""
+  return [[
+      line_loc.lineno, origin.loc.filename, origin.loc.lineno,
+      origin.loc.col_offset, origin.function_name, origin.source_code_line,
+      origin.comment
+  ] for line_loc, origin in source_map.items()]
+
+
+def _deserialize_source_map(entries, filename):
+  """Inverse of `_serialize_source_map`, for code loaded from `filename`."""
+  source_map = {}
+  for (lineno, origin_filename, origin_lineno, origin_col_offset,
+       function_name, source_code_line, comment) in entries:
+    source_map[origin_info.LineLocation(filename, lineno)] = (
+        origin_info.OriginInfo(
+            origin_info.Location(origin_filename, origin_lineno,
+                                 origin_col_offset), function_name,
+            source_code_line, comment))
+  return source_map
+
+
 class _PythonFnFactory(object):
   """Helper object that wraps a Python function factory."""
 
@@ -159,6 +182,12 @@ class _PythonFnFactory(object):
     self._unbound_factory = None
     self.module = None
     self.source_map = None
+    self.source = None
+    self.outer_factory_name = None
+
+  @property
+  def name(self):
+    return self._name
 
   def create(self,
              nodes,
@@ -176,12 +205,34 @@ class _PythonFnFactory(object):
                                outer_factory_name, self._freevars,
                                self._extra_locals.keys(), future_features)
 
-    module, _, source_map = loader.load_ast(
+    module, source, source_map = loader.load_ast(
         nodes, include_source_map=True)
     outer_factory = getattr(module, outer_factory_name)
     self._unbound_factory = outer_factory()
     self.module = module
     self.source_map = source_map
+    self.source = source
+    self.outer_factory_name = outer_factory_name
+
+  def load(self, source, outer_factory_name, source_map_entries):
+    """Initializes a function from the code generated by `create`.
+
+    Args:
+      source: Text, the `source` of a factory initialized by `create`.
+      outer_factory_name: Text, the `outer_factory_name` of that factory.
+      source_map_entries: The source map of that factory, as returned by
+        `_serialize_source_map`.
+    """
+    if self._unbound_factory is not None:
+      raise ValueError('double initialization; create a new object instead')
+
+    module, file_name = loader.load_source(source, delete_on_exit=True)
+    outer_factory = getattr(module, outer_factory_name)
+    self._unbound_factory = outer_factory()
+    self.module = module
+    self.source_map = _deserialize_source_map(source_map_entries, file_name)
+    self.source = source
+    self.outer_factory_name = outer_factory_name
 
   def instantiate(self,
                   globals_,
@@ -394,6 +445,17 @@ class PyToPy(GenericTranspiler):
   def __init__(self):
     self._cache_lock = threading.RLock()
     self._cache = cache.CodeObjectCache()
+    self._persistent_cache = None
+
+  def set_persistent_cache(self, persistent_cache):
+    """Sets a cache of transformed code shared by processes.
+
+    Args:
+      persistent_cache: A `cache.PersistentCodeCache`, or None to disable
+        persistent caching. Only transformations with a persistent caching key
+        are cached, see `get_persistent_caching_key`.
+    """
+    self._persistent_cache = persistent_cache
 
   def get_extra_locals(self):
     """Returns extra static local variables to be made to transformed code.
@@ -423,12 +485,107 @@ class PyToPy(GenericTranspiler):
     """
     raise NotImplementedError('subclasses must override this')
 
+  def get_persistent_caching_key(self, user_context):
+    """Returns a key identifying a transformation across processes, or None.
+
+    Subclasses may override this to enable persistent caching. The key must
+    change whenever the transformation may produce different code, e.g. when
+    its options or the transpiler itself change. By default, returns None,
+    which disables persistent caching.
+
+    Args:
+      user_context: The context object which was passed to `transform`.
+
+    Returns:
+      Optional[Text]
+    """
+    del user_context
+    return None
+
+  def _persistent_cache_key(self, fn, user_context):
+    """Returns the key of `fn` in the persistent cache, or None."""
+    if self._persistent_cache is None:
+      return None
+    transformation_key = self.get_persistent_caching_key(user_context)
+    if transformation_key is None or not hasattr(fn, '__code__'):
+      return None
+    try:
+      source = inspect.getsource(fn)
+    except (OSError, TypeError):
+      return None
+    code = fn.__code__
+    # The generated code avoids the names visible to fn, so they are part of
+    # the key along with its location, which the source map refers to.
+    return self._persistent_cache.make_key(
+        transformation_key, sys.version, code.co_filename,
+        str(code.co_firstlineno), code.co_code.hex(), source,
+        ' '.join(sorted(inspect_utils.getnamespace(fn))),
+        ' '.join(sorted(self.get_extra_locals())))
+
+  def _load_persistent_factory(self, fn, persistent_key):
+    """Returns a factory loaded from the persistent cache, or None."""
+    entry = self._persistent_cache.lookup(persistent_key)
+    if entry is None:
+      return None
+    logging.log(1, 'Loading %s from the persistent cache', fn)
+    factory = _PythonFnFactory(
+        entry['name'], fn.__code__.co_freevars, self.get_extra_locals())
+    try:
+      factory.load(entry['source'], entry['outer_factory_name'],
+                   entry['source_map'])
+    except Exception:  # pylint:disable=broad-except
+      # Corrupt entries are transformed again, which overwrites them.
+      logging.log(1, 'Error loading %s from the persistent cache', fn,
+                  exc_info=True)
+      return None
+    return factory
+
+  def _save_persistent_factory(self, fn, persistent_key, factory):
+    try:
+      self._persistent_cache.add(
+          persistent_key, {
+              'name': factory.name,
+              'source': factory.source,
+              'outer_factory_name': factory.outer_factory_name,
+              'source_map': _serialize_source_map(factory.source_map),
+          })
+    except OSError:
+      logging.warning('Error writing %s to the persistent AutoGraph cache '
+                      'in %s', fn, self._persistent_cache.directory)
+
   def _cached_factory(self, fn, cache_subkey):
     cached_factory = self._cache[fn][cache_subkey]
     logging.log(3, 'Cache hit for %s subkey %s: %s', fn, cache_subkey,
                 cached_factory)
     return cached_factory
 
+  def _create_factory(self, fn, user_context):
+    """Transforms `fn` and returns a factory for the transformed function."""
+    # TODO(mdan): Confusing overloading pattern. Fix.
+    nodes, ctx = super(PyToPy, self).transform_function(fn, user_context)
+
+    if isinstance(nodes, gast.Lambda):
+      nodes = gast.Assign(
+          targets=[
+              gast.Name(
+                  ctx.info.name,
+                  ctx=gast.Store(),
+                  annotation=None,
+                  type_comment=None)
+          ],
+          value=nodes)
+    else:
+      nodes.name = ctx.info.name
+
+    if logging.has_verbosity(2):
+      logging.log(2, 'Transformed %s:\n\n%s\n', fn, parser.unparse(nodes))
+
+    factory = _PythonFnFactory(
+        ctx.info.name, fn.__code__.co_freevars, self.get_extra_locals())
+    factory.create(
+        nodes, ctx.namer, future_features=ctx.info.future_features)
+    return factory
+
   def transform_function(self, fn, user_context):
     """Transforms a function. See GenericTranspiler.trasnform_function.
 
@@ -462,29 +619,15 @@ class PyToPy(GenericTranspiler):
 
         else:
           logging.log(1, '%s is not cached for subkey %s', fn, cache_subkey)
-          # TODO(mdan): Confusing overloading pattern. Fix.
-          nodes, ctx = super(PyToPy, self).transform_function(fn, user_context)
-
-          if isinstance(nodes, gast.Lambda):
-            nodes = gast.Assign(
-                targets=[
-                    gast.Name(
-                        ctx.info.name,
-                        ctx=gast.Store(),
-                        annotation=None,
-                        type_comment=None)
-                ],
-                value=nodes)
-          else:
-            nodes.name = ctx.info.name
-
-          if logging.has_verbosity(2):
-            logging.log(2, 'Transformed %s:\n\n%s\n', fn, parser.unparse(nodes))
-
-          factory = _PythonFnFactory(
-              ctx.info.name, fn.__code__.co_freevars, self.get_extra_locals())
-          factory.create(
-              nodes, ctx.namer, future_features=ctx.info.future_features)
+          persistent_key = self._persistent_cache_key(fn, user_context)
+          factory = None
+          if persistent_key is not None:
+            factory = self._load_persistent_factory(fn, persistent_key)
+
+          if factory is None:
+            factory = self._create_factory(fn, user_context)
+            if persistent_key is not None:
+              self._save_persistent_factory(fn, persistent_key, factory)
           self._cache[fn][cache_subkey] = factory
 
     transformed_fn = factory.instantiate(
@@ -18,6 +18,7 @@ import threading
 
 import gast
 
+from tensorflow.python.autograph.pyct import cache
 from tensorflow.python.autograph.pyct import transformer
 from tensorflow.python.autograph.pyct import transpiler
 from tensorflow.python.platform import test
@@ -44,6 +45,21 @@ class TestTranspiler(transpiler.PyToPy):
     return FlipSignTransformer(ctx).visit(node)
 
 
+class PersistentTestTranspiler(TestTranspiler):
+
+  def __init__(self):
+    super().__init__()
+    self.transform_count = 0
+
+  def get_persistent_caching_key(self, ctx):
+    del ctx
+    return 'test'
+
+  def transform_ast(self, node, ctx):
+    self.transform_count += 1
+    return super().transform_ast(node, ctx)
+
+
 global_var_for_test_global = 1
 global_var_for_test_namespace_collisions = object()
 
@@ -235,6 +251,47 @@ class PyToPyTest(test.TestCase):
         obj.global_var_for_test_namespace_collisions, None)
     self.assertIs(f(obj), global_var_for_test_namespace_collisions)
 
+  def test_persistent_cache(self):
+    b = 1
+
+    def f(a):
+      return a + b
+
+    persistent_cache = cache.PersistentCodeCache(self.get_temp_dir())
+    tr = PersistentTestTranspiler()
+    tr.set_persistent_cache(persistent_cache)
+    converted_f, _, source_map = tr.transform(f, None)
+    self.assertEqual(converted_f(1), 0)
+    self.assertEqual(tr.transform_count, 1)
+
+    # A new transpiler, e.g. in another process, loads the converted code.
+    other_tr = PersistentTestTranspiler()
+    other_tr.set_persistent_cache(persistent_cache)
+    loaded_f, module, loaded_source_map = other_tr.transform(f, None)
+    self.assertEqual(other_tr.transform_count, 0)
+    self.assertEqual(loaded_f(1), 0)
+    b = 2
+    self.assertEqual(loaded_f(1), -1)
+
+    self.assertCountEqual(loaded_source_map.values(), source_map.values())
+    for line_loc in loaded_source_map:
+      self.assertEqual(line_loc.filename, module.__file__)
+
+  def test_persistent_cache_disabled_without_key(self):
+
+    def f(a):
+      return a + 1
+
+    persistent_cache = cache.PersistentCodeCache(self.get_temp_dir())
+    tr = TestTranspiler()
+    tr.set_persistent_cache(persistent_cache)
+    tr.transform(f, None)
+
+    other_tr = PersistentTestTranspiler()
+    other_tr.set_persistent_cache(persistent_cache)
+    other_tr.transform(f, None)
+    self.assertEqual(other_tr.transform_count, 1)
+
 
 if __name__ == '__main__':
   test.main()
@@ -32,9 +32,11 @@ See [Importing Data](https://tensorflow.org/guide/datasets) for an overview.
 @@DatasetStructure
 @@DistributeOptions
 @@ExternalStatePolicy
+@@IndexedTFRecordDataset
 @@OptimizationOptions
 @@Optional
 @@OptionalStructure
+@@PipelineProfiler
 @@RaggedTensorStructure
 @@RandomDataset
 @@Reducer
@@ -57,11 +59,14 @@ See [Importing Data](https://tensorflow.org/guide/datasets) for an overview.
 @@distribute
 @@enable_debug_mode
 @@enumerate_dataset
+@@from_columns
 @@from_list
 @@from_variant
 @@get_next_as_optional
+@@get_pipeline_stats
 @@get_single_element
 @@get_structure
+@@global_shuffle
 @@group_by_reducer
 @@group_by_window
 @@ignore_errors
@@ -108,6 +113,7 @@ from tensorflow.python.data.experimental.ops.counter import Counter
 from tensorflow.python.data.experimental.ops.distribute import SHARD_HINT
 from tensorflow.python.data.experimental.ops.enumerate_ops import enumerate_dataset
 from tensorflow.python.data.experimental.ops.error_ops import ignore_errors
+from tensorflow.python.data.experimental.ops.from_columns import from_columns
 from tensorflow.python.data.experimental.ops.from_list import from_list
 from tensorflow.python.data.experimental.ops.get_single_element import get_single_element
 from tensorflow.python.data.experimental.ops.grouping import bucket_by_sequence_length
@@ -125,16 +131,20 @@ from tensorflow.python.data.experimental.ops.lookup_ops import DatasetInitialize
 from tensorflow.python.data.experimental.ops.lookup_ops import index_table_from_dataset
 from tensorflow.python.data.experimental.ops.lookup_ops import table_from_dataset
 from tensorflow.python.data.experimental.ops.parsing_ops import parse_example_dataset
+from tensorflow.python.data.experimental.ops.pipeline_stats import get_pipeline_stats
+from tensorflow.python.data.experimental.ops.pipeline_stats import PipelineProfiler
 from tensorflow.python.data.experimental.ops.prefetching_ops import copy_to_device
 from tensorflow.python.data.experimental.ops.prefetching_ops import prefetch_to_device
 from tensorflow.python.data.experimental.ops.random_access import at
 from tensorflow.python.data.experimental.ops.random_ops import RandomDataset
 from tensorflow.python.data.experimental.ops.readers import CsvDataset
+from tensorflow.python.data.experimental.ops.readers import IndexedTFRecordDataset
 from tensorflow.python.data.experimental.ops.readers import make_batched_features_dataset
 from tensorflow.python.data.experimental.ops.readers import make_csv_dataset
 from tensorflow.python.data.experimental.ops.readers import SqlDataset
 from tensorflow.python.data.experimental.ops.resampling import rejection_resample
 from tensorflow.python.data.experimental.ops.scan_ops import scan
+from tensorflow.python.data.experimental.ops.shuffle_ops import global_shuffle
 from tensorflow.python.data.experimental.ops.shuffle_ops import shuffle_and_repeat
 from tensorflow.python.data.experimental.ops.snapshot import snapshot
 from tensorflow.python.data.experimental.ops.take_while_ops import take_while
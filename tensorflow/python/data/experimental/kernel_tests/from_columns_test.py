@@ -0,0 +1,144 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for `tf.data.experimental.from_columns()`."""
+import os
+
+from absl.testing import parameterized
+import numpy as np
+
+from tensorflow.python.data.experimental.ops import from_columns
+from tensorflow.python.data.kernel_tests import test_base
+from tensorflow.python.framework import combinations
+from tensorflow.python.framework import dtypes
+from tensorflow.python.platform import test
+
+
+class _UntouchableColumn(object):
+  """A column that fails if it is ever converted to an array."""
+
+  def __array__(self, dtype=None):
+    raise AssertionError("Unselected column was accessed.")
+
+
+class FromColumnsTest(test_base.DatasetTestBase, parameterized.TestCase):
+
+  def _columns(self, num_rows=10):
+    return {
+        "a": np.arange(num_rows, dtype=np.int64),
+        "b": np.arange(num_rows * 2, dtype=np.float32).reshape([num_rows, 2]),
+    }
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testRows(self):
+    columns = self._columns()
+    dataset = from_columns.from_columns(columns)
+    self.assertEqual(dtypes.int64, dataset.element_spec["a"].dtype)
+    self.assertEqual([2], dataset.element_spec["b"].shape.as_list())
+    self.assertDatasetProduces(
+        dataset,
+        expected_output=[{
+            "a": columns["a"][i],
+            "b": columns["b"][i]
+        } for i in range(10)])
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testManyRows(self):
+    num_rows = 2 * from_columns._ROWS_PER_CHUNK + 5  # pylint: disable=protected-access
+    columns = {"a": np.arange(num_rows)}
+    dataset = from_columns.from_columns(columns)
+    self.assertEqual(num_rows, self.evaluate(dataset.cardinality()))
+    self.assertDatasetProduces(
+        dataset, expected_output=[{"a": i} for i in range(num_rows)])
+
+  @combinations.generate(
+      combinations.times(test_base.default_test_combinations(),
+                         combinations.combine(drop_remainder=[True, False])))
+  def testBatches(self, drop_remainder):
+    columns = self._columns()
+    dataset = from_columns.from_columns(
+        columns, batch_size=4, drop_remainder=drop_remainder)
+    expected_dim = 4 if drop_remainder else None
+    self.assertEqual([expected_dim],
+                     dataset.element_spec["a"].shape.as_list())
+    self.assertEqual([expected_dim, 2],
+                     dataset.element_spec["b"].shape.as_list())
+    starts = [0, 4] if drop_remainder else [0, 4, 8]
+    self.assertDatasetProduces(
+        dataset,
+        expected_output=[{
+            "a": columns["a"][start:start + 4],
+            "b": columns["b"][start:start + 4]
+        } for start in starts])
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testSelectColumns(self):
+    columns = self._columns()
+    columns["c"] = _UntouchableColumn()
+    dataset = from_columns.from_columns(columns, select_columns=["a"])
+    self.assertEqual(["a"], list(dataset.element_spec))
+    self.assertDatasetProduces(
+        dataset, expected_output=[{"a": i} for i in range(10)])
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testMemoryMappedColumn(self):
+    path = os.path.join(self.get_temp_dir(), "column.npy")
+    np.save(path, np.arange(20, dtype=np.int32).reshape([10, 2]))
+    columns = {"a": np.load(path, mmap_mode="r")}
+    dataset = from_columns.from_columns(columns, batch_size=5)
+    self.assertDatasetProduces(
+        dataset,
+        expected_output=[{
+            "a": np.arange(10, dtype=np.int32).reshape([5, 2])
+        }, {
+            "a": np.arange(10, 20, dtype=np.int32).reshape([5, 2])
+        }])
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testMemoryViewColumn(self):
+    columns = {"a": memoryview(bytes(range(8)))}
+    dataset = from_columns.from_columns(columns, batch_size=8)
+    self.assertDatasetProduces(
+        dataset, expected_output=[{"a": np.arange(8, dtype=np.uint8)}])
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testMismatchedNumberOfRows(self):
+    columns = {"a": np.arange(3), "b": np.arange(4)}
+    with self.assertRaisesRegex(ValueError, "same number of rows"):
+      from_columns.from_columns(columns)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testMissingColumn(self):
+    with self.assertRaisesRegex(ValueError, "does not exist"):
+      from_columns.from_columns(self._columns(), select_columns=["z"])
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testInvalidColumns(self):
+    with self.assertRaisesRegex(TypeError, "must be a dictionary"):
+      from_columns.from_columns([np.arange(3)])
+    with self.assertRaisesRegex(TypeError, "numeric or boolean dtype"):
+      from_columns.from_columns({"a": np.array(["x", "y"])})
+    with self.assertRaisesRegex(ValueError, "at least one dimension"):
+      from_columns.from_columns({"a": np.int64(1)})
+    with self.assertRaisesRegex(ValueError, "At least one column"):
+      from_columns.from_columns({})
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testInvalidBatchSize(self):
+    with self.assertRaisesRegex(ValueError, "must be a positive integer"):
+      from_columns.from_columns(self._columns(), batch_size=0)
+
+
+if __name__ == "__main__":
+  test.main()
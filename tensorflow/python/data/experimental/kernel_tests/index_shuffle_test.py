@@ -13,6 +13,8 @@
 # limitations under the License.
 # ==============================================================================
 """Tests for `tf.data.experimental.index_shuffle()`."""
+import os
+
 from absl.testing import parameterized
 import numpy as np
 
@@ -21,8 +23,10 @@ from tensorflow.python.data.kernel_tests import checkpoint_test_base
 from tensorflow.python.data.kernel_tests import test_base
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.data.ops import options as options_lib
+from tensorflow.python.data.ops import readers
 from tensorflow.python.framework import combinations
 from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors
 from tensorflow.python.ops import array_ops
 from tensorflow.python.platform import test
 
@@ -226,5 +230,131 @@ class IndexShuffleCheckpointTest(checkpoint_test_base.CheckpointTestBase,
             symbolic_checkpoint=symbolic_checkpoint), num_outputs)
 
 
+class GlobalShuffleTest(test_base.DatasetTestBase, parameterized.TestCase):
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testGlobalShuffle(self):
+    dataset = dataset_ops.Dataset.range(100).map(lambda x: x * 2)
+    dataset = dataset.apply(shuffle_ops.global_shuffle(seed=42))
+    shuffled_elements = self.getDatasetOutput(
+        dataset, requires_initialization=True)
+    self.assertNotEqual(list(range(0, 200, 2)), shuffled_elements)
+    self.assertAllEqual(list(range(0, 200, 2)), sorted(shuffled_elements))
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testSameSeed(self):
+    shuffled_elements_1 = self.getDatasetOutput(
+        dataset_ops.Dataset.range(100).apply(
+            shuffle_ops.global_shuffle(seed=42)),
+        requires_initialization=True)
+    shuffled_elements_2 = self.getDatasetOutput(
+        dataset_ops.Dataset.range(100).apply(
+            shuffle_ops.global_shuffle(seed=42)),
+        requires_initialization=True)
+    self.assertEqual(shuffled_elements_1, shuffled_elements_2)
+
+  @combinations.generate(
+      combinations.times(
+          test_base.v2_eager_only_combinations(),
+          combinations.combine(reshuffle_each_iteration=[True, False])))
+  def testReshuffleEachIteration(self, reshuffle_each_iteration):
+    dataset = dataset_ops.Dataset.range(100).apply(
+        shuffle_ops.global_shuffle(
+            seed=42, reshuffle_each_iteration=reshuffle_each_iteration))
+    shuffled_elements_1 = self.getDatasetOutput(dataset)
+    shuffled_elements_2 = self.getDatasetOutput(dataset)
+    if reshuffle_each_iteration:
+      self.assertNotEqual(shuffled_elements_1, shuffled_elements_2)
+      self.assertAllEqual(
+          sorted(shuffled_elements_1), sorted(shuffled_elements_2))
+    else:
+      self.assertAllEqual(shuffled_elements_1, shuffled_elements_2)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testNestedElements(self):
+    dataset = dataset_ops.Dataset.from_tensor_slices(np.arange(40))
+    dataset = dataset_ops.Dataset.zip((dataset, dataset.map(lambda x: -x)))
+    dataset = dataset.batch(4)
+    dataset = dataset.apply(shuffle_ops.global_shuffle(seed=42))
+    shuffled_elements = self.getDatasetOutput(
+        dataset, requires_initialization=True)
+    self.assertLen(shuffled_elements, 10)
+    for positive, negative in shuffled_elements:
+      self.assertAllEqual(positive, -negative)
+      self.assertAllEqual(positive, np.arange(positive[0], positive[0] + 4))
+    self.assertAllEqual(
+        np.arange(40),
+        np.sort(np.concatenate([positive for positive, _ in shuffled_elements
+                               ])))
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testFixedLengthRecords(self):
+    filenames = []
+    for i in range(3):
+      filename = os.path.join(self.get_temp_dir(), f"records.{i}.bin")
+      with open(filename, "wb") as f:
+        f.write(b"".join(b"%03d" % (i * 10 + j) for j in range(10)))
+      filenames.append(filename)
+    # pylint: disable=protected-access
+    dataset = readers._FixedLengthRecordDataset(filenames, record_bytes=3)
+    dataset = dataset.apply(shuffle_ops.global_shuffle(seed=42))
+    shuffled_elements = self.getDatasetOutput(
+        dataset, requires_initialization=True)
+    self.assertAllEqual([b"%03d" % i for i in range(30)],
+                        sorted(shuffled_elements))
+
+  @combinations.generate(test_base.eager_only_combinations())
+  def testUnknownCardinalityEager(self):
+    dataset = dataset_ops.Dataset.range(10).filter(lambda x: x % 2 == 0)
+    with self.assertRaisesRegex(ValueError, "finite, known cardinality"):
+      dataset.apply(shuffle_ops.global_shuffle())
+
+  @combinations.generate(test_base.graph_only_combinations())
+  def testUnknownCardinalityGraph(self):
+    dataset = dataset_ops.Dataset.range(10).filter(lambda x: x % 2 == 0)
+    dataset = dataset.apply(shuffle_ops.global_shuffle())
+    with self.assertRaisesRegex(errors.InvalidArgumentError,
+                                "finite, known cardinality"):
+      self.getDatasetOutput(dataset, requires_initialization=True)
+
+
+class GlobalShuffleCheckpointTest(checkpoint_test_base.CheckpointTestBase,
+                                  parameterized.TestCase):
+
+  def _build_dataset(self,
+                     num_elements,
+                     num_epochs,
+                     reshuffle_each_iteration,
+                     symbolic_checkpoint=None):
+    dataset = dataset_ops.Dataset.range(num_elements)
+    dataset = dataset.apply(
+        shuffle_ops.global_shuffle(
+            seed=42, reshuffle_each_iteration=reshuffle_each_iteration))
+    dataset = dataset.repeat(num_epochs)
+    if symbolic_checkpoint:
+      options = options_lib.Options()
+      options.experimental_symbolic_checkpoint = symbolic_checkpoint
+      dataset = dataset.with_options(options)
+    return dataset
+
+  @combinations.generate(
+      combinations.times(
+          test_base.default_test_combinations(),
+          checkpoint_test_base.default_test_combinations(),
+          combinations.combine(
+              symbolic_checkpoint=[False, True],
+              reshuffle_each_iteration=[False, True])))
+  def test(self, verify_fn, symbolic_checkpoint, reshuffle_each_iteration):
+    num_elements = 20
+    num_epochs = 2
+    # pylint: disable=g-long-lambda
+    verify_fn(
+        self, lambda: self._build_dataset(
+            num_elements=num_elements,
+            num_epochs=num_epochs,
+            reshuffle_each_iteration=reshuffle_each_iteration,
+            symbolic_checkpoint=symbolic_checkpoint), num_elements * num_epochs)
+
+
 if __name__ == "__main__":
   test.main()
@@ -0,0 +1,207 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for `tf.data.experimental.IndexedTFRecordDataset`."""
+import os
+
+from absl.testing import parameterized
+
+from tensorflow.python.data.experimental.ops import random_access
+from tensorflow.python.data.experimental.ops import readers
+from tensorflow.python.data.experimental.ops import writers
+from tensorflow.python.data.kernel_tests import checkpoint_test_base
+from tensorflow.python.data.kernel_tests import test_base
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.data.ops import options as options_lib
+from tensorflow.python.framework import combinations
+from tensorflow.python.framework import errors
+from tensorflow.python.lib.io import tf_record
+from tensorflow.python.platform import test
+from tensorflow.python.util import compat
+
+
+def _record(file_index, record_index):
+  return compat.as_bytes("Record %d of file %d" % (record_index, file_index))
+
+
+class IndexedTFRecordTestBase(test_base.DatasetTestBase):
+  """Base class for tests reading indexed TFRecord files."""
+
+  def setUp(self):
+    super(IndexedTFRecordTestBase, self).setUp()
+    self._num_files = 2
+    self._num_records = 7
+    self._filenames = self._createFiles()
+
+  def _createFiles(self):
+    filenames = []
+    for i in range(self._num_files):
+      filename = os.path.join(self.get_temp_dir(), "tf_record.%d.txt" % i)
+      dataset = dataset_ops.Dataset.from_tensor_slices(
+          [_record(i, j) for j in range(self._num_records)])
+      writer = writers.TFRecordWriter(filename, write_index=True)
+      self.evaluate(writer.write(dataset))
+      filenames.append(filename)
+    return filenames
+
+  def _records(self):
+    return [
+        _record(i, j)
+        for i in range(self._num_files)
+        for j in range(self._num_records)
+    ]
+
+
+class IndexedTFRecordDatasetTest(IndexedTFRecordTestBase,
+                                 parameterized.TestCase):
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testWriteIndex(self):
+    # The written files remain regular TFRecord files.
+    for i, filename in enumerate(self._filenames):
+      self.assertEqual([_record(i, j) for j in range(self._num_records)],
+                       list(tf_record.tf_record_iterator(filename)))
+      self.assertEqual(self._num_records * 8,
+                       os.path.getsize(filename + ".index"))
+
+  @combinations.generate(
+      combinations.times(test_base.default_test_combinations(),
+                         combinations.combine(buffer_size=[None, 0, 1, 100])))
+  def testRead(self, buffer_size):
+    dataset = readers.IndexedTFRecordDataset(
+        self._filenames, buffer_size=buffer_size)
+    self.assertEqual(self._num_files * self._num_records,
+                     self.evaluate(dataset.cardinality()))
+    self.assertDatasetProduces(dataset, expected_output=self._records())
+
+  @combinations.generate(
+      combinations.times(test_base.default_test_combinations(),
+                         combinations.combine(count=[-1, 0, 3, 7, 10, 20])))
+  def testSkip(self, count):
+    dataset = readers.IndexedTFRecordDataset(self._filenames).skip(count)
+    self.assertIsInstance(dataset, readers.IndexedTFRecordDataset)
+    expected = self._records()[count:] if count >= 0 else []
+    self.assertEqual(len(expected), self.evaluate(dataset.cardinality()))
+    self.assertDatasetProduces(dataset, expected_output=expected)
+
+  @combinations.generate(
+      combinations.times(test_base.default_test_combinations(),
+                         combinations.combine(count=[-1, 0, 3, 7, 10, 20])))
+  def testTake(self, count):
+    dataset = readers.IndexedTFRecordDataset(self._filenames).take(count)
+    self.assertIsInstance(dataset, readers.IndexedTFRecordDataset)
+    expected = self._records()[:count] if count >= 0 else self._records()
+    self.assertEqual(len(expected), self.evaluate(dataset.cardinality()))
+    self.assertDatasetProduces(dataset, expected_output=expected)
+
+  @combinations.generate(
+      combinations.times(test_base.default_test_combinations(),
+                         combinations.combine(num_shards=[1, 3, 20])))
+  def testShard(self, num_shards):
+    for index in range(num_shards):
+      dataset = readers.IndexedTFRecordDataset(self._filenames)
+      dataset = dataset.shard(num_shards, index)
+      self.assertIsInstance(dataset, readers.IndexedTFRecordDataset)
+      self.assertDatasetProduces(
+          dataset, expected_output=self._records()[index::num_shards])
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testComposedSeeks(self):
+    dataset = readers.IndexedTFRecordDataset(self._filenames)
+    dataset = dataset.skip(1).shard(2, 1).take(4).skip(1)
+    self.assertIsInstance(dataset, readers.IndexedTFRecordDataset)
+    self.assertDatasetProduces(
+        dataset, expected_output=self._records()[1:][1::2][:4][1:])
+
+  @combinations.generate(
+      combinations.times(
+          test_base.default_test_combinations(),
+          combinations.combine(num_parallel_reads=[1, 2, 3, 20])))
+  def testParallelReads(self, num_parallel_reads):
+    dataset = readers.IndexedTFRecordDataset(
+        self._filenames, num_parallel_reads=num_parallel_reads)
+    self.assertDatasetProduces(
+        dataset, expected_output=self._records(), assert_items_equal=True)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testParallelReadsOrder(self):
+    dataset = readers.IndexedTFRecordDataset(
+        self._filenames, num_parallel_reads=3)
+    # The 14 records are split into the ranges [0, 5), [5, 10) and [10, 14),
+    # whose records are interleaved.
+    records = self._records()
+    expected = []
+    for i in range(5):
+      expected.extend(records[start + i]
+                      for start in (0, 5, 10)
+                      if start + i < len(records))
+    self.assertDatasetProduces(dataset, expected_output=expected)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testRandomAccess(self):
+    dataset = readers.IndexedTFRecordDataset(self._filenames).shard(3, 1)
+    expected = self._records()[1::3]
+    for i in reversed(range(len(expected))):
+      self.assertEqual(expected[i],
+                       self.evaluate(random_access.at(dataset, i)))
+    with self.assertRaises(errors.OutOfRangeError):
+      self.evaluate(random_access.at(dataset, len(expected)))
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testMissingIndex(self):
+    filename = os.path.join(self.get_temp_dir(), "no_index.txt")
+    writer = writers.TFRecordWriter(filename)
+    self.evaluate(writer.write(dataset_ops.Dataset.from_tensors(b"record")))
+    with self.assertRaisesRegex(errors.NotFoundError, "write_index=True"):
+      dataset = readers.IndexedTFRecordDataset(filename)
+      self.evaluate(dataset.cardinality())
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testWriteIndexWithCompression(self):
+    with self.assertRaisesRegex(ValueError, "can not be written"):
+      writers.TFRecordWriter(
+          self._filenames[0], compression_type="GZIP", write_index=True)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testInvalidNumParallelReads(self):
+    with self.assertRaisesRegex(ValueError, "must be a positive integer"):
+      readers.IndexedTFRecordDataset(self._filenames, num_parallel_reads=0)
+
+
+class IndexedTFRecordDatasetCheckpointTest(
+    IndexedTFRecordTestBase, checkpoint_test_base.CheckpointTestBase,
+    parameterized.TestCase):
+
+  def _build_dataset(self, num_shards, symbolic_checkpoint):
+    dataset = readers.IndexedTFRecordDataset(self._filenames, buffer_size=10)
+    dataset = dataset.shard(num_shards, 0)
+    options = options_lib.Options()
+    options.experimental_symbolic_checkpoint = symbolic_checkpoint
+    return dataset.with_options(options)
+
+  @combinations.generate(
+      combinations.times(
+          test_base.default_test_combinations(),
+          checkpoint_test_base.default_test_combinations(),
+          combinations.combine(
+              num_shards=[1, 2], symbolic_checkpoint=[False, True])))
+  def test(self, verify_fn, num_shards, symbolic_checkpoint):
+    num_outputs = len(self._records()[::num_shards])
+    verify_fn(
+        self, lambda: self._build_dataset(num_shards, symbolic_checkpoint),
+        num_outputs)
+
+
+if __name__ == "__main__":
+  test.main()
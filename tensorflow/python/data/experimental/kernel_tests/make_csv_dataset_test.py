@@ -14,6 +14,7 @@
 # ==============================================================================
 """Tests for `tf.data.experimental.make_csv_dataset()`."""
 import gzip
+import json
 import os
 import zlib
 
@@ -788,6 +789,95 @@ class MakeCsvDatasetTest(test_base.DatasetTestBase, parameterized.TestCase):
 
     self.assertEqual(result, sorted(result))
 
+  @combinations.generate(
+      combinations.times(
+          test_base.default_test_combinations(),
+          combinations.combine(
+              compression_type=[None, "GZIP"],
+              select_columns=[None, ["col1", "col3"]],
+              label_name=[None, "col1"])))
+  def testVectorizedParsing(self, compression_type, select_columns,
+                            label_name):
+    column_names = ["col%d" % i for i in range(4)]
+    inputs = [[
+        ",".join(column_names), "0,1.5,a,3", "4,5.5,\"b,c\",7", "8,,d,11"
+    ], [",".join(column_names), "12,13.5,e,15"]]
+    expected_output = [[0, 1.5, b"a", 3], [4, 5.5, b"b,c", 7],
+                       [8, 0.0, b"d", 11], [12, 13.5, b"e", 15]]
+    expected_keys = column_names
+    if select_columns is not None:
+      expected_output = [[row[1], row[3]] for row in expected_output]
+      expected_keys = select_columns
+    self._test_dataset(
+        inputs,
+        expected_output=expected_output,
+        expected_keys=expected_keys,
+        label_name=label_name,
+        batch_size=3,
+        num_epochs=2,
+        shuffle=False,
+        select_columns=select_columns,
+        compression_type=compression_type,
+        vectorized_parsing=True)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testVectorizedParsingSkipsEmptyLines(self):
+    column_names = ["col0", "col1"]
+    inputs = [[",".join(column_names), "0,a", "", "1,b", "", "2,c", ""]]
+    self._test_dataset(
+        inputs,
+        expected_output=[[0, b"a"], [1, b"b"], [2, b"c"]],
+        expected_keys=column_names,
+        column_defaults=[
+            constant_op.constant([], dtypes.int32),
+            constant_op.constant([], dtypes.string)
+        ],
+        batch_size=2,
+        num_epochs=1,
+        shuffle=False,
+        vectorized_parsing=True)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testVectorizedParsingWithIgnoreErrors(self):
+    filenames = self._setup_files([["col0", "0"]])
+    with self.assertRaisesRegex(ValueError, "not supported"):
+      self._make_csv_dataset(
+          filenames,
+          batch_size=1,
+          vectorized_parsing=True,
+          ignore_errors=True)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testSchemaCache(self):
+    schema_cache_dir = os.path.join(self.get_temp_dir(), "schema_cache")
+    filenames = self._setup_files([["col0,col1", "0,a", "1,b"]])
+
+    def get_output_types():
+      dataset = self._make_csv_dataset(
+          filenames, batch_size=1, schema_cache_dir=schema_cache_dir)
+      return [
+          spec.dtype for spec in dataset_ops.get_structure(dataset).values()
+      ]
+
+    self.assertEqual([dtypes.int32, dtypes.string], get_output_types())
+    cache_files = os.listdir(schema_cache_dir)
+    self.assertLen(cache_files, 1)
+
+    # Later datasets use the cached schema instead of reading the files.
+    cache_file = os.path.join(schema_cache_dir, cache_files[0])
+    with open(cache_file, "r") as f:
+      schema = json.load(f)
+    self.assertEqual(["col0", "col1"], schema["column_names"])
+    schema["column_types"] = ["int64", "string"]
+    with open(cache_file, "w") as f:
+      json.dump(schema, f)
+    self.assertEqual([dtypes.int64, dtypes.string], get_output_types())
+
+    # Changing a file invalidates its cached schema.
+    filenames = self._setup_files([["col0,col1", "0.5,a", "1,b"]])
+    self.assertEqual([dtypes.float32, dtypes.string], get_output_types())
+    self.assertLen(os.listdir(schema_cache_dir), 2)
+
 
 if __name__ == "__main__":
   test.main()
@@ -0,0 +1,125 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for `tf.data.experimental.get_pipeline_stats()`."""
+import json
+import time
+
+from absl.testing import parameterized
+
+from tensorflow.python.data.experimental.ops import pipeline_stats
+from tensorflow.python.data.kernel_tests import test_base
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.data.ops import options as options_lib
+from tensorflow.python.framework import combinations
+from tensorflow.python.platform import test
+
+
+class PipelineStatsTest(test_base.DatasetTestBase, parameterized.TestCase):
+
+  def _dataset(self):
+    dataset = dataset_ops.Dataset.range(100)
+    dataset = dataset.map(
+        lambda x: x * 2, num_parallel_calls=dataset_ops.AUTOTUNE)
+    dataset = dataset.batch(10)
+    return dataset.prefetch(2)
+
+  @combinations.generate(test_base.eager_only_combinations())
+  def testTransformationStats(self):
+    iterator = iter(self._dataset())
+    for _ in range(5):
+      next(iterator)
+    stats = pipeline_stats.get_pipeline_stats(iterator)
+    names = [t.name for t in stats.transformations]
+    for expected in ["Prefetch", "BatchV2", "ParallelMapV2", "Range"]:
+      self.assertTrue(
+          any(name.startswith(expected) for name in names),
+          f"{expected} not found in {names}")
+    by_id = {t.id: t for t in stats.transformations}
+    for t in stats.transformations:
+      for input_id in t.inputs:
+        self.assertIn(input_id, by_id)
+      if t.name.startswith("BatchV2"):
+        self.assertGreaterEqual(t.num_elements, 5)
+      if t.name.startswith("ParallelMapV2"):
+        self.assertIn("parallelism", t.parameters)
+        self.assertGreater(t.produce_latency_ns, 0)
+
+  @combinations.generate(test_base.eager_only_combinations())
+  def testAutotuneDisabled(self):
+    options = options_lib.Options()
+    options.autotune.enabled = False
+    iterator = iter(self._dataset().with_options(options))
+    next(iterator)
+    stats = pipeline_stats.get_pipeline_stats(iterator)
+    self.assertEmpty(stats.transformations)
+    self.assertEmpty(stats.consumer_gap_times_us)
+
+  @combinations.generate(test_base.eager_only_combinations())
+  def testHostWideAutotune(self):
+    options = options_lib.Options()
+    options.autotune.host_wide = True
+    options.autotune.cpu_budget = 4
+    dataset = self._dataset().repeat().with_options(options)
+    iterators = [iter(dataset), iter(dataset)]
+    # Waits for the first optimization.
+    for _ in range(1000):
+      for iterator in iterators:
+        next(iterator)
+      stats = pipeline_stats.get_pipeline_stats(iterators[0])
+      if stats.autotune is not None:
+        break
+      time.sleep(0.01)
+    self.assertIsNotNone(stats.autotune)
+    self.assertTrue(stats.autotune.host_wide)
+    self.assertEqual("HILL_CLIMB", stats.autotune.algorithm)
+    self.assertEqual(4, stats.autotune.host_cpu_budget)
+    self.assertBetween(stats.autotune.cpu_budget, 1, 4)
+    self.assertGreaterEqual(stats.autotune.host_num_pipelines, 1)
+    self.assertGreater(stats.autotune.ram_budget, 0)
+
+  @combinations.generate(test_base.eager_only_combinations())
+  def testInvalidIterator(self):
+    with self.assertRaisesRegex(TypeError, "must be an iterator"):
+      pipeline_stats.get_pipeline_stats(iter([1, 2, 3]))
+
+  @combinations.generate(test_base.eager_only_combinations())
+  def testProfiler(self):
+    iterator = iter(self._dataset())
+    with pipeline_stats.PipelineProfiler(
+        iterator, interval_secs=0.01) as profiler:
+      for _ in iterator:
+        pass
+    latest = profiler.latest()
+    self.assertNotEmpty(latest.transformations)
+    self.assertNotEmpty(latest.consumer_gap_times_us)
+    histograms = profiler.latency_histograms()
+    for t in latest.transformations:
+      self.assertEqual(t.num_elements,
+                       sum(count for _, count in histograms.get(t.id, [])))
+    self.assertLen(latest.consumer_gap_times_us,
+                   sum(count for _, count in
+                       profiler.consumer_latency_histogram()))
+    trace = json.loads(profiler.to_chrome_trace())
+    self.assertNotEmpty(trace["traceEvents"])
+    self.assertEqual("C", trace["traceEvents"][0]["ph"])
+
+  @combinations.generate(test_base.eager_only_combinations())
+  def testInvalidInterval(self):
+    with self.assertRaisesRegex(ValueError, "must be positive"):
+      pipeline_stats.PipelineProfiler(iter(self._dataset()), interval_secs=0)
+
+
+if __name__ == "__main__":
+  test.main()
@@ -0,0 +1,139 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for `tf.data.experimental.service.LocalServiceCluster`."""
+import glob
+import os
+
+from absl.testing import parameterized
+
+from tensorflow.python.data.experimental.ops import data_service_ops
+from tensorflow.python.data.experimental.service import server_lib
+from tensorflow.python.data.kernel_tests import test_base
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.framework import combinations
+from tensorflow.python.platform import test
+
+
+class LocalServiceClusterTest(test_base.DatasetTestBase,
+                              parameterized.TestCase):
+
+  def _distribute(self, dataset, cluster, data_transfer_protocol="shm",
+                  **kwargs):
+    return dataset.apply(
+        data_service_ops.distribute(
+            service=cluster.target,
+            data_transfer_protocol=data_transfer_protocol,
+            **kwargs))
+
+  @combinations.generate(
+      combinations.times(
+          test_base.default_test_combinations(),
+          combinations.combine(
+              num_workers=[1, 3], data_transfer_protocol=["shm", "grpc"])))
+  def testRead(self, num_workers, data_transfer_protocol):
+    cluster = server_lib.LocalServiceCluster(
+        num_workers=num_workers, data_transfer_protocol=data_transfer_protocol)
+    self.assertEqual(num_workers, cluster.num_workers)
+    dataset = self._distribute(
+        dataset_ops.Dataset.range(10),
+        cluster,
+        data_transfer_protocol=data_transfer_protocol,
+        processing_mode=data_service_ops.ShardingPolicy.OFF)
+    self.assertDatasetProduces(
+        dataset, num_workers * list(range(10)), assert_items_equal=True)
+
+  @combinations.generate(
+      combinations.times(
+          test_base.default_test_combinations(),
+          combinations.combine(compression=[None, "AUTO"])))
+  def testReadStrings(self, compression):
+    cluster = server_lib.LocalServiceCluster(num_workers=1)
+    elements = [b"a" * i for i in range(10)]
+    dataset = self._distribute(
+        dataset_ops.Dataset.from_tensor_slices(elements),
+        cluster,
+        processing_mode=data_service_ops.ShardingPolicy.OFF,
+        compression=compression)
+    self.assertDatasetProduces(dataset, elements)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testSharedJob(self):
+    cluster = server_lib.LocalServiceCluster(num_workers=2)
+    datasets = [
+        self._distribute(
+            dataset_ops.Dataset.range(100),
+            cluster,
+            processing_mode=data_service_ops.ShardingPolicy.DYNAMIC,
+            job_name="shared_job") for _ in range(2)
+    ]
+    results = []
+    for dataset in datasets:
+      results.extend(self.getDatasetOutput(dataset))
+    self.assertCountEqual(list(range(100)), results)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testAddAndRemoveWorkers(self):
+    cluster = server_lib.LocalServiceCluster(num_workers=0)
+    self.assertEqual(0, cluster.num_workers)
+    addresses = [cluster.add_worker(), cluster.add_worker()]
+    # pylint: disable=protected-access
+    self.assertCountEqual(addresses, cluster._worker_addresses())
+    self.assertEqual(2, cluster._dispatcher._num_workers())
+    # pylint: enable=protected-access
+    dataset = self._distribute(
+        dataset_ops.Dataset.range(10),
+        cluster,
+        processing_mode=data_service_ops.ShardingPolicy.OFF)
+    self.assertDatasetProduces(
+        dataset, 2 * list(range(10)), assert_items_equal=True)
+
+    cluster.remove_worker()
+    self.assertEqual(1, cluster.num_workers)
+    cluster.remove_worker()
+    with self.assertRaisesRegex(ValueError, "no workers to remove"):
+      cluster.remove_worker()
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testStop(self):
+    cluster = server_lib.LocalServiceCluster(num_workers=2)
+    cluster.stop()
+    self.assertEqual(0, cluster.num_workers)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testStopDeletesElementFiles(self):
+    if not os.path.isdir("/dev/shm"):
+      self.skipTest("The workers only write element files to /dev/shm.")
+    pattern = os.path.join("/dev/shm", "tf_data_service_element_*")
+    existing_files = set(glob.glob(pattern))
+    cluster = server_lib.LocalServiceCluster(num_workers=2)
+    dataset = self._distribute(
+        dataset_ops.Dataset.range(1000),
+        cluster,
+        processing_mode=data_service_ops.ShardingPolicy.OFF)
+    get_next = self.getNext(dataset)
+    # The trainer prefetches elements, which are written to files before they
+    # are read.
+    self.evaluate(get_next())
+    cluster.stop()
+    self.assertEmpty(set(glob.glob(pattern)) - existing_files)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testInvalidNumWorkers(self):
+    with self.assertRaisesRegex(ValueError, "must be a non-negative integer"):
+      server_lib.LocalServiceCluster(num_workers=-1)
+
+
+if __name__ == "__main__":
+  test.main()
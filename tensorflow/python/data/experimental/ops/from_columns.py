@@ -0,0 +1,185 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Python API for creating a dataset from in-memory columns."""
+
+import collections
+
+import numpy as np
+
+from tensorflow.python.data.experimental.ops import cardinality
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import tensor_shape
+from tensorflow.python.ops import script_ops
+from tensorflow.python.util.tf_export import tf_export
+
+# Number of rows fetched from the columns at a time when the dataset produces
+# individual rows. Fetching chunks amortizes the Python call overhead over many
+# rows.
+_ROWS_PER_CHUNK = 1024
+
+
+class _ColumnSlicer(object):
+  """Returns views of a range of rows of a set of columns."""
+
+  def __init__(self, columns, rows_per_slice):
+    self._columns = columns
+    self._rows_per_slice = rows_per_slice
+
+  def __call__(self, index):
+    start = int(index) * self._rows_per_slice
+    stop = start + self._rows_per_slice
+    # Basic slicing returns views, so no row data is copied here. The runtime
+    # then wraps the (suitably aligned) views without copying them either.
+    return [column[start:stop] for column in self._columns]
+
+
+def _as_column(name, buffer):
+  """Converts `buffer` to an array without copying its contents."""
+  try:
+    column = np.asarray(buffer)
+  except Exception as e:  # pylint: disable=broad-except
+    raise TypeError(f"Invalid column `{name}`. Columns must be NumPy arrays or "
+                    f"objects supporting the buffer protocol, but got "
+                    f"{type(buffer)}.") from e
+  if column.dtype.kind not in "biuf":
+    raise TypeError(f"Invalid column `{name}`. Columns must have a numeric or "
+                    f"boolean dtype, but got {column.dtype}.")
+  if not column.ndim:
+    raise ValueError(f"Invalid column `{name}`. Columns must have at least one "
+                     f"dimension.")
+  return column
+
+
+@tf_export("data.experimental.from_columns")
+def from_columns(columns,
+                 select_columns=None,
+                 batch_size=None,
+                 drop_remainder=False,
+                 name=None):
+  """Creates a `Dataset` from columns of data held in host memory.
+
+  Unlike `tf.data.Dataset.from_tensor_slices`, which embeds a copy of its input
+  in the dataset graph, `from_columns` only keeps references to the column
+  buffers. Rows (or batches of rows) are sliced out of the buffers lazily, as
+  the dataset produces its elements, so large in-memory or memory-mapped tables
+  are neither copied up front nor serialized with the dataset.
+
+  >>> columns = {"x": np.arange(6), "y": np.arange(6) * 10.0}
+  >>> dataset = tf.data.experimental.from_columns(columns, batch_size=4)
+  >>> for element in dataset.as_numpy_iterator():
+  ...   print(element["x"], element["y"])
+  [0 1 2 3] [ 0. 10. 20. 30.]
+  [4 5] [40. 50.]
+
+  Each column can be a NumPy array, a `numpy.memmap` (e.g. as returned by
+  `np.load(path, mmap_mode="r")`) or any object supporting the buffer
+  protocol, such as a `memoryview`. The first dimension of every column
+  indexes the rows of the table. Only the columns named in `select_columns`
+  are accessed, which makes it cheap to project wide tables:
+
+  >>> dataset = tf.data.experimental.from_columns(columns, select_columns=["y"])
+  >>> list(dataset.take(2).as_numpy_iterator())
+  [{'y': 0.0}, {'y': 10.0}]
+
+  Producing whole batches is considerably faster than producing individual
+  rows and batching them afterwards, because batches are contiguous slices of
+  the columns. Batches are handed to the runtime without copying whenever the
+  slice is suitably aligned.
+
+  NOTE: The resulting dataset reads the columns through `tf.numpy_function`
+  and inherits its constraints. In particular, the columns must remain alive
+  and unmodified while the dataset is in use, and the dataset can not be
+  serialized or processed remotely (e.g. by the tf.data service).
+
+  Args:
+    columns: A dictionary mapping column names to column buffers. All columns
+      must have the same number of rows and a numeric or boolean dtype.
+    select_columns: (Optional.) A list of the names of the columns to produce.
+      Defaults to all columns.
+    batch_size: (Optional.) If set, the dataset produces batches of
+      `batch_size` consecutive rows instead of individual rows.
+    drop_remainder: (Optional.) Whether the last batch should be dropped in
+      case it has fewer than `batch_size` rows. Ignored if `batch_size` is not
+      set.
+    name: (Optional.) A name for the tf.data operation.
+
+  Returns:
+    Dataset: A `Dataset` whose elements are dictionaries mapping the selected
+    column names to rows (or batches of rows).
+
+  Raises:
+    TypeError: If `columns` is not a dictionary or a column is not a numeric
+      buffer.
+    ValueError: If `columns` is empty, a selected column does not exist, the
+      columns have different numbers of rows, or `batch_size` is not positive.
+  """
+  if not isinstance(columns, collections.abc.Mapping):
+    raise TypeError(f"Invalid `columns`. `columns` must be a dictionary "
+                    f"mapping column names to buffers, but got "
+                    f"{type(columns)}.")
+  if select_columns is None:
+    select_columns = list(columns)
+  if not select_columns:
+    raise ValueError("Invalid `columns`. At least one column must be "
+                     "selected.")
+  for column_name in select_columns:
+    if column_name not in columns:
+      raise ValueError(f"Invalid `select_columns`. Column `{column_name}` does "
+                       f"not exist. Available columns: {list(columns)}.")
+  if batch_size is not None and batch_size < 1:
+    raise ValueError(f"Invalid `batch_size`. `batch_size` must be a positive "
+                     f"integer, but got {batch_size}.")
+
+  # Components are produced in the order in which `nest` flattens the output
+  # dictionary.
+  names = sorted(select_columns)
+  arrays = [_as_column(column_name, columns[column_name])
+            for column_name in names]
+  num_rows = arrays[0].shape[0]
+  for column_name, array in zip(names[1:], arrays[1:]):
+    if array.shape[0] != num_rows:
+      raise ValueError(f"Invalid `columns`. All columns must have the same "
+                       f"number of rows, but column `{names[0]}` has "
+                       f"{num_rows} rows and column `{column_name}` has "
+                       f"{array.shape[0]} rows.")
+
+  rows_per_slice = batch_size if batch_size is not None else _ROWS_PER_CHUNK
+  if batch_size is not None and drop_remainder:
+    num_slices = num_rows // rows_per_slice
+    slice_dim = batch_size
+  else:
+    num_slices = -(-num_rows // rows_per_slice)
+    slice_dim = None
+  output_types = [dtypes.as_dtype(array.dtype) for array in arrays]
+  output_shapes = [
+      tensor_shape.TensorShape([slice_dim] + list(array.shape[1:]))
+      for array in arrays
+  ]
+  slicer = _ColumnSlicer(arrays, rows_per_slice)
+
+  def slice_fn(index):
+    values = script_ops.numpy_function(slicer, [index], output_types)
+    for value, shape in zip(values, output_shapes):
+      value.set_shape(shape)
+    return dict(zip(names, values))
+
+  dataset = dataset_ops.Dataset.range(num_slices, name=name)
+  dataset = dataset.map(slice_fn, name=name)
+  if batch_size is None:
+    dataset = dataset.unbatch(name=name)
+    # `unbatch` can not infer the number of rows.
+    dataset = dataset.apply(cardinality.assert_cardinality(num_rows))
+  return dataset
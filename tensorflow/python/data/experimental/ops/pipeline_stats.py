@@ -0,0 +1,416 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Python API for inspecting the performance of an input pipeline."""
+
+import bisect
+import collections
+import json
+import threading
+import time
+
+from tensorflow.core.framework import model_pb2
+from tensorflow.python.data.ops import iterator_ops
+from tensorflow.python.eager import context
+from tensorflow.python.ops import gen_dataset_ops
+from tensorflow.python.profiler import trace
+from tensorflow.python.util.tf_export import tf_export
+
+# Upper bounds, in microseconds, of the latency histogram buckets. The last
+# bucket is unbounded.
+LATENCY_BUCKETS_US = tuple(2**i for i in range(24))
+
+# Number of samples kept by `PipelineProfiler` for trace export.
+_MAX_SAMPLES = 1024
+
+_NANOS_PER_MICRO = 1000
+
+
+class TransformationStats(
+    collections.namedtuple("TransformationStats", [
+        "id", "name", "inputs", "num_elements", "processing_time_ns",
+        "input_time_ns", "bytes_produced", "bytes_consumed",
+        "buffered_elements", "buffered_bytes", "parameters"
+    ])):
+  """Statistics of a single transformation of an input pipeline.
+
+  Attributes:
+    id: An identifier of the transformation, unique within the pipeline.
+    name: The name of the transformation, e.g. `ParallelMapV2`.
+    inputs: The `id`s of the inputs of the transformation.
+    num_elements: The number of elements produced so far.
+    processing_time_ns: The aggregate time spent in the transformation itself,
+      excluding the time spent in its inputs.
+    input_time_ns: The average time the inputs of the transformation took to
+      produce an element, or 0 if it is not known yet.
+    bytes_produced: The number of bytes produced so far.
+    bytes_consumed: The number of bytes consumed so far.
+    buffered_elements: The number of elements currently buffered.
+    buffered_bytes: The number of bytes currently buffered.
+    parameters: A dictionary mapping the names of the tunable parameters of the
+      transformation (e.g. `parallelism` or `buffer_size`) to their values.
+  """
+  __slots__ = ()
+
+  @property
+  def produce_latency_ns(self):
+    """The average time spent in the transformation per produced element."""
+    if not self.num_elements:
+      return 0.0
+    return self.processing_time_ns / self.num_elements
+
+  @property
+  def bytes_per_element(self):
+    """The average size of a produced element."""
+    if not self.num_elements:
+      return 0.0
+    return self.bytes_produced / self.num_elements
+
+
+class AutotuneStats(
+    collections.namedtuple("AutotuneStats", [
+        "algorithm", "cpu_budget", "ram_budget", "target_time_ns",
+        "host_wide", "host_cpu_budget", "host_ram_budget", "host_num_pipelines",
+        "cpu_demand", "host_cpu_demand"
+    ])):
+  """The resource model used by the latest autotuning optimization.
+
+  The values of the tuned parameters are reported by the `parameters` of
+  `TransformationStats`.
+
+  Attributes:
+    algorithm: The name of the autotuning algorithm, e.g. `HILL_CLIMB`.
+    cpu_budget: The number of logical threads the pipeline was tuned for.
+    ram_budget: The number of bytes the buffers of the pipeline were tuned for.
+    target_time_ns: The target time between produced elements, measured from
+      the consumer of the pipeline, or 0 if the algorithm does not use one.
+    host_wide: Whether the budgets are the share of the pipeline of budgets
+      shared by the pipelines of the process (see
+      `tf.data.experimental.AutotuneOptions.host_wide`). The following
+      attributes are only set if `host_wide` is `True`.
+    host_cpu_budget: The number of logical threads shared by the pipelines.
+    host_ram_budget: The number of bytes shared by the pipelines.
+    host_num_pipelines: The number of pipelines sharing the budgets.
+    cpu_demand: The number of logical threads the pipeline needs to produce
+      elements as fast as they are consumed, or 0 if it is not known yet.
+    host_cpu_demand: The sum of the known CPU demands of the pipelines sharing
+      the budgets.
+  """
+  __slots__ = ()
+
+
+class PipelineStats(
+    collections.namedtuple(
+        "PipelineStats",
+        ["transformations", "consumer_gap_times_us", "autotune"])):
+  """Statistics of an input pipeline.
+
+  Attributes:
+    transformations: A list of `TransformationStats`, ordered from the output
+      of the pipeline towards its sources.
+    consumer_gap_times_us: The recent times between consecutive `GetNext`
+      calls of the consumer of the pipeline, in microseconds.
+    autotune: An `AutotuneStats` describing the latest autotuning
+      optimization, or `None` if no optimization has run yet.
+  """
+  __slots__ = ()
+
+
+def _parse_model(serialized):
+  """Converts a serialized `ModelProto` to `PipelineStats`."""
+  model = model_pb2.ModelProto()
+  model.ParseFromString(serialized)
+  transformations = []
+  if model.nodes:
+    # Visit the nodes breadth-first from the output of the pipeline.
+    queue = collections.deque([model.output])
+    visited = set()
+    while queue:
+      node_id = queue.popleft()
+      if node_id in visited or node_id not in model.nodes:
+        continue
+      visited.add(node_id)
+      node = model.nodes[node_id]
+      input_time_ns = 0.0
+      if node.input_processing_time_count:
+        input_time_ns = (
+            node.input_processing_time_sum / node.input_processing_time_count)
+      transformations.append(
+          TransformationStats(
+              id=node.id,
+              name=node.name,
+              inputs=list(node.inputs),
+              num_elements=node.num_elements,
+              processing_time_ns=node.processing_time,
+              input_time_ns=input_time_ns,
+              bytes_produced=node.bytes_produced,
+              bytes_consumed=node.bytes_consumed,
+              buffered_elements=node.buffered_elements,
+              buffered_bytes=node.buffered_bytes,
+              parameters={p.name: p.state_value for p in node.parameters}))
+      queue.extend(node.inputs)
+  autotune = None
+  if model.HasField("optimization_params"):
+    params = model.optimization_params
+    host_wide = params.HasField("host_wide_budget")
+    budget = params.host_wide_budget
+    autotune = AutotuneStats(
+        algorithm=model_pb2.AutotuneAlgorithm.Name(params.algorithm),
+        cpu_budget=params.cpu_budget,
+        ram_budget=params.ram_budget,
+        target_time_ns=params.model_input_time,
+        host_wide=host_wide,
+        host_cpu_budget=budget.cpu_budget,
+        host_ram_budget=budget.ram_budget,
+        host_num_pipelines=budget.num_models,
+        cpu_demand=budget.cpu_demand,
+        host_cpu_demand=budget.total_cpu_demand)
+  return PipelineStats(
+      transformations=transformations,
+      consumer_gap_times_us=list(model.gap_times),
+      autotune=autotune)
+
+
+@tf_export("data.experimental.get_pipeline_stats", v1=[])
+def get_pipeline_stats(iterator):
+  """Returns the current statistics of the input pipeline of `iterator`.
+
+  The statistics are collected by the tf.data runtime for every transformation
+  of the pipeline while autotuning is enabled (the default), so reading them
+  does not slow down the pipeline.
+
+  >>> dataset = tf.data.Dataset.range(10).map(lambda x: x * 2).batch(2)
+  >>> iterator = iter(dataset)
+  >>> _ = next(iterator)
+  >>> stats = tf.data.experimental.get_pipeline_stats(iterator)
+  >>> stats.transformations[0].num_elements > 0
+  True
+
+  The statistics are empty if autotuning is disabled through
+  `tf.data.Options.autotune`.
+
+  Args:
+    iterator: An iterator created by iterating over a `tf.data.Dataset` in
+      eager mode.
+
+  Returns:
+    A `PipelineStats` named tuple holding a list of per-transformation
+    statistics (ordered from the output of the pipeline towards its sources),
+    the recent gap times of the consumer and the resource model of the latest
+    autotuning optimization.
+
+  Raises:
+    TypeError: If `iterator` is not a `tf.data` iterator.
+    RuntimeError: If not executing eagerly.
+  """
+  if not isinstance(iterator, iterator_ops.OwnedIterator):
+    raise TypeError(f"`iterator` must be an iterator created from a "
+                    f"`tf.data.Dataset`, but got {type(iterator)}.")
+  if not context.executing_eagerly():
+    raise RuntimeError("`get_pipeline_stats` is only supported in eager mode.")
+  serialized = gen_dataset_ops.iterator_get_model_proto(
+      iterator._iterator_resource)  # pylint: disable=protected-access
+  return _parse_model(serialized.numpy())
+
+
+class _Histogram(object):
+  """A histogram over `LATENCY_BUCKETS_US`."""
+
+  def __init__(self):
+    self.counts = [0] * (len(LATENCY_BUCKETS_US) + 1)
+
+  def add(self, value_us, count=1):
+    self.counts[bisect.bisect_left(LATENCY_BUCKETS_US, value_us)] += count
+
+  def buckets(self):
+    bounds = list(LATENCY_BUCKETS_US) + [float("inf")]
+    return list(zip(bounds, self.counts))
+
+
+@tf_export("data.experimental.PipelineProfiler", v1=[])
+class PipelineProfiler(object):
+  """Periodically samples the statistics of an input pipeline.
+
+  The profiler reads the statistics maintained by the tf.data runtime (see
+  `tf.data.experimental.get_pipeline_stats`) from a background thread and
+  aggregates them into per-transformation latency histograms. Each sample
+  costs a single, cheap op invocation, which makes the profiler suitable to be
+  left on in production.
+
+  ```python
+  iterator = iter(dataset)
+  with tf.data.experimental.PipelineProfiler(iterator) as profiler:
+    for element in iterator:
+      train_step(element)
+  for t in profiler.latest().transformations:
+    print(t.name, t.produce_latency_ns, t.buffered_elements)
+  ```
+
+  While the TensorFlow profiler is running (see
+  `tf.profiler.experimental.start`), every sample is also recorded as a set of
+  trace events named `tf.data/<transformation>`, so that the statistics show
+  up next to the rest of the trace. `to_chrome_trace` exports the collected
+  samples as counter events in the Chrome trace event format.
+  """
+
+  def __init__(self, iterator, interval_secs=1.0):
+    """Creates a profiler for the input pipeline of `iterator`.
+
+    Args:
+      iterator: An iterator created by iterating over a `tf.data.Dataset` in
+        eager mode.
+      interval_secs: (Optional.) The interval between two samples.
+
+    Raises:
+      ValueError: If `interval_secs` is not positive.
+    """
+    if interval_secs <= 0:
+      raise ValueError(f"`interval_secs` must be positive, but got "
+                       f"{interval_secs}.")
+    self._iterator = iterator
+    self._interval_secs = interval_secs
+    self._lock = threading.Lock()
+    self._samples = collections.deque(maxlen=_MAX_SAMPLES)
+    self._histograms = collections.defaultdict(_Histogram)
+    self._previous = {}
+    self._stop_event = threading.Event()
+    self._thread = None
+
+  def start(self):
+    """Starts sampling in a background thread."""
+    if self._thread is not None:
+      return
+    self._stop_event.clear()
+    self._thread = threading.Thread(target=self._run, daemon=True)
+    self._thread.start()
+
+  def stop(self):
+    """Stops sampling and takes a final sample."""
+    if self._thread is None:
+      return
+    self._stop_event.set()
+    self._thread.join()
+    self._thread = None
+    self.sample()
+
+  def __enter__(self):
+    self.start()
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.stop()
+
+  def _run(self):
+    with context.eager_mode():
+      while not self._stop_event.wait(self._interval_secs):
+        self.sample()
+
+  def sample(self):
+    """Takes a sample of the pipeline statistics.
+
+    Returns:
+      The sampled `PipelineStats`.
+    """
+    stats = get_pipeline_stats(self._iterator)
+    timestamp_us = time.time() * 1e6
+    with self._lock:
+      for t in stats.transformations:
+        previous = self._previous.get(t.id)
+        num_elements, processing_time_ns = t.num_elements, t.processing_time_ns
+        if previous is not None:
+          num_elements -= previous.num_elements
+          processing_time_ns -= previous.processing_time_ns
+        if num_elements > 0:
+          self._histograms[t.id].add(
+              processing_time_ns / num_elements / _NANOS_PER_MICRO,
+              num_elements)
+        self._previous[t.id] = t
+      self._samples.append((timestamp_us, stats))
+    if trace.enabled:
+      for t in stats.transformations:
+        with trace.Trace(
+            f"tf.data/{t.name}",
+            id=t.id,
+            num_elements=t.num_elements,
+            produce_latency_ns=int(t.produce_latency_ns),
+            input_time_ns=int(t.input_time_ns),
+            buffered_elements=t.buffered_elements,
+            buffered_bytes=t.buffered_bytes,
+            bytes_per_element=int(t.bytes_per_element)):
+          pass
+    return stats
+
+  def latest(self):
+    """Returns the most recent `PipelineStats`, or `None` if not sampled yet."""
+    with self._lock:
+      if not self._samples:
+        return None
+      return self._samples[-1][1]
+
+  def latency_histograms(self):
+    """Returns the per-element latency histogram of each transformation.
+
+    Each sampling interval contributes the average time the transformation
+    spent per element produced during the interval, weighted by the number of
+    elements.
+
+    Returns:
+      A dictionary mapping transformation ids to lists of
+      `(upper_bound_us, count)` pairs. The last bucket is unbounded.
+    """
+    with self._lock:
+      return {
+          node_id: histogram.buckets()
+          for node_id, histogram in self._histograms.items()
+      }
+
+  def consumer_latency_histogram(self):
+    """Returns a histogram of the recent gap times of the pipeline consumer.
+
+    Returns:
+      A list of `(upper_bound_us, count)` pairs. The last bucket is unbounded.
+    """
+    histogram = _Histogram()
+    stats = self.latest()
+    if stats is not None:
+      for gap_time_us in stats.consumer_gap_times_us:
+        histogram.add(gap_time_us)
+    return histogram.buckets()
+
+  def to_chrome_trace(self):
+    """Exports the collected samples in the Chrome trace event format.
+
+    Returns:
+      A JSON string that can be loaded by `chrome://tracing` or Perfetto.
+    """
+    events = []
+    with self._lock:
+      samples = list(self._samples)
+    for timestamp_us, stats in samples:
+      for t in stats.transformations:
+        events.append({
+            "name": f"{t.name}:{t.id}",
+            "cat": "tf.data",
+            "ph": "C",
+            "ts": timestamp_us,
+            "pid": 0,
+            "args": {
+                "num_elements": t.num_elements,
+                "produce_latency_ns": t.produce_latency_ns,
+                "buffered_elements": t.buffered_elements,
+                "buffered_bytes": t.buffered_bytes,
+                "bytes_per_element": t.bytes_per_element,
+            },
+        })
+    return json.dumps({"traceEvents": events})
@@ -42,7 +42,7 @@ def at(dataset, index):
      - `tf.data.Dataset.parallel_map`,
      - `tf.data.Dataset.prefetch`,
      - `tf.data.Dataset.take`,
-     - `tf.data.Dataset.cache` (in-memory only)
+     - `tf.data.Dataset.cache` (in-memory or with `file_format="mmap"`)
 
      Users can use the cache operation to enable random access for any dataset,
      even one comprised of transformations which are not on this list.
@@ -17,6 +17,9 @@ import collections
 import csv
 import functools
 import gzip
+import hashlib
+import json
+import os
 
 import numpy as np
 
@@ -35,8 +38,11 @@ from tensorflow.python.framework import ops
 from tensorflow.python.framework import tensor_spec
 from tensorflow.python.framework import tensor_util
 from tensorflow.python.lib.io import file_io
+from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import gen_experimental_dataset_ops
 from tensorflow.python.ops import io_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import parsing_ops as core_parsing_ops
 from tensorflow.python.platform import gfile
 from tensorflow.python.util.tf_export import tf_export
 
@@ -128,9 +134,9 @@ def _next_csv_row(filenames, num_cols, field_delim, use_quote_delim, header,
         yield csv_row
 
 
-def _infer_column_defaults(filenames, num_cols, field_delim, use_quote_delim,
-                           na_value, header, num_rows_for_inference,
-                           select_columns, file_io_fn):
+def _infer_column_types(filenames, num_cols, field_delim, use_quote_delim,
+                        na_value, header, num_rows_for_inference,
+                        select_columns, file_io_fn):
   """Infers column types from the first N valid CSV records of files."""
   if select_columns is None:
     select_columns = range(num_cols)
@@ -147,11 +153,14 @@ def _infer_column_defaults(filenames, num_cols, field_delim, use_quote_delim,
                                       inferred_types[j])
 
   # Replace None's with a default type
-  inferred_types = [t or dtypes.string for t in inferred_types]
+  return [t or dtypes.string for t in inferred_types]
+
+
+def _column_defaults_for_types(column_types):
   # Default to 0 or '' for null values
   return [
       constant_op.constant([0 if t is not dtypes.string else ""], dtype=t)
-      for t in inferred_types
+      for t in column_types
   ]
 
 
@@ -181,6 +190,60 @@ def _infer_column_names(filenames, field_delim, use_quote_delim, file_io_fn):
   return column_names
 
 
+def _csv_schema_cache_path(schema_cache_dir, filenames, **params):
+  """Returns the path of the cached schema of `filenames`.
+
+  The path depends on the parameters used for inferring the schema and on the
+  name, size and modification time of every file, so that a cached schema is
+  not reused once any of the files has changed.
+
+  Args:
+    schema_cache_dir: The directory in which schemas are cached.
+    filenames: The names of the CSV files.
+    **params: JSON-serializable parameters that affect the inferred schema.
+
+  Returns:
+    The path of the cached schema.
+  """
+  fingerprint = hashlib.sha256()
+  fingerprint.update(json.dumps(params, sort_keys=True).encode("utf-8"))
+  for filename in filenames:
+    stat = file_io.stat(filename)
+    fingerprint.update(
+        f"{filename}:{stat.length}:{stat.mtime_nsec}\n".encode("utf-8"))
+  return os.path.join(schema_cache_dir,
+                      f"csv_schema_{fingerprint.hexdigest()}.json")
+
+
+def _read_csv_schema(path):
+  """Reads a cached schema, returning `None` if it is missing or invalid."""
+  if not file_io.file_exists(path):
+    return None
+  try:
+    schema = json.loads(file_io.read_file_to_string(path))
+    return {
+        "column_names":
+            schema["column_names"],
+        "column_types":
+            None if schema["column_types"] is None else
+            [dtypes.as_dtype(t) for t in schema["column_types"]],
+    }
+  except (ValueError, TypeError, KeyError):
+    # The schema is recomputed, and the cache entry overwritten.
+    return None
+
+
+def _write_csv_schema(path, column_names, column_types):
+  file_io.recursive_create_dir(os.path.dirname(path))
+  schema = {
+      "column_names":
+          column_names,
+      "column_types":
+          None if column_types is None else [t.name for t in column_types],
+  }
+  file_io.atomic_write_string_to_file(path, json.dumps(schema))
+
+
 def _get_sorted_col_indices(select_columns, column_names):
   """Transforms select_columns argument into sorted column indices."""
   names_to_indices = {n: i for i, n in enumerate(column_names)}
@@ -346,6 +409,8 @@ def make_csv_dataset_v2(
     compression_type=None,
     ignore_errors=False,
     encoding="utf-8",
+    vectorized_parsing=False,
+    schema_cache_dir=None,
 ):
   """Reads CSV files into a dataset.
 
@@ -466,6 +531,19 @@ def make_csv_dataset_v2(
       CSV record. Otherwise, the dataset raises an error and stops processing
       when encountering any invalid records. Defaults to `False`.
     encoding: Encoding to use when reading. Defaults to `UTF-8`.
+    vectorized_parsing: (Optional.) If `True`, the files are read as lines and
+      each batch of lines is parsed by a single `tf.io.decode_csv` operation,
+      which only converts the selected columns. This is considerably faster
+      than parsing records one at a time, but requires every record to fit on
+      a single line (quoted fields can not contain line breaks), and can not
+      be combined with `ignore_errors`. Empty lines are skipped, as they would
+      otherwise fail the parsing of a whole batch, whereas without vectorized
+      parsing they are parsed as records. Defaults to `False`.
+    schema_cache_dir: (Optional.) A directory in which to cache the column
+      names and types inferred from the files. A cached schema is reused as
+      long as the names, sizes and modification times of the files and the
+      arguments affecting the inference are unchanged, which avoids reading
+      the files when the dataset is created again. Defaults to no caching.
 
   Returns:
     A dataset, where each element is a (features, labels) tuple that corresponds
@@ -483,6 +561,10 @@ def make_csv_dataset_v2(
   if prefetch_buffer_size is None:
     prefetch_buffer_size = dataset_ops.AUTOTUNE
 
+  if vectorized_parsing and ignore_errors:
+    raise ValueError("`ignore_errors` is not supported with "
+                     "`vectorized_parsing=True`.")
+
   # Create dataset of all matching filenames
   filenames = _get_file_names(file_pattern, False)
   dataset = dataset_ops.Dataset.from_tensor_slices(filenames)
@@ -490,6 +572,9 @@ def make_csv_dataset_v2(
     dataset = dataset.shuffle(len(filenames), shuffle_seed)
 
   # Clean arguments; figure out column names and defaults
+  schema_cache_path = None
+  cached_schema = None
+  column_types = None
   if column_names is None or column_defaults is None:
     # Find out which io function to open the file
     file_io_fn = lambda filename: file_io.FileIO(  # pylint: disable=g-long-lambda
@@ -512,13 +597,33 @@ def make_csv_dataset_v2(
             f"Received unknown `compression_type` {compression_type}. "
             "Expected: GZIP, ZLIB or "
             " (empty string).")
+    if schema_cache_dir is not None:
+      schema_cache_path = _csv_schema_cache_path(
+          schema_cache_dir,
+          filenames,
+          column_names=None if column_names is None else list(column_names),
+          infer_column_types=column_defaults is None,
+          select_columns=(None if select_columns is None else
+                          list(select_columns)),
+          field_delim=field_delim,
+          use_quote_delim=use_quote_delim,
+          na_value=na_value,
+          header=header,
+          num_rows_for_inference=num_rows_for_inference,
+          compression_type=(None if compression_type is None else
+                            compression_type_value),
+          encoding=encoding)
+      cached_schema = _read_csv_schema(schema_cache_path)
   if column_names is None:
     if not header:
       raise ValueError("Expected `column_names` or `header` arguments. Neither "
                        "is provided.")
-    # If column names are not provided, infer from the header lines
-    column_names = _infer_column_names(filenames, field_delim, use_quote_delim,
-                                       file_io_fn)
+    if cached_schema is not None:
+      column_names = cached_schema["column_names"]
+    else:
+      # If column names are not provided, infer from the header lines
+      column_names = _infer_column_names(filenames, field_delim,
+                                         use_quote_delim, file_io_fn)
   if len(column_names) != len(set(column_names)):
     sorted_names = sorted(column_names)
     duplicate_columns = set([a for a, b in zip(
@@ -536,14 +641,20 @@ def make_csv_dataset_v2(
         if not tensor_util.is_tf_type(x) and x in _ACCEPTABLE_CSV_TYPES else x
         for x in column_defaults
     ]
+  elif cached_schema is not None:
+    column_types = cached_schema["column_types"]
+    column_defaults = _column_defaults_for_types(column_types)
   else:
     # If column defaults are not provided, infer from records at graph
     # construction time
-    column_defaults = _infer_column_defaults(filenames, len(column_names),
-                                             field_delim, use_quote_delim,
-                                             na_value, header,
-                                             num_rows_for_inference,
-                                             select_columns, file_io_fn)
+    column_types = _infer_column_types(filenames, len(column_names),
+                                       field_delim, use_quote_delim, na_value,
+                                       header, num_rows_for_inference,
+                                       select_columns, file_io_fn)
+    column_defaults = _column_defaults_for_types(column_types)
+
+  if schema_cache_path is not None and cached_schema is None:
+    _write_csv_schema(schema_cache_path, column_names, column_types)
 
   if select_columns is not None and len(column_defaults) != len(select_columns):
     raise ValueError(
@@ -559,6 +670,14 @@ def make_csv_dataset_v2(
                      f"{column_names}. Received: {label_name}.")
 
   def filename_to_dataset(filename):
+    if vectorized_parsing:
+      # Records are parsed after batching.
+      dataset = core_readers.TextLineDataset(
+          filename, compression_type=compression_type)
+      if header:
+        dataset = dataset.skip(1)
+      # `TextLineDataset` strips line breaks, so empty lines are empty strings.
+      return dataset.filter(lambda line: math_ops.not_equal(line, ""))
     dataset = CsvDataset(
         filename,
         record_defaults=column_defaults,
@@ -620,8 +739,23 @@ def make_csv_dataset_v2(
   # indefinitely, and all batches will be full-sized.
   dataset = dataset.batch(batch_size=batch_size,
                           drop_remainder=num_epochs is None)
-  dataset = map_op._MapDataset(  # pylint: disable=protected-access
-      dataset, map_fn, use_inter_op_parallelism=False)
+  if vectorized_parsing:
+
+    def decode_fn(records):
+      # Parses a whole batch of records into columns at once. Only the
+      # selected columns are converted.
+      return map_fn(*core_parsing_ops.decode_csv_v2(
+          records,
+          record_defaults=column_defaults,
+          field_delim=field_delim,
+          use_quote_delim=use_quote_delim,
+          na_value=na_value,
+          select_cols=select_columns))
+
+    dataset = dataset.map(decode_fn, num_parallel_calls=dataset_ops.AUTOTUNE)
+  else:
+    dataset = map_op._MapDataset(  # pylint: disable=protected-access
+        dataset, map_fn, use_inter_op_parallelism=False)
   dataset = dataset.prefetch(prefetch_buffer_size)
 
   return dataset
@@ -650,6 +784,8 @@ def make_csv_dataset_v1(
     compression_type=None,
     ignore_errors=False,
     encoding="utf-8",
+    vectorized_parsing=False,
+    schema_cache_dir=None,
 ):  # pylint: disable=missing-docstring
   return dataset_ops.DatasetV1Adapter(
       make_csv_dataset_v2(file_pattern, batch_size, column_names,
@@ -658,7 +794,8 @@ def make_csv_dataset_v1(
                           num_epochs, shuffle, shuffle_buffer_size,
                           shuffle_seed, prefetch_buffer_size,
                           num_parallel_reads, sloppy, num_rows_for_inference,
-                          compression_type, ignore_errors, encoding))
+                          compression_type, ignore_errors, encoding,
+                          vectorized_parsing, schema_cache_dir))
 make_csv_dataset_v1.__doc__ = make_csv_dataset_v2.__doc__
 
 
@@ -1210,6 +1347,188 @@ class SqlDatasetV1(dataset_ops.DatasetV1Adapter):
     super(SqlDatasetV1, self).__init__(wrapped)
 
 
+class _IndexedTFRecordDataset(dataset_ops.DatasetSource):
+  """A `Dataset` reading a range of records of indexed TFRecord files."""
+
+  def __init__(self, filenames, buffer_size, start, stop, step, name=None):
+    self._filenames = filenames
+    self._buffer_size = buffer_size
+    self._start = ops.convert_to_tensor(start, dtype=dtypes.int64, name="start")
+    self._stop = ops.convert_to_tensor(stop, dtype=dtypes.int64, name="stop")
+    self._step = ops.convert_to_tensor(step, dtype=dtypes.int64, name="step")
+    self._name = name
+    variant_tensor = gen_experimental_dataset_ops.indexed_tf_record_dataset(
+        self._filenames,
+        self._buffer_size,
+        self._start,
+        self._stop,
+        self._step,
+        metadata=self._metadata.SerializeToString())
+    super(_IndexedTFRecordDataset, self).__init__(variant_tensor)
+
+  @property
+  def element_spec(self):
+    return tensor_spec.TensorSpec([], dtypes.string)
+
+
+def _is_int(value):
+  return isinstance(value, (int, np.integer)) and not isinstance(value, bool)
+
+
+@tf_export("data.experimental.IndexedTFRecordDataset", v1=[])
+class IndexedTFRecordDataset(dataset_ops.DatasetSource):
+  """A `Dataset` of the records of TFRecord files that have a record index.
+
+  The record index of a TFRecord file holds the byte offset of every record in
+  the file. It is written next to the file, with the suffix `.index`, by
+  `tf.data.experimental.TFRecordWriter` when `write_index=True`:
+
+  ```python
+  writer = tf.data.experimental.TFRecordWriter(path, write_index=True)
+  writer.write(dataset)
+  ```
+
+  The index lets `IndexedTFRecordDataset` determine the number of records, and
+  locate any record, without scanning the files:
+
+  * Its cardinality is known, so that it can be used with transformations
+    that require it.
+  * `skip`, `take` and `shard`, applied directly to the dataset, seek to the
+    records to read instead of reading and discarding the records before
+    them.
+  * It supports random access through `tf.data.experimental.at`, and can
+    therefore be shuffled globally with
+    `tf.data.experimental.global_shuffle`.
+  * With `num_parallel_reads`, the records of even a single large file are
+    read by several readers in parallel.
+
+  ```python
+  dataset = tf.data.experimental.IndexedTFRecordDataset(path)
+  # Each worker only reads its own share of the records.
+  dataset = dataset.shard(num_workers, worker_index)
+  ```
+
+  Compressed files can not be indexed.
+  """
+
+  def __init__(self,
+               filenames,
+               buffer_size=None,
+               num_parallel_reads=None,
+               name=None):
+    """Creates an `IndexedTFRecordDataset`.
+
+    Args:
+      filenames: A `tf.string` tensor containing one or more filenames. Each
+        file must have a record index.
+      buffer_size: (Optional.) A `tf.int64` scalar representing the number of
+        bytes in the read buffer. 0 means no buffering.
+      num_parallel_reads: (Optional.) A positive Python integer representing
+        the number of readers to use. If greater than one, the records are
+        divided into `num_parallel_reads` contiguous ranges that are read in
+        parallel, and the records of the ranges are outputted in an
+        interleaved order. If `None`, the records are read sequentially.
+      name: (Optional.) A name for the tf.data operation.
+
+    Raises:
+      ValueError: If `num_parallel_reads` is not a positive integer.
+    """
+    if num_parallel_reads is not None and (not _is_int(num_parallel_reads) or
+                                           num_parallel_reads < 1):
+      raise ValueError(f"Invalid `num_parallel_reads`. `num_parallel_reads` "
+                       f"must be a positive integer or `None`, but got "
+                       f"{num_parallel_reads}.")
+    filenames = ops.convert_to_tensor(
+        filenames, dtype=dtypes.string, name="filenames")
+    filenames = array_ops.reshape(filenames, [-1], name="flat_filenames")
+    buffer_size = convert.optional_param_to_tensor(
+        "buffer_size", buffer_size,
+        core_readers._DEFAULT_READER_BUFFER_SIZE_BYTES)  # pylint: disable=protected-access
+    self._init(filenames, buffer_size, num_parallel_reads, 0, -1, 1, name)
+
+  def _init(self, filenames, buffer_size, num_parallel_reads, start, stop,
+            step, name):
+    """Initializes the dataset to read the records `range(start, stop, step)`.
+
+    The range counts the records of all files in order. A `stop` of -1 denotes
+    the end of the last file.
+    """
+    self._filenames = filenames
+    self._buffer_size = buffer_size
+    self._num_parallel_reads = num_parallel_reads
+    self._start = start
+    self._stop = stop
+    self._step = step
+    self._name = name
+
+    def read_range(start, stop):
+      return _IndexedTFRecordDataset(
+          filenames, buffer_size, start, stop, step, name=name)
+
+    self._impl = read_range(start, stop)
+    if num_parallel_reads is not None and num_parallel_reads > 1:
+      num_records = self._impl.cardinality()
+      end = start + num_records * step
+      records_per_reader = (num_records + num_parallel_reads -
+                            1) // num_parallel_reads
+
+      def read_block(reader_index):
+        block_start = start + reader_index * records_per_reader * step
+        block_stop = math_ops.minimum(
+            block_start + records_per_reader * step, end)
+        return read_range(block_start, block_stop)
+
+      self._impl = dataset_ops.Dataset.range(num_parallel_reads).interleave(
+          read_block,
+          cycle_length=num_parallel_reads,
+          block_length=1,
+          num_parallel_calls=num_parallel_reads,
+          deterministic=True,
+          name=name)
+    super(IndexedTFRecordDataset, self).__init__(self._impl._variant_tensor)  # pylint: disable=protected-access
+
+  def _with_range(self, start, stop, step, name):
+    dataset = IndexedTFRecordDataset.__new__(IndexedTFRecordDataset)
+    dataset._init(self._filenames, self._buffer_size, None, start, stop, step,  # pylint: disable=protected-access
+                  name or self._name)
+    return dataset
+
+  def _seekable(self, *args):
+    # The outputs of parallel readers are interleaved, so they do not map to
+    # a range of records.
+    return self._num_parallel_reads is None and all(_is_int(a) for a in args)
+
+  def skip(self, count, name=None):
+    if not self._seekable(count):
+      return super(IndexedTFRecordDataset, self).skip(count, name=name)
+    if count < 0:
+      return self._with_range(self._start, self._start, self._step, name)
+    return self._with_range(self._start + count * self._step, self._stop,
+                            self._step, name)
+
+  def take(self, count, name=None):
+    if not self._seekable(count):
+      return super(IndexedTFRecordDataset, self).take(count, name=name)
+    if count < 0:
+      return self
+    stop = self._start + count * self._step
+    if self._stop >= 0:
+      stop = min(stop, self._stop)
+    return self._with_range(self._start, stop, self._step, name)
+
+  def shard(self, num_shards, index, name=None):
+    if (not self._seekable(num_shards, index) or num_shards < 1 or
+        not 0 <= index < num_shards):
+      return super(IndexedTFRecordDataset, self).shard(
+          num_shards, index, name=name)
+    return self._with_range(self._start + index * self._step, self._stop,
+                            self._step * num_shards, name)
+
+  @property
+  def element_spec(self):
+    return tensor_spec.TensorSpec([], dtypes.string)
+
+
 if tf2.enabled():
   CsvDataset = CsvDatasetV2
   SqlDataset = SqlDatasetV2
@@ -17,13 +17,16 @@
 import functools
 import numpy as np
 
+from tensorflow.core.framework import dataset_options_pb2
 from tensorflow.python.data.experimental.ops import random_access
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.data.util import random_seed
+from tensorflow.python.eager import context
 from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
 from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import control_flow_assert
 from tensorflow.python.ops import gen_dataset_ops
 from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import stateless_random_ops
@@ -270,3 +273,104 @@ def index_shuffle(file_infos,
       rerandomize_each_iteration=reshuffle_each_iteration)
   rng_ds = rng_ds.take(2).batch(2, drop_remainder=True)
   return rng_ds.flat_map(sequential_index_shuffle)
+
+
+def _random_access_cardinality(dataset):
+  """Returns the cardinality of `dataset` as seen by random access.
+
+  Unlike `tf.data.Dataset.cardinality()`, this also accounts for sources whose
+  cardinality can only be determined by inspecting their files, such as
+  `tf.data.FixedLengthRecordDataset`.
+
+  Args:
+    dataset: A `tf.data.Dataset`.
+
+  Returns:
+    A scalar `tf.int64` `Tensor`.
+  """
+  options = dataset_options_pb2.CardinalityOptions(
+      compute_level=dataset_options_pb2.CardinalityOptions
+      .CARDINALITY_COMPUTE_MODERATE)
+  return gen_dataset_ops.dataset_cardinality(
+      dataset._variant_tensor,  # pylint: disable=protected-access
+      cardinality_options=options.SerializeToString())
+
+
+@tf_export("data.experimental.global_shuffle", v1=[])
+def global_shuffle(seed=None,
+                   reshuffle_each_iteration=True,
+                   num_parallel_calls=dataset_ops.AUTOTUNE):
+  """Shuffles all elements of a dataset that supports random access.
+
+  Unlike `tf.data.Dataset.shuffle()`, which shuffles elements within a buffer
+  of a fixed size, `global_shuffle()` draws a random permutation of the
+  indices of all elements of the input and then reads the elements in the
+  permuted order using `tf.data.experimental.at`. The result is a uniform
+  shuffle over the whole dataset that requires no buffer: the permutation is
+  computed element by element from the index and a pair of seeds. Since the
+  position within an epoch is just an index into the permutation, the
+  shuffled dataset is also cheap to checkpoint and restore.
+
+  >>> dataset = tf.data.Dataset.range(10)
+  >>> dataset = dataset.apply(tf.data.experimental.global_shuffle(seed=42))
+  >>> sorted(dataset.as_numpy_iterator())
+  [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+
+  The input must support random access (see `tf.data.experimental.at` for the
+  list of supported transformations) and have a finite, known cardinality.
+  Reading elements in a random order is generally less efficient than reading
+  them sequentially, so `global_shuffle()` works best on sources that support
+  cheap random reads, such as in-memory data, uncompressed
+  `tf.data.FixedLengthRecordDataset` files or a memory-mapped cache.
+
+  Args:
+    seed: (Optional.) A `tf.int64` scalar `tf.Tensor`, representing the random
+      seed that will be used to create the permutation. See
+      `tf.random.set_seed` for behavior.
+    reshuffle_each_iteration: (Optional.) A boolean, which if true indicates
+      that a different permutation should be used for each iteration over the
+      dataset. Defaults to `True`.
+    num_parallel_calls: (Optional.) A `tf.int64` scalar `tf.Tensor`, that
+      determines the maximum number of random access operations to perform
+      in parallel. By default, the tf.data runtime uses autotuning to determine
+      the value dynamically.
+
+  Returns:
+    A `Dataset` transformation function, which can be passed to
+    `tf.data.Dataset.apply`.
+  """
+
+  def _apply_fn(dataset):  # pylint: disable=missing-docstring
+    num_elements = _random_access_cardinality(dataset)
+    if context.executing_eagerly():
+      if num_elements < 0:
+        raise ValueError(
+            "`global_shuffle()` requires a dataset with a finite, known "
+            "cardinality that supports random access, but got a dataset with "
+            f"cardinality {int(num_elements)}.")
+    else:
+      assert_known = control_flow_assert.Assert(
+          math_ops.greater_equal(num_elements, 0), [
+              "`global_shuffle()` requires a dataset with a finite, known "
+              "cardinality that supports random access, but got a dataset "
+              "with cardinality", num_elements
+          ])
+      with ops.control_dependencies([assert_known]):
+        num_elements = array_ops.identity(num_elements)
+
+    def shuffled_epoch(seeds):
+
+      def read_element(index):
+        shuffled_index = stateless_random_ops.index_shuffle(
+            index, seeds, num_elements - 1)
+        return random_access.at(dataset, shuffled_index)
+
+      return dataset_ops.Dataset.range(num_elements).map(
+          read_element, num_parallel_calls=num_parallel_calls)
+
+    rng_ds = dataset_ops.Dataset.random(
+        seed=seed, rerandomize_each_iteration=reshuffle_each_iteration)
+    rng_ds = rng_ds.take(2).batch(2, drop_remainder=True)
+    return rng_ds.flat_map(shuffled_epoch)
+
+  return _apply_fn
@@ -69,9 +69,14 @@ class TFRecordWriter:
   for _ in dataset:
     pass
   ```
+
+  With `write_index=True`, the writer also writes a record index, holding the
+  byte offset of every record, to the file `<filename>.index`. Indexed files
+  can be read with `tf.data.experimental.IndexedTFRecordDataset`, which uses
+  the index to seek to records and to read a file with parallel readers.
   """
 
-  def __init__(self, filename, compression_type=None):
+  def __init__(self, filename, compression_type=None, write_index=False):
     """Initializes a `TFRecordWriter`.
 
     Args:
@@ -79,7 +84,19 @@ class TFRecordWriter:
       compression_type: (Optional.) a string indicating what type of compression
         to use when writing the file. See `tf.io.TFRecordCompressionType` for
         what types of compression are available. Defaults to `None`.
+      write_index: (Optional.) A Python boolean indicating whether to write a
+        record index to the file `<filename>.index`. Can not be combined with
+        compression. Defaults to `False`.
+
+    Raises:
+      ValueError: If `write_index` is set and `compression_type` is a
+        compression.
     """
+    if write_index and isinstance(compression_type, str) and compression_type:
+      raise ValueError(f"Invalid `compression_type`. Record indices can not be "
+                       f"written for compressed files, but got "
+                       f"`compression_type={compression_type}`.")
+    self._write_index = write_index
     self._filename = ops.convert_to_tensor(
         filename, dtypes.string, name="filename")
     self._compression_type = convert.optional_param_to_tensor(
@@ -123,4 +140,7 @@ class TFRecordWriter:
     # pylint: disable=protected-access
     dataset = dataset._apply_debug_options()
     return gen_experimental_dataset_ops.dataset_to_tf_record(
-        dataset._variant_tensor, self._filename, self._compression_type)
+        dataset._variant_tensor,
+        self._filename,
+        self._compression_type,
+        write_index=self._write_index)
@@ -402,6 +402,23 @@ dataset. To ensure all the trainers get sufficient training data, we require the
 input dataset to be infinite. This can be achieved, for example, by repeating
 the dataset and performing random augmentation on the training instances.
 
+## Sharing data on a single host
+
+When several trainers run on the same host, for example one trainer per GPU,
+`tf.data.experimental.service.LocalServiceCluster` starts a dispatcher and a
+set of worker processes with a single call. The trainers read from the cluster
+with the `"shm"` data transfer protocol, which passes elements through shared
+memory instead of gRPC messages:
+
+```
+cluster = tf.data.experimental.service.LocalServiceCluster(num_workers=4)
+dataset = dataset.apply(tf.data.experimental.service.distribute(
+    processing_mode=tf.data.experimental.service.ShardingPolicy.DYNAMIC,
+    service=cluster.target,
+    job_name="shared_job",
+    data_transfer_protocol="shm"))
+```
+
 ## Limitations
 
 - Python-based data processing: Datasets which use Python-based data processing
@@ -422,5 +439,6 @@ from tensorflow.python.data.experimental.ops.data_service_ops import register_da
 from tensorflow.python.data.experimental.ops.data_service_ops import ShardingPolicy
 from tensorflow.python.data.experimental.service.server_lib import DispatcherConfig
 from tensorflow.python.data.experimental.service.server_lib import DispatchServer
+from tensorflow.python.data.experimental.service.server_lib import LocalServiceCluster
 from tensorflow.python.data.experimental.service.server_lib import WorkerConfig
 from tensorflow.python.data.experimental.service.server_lib import WorkerServer
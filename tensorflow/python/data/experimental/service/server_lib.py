@@ -15,6 +15,7 @@
 """A Python interface for creating dataset servers."""
 
 import collections
+import multiprocessing
 
 # pylint: disable=invalid-import-order,g-bad-import-order, unused-import
 from tensorflow.core.protobuf import service_config_pb2
@@ -467,3 +468,180 @@ class WorkerServer:
       An `Iterable[common_pb2.SnapshotTaskProgress]`.
     """
     return self._server.snapshot_task_progresses()
+
+
+# How long `LocalServiceCluster` waits for a worker process to stop before
+# terminating it.
+_LOCAL_WORKER_STOP_TIMEOUT_SECS = 10
+
+
+def _run_local_worker(config, address_writer, stop_reader):
+  """Runs a worker server in a process started by `LocalServiceCluster`."""
+  worker = WorkerServer(config)
+  address_writer.send(worker._address)  # pylint: disable=protected-access
+  address_writer.close()
+  try:
+    stop_reader.recv()
+  except EOFError:
+    # The cluster process exited without stopping the worker.
+    pass
+  worker._stop()  # pylint: disable=protected-access
+  # Destroying the server deletes the shared memory files of the elements which
+  # no trainer has read.
+  del worker
+
+
+@tf_export("data.experimental.service.LocalServiceCluster", v1=[])
+class LocalServiceCluster:
+  """A tf.data service cluster running on the local host.
+
+  A `tf.data.experimental.service.LocalServiceCluster` starts an in-process
+  `tf.data.experimental.service.DispatchServer` and `num_workers`
+  `tf.data.experimental.service.WorkerServer`s, each in its own process. This
+  moves input processing out of the trainer processes and lets several trainers
+  on the same host, such as one trainer per accelerator or the trials of a
+  hyperparameter sweep, read a single preprocessed stream instead of each
+  repeating the same work.
+
+  By default, the workers transfer elements with the `"shm"` protocol, which
+  hands the element data to the trainers through shared memory files instead
+  of serializing it into gRPC messages. Trainers opt into the protocol with the
+  `data_transfer_protocol` argument of
+  `tf.data.experimental.service.distribute`:
+
+  ```
+  cluster = tf.data.experimental.service.LocalServiceCluster(num_workers=4)
+  # In each trainer process:
+  dataset = dataset.apply(tf.data.experimental.service.distribute(
+      processing_mode=tf.data.experimental.service.ShardingPolicy.DYNAMIC,
+      service=cluster.target,
+      job_name="shared_job",
+      data_transfer_protocol="shm"))
+  ```
+
+  Trainers reading from the same `job_name` split the elements of the job
+  between them. To give every trainer the same elements, additionally pass a
+  `tf.data.experimental.service.CrossTrainerCache`.
+
+  The cluster is elastic: `add_worker` and `remove_worker` change the number
+  of worker processes while jobs are running. The worker processes are started
+  with the "spawn" start method, so scripts which create a
+  `LocalServiceCluster` must guard their entry point with
+  `if __name__ == "__main__":`. The cluster stops when `stop` is called or all
+  references to it have been deleted.
+  """
+
+  def __init__(self, num_workers=1, data_transfer_protocol="shm", port=0):
+    """Creates and starts a new local cluster.
+
+    Args:
+      num_workers: (Optional.) The number of worker processes to start.
+        Defaults to 1.
+      data_transfer_protocol: (Optional.) The protocol used by the workers to
+        transfer elements to the trainers. Defaults to `"shm"`. Set it to
+        `"grpc"` to transfer elements over gRPC.
+      port: (Optional.) The port of the dispatcher. A value of 0 indicates that
+        the dispatcher can bind to any available port.
+
+    Raises:
+      ValueError: If `num_workers` is negative.
+    """
+    if num_workers < 0:
+      raise ValueError(
+          f"`num_workers` must be a non-negative integer, but got "
+          f"{num_workers}.")
+    # List of (worker address, worker process, stop connection) tuples. Sending
+    # a message on the stop connection stops the worker.
+    self._workers = []
+    self._data_transfer_protocol = data_transfer_protocol
+    self._context = multiprocessing.get_context("spawn")
+    self._dispatcher = DispatchServer(DispatcherConfig(port=port))
+    self._dispatcher_address = self._dispatcher.target.split("://")[1]
+    for _ in range(num_workers):
+      self.add_worker()
+
+  @property
+  def target(self):
+    """Returns a target that can be used to connect to the cluster.
+
+    The returned string will be in the form protocol://address, e.g.
+    "grpc://localhost:5050".
+    """
+    return self._dispatcher.target
+
+  @property
+  def num_workers(self):
+    """Returns the number of worker processes of the cluster."""
+    return len(self._workers)
+
+  def add_worker(self):
+    """Starts a new worker process.
+
+    Returns:
+      The address of the new worker, e.g. "localhost:5051".
+
+    Raises:
+      RuntimeError: If the worker process exits before starting its server.
+    """
+    address_reader, address_writer = self._context.Pipe(duplex=False)
+    stop_reader, stop_writer = self._context.Pipe(duplex=False)
+    config = WorkerConfig(
+        dispatcher_address=self._dispatcher_address,
+        data_transfer_protocol=self._data_transfer_protocol)
+    process = self._context.Process(
+        target=_run_local_worker,
+        args=(config, address_writer, stop_reader),
+        daemon=True)
+    process.start()
+    address_writer.close()
+    stop_reader.close()
+    try:
+      address = address_reader.recv()
+    except EOFError:
+      process.join()
+      stop_writer.close()
+      raise RuntimeError(
+          f"tf.data service worker process exited with code "
+          f"{process.exitcode} before starting its server.") from None
+    self._workers.append((address, process, stop_writer))
+    return address
+
+  def remove_worker(self):
+    """Stops the most recently added worker process.
+
+    The dispatcher stops assigning work to the removed worker once the worker
+    times out. Elements which are being produced by the worker are lost.
+
+    Raises:
+      ValueError: If the cluster has no workers.
+    """
+    if not self._workers:
+      raise ValueError("The cluster has no workers to remove.")
+    _, process, stop_writer = self._workers.pop()
+    try:
+      stop_writer.send(None)
+    except OSError:
+      # The worker process has already exited.
+      pass
+    stop_writer.close()
+    # The worker shuts its server down gracefully, which deletes the shared
+    # memory files of the elements it produced. It is only terminated if it
+    # does not stop in time.
+    process.join(_LOCAL_WORKER_STOP_TIMEOUT_SECS)
+    if process.is_alive():
+      process.terminate()
+      process.join()
+
+  def stop(self):
+    """Stops the worker processes and the dispatcher."""
+    while self._workers:
+      self.remove_worker()
+    self._dispatcher._stop()  # pylint: disable=protected-access
+
+  def __del__(self):
+    if hasattr(self, "_dispatcher"):
+      self.stop()
+
+  def _worker_addresses(self):
+    """Returns the addresses of the workers of the cluster."""
+    return [address for address, _, _ in self._workers]
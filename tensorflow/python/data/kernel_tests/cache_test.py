@@ -34,6 +34,7 @@ from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import errors
 from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import variables
 from tensorflow.python.platform import test
@@ -212,6 +213,93 @@ class FileCacheTest(test_base.DatasetTestBase, parameterized.TestCase):
       do_test(i)
 
 
+class MemoryMappedFileCacheTest(test_base.DatasetTestBase,
+                                parameterized.TestCase):
+
+  def setUp(self):
+    super(MemoryMappedFileCacheTest, self).setUp()
+    self.tmp_dir = tempfile.mkdtemp()
+    self.cache_prefix = path.join(self.tmp_dir, "cache")
+
+  def tearDown(self):
+    if self.tmp_dir:
+      shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    super(MemoryMappedFileCacheTest, self).tearDown()
+
+  def _dataset(self, num_elements=10):
+    dataset = dataset_ops.Dataset.range(num_elements)
+    return dataset.map(lambda x: (array_ops.fill([3], x),
+                                  math_ops.cast(x, dtypes.float32) / 2))
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testCacheDatasetPassthrough(self):
+    expected = [(np.full([3], i), i / 2) for i in range(10)]
+    dataset = self._dataset().cache(self.cache_prefix, file_format="mmap")
+    self.assertDatasetProduces(dataset, expected)
+    self.assertTrue(os.path.exists(self.cache_prefix + ".mmap_index"))
+    # Subsequent iterations, including ones over a different input, read the
+    # cache.
+    dataset = self._dataset(20).cache(self.cache_prefix, file_format="mmap")
+    self.assertDatasetProduces(dataset, expected)
+    self.assertDatasetProduces(dataset.repeat(2), expected * 2)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testEmptyInput(self):
+    dataset = self._dataset(0).cache(self.cache_prefix, file_format="mmap")
+    self.assertDatasetProduces(dataset, [])
+    self.assertDatasetProduces(dataset, [])
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testRandomAccess(self):
+    dataset = self._dataset().cache(self.cache_prefix, file_format="mmap")
+    expected = [(np.full([3], i), i / 2) for i in range(10)]
+    # Before the cache is written, elements are read from the input.
+    self.verifyRandomAccess(dataset, expected)
+    self.assertDatasetProduces(dataset, expected)
+    self.verifyRandomAccess(dataset, expected)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testConcurrentWriters(self):
+    dataset1 = self._dataset().cache(self.cache_prefix, file_format="mmap")
+    dataset2 = self._dataset().cache(self.cache_prefix, file_format="mmap")
+    get_next1 = self.getNext(dataset1)
+    get_next2 = self.getNext(dataset2)
+    self.evaluate(get_next1())
+    with self.assertRaises(errors.AlreadyExistsError):
+      self.evaluate(get_next2())
+    self.evaluate(get_next1())
+
+  @combinations.generate(test_base.eager_only_combinations())
+  def testIncompleteCacheIsDiscarded(self):
+    dataset = self._dataset().cache(self.cache_prefix, file_format="mmap")
+    get_next = self.getNext(dataset)
+    self.evaluate(get_next())
+    del get_next
+    self.assertFalse(os.path.exists(self.cache_prefix + ".mmap_data"))
+    self.assertDatasetProduces(
+        dataset, [(np.full([3], i), i / 2) for i in range(10)])
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testUnsupportedElements(self):
+    with self.assertRaisesRegex(errors.InvalidArgumentError,
+                                "numeric and boolean"):
+      dataset = dataset_ops.Dataset.from_tensors("a").cache(
+          self.cache_prefix, file_format="mmap")
+      self.getDatasetOutput(dataset)
+    with self.assertRaisesRegex(errors.InvalidArgumentError,
+                                "fully defined shapes"):
+      dataset = dataset_ops.Dataset.range(3).batch(2).cache(
+          self.cache_prefix, file_format="mmap")
+      self.getDatasetOutput(dataset)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testInvalidArguments(self):
+    with self.assertRaisesRegex(ValueError, "Invalid `file_format`"):
+      dataset_ops.Dataset.range(3).cache(self.cache_prefix, file_format="x")
+    with self.assertRaisesRegex(ValueError, "requires a filename"):
+      dataset_ops.Dataset.range(3).cache(file_format="mmap")
+
+
 class MemoryCacheTest(test_base.DatasetTestBase, parameterized.TestCase):
 
   @combinations.generate(test_base.default_test_combinations())
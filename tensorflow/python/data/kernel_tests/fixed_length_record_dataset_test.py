@@ -20,6 +20,7 @@ import zlib
 
 from absl.testing import parameterized
 
+from tensorflow.python.data.experimental.ops import random_access
 from tensorflow.python.data.kernel_tests import checkpoint_test_base
 from tensorflow.python.data.kernel_tests import test_base
 from tensorflow.python.data.ops import readers
@@ -226,6 +227,64 @@ class FixedLengthRecordDatasetTest(FixedLengthRecordDatasetTestBase,
     self.assertDatasetProduces(dataset, expected_output=expected_output)
 
 
+class FixedLengthRecordDatasetRandomAccessTest(FixedLengthRecordDatasetTestBase,
+                                               parameterized.TestCase):
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testRandomAccess(self):
+    test_filenames = self._createFiles()
+    # pylint: disable=protected-access
+    dataset = readers._FixedLengthRecordDataset(test_filenames,
+                                                self._record_bytes,
+                                                self._header_bytes,
+                                                self._footer_bytes)
+    expected_output = []
+    for j in range(self._num_files):
+      expected_output.extend(
+          [self._record(j, i) for i in range(self._num_records)])
+    self.verifyRandomAccess(dataset, expected_output)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testRandomAccessEmptyFile(self):
+    test_filenames = self._createFiles()
+    empty_filename = os.path.join(self.get_temp_dir(), "empty.txt")
+    with open(empty_filename, "wb") as f:
+      f.write(b"H" * self._header_bytes + b"F" * self._footer_bytes)
+    # pylint: disable=protected-access
+    dataset = readers._FixedLengthRecordDataset(
+        [test_filenames[0], empty_filename, test_filenames[1]],
+        self._record_bytes, self._header_bytes, self._footer_bytes)
+    expected_output = []
+    for j in range(self._num_files):
+      expected_output.extend(
+          [self._record(j, i) for i in range(self._num_records)])
+    self.verifyRandomAccess(dataset, expected_output)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testRandomAccessCompressed(self):
+    test_filenames = self._createFiles(compression_type="GZIP")
+    # pylint: disable=protected-access
+    dataset = readers._FixedLengthRecordDataset(
+        test_filenames,
+        self._record_bytes,
+        self._header_bytes,
+        self._footer_bytes,
+        compression_type="GZIP")
+    with self.assertRaises(errors.FailedPreconditionError):
+      self.evaluate(random_access.at(dataset, 0))
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testRandomAccessWrongSize(self):
+    test_filenames = self._createFiles()
+    # pylint: disable=protected-access
+    dataset = readers._FixedLengthRecordDataset(test_filenames,
+                                                self._record_bytes + 1,
+                                                self._header_bytes,
+                                                self._footer_bytes)
+    with self.assertRaises(errors.FailedPreconditionError):
+      self.evaluate(random_access.at(dataset, 0))
+
+
 class FixedLengthRecordDatasetCheckpointTest(
     FixedLengthRecordDatasetTestBase, checkpoint_test_base.CheckpointTestBase,
     parameterized.TestCase):
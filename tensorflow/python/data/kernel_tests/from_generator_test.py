@@ -34,6 +34,25 @@ from tensorflow.python.ops.ragged import ragged_tensor
 from tensorflow.python.platform import test
 
 
+# Generators run by `num_parallel_workers` are pickled by reference, so they
+# need to be defined at module level.
+def _strided_range(stop, worker_index, num_workers):
+  for i in range(worker_index, stop, num_workers):
+    yield i, np.full([i % 4], i, dtype=np.float32)
+
+
+def _strided_batches(stop, batch_size, worker_index, num_workers):
+  for start in range(worker_index * batch_size, stop,
+                     num_workers * batch_size):
+    yield np.arange(start, min(start + batch_size, stop), dtype=np.int64)
+
+
+def _failing_generator(worker_index, num_workers):
+  del worker_index, num_workers
+  yield np.int64(0)
+  raise ValueError("generator failure")
+
+
 class FromGeneratorTest(test_base.DatasetTestBase, parameterized.TestCase):
 
   def _testFromGenerator(self, generator, elem_sequence, num_repeats,
@@ -487,6 +506,121 @@ class FromGeneratorTest(test_base.DatasetTestBase, parameterized.TestCase):
     self.assertAllEqual([[1, 0, 0, 0], [0, 0, 2, 0], [0, 0, 0, 0]],
                         sparse_ops.sparse_tensor_to_dense(ret))
 
+  @combinations.generate(
+      combinations.times(
+          test_base.default_test_combinations(),
+          combinations.combine(num_parallel_workers=[1, 3])))
+  def testFromGeneratorParallelWorkers(self, num_parallel_workers):
+    dataset = dataset_ops.Dataset.from_generator(
+        _strided_range,
+        args=(10,),
+        output_signature=(tensor_spec.TensorSpec([], dtypes.int64),
+                          tensor_spec.TensorSpec([None], dtypes.float32)),
+        num_parallel_workers=num_parallel_workers)
+    self.assertDatasetProduces(
+        dataset,
+        expected_output=[(i, np.full([i % 4], i, dtype=np.float32))
+                         for i in range(10)])
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testFromGeneratorParallelWorkersRepeat(self):
+    dataset = dataset_ops.Dataset.from_generator(
+        _strided_range,
+        args=(6,),
+        output_types=(dtypes.int64, dtypes.float32),
+        output_shapes=((), (None,)),
+        num_parallel_workers=2).map(lambda i, _: i).repeat(2)
+    self.assertDatasetProduces(dataset, expected_output=list(range(6)) * 2)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testFromGeneratorParallelWorkersError(self):
+    dataset = dataset_ops.Dataset.from_generator(
+        _failing_generator,
+        output_signature=tensor_spec.TensorSpec([], dtypes.int64),
+        num_parallel_workers=2)
+    get_next = self.getNext(dataset)
+    self.assertAllEqual(0, self.evaluate(get_next()))
+    with self.assertRaisesRegex(errors.UnknownError, "generator failure"):
+      self.evaluate(get_next())
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testFromGeneratorParallelWorkersInvalidSignature(self):
+    with self.assertRaisesRegex(TypeError, "numeric or boolean dtype"):
+      dataset_ops.Dataset.from_generator(
+          _strided_range,
+          output_signature=tensor_spec.TensorSpec([], dtypes.string),
+          num_parallel_workers=2)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testFromGeneratorParallelWorkersInvalidCount(self):
+    with self.assertRaisesRegex(ValueError, "must be a positive integer"):
+      dataset_ops.Dataset.from_generator(
+          _strided_range,
+          output_signature=tensor_spec.TensorSpec([], dtypes.int64),
+          num_parallel_workers=0)
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testFromGeneratorBatched(self):
+
+    def generator():
+      for start in range(0, 10, 4):
+        stop = min(start + 4, 10)
+        yield {
+            "id": np.arange(start, stop, dtype=np.int64),
+            "feature": np.ones([stop - start, 2], dtype=np.float32) * start
+        }
+
+    dataset = dataset_ops.Dataset.from_generator(
+        generator,
+        output_signature={
+            "id": tensor_spec.TensorSpec([], dtypes.int64),
+            "feature": tensor_spec.TensorSpec([2], dtypes.float32)
+        },
+        batched=True)
+    self.assertEqual([], dataset.element_spec["id"].shape)
+    self.assertEqual([2], dataset.element_spec["feature"].shape)
+    self.assertDatasetProduces(
+        dataset,
+        expected_output=[{
+            "id": i,
+            "feature": np.ones([2], dtype=np.float32) * (i // 4 * 4)
+        } for i in range(10)])
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testFromGeneratorBatchedOutputTypes(self):
+
+    def generator():
+      yield [1, 2, 3]
+      yield [4]
+
+    dataset = dataset_ops.Dataset.from_generator(
+        generator, output_types=dtypes.int64, output_shapes=(), batched=True)
+    self.assertDatasetProduces(
+        dataset.batch(2), expected_output=[[1, 2], [3, 4]])
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testFromGeneratorBatchedShapeError(self):
+
+    def generator():
+      yield np.zeros([2, 3], dtype=np.int64)
+
+    dataset = dataset_ops.Dataset.from_generator(
+        generator, output_types=dtypes.int64, output_shapes=(2,), batched=True)
+    get_next = self.getNext(dataset)
+    with self.assertRaises(errors.InvalidArgumentError):
+      self.evaluate(get_next())
+
+  @combinations.generate(test_base.default_test_combinations())
+  def testFromGeneratorBatchedParallelWorkers(self):
+    dataset = dataset_ops.Dataset.from_generator(
+        _strided_batches,
+        args=(12, 5),
+        output_signature=tensor_spec.TensorSpec([], dtypes.int64),
+        num_parallel_workers=2,
+        batched=True)
+    self.assertDatasetProduces(
+        dataset, expected_output=list(range(12)), assert_items_equal=True)
+
   @combinations.generate(test_base.default_test_combinations())
   def testTypeIsListError(self):
 
@@ -132,6 +132,7 @@ class OptionsTest(test_base.DatasetTestBase, parameterized.TestCase):
     options.autotune.enabled = True
     options.autotune.cpu_budget = 10
     options.autotune.ram_budget = 20
+    options.autotune.host_wide = True
     options.deterministic = True
     options.experimental_external_state_policy = (
         options_lib.ExternalStatePolicy.FAIL)
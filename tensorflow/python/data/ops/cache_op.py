@@ -22,28 +22,40 @@ from tensorflow.python.framework import ops
 from tensorflow.python.ops import gen_dataset_ops
 
 
-def _cache(input_dataset, filename, name):  # pylint: disable=unused-private-name
-  return CacheDataset(input_dataset, filename, name)
+_FILE_FORMATS = (None, "mmap")
+
+
+def _cache(input_dataset, filename, name, file_format=None):  # pylint: disable=unused-private-name
+  return CacheDataset(input_dataset, filename, name, file_format)
 
 
 class CacheDataset(dataset_ops.UnaryUnchangedStructureDataset):
   """A `Dataset` that caches elements of its input."""
 
-  def __init__(self, input_dataset, filename, name=None):
+  def __init__(self, input_dataset, filename, name=None, file_format=None):
     """See `Dataset.cache()` for details."""
+    if file_format not in _FILE_FORMATS:
+      raise ValueError(f"Invalid `file_format`. Supported formats are "
+                       f"{_FILE_FORMATS}, but got {file_format!r}.")
+    if file_format is not None and isinstance(filename, str) and not filename:
+      raise ValueError(f"Invalid `filename`. Caching with "
+                       f"`file_format={file_format!r}` requires a filename.")
     self._input_dataset = input_dataset
     self._filename = ops.convert_to_tensor(
         filename, dtype=dtypes.string, name="filename")
     self._name = name
+    self._file_format = file_format or ""
     if tf2.enabled() and (context.executing_eagerly() or ops.inside_function()):
       variant_tensor = gen_dataset_ops.cache_dataset_v2(
           input_dataset._variant_tensor,  # pylint: disable=protected-access
           filename=self._filename,
           cache=gen_dataset_ops.dummy_memory_cache(),
+          file_format=self._file_format,
           **self._common_args)
     else:
       variant_tensor = gen_dataset_ops.cache_dataset(
           input_dataset._variant_tensor,  # pylint: disable=protected-access
           filename=self._filename,
+          file_format=self._file_format,
           **self._common_args)
     super().__init__(input_dataset, variant_tensor)
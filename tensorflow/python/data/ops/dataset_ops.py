@@ -883,7 +883,9 @@ class DatasetV2(
                      output_shapes=None,
                      args=None,
                      output_signature=None,
-                     name=None):
+                     name=None,
+                     num_parallel_workers=None,
+                     batched=False):
     """Creates a `Dataset` whose elements are generated by `generator`.
 
     Note: The current implementation of `Dataset.from_generator()` uses
@@ -943,6 +945,37 @@ class DatasetV2(
     tf.data operations within the generator function is an anti-pattern and may
     result in incremental memory growth.
 
+    If `num_parallel_workers` is set, `generator` runs in that many worker
+    processes instead of the calling process, which lets Python-heavy
+    generators scale beyond a single core. Each worker calls
+    `generator(*args, worker_index, num_workers)` and must yield its own,
+    disjoint share of the elements. The elements are handed back through shared
+    memory, without pickling, and are produced in round-robin order over the
+    workers. In this mode `generator` and the values of `args` must be
+    picklable, and every component of `output_signature` must be a
+    `tf.TensorSpec` with a numeric or boolean dtype.
+
+    If `batched=True`, `generator` yields whole batches of elements instead of
+    individual elements, which amortizes the per-call cost of the Python
+    function over the batch. `output_signature` still describes a single
+    element; every component of a yielded batch has an additional leading
+    dimension, whose size must be the same for all components. The batches
+    are split into individual elements by the runtime:
+
+    >>> def gen():
+    ...   yield np.arange(3), np.ones([3, 2])
+    ...   yield np.arange(3, 5), np.zeros([2, 2])
+    >>>
+    >>> dataset = tf.data.Dataset.from_generator(
+    ...     gen, batched=True,
+    ...     output_signature=(tf.TensorSpec(shape=(), dtype=tf.int64),
+    ...                       tf.TensorSpec(shape=(2,), dtype=tf.float64)))
+    >>> [x for x, _ in dataset.as_numpy_iterator()]
+    [0, 1, 2, 3, 4]
+
+    To keep the batches produced by `generator` intact, include the batch
+    dimension in `output_signature` and leave `batched` unset.
+
     Args:
       generator: A callable object that returns an object that supports the
         `iter()` protocol. If `args` is not specified, `generator` must take no
@@ -960,6 +993,10 @@ class DatasetV2(
         `generator`.
       name: (Optional.) A name for the tf.data operations used by
         `from_generator`.
+      num_parallel_workers: (Optional.) If set, the number of worker processes
+        in which `generator` is run.
+      batched: (Optional.) Whether `generator` yields batches of elements
+        rather than individual elements. Defaults to `False`.
 
     Returns:
       Dataset: A `Dataset`.
@@ -970,7 +1007,8 @@ class DatasetV2(
     from tensorflow.python.data.ops import from_generator_op
     return from_generator_op._from_generator(generator, output_types,
                                              output_shapes, args,
-                                             output_signature, name)
+                                             output_signature, name,
+                                             num_parallel_workers, batched)
     # pylint: enable=g-import-not-at-top,protected-access
 
   @staticmethod
@@ -1462,7 +1500,7 @@ class DatasetV2(
     return shuffle_op._shuffle(  # pylint: disable=protected-access
         self, buffer_size, seed, reshuffle_each_iteration, name=name)
 
-  def cache(self, filename="", name=None):
+  def cache(self, filename="", name=None, file_format=None):
     """Caches the elements in this dataset.
 
     The first time the dataset is iterated over, its elements will be cached
@@ -1504,20 +1542,44 @@ class DatasetV2(
     through the dataset. If you wish to randomize the iteration order, make sure
     to call `shuffle` *after* calling `cache`.
 
+    When `file_format="mmap"`, elements are written to `<filename>.mmap_data`
+    with a fixed-size record per element, and an index file
+    `<filename>.mmap_index` is written once the input has been exhausted.
+    Later iterations map the data file into memory and produce elements that
+    alias the mapped pages instead of deserializing them, so epochs after the
+    first are nearly free and processes on the same host share the cached data
+    through the page cache. The cache also supports reading elements by index
+    in constant time (see `tf.data.experimental.at`). This format requires all
+    components to be numeric or boolean tensors with fully defined shapes, and
+    does not support checkpointing the iterator while the cache is being
+    written.
+
+    ```python
+    dataset = tf.data.Dataset.range(5).map(lambda x: tf.fill([3], x))
+    dataset = dataset.cache("/path/to/file", file_format="mmap")
+    ```
+
     Args:
       filename: A `tf.string` scalar `tf.Tensor`, representing the name of a
         directory on the filesystem to use for caching elements in this Dataset.
         If a filename is not provided, the dataset will be cached in memory.
       name: (Optional.) A name for the tf.data operation.
+      file_format: (Optional.) The format of the cache file. Either `None`,
+        which uses a checkpoint-style tensor bundle, or `"mmap"`, which uses a
+        memory-mapped file with fixed-size records. Requires `filename`.
 
     Returns:
       A new `Dataset` with the transformation applied as described above.
+
+    Raises:
+      ValueError: If `file_format` is not supported, or if it is set without a
+        `filename`.
     """
     # Loaded lazily due to a circular dependency (dataset_ops -> cache_op ->
     # -> dataset_ops).
     # pylint: disable=g-import-not-at-top,protected-access
     from tensorflow.python.data.ops import cache_op
-    return cache_op._cache(self, filename, name)
+    return cache_op._cache(self, filename, name, file_format)
     # pylint: enable=g-import-not-at-top,protected-access
 
   def take(self, count, name=None):
@@ -3934,7 +3996,9 @@ class DatasetV1(DatasetV2, data_types.DatasetV1):
                      output_shapes=None,
                      args=None,
                      output_signature=None,
-                     name=None):
+                     name=None,
+                     num_parallel_workers=None,
+                     batched=False):
     # Calling DatasetV2.from_generator with output_shapes or output_types is
     # deprecated, but this is already checked by the decorator on this function.
     with deprecation.silence():
@@ -3945,7 +4009,9 @@ class DatasetV1(DatasetV2, data_types.DatasetV1):
               output_shapes,
               args,
               output_signature,
-              name=name))
+              name=name,
+              num_parallel_workers=num_parallel_workers,
+              batched=batched))
 
   @staticmethod
   @functools.wraps(DatasetV2.range)
@@ -3988,8 +4054,10 @@ class DatasetV1(DatasetV2, data_types.DatasetV1):
             buffer_size, seed, reshuffle_each_iteration, name=name))
 
   @functools.wraps(DatasetV2.cache)
-  def cache(self, filename="", name=None):
-    return DatasetV1Adapter(super(DatasetV1, self).cache(filename, name=name))
+  def cache(self, filename="", name=None, file_format=None):
+    return DatasetV1Adapter(
+        super(DatasetV1, self).cache(
+            filename, name=name, file_format=file_format))
 
   @functools.wraps(DatasetV2.take)
   def take(self, count, name=None):
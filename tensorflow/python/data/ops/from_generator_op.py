@@ -19,6 +19,7 @@ import numpy as np
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.data.ops import structured_function
 from tensorflow.python.data.util import nest
+from tensorflow.python.data.util import shared_memory_pool
 from tensorflow.python.data.util import structure
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
@@ -29,8 +30,14 @@ from tensorflow.python.ops import gen_dataset_ops
 from tensorflow.python.ops import script_ops
 
 
-def _from_generator(generator, output_types, output_shapes, args,
-                    output_signature, name):
+def _from_generator(generator,
+                    output_types,
+                    output_shapes,
+                    args,
+                    output_signature,
+                    name,
+                    num_parallel_workers=None,
+                    batched=False):
   """Creates a `Dataset` whose elements are generated by `generator`.
 
   Note: The current implementation of `Dataset.from_generator()` uses
@@ -90,6 +97,47 @@ def _from_generator(generator, output_types, output_shapes, args,
   tf.data operations within the generator function is an anti-pattern and may
   result in incremental memory growth.
 
+  If `num_parallel_workers` is set, `generator` runs in that many worker
+  processes instead of the calling process, which lets Python-heavy generators
+  scale beyond a single core. Each worker calls
+  `generator(*args, worker_index, num_workers)` and must yield its own,
+  disjoint share of the elements. The elements are handed back through shared
+  memory and are produced in round-robin order over the workers:
+
+  >>> def gen(stop, worker_index, num_workers):
+  ...   for i in range(worker_index, stop, num_workers):
+  ...     yield i
+  >>>
+  >>> dataset = tf.data.Dataset.from_generator(
+  ...     gen, args=(6,), num_parallel_workers=2,
+  ...     output_signature=tf.TensorSpec(shape=(), dtype=tf.int64))
+
+  In this mode `generator` and the values of `args` must be picklable, and
+  every component of `output_signature` must be a `tf.TensorSpec` with a
+  numeric or boolean dtype.
+
+  If `batched=True`, `generator` yields whole batches of elements instead of
+  individual elements, which amortizes the per-call cost of the Python
+  function over the batch. `output_signature` (or `output_types` and
+  `output_shapes`) still describes a single element; every component of a
+  yielded batch has an additional leading dimension, whose size must be the
+  same for all components. The batches are split into individual elements
+  by the runtime:
+
+  >>> def gen():
+  ...   yield np.arange(3), np.ones([3, 2])
+  ...   yield np.arange(3, 5), np.zeros([2, 2])
+  >>>
+  >>> dataset = tf.data.Dataset.from_generator(
+  ...     gen, batched=True,
+  ...     output_signature=(tf.TensorSpec(shape=(), dtype=tf.int64),
+  ...                       tf.TensorSpec(shape=(2,), dtype=tf.float64)))
+  >>> [x for x, _ in dataset.as_numpy_iterator()]
+  [0, 1, 2, 3, 4]
+
+  To keep the batches produced by `generator` intact, include the batch
+  dimension in `output_signature` and leave `batched` unset.
+
   Args:
     generator: A callable object that returns an object that supports the
       `iter()` protocol. If `args` is not specified, `generator` must take no
@@ -105,6 +153,10 @@ def _from_generator(generator, output_types, output_shapes, args,
       corresponding to each component of an element yielded by `generator`.
     name: (Optional.) A name for the tf.data operations used by
       `from_generator`.
+    num_parallel_workers: (Optional.) If set, the number of worker processes
+      in which `generator` is run.
+    batched: (Optional.) Whether `generator` yields batches of elements rather
+      than individual elements. Defaults to `False`.
 
   Returns:
     Dataset: A `Dataset`.
@@ -112,6 +164,10 @@ def _from_generator(generator, output_types, output_shapes, args,
   if not callable(generator):
     raise TypeError("`generator` must be a Python callable.")
 
+  if num_parallel_workers is not None and num_parallel_workers < 1:
+    raise ValueError(f"`num_parallel_workers` must be a positive integer, but "
+                     f"got {num_parallel_workers}.")
+
   if output_signature is not None:
     if output_types is not None:
       raise TypeError("The `output_types` argument can not be used together "
@@ -141,6 +197,12 @@ def _from_generator(generator, output_types, output_shapes, args,
     output_signature = nest.map_structure_up_to(output_types,
                                                 tensor_spec.TensorSpec,
                                                 output_shapes, output_types)
+  if batched:
+    # The generator dataset produces whole batches, which are split by an
+    # `unbatch()` transformation below.
+    output_signature = nest.map_structure(
+        lambda spec: spec._batch(None),  # pylint: disable=protected-access
+        output_signature)
   if all(
       isinstance(x, tensor_spec.TensorSpec)
       for x in nest.flatten(output_signature)):
@@ -154,6 +216,10 @@ def _from_generator(generator, output_types, output_shapes, args,
   else:
     args = tuple(ops.convert_n_to_tensor(args, name="args"))
 
+  if num_parallel_workers is not None:
+    generator = _shared_memory_generator(generator, output_signature,
+                                         num_parallel_workers)
+
   generator_state = dataset_ops.DatasetV2._GeneratorState(generator)  # pylint: disable=protected-access
 
   def get_iterator_id_fn(unused_dummy):
@@ -328,7 +394,51 @@ def _from_generator(generator, output_types, output_shapes, args,
   # into a flat_map here enables multiple repetitions and/or nested
   # versions of the returned dataset to be created, because it forces
   # the generation of a new ID for each version.
-  return id_dataset.flat_map(flat_map_fn, name=name)
+  dataset = id_dataset.flat_map(flat_map_fn, name=name)
+  if batched:
+    dataset = dataset.unbatch(name=name)
+  return dataset
+
+
+def _shared_memory_generator(generator, output_signature, num_workers):
+  """Returns a generator that runs `generator` in `num_workers` processes.
+
+  Args:
+    generator: The generator passed to `from_generator`.
+    output_signature: A (nested) structure of `tf.TensorSpec` objects describing
+      the elements yielded by `generator`.
+    num_workers: The number of worker processes.
+
+  Returns:
+    A callable that takes the `args` of `from_generator` and returns an
+    iterator over the elements produced by the workers.
+
+  Raises:
+    TypeError: If `output_signature` contains a component that can not be
+      transferred through shared memory.
+  """
+  flat_specs = nest.flatten(output_signature)
+  for spec in flat_specs:
+    if (not isinstance(spec, tensor_spec.TensorSpec) or
+        not spec.dtype.is_numpy_compatible or spec.dtype == dtypes.string):
+      raise TypeError(
+          f"`num_parallel_workers` requires every component of the output "
+          f"signature to be a `tf.TensorSpec` with a numeric or boolean dtype, "
+          f"but found {spec}.")
+  numpy_structure = nest.map_structure(lambda spec: spec.dtype.as_numpy_dtype,
+                                       output_signature)
+  # Size the slots to fit exactly one element when the shapes are static.
+  slot_bytes = None
+  if all(spec.shape.is_fully_defined() for spec in flat_specs):
+    slot_bytes = shared_memory_pool.element_size(
+        [spec.shape.as_list() for spec in flat_specs],
+        nest.flatten(numpy_structure))
+
+  def parallel_generator(*args):
+    return shared_memory_pool.SharedMemoryGeneratorPool(
+        generator, args, numpy_structure, num_workers, slot_bytes=slot_bytes)
+
+  return parallel_generator
 
 
 class _GeneratorDataset(dataset_ops.DatasetSource):
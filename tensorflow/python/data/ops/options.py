@@ -229,6 +229,21 @@ class AutotuneOptions(options_lib.OptionsBase):
       docstring="When autotuning is enabled (through `autotune`), determines "
       "the algorithm to use.")
 
+  host_wide = options_lib.create_option(
+      name="host_wide",
+      ty=bool,
+      docstring="When autotuning is enabled (through `autotune`), determines "
+      "whether the CPU and RAM budgets are shared by all iterators of the "
+      "process that set this option, instead of being available to each of "
+      "them. The shared budgets are the largest budgets of the iterators "
+      "sharing them. Each iterator is granted a share of the CPU budget that "
+      "depends on the CPU it needs to produce elements as fast as its "
+      "consumer requests them, and a proportional share of the RAM budget. "
+      "The parallelism and buffer sizes of each pipeline are tuned within its "
+      "share, targeting the measured time between the consumer's requests. "
+      "The budgets granted to an iterator can be inspected with "
+      "`tf.data.experimental.get_pipeline_stats`. If None, defaults to False.")
+
   def _to_proto(self):
     pb = dataset_options_pb2.AutotuneOptions()
     if self.enabled is not None:
@@ -240,6 +255,8 @@ class AutotuneOptions(options_lib.OptionsBase):
     if self.autotune_algorithm is not None:
       pb.autotune_algorithm = AutotuneAlgorithm._to_proto(  # pylint: disable=protected-access
           self.autotune_algorithm)
+    if self.host_wide is not None:
+      pb.host_wide = self.host_wide
     return pb
 
   def _from_proto(self, pb):
@@ -252,6 +269,8 @@ class AutotuneOptions(options_lib.OptionsBase):
     if pb.WhichOneof("optional_autotune_algorithm") is not None:
       self.autotune_algorithm = AutotuneAlgorithm._from_proto(  # pylint: disable=protected-access
           pb.autotune_algorithm)
+    if pb.WhichOneof("optional_host_wide") is not None:
+      self.host_wide = pb.host_wide
 
   def _set_mutable(self, mutable):
     """Change the mutability value to `mutable` on this options and children."""
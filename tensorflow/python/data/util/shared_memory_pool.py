@@ -0,0 +1,307 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Runs a Python generator in worker processes over shared memory.
+
+Elements produced by the workers are written into pre-allocated
+`multiprocessing.shared_memory` slots and read back by the consumer without
+pickling the element payloads. Only a small header (the slot index and the
+component shapes) is sent through the control queues.
+"""
+
+import multiprocessing
+from multiprocessing import shared_memory
+import queue
+import traceback
+
+import numpy as np
+
+from tensorflow.python.data.util import nest
+
+# Number of shared memory slots allocated for each worker. Two slots let a
+# worker fill one slot while the consumer is copying out of the other.
+DEFAULT_SLOTS_PER_WORKER = 2
+
+# Size of a slot when the element size can not be computed from the output
+# signature. Elements that do not fit are sent through a dedicated block.
+DEFAULT_SLOT_BYTES = 1 << 20
+
+# Components are aligned within a slot so that the consumer can create
+# properly aligned NumPy views over the shared buffer.
+_ALIGNMENT = 64
+
+# Interval (in seconds) at which the consumer checks worker liveness while
+# waiting for an element.
+_POLL_INTERVAL_SECS = 1.0
+
+_ELEMENT = "element"
+_OVERSIZE = "oversize"
+_DONE = "done"
+_ERROR = "error"
+
+
+def _aligned(offset):
+  return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _layout(shapes, dtypes):
+  """Returns the byte offsets of each component and the total size."""
+  offsets = []
+  offset = 0
+  for shape, dtype in zip(shapes, dtypes):
+    offset = _aligned(offset)
+    offsets.append(offset)
+    offset += int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+  return offsets, offset
+
+
+def element_size(shapes, dtypes):
+  """Returns the number of slot bytes used by an element.
+
+  Args:
+    shapes: The shapes of the flattened components of the element.
+    dtypes: The NumPy dtypes of the flattened components of the element.
+
+  Returns:
+    The size, including alignment padding, of the element in a slot.
+  """
+  return _layout(shapes, dtypes)[1]
+
+
+def _write(buf, arrays, offsets):
+  for array, offset in zip(arrays, offsets):
+    view = np.ndarray(array.shape, array.dtype, buffer=buf, offset=offset)
+    view[...] = array
+
+
+def _read(buf, shapes, dtypes, offsets):
+  # The copy decouples the returned arrays from the slot, which is recycled
+  # as soon as this function returns.
+  return [
+      np.ndarray(shape, dtype, buffer=buf, offset=offset).copy()
+      for shape, dtype, offset in zip(shapes, dtypes, offsets)
+  ]
+
+
+def _worker_loop(generator, args, worker_index, num_workers, structure,
+                 dtypes, slot_names, free_slots, ready):
+  """Entry point of a worker process."""
+  slots = [shared_memory.SharedMemory(name=name) for name in slot_names]
+  try:
+    for element in generator(*args, worker_index, num_workers):
+      arrays = [
+          np.asarray(value, dtype=dtype) for value, dtype in zip(
+              nest.flatten_up_to(structure, element), dtypes)
+      ]
+      shapes = tuple(array.shape for array in arrays)
+      offsets, size = _layout(shapes, dtypes)
+      slot_index = free_slots.get()
+      if slot_index is None:
+        # The consumer is shutting down.
+        return
+      slot = slots[slot_index]
+      if size <= slot.size:
+        _write(slot.buf, arrays, offsets)
+        ready.put((_ELEMENT, slot_index, shapes))
+      else:
+        # Hand the slot back and transfer ownership of a dedicated block to
+        # the consumer, which unlinks it after reading. Spawned workers share
+        # the resource tracker of the consumer, so the block is not leaked if
+        # the consumer exits before reading it.
+        free_slots.put(slot_index)
+        block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        _write(block.buf, arrays, offsets)
+        name = block.name
+        block.close()
+        ready.put((_OVERSIZE, name, shapes))
+    ready.put((_DONE,))
+  except Exception as e:  # pylint: disable=broad-except
+    ready.put((_ERROR, "".join(
+        traceback.format_exception(type(e), e, e.__traceback__))))
+  finally:
+    for slot in slots:
+      slot.close()
+
+
+class SharedMemoryGeneratorPool:
+  """Iterates over the elements of a generator run in worker processes.
+
+  Each of the `num_workers` processes calls
+  `generator(*args, worker_index, num_workers)` and is expected to yield its
+  own, disjoint share of the elements. Elements are returned in round-robin
+  order over the workers, so the output is deterministic whenever each worker
+  yields a deterministic sequence. Workers that run out of elements are
+  dropped from the rotation.
+
+  Every element must be a (nested) structure of dense, numeric values matching
+  `structure`; the leaves of `structure` are the NumPy dtypes of the
+  components.
+  """
+
+  def __init__(self,
+               generator,
+               args,
+               structure,
+               num_workers,
+               slot_bytes=None,
+               slots_per_worker=DEFAULT_SLOTS_PER_WORKER):
+    """Starts the worker processes.
+
+    Args:
+      generator: A picklable callable. See the class docstring for the calling
+        convention.
+      args: A tuple of picklable arguments for `generator`.
+      structure: A (nested) structure of NumPy dtypes describing an element.
+      num_workers: The number of worker processes to start.
+      slot_bytes: (Optional.) The size of each shared memory slot. Defaults to
+        `DEFAULT_SLOT_BYTES`.
+      slots_per_worker: (Optional.) The number of slots owned by each worker.
+
+    Raises:
+      ValueError: If `num_workers` or `slots_per_worker` is not positive.
+    """
+    if num_workers < 1:
+      raise ValueError(f"`num_workers` must be positive, but got "
+                       f"{num_workers}.")
+    if slots_per_worker < 1:
+      raise ValueError(f"`slots_per_worker` must be positive, but got "
+                       f"{slots_per_worker}.")
+    if slot_bytes is None:
+      slot_bytes = DEFAULT_SLOT_BYTES
+    self._structure = structure
+    self._dtypes = [np.dtype(dtype) for dtype in nest.flatten(structure)]
+    self._closed = False
+    self._slots = []
+    self._free_slots = []
+    self._ready = []
+    self._processes = []
+    # `spawn` avoids forking a process that may hold TensorFlow runtime
+    # threads and locks.
+    context = multiprocessing.get_context("spawn")
+    try:
+      for worker_index in range(num_workers):
+        slots = [
+            shared_memory.SharedMemory(create=True, size=max(slot_bytes, 1))
+            for _ in range(slots_per_worker)
+        ]
+        self._slots.append(slots)
+        free_slots = context.Queue()
+        for slot_index in range(slots_per_worker):
+          free_slots.put(slot_index)
+        ready = context.Queue()
+        self._free_slots.append(free_slots)
+        self._ready.append(ready)
+        process = context.Process(
+            target=_worker_loop,
+            args=(generator, tuple(args), worker_index, num_workers,
+                  structure, self._dtypes, [slot.name for slot in slots],
+                  free_slots, ready),
+            daemon=True)
+        process.start()
+        self._processes.append(process)
+    except Exception:
+      self.close()
+      raise
+    self._active = list(range(num_workers))
+    self._position = 0
+
+  def __iter__(self):
+    return self
+
+  def __next__(self):
+    while self._active:
+      self._position %= len(self._active)
+      worker_index = self._active[self._position]
+      message = self._get(worker_index)
+      if message[0] == _DONE:
+        del self._active[self._position]
+        continue
+      self._position += 1
+      return nest.pack_sequence_as(self._structure,
+                                   self._receive(worker_index, message))
+    self.close()
+    raise StopIteration
+
+  def _get(self, worker_index):
+    """Waits for the next message of a worker, checking that it is alive."""
+    while True:
+      try:
+        message = self._ready[worker_index].get(timeout=_POLL_INTERVAL_SECS)
+        break
+      except queue.Empty:
+        process = self._processes[worker_index]
+        if not process.is_alive():
+          self.close()
+          raise RuntimeError(
+              f"Generator worker {worker_index} exited unexpectedly with "
+              f"exit code {process.exitcode}.")
+    if message[0] == _ERROR:
+      self.close()
+      raise RuntimeError(
+          f"Generator worker {worker_index} failed:\n{message[1]}")
+    return message
+
+  def _receive(self, worker_index, message):
+    """Copies an element out of shared memory and releases its buffer."""
+    kind, location, shapes = message
+    offsets, _ = _layout(shapes, self._dtypes)
+    if kind == _ELEMENT:
+      slot = self._slots[worker_index][location]
+      arrays = _read(slot.buf, shapes, self._dtypes, offsets)
+      self._free_slots[worker_index].put(location)
+      return arrays
+    block = shared_memory.SharedMemory(name=location)
+    try:
+      return _read(block.buf, shapes, self._dtypes, offsets)
+    finally:
+      block.close()
+      block.unlink()
+
+  def close(self):
+    """Stops the workers and releases all shared memory."""
+    if self._closed:
+      return
+    self._closed = True
+    for free_slots in self._free_slots:
+      free_slots.put(None)
+    for process in self._processes:
+      process.join(timeout=_POLL_INTERVAL_SECS)
+      if process.is_alive():
+        process.terminate()
+        process.join()
+    for worker_index, ready in enumerate(self._ready):
+      # Release dedicated blocks that were produced but never consumed.
+      while True:
+        try:
+          message = ready.get_nowait()
+        except (queue.Empty, OSError, ValueError):
+          break
+        if message[0] == _OVERSIZE:
+          try:
+            block = shared_memory.SharedMemory(name=message[1])
+          except FileNotFoundError:
+            continue
+          block.close()
+          block.unlink()
+      ready.close()
+      self._free_slots[worker_index].close()
+    for slots in self._slots:
+      for slot in slots:
+        slot.close()
+        slot.unlink()
+
+  def __del__(self):
+    # `__init__` may have failed before all attributes were set.
+    if hasattr(self, "_closed"):
+      self.close()
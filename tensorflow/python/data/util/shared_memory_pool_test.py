@@ -0,0 +1,97 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for running generators in worker processes over shared memory."""
+
+import numpy as np
+
+from tensorflow.python.data.util import shared_memory_pool
+from tensorflow.python.platform import test
+
+
+def _strided_range(stop, worker_index, num_workers):
+  for i in range(worker_index, stop, num_workers):
+    yield i, (np.full([i % 3], i, dtype=np.float32), i % 2 == 0)
+
+
+def _large_elements(worker_index, num_workers):
+  del num_workers
+  yield np.arange(1 << 16, dtype=np.int64) + worker_index
+
+
+def _uneven(worker_index, num_workers):
+  del num_workers
+  for _ in range(worker_index + 1):
+    yield worker_index
+
+
+def _failing(worker_index, num_workers):
+  del worker_index, num_workers
+  yield 1
+  raise ValueError("worker failure")
+
+
+class SharedMemoryPoolTest(test.TestCase):
+
+  def testRoundRobinOrder(self):
+    pool = shared_memory_pool.SharedMemoryGeneratorPool(
+        _strided_range, (10,), (np.int64, (np.float32, np.bool_)),
+        num_workers=3)
+    elements = list(pool)
+    self.assertEqual(list(range(10)), [int(i) for i, _ in elements])
+    for i, (values, even) in elements:
+      self.assertAllEqual(np.full([i % 3], i, dtype=np.float32), values)
+      self.assertEqual(i % 2 == 0, even)
+
+  def testOversizeElements(self):
+    pool = shared_memory_pool.SharedMemoryGeneratorPool(
+        _large_elements, (), np.int64, num_workers=2, slot_bytes=64)
+    elements = list(pool)
+    self.assertLen(elements, 2)
+    for worker_index, values in enumerate(elements):
+      self.assertAllEqual(
+          np.arange(1 << 16, dtype=np.int64) + worker_index, values)
+
+  def testUnevenWorkers(self):
+    pool = shared_memory_pool.SharedMemoryGeneratorPool(
+        _uneven, (), np.int64, num_workers=3)
+    self.assertEqual([0, 1, 2, 1, 2, 2], [int(x) for x in pool])
+
+  def testWorkerError(self):
+    pool = shared_memory_pool.SharedMemoryGeneratorPool(
+        _failing, (), np.int64, num_workers=1)
+    self.assertEqual(1, next(pool))
+    with self.assertRaisesRegex(RuntimeError, "worker failure"):
+      next(pool)
+
+  def testCloseBeforeExhaustion(self):
+    pool = shared_memory_pool.SharedMemoryGeneratorPool(
+        _strided_range, (100,), (np.int64, (np.float32, np.bool_)),
+        num_workers=2)
+    next(pool)
+    pool.close()
+    pool.close()
+
+  def testElementSize(self):
+    self.assertEqual(
+        72, shared_memory_pool.element_size([[2], []], [np.int32, np.int64]))
+
+  def testInvalidNumWorkers(self):
+    with self.assertRaisesRegex(ValueError, "must be positive"):
+      shared_memory_pool.SharedMemoryGeneratorPool(
+          _uneven, (), np.int64, num_workers=0)
+
+
+if __name__ == "__main__":
+  test.main()
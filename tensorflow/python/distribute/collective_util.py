@@ -18,6 +18,7 @@
 import copy
 import enum
 
+from tensorflow.python.distribute import gradient_compression
 from tensorflow.python.util import deprecation
 from tensorflow.python.util.tf_export import tf_export
 
@@ -86,7 +87,9 @@ class _OptionsExported(object):
   def __init__(self,
                bytes_per_pack=0,
                timeout_seconds=None,
-               implementation=CommunicationImplementation.AUTO):
+               implementation=CommunicationImplementation.AUTO,
+               overlap_backward=False,
+               compression=None):
     """Creates a CollectiveHints.
 
     Args:
@@ -107,6 +110,23 @@ class _OptionsExported(object):
         `AUTO`, `RING`, and `NCCL`. NCCL is generally more performant for GPU,
         but doesn't work for CPU. This only works for
         `tf.distribute.experimental.MultiWorkerMirroredStrategy`.
+      overlap_backward: a bool. If True, gradients are all-reduced in buckets
+        in reverse order, which is roughly the order in which backprop
+        computes them, and each bucket is reduced by its own collective. Inside
+        a `tf.function`, the collective of a bucket can then start as soon as
+        its gradients are computed, overlapping communication with the rest of
+        backprop. Buckets are `bytes_per_pack` large, or 25MiB if it's zero.
+        This only works for
+        `tf.distribute.experimental.MultiWorkerMirroredStrategy`.
+      compression: None, or the name of a codec which compresses dense floating
+        point values before they are all-reduced. Possible values include
+        `"float16"` and `"bfloat16"`, which cast values to lower precision,
+        `"top_k"`, which only all-reduces the 1% largest elements of each
+        value, and `"power_sgd"`, which all-reduces a rank 1 approximation of
+        each value. The last two keep the compression error of each replica
+        and add it to the value of the next step, so they should only be used
+        to all-reduce gradients. Compression only applies to all-reduces, i.e.
+        when values are reduced to their own devices.
 
     Raises:
       ValueError: When arguments have invalid value.
@@ -120,7 +140,9 @@ class Options(object):
   def __init__(self,
                bytes_per_pack=0,
                timeout_seconds=None,
-               implementation=CommunicationImplementation.AUTO):
+               implementation=CommunicationImplementation.AUTO,
+               overlap_backward=False,
+               compression=None):
     if bytes_per_pack < 0:
       raise ValueError(
           f"Argument `bytes_per_pack` must be >=0, Received {bytes_per_pack}.")
@@ -133,6 +155,8 @@ class Options(object):
     self.bytes_per_pack = bytes_per_pack
     self.timeout_seconds = timeout_seconds
     self.implementation = implementation
+    self.overlap_backward = overlap_backward
+    self.compression = gradient_compression.get(compression)
 
   __init__.__doc__ = _OptionsExported.__init__.__doc__
 
@@ -157,12 +181,18 @@ class Options(object):
       merged.timeout_seconds = options.timeout_seconds
     if options.implementation != CommunicationImplementation.AUTO:
       merged.implementation = options.implementation
+    if options.overlap_backward:
+      merged.overlap_backward = options.overlap_backward
+    if options.compression is not None:
+      merged.compression = options.compression
     return merged
 
   def __str__(self):
     return (f"Options(bytes_per_pack={self.bytes_per_pack},"
             f"timeout_seconds={self.timeout_seconds}, "
-            f"implementation={self.implementation})")
+            f"implementation={self.implementation}, "
+            f"overlap_backward={self.overlap_backward}, "
+            f"compression={self.compression})")
 
 
 @tf_export("distribute.experimental.CollectiveHints")
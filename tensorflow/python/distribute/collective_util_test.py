@@ -15,6 +15,7 @@
 """Test for utilities for collectives."""
 
 from tensorflow.python.distribute import collective_util
+from tensorflow.python.distribute import gradient_compression
 from tensorflow.python.eager import test
 
 
@@ -35,6 +36,26 @@ class OptionsTest(test.TestCase):
     self.assertEqual(options.bytes_per_pack, 50)
     self.assertEqual(options.timeout_seconds, 1)
 
+  def testMergeOverlapBackward(self):
+    options = collective_util.Options(bytes_per_pack=1)
+    self.assertFalse(options.overlap_backward)
+    merged = options.merge(collective_util.Options(overlap_backward=True))
+    self.assertTrue(merged.overlap_backward)
+    self.assertEqual(merged.bytes_per_pack, 1)
+    merged = merged.merge(collective_util.Options())
+    self.assertTrue(merged.overlap_backward)
+
+  def testCompression(self):
+    options = collective_util.Options(compression="top_k")
+    self.assertIsInstance(options.compression, gradient_compression.TopKCodec)
+    # Codecs are stateful, so they are shared by merged options.
+    merged = collective_util.Options(bytes_per_pack=1).merge(options)
+    self.assertIs(merged.compression, options.compression)
+    merged = merged.merge(collective_util.Options())
+    self.assertIs(merged.compression, options.compression)
+    with self.assertRaises(ValueError):
+      collective_util.Options(compression="zip")
+
 
 if __name__ == "__main__":
   test.main()
@@ -0,0 +1,107 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Schedulers deciding which worker executes the closures of a coordinator."""
+
+
+class ClosureScheduler(object):
+  """Decides which of the idle workers executes the next queued closure.
+
+  Without a scheduler, the closure queue of a `ClusterCoordinator` hands out
+  closures in FIFO order to whichever worker asks first. With a scheduler, an
+  idle worker only takes the next closure if `should_dispatch` allows it, and
+  keeps waiting otherwise.
+
+  The closure queue calls the methods of a scheduler while holding its lock, so
+  they do not need to be thread-safe, but should be cheap.
+  """
+
+  def should_dispatch(self, closure, worker_index, idle_worker_indices,
+                      num_queued_closures):
+    """Returns whether a worker should take the next closure now.
+
+    Args:
+      closure: the next `Closure` in the queue.
+      worker_index: the index of the worker asking for a closure.
+      idle_worker_indices: the indices of the other workers waiting for a
+        closure.
+      num_queued_closures: the number of closures in the queue.
+    """
+    raise NotImplementedError("must be implemented in descendants")
+
+  def record_closure_latency(self, worker_index, duration_sec):
+    """Records the time a worker took to execute a closure."""
+    pass
+
+
+class LoadAwareClosureScheduler(ClosureScheduler):
+  """Prefers fast workers, and workers whose per-worker inputs are ready.
+
+  Each worker is ranked by whether the per-worker inputs of the closure, e.g.
+  its dataset iterator, have already been built on the worker, and then by an
+  exponential moving average of its closure execution time. Workers without
+  any recorded latency are ranked as the fastest, so that new and recovered
+  workers are tried first.
+
+  An idle worker takes the next closure unless the queued closures can all be
+  taken by idle workers ranked before it. When there is more work than idle
+  workers, every worker keeps executing closures. When there is little work,
+  e.g. towards the end of an epoch or while the coordinator is the bottleneck,
+  closures are not handed to stragglers, which would delay `join`.
+  """
+
+  def __init__(self, latency_decay=0.9):
+    """Creates a LoadAwareClosureScheduler.
+
+    Args:
+      latency_decay: the decay of the moving average of closure execution
+        times, in [0, 1). Higher values smooth out latency spikes more, but
+        adapt to a change of worker speed more slowly.
+
+    Raises:
+      ValueError: if `latency_decay` is not in [0, 1).
+    """
+    if not 0 <= latency_decay < 1:
+      raise ValueError("Argument `latency_decay` must be in [0, 1). "
+                       f"Received {latency_decay}.")
+    self._latency_decay = latency_decay
+    self._latencies = {}
+
+  def worker_latency(self, worker_index):
+    """Returns the average closure execution time of a worker, or None."""
+    return self._latencies.get(worker_index)
+
+  def record_closure_latency(self, worker_index, duration_sec):
+    latency = self._latencies.get(worker_index)
+    if latency is None:
+      self._latencies[worker_index] = duration_sec
+    else:
+      self._latencies[worker_index] = (
+          self._latency_decay * latency +
+          (1 - self._latency_decay) * duration_sec)
+
+  def _rank(self, closure, worker_index):
+    return (not closure.inputs_ready_on(worker_index),
+            self._latencies.get(worker_index, 0.))
+
+  def should_dispatch(self, closure, worker_index, idle_worker_indices,
+                      num_queued_closures):
+    rank = self._rank(closure, worker_index)
+    num_preferred_workers = 0
+    for other_worker_index in idle_worker_indices:
+      if self._rank(closure, other_worker_index) < rank:
+        num_preferred_workers += 1
+        if num_preferred_workers >= num_queued_closures:
+          return False
+    return True
@@ -0,0 +1,79 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for closure_scheduler.py."""
+
+from tensorflow.python.distribute.coordinator import closure_scheduler
+from tensorflow.python.eager import test
+
+
+class FakeClosure(object):
+
+  def __init__(self, ready_worker_indices=None):
+    self._ready_worker_indices = ready_worker_indices
+
+  def inputs_ready_on(self, worker_index):
+    return (self._ready_worker_indices is None or
+            worker_index in self._ready_worker_indices)
+
+
+class LoadAwareClosureSchedulerTest(test.TestCase):
+
+  def testRecordClosureLatency(self):
+    scheduler = closure_scheduler.LoadAwareClosureScheduler(latency_decay=0.5)
+    self.assertIsNone(scheduler.worker_latency(0))
+    scheduler.record_closure_latency(0, 2.)
+    self.assertEqual(scheduler.worker_latency(0), 2.)
+    scheduler.record_closure_latency(0, 4.)
+    self.assertEqual(scheduler.worker_latency(0), 3.)
+
+  def testPreferFastWorkers(self):
+    scheduler = closure_scheduler.LoadAwareClosureScheduler()
+    scheduler.record_closure_latency(0, 1.)
+    scheduler.record_closure_latency(1, 2.)
+    scheduler.record_closure_latency(2, 10.)
+    closure = FakeClosure()
+
+    self.assertTrue(scheduler.should_dispatch(closure, 0, [1, 2], 1))
+    self.assertFalse(scheduler.should_dispatch(closure, 1, [0, 2], 1))
+    self.assertTrue(scheduler.should_dispatch(closure, 1, [0, 2], 2))
+    self.assertFalse(scheduler.should_dispatch(closure, 2, [0, 1], 2))
+    self.assertTrue(scheduler.should_dispatch(closure, 2, [0, 1], 3))
+    # Without faster idle workers, slow workers still execute closures.
+    self.assertTrue(scheduler.should_dispatch(closure, 2, [], 1))
+
+  def testPreferWorkersWithoutLatency(self):
+    scheduler = closure_scheduler.LoadAwareClosureScheduler()
+    scheduler.record_closure_latency(0, 1.)
+    closure = FakeClosure()
+
+    self.assertFalse(scheduler.should_dispatch(closure, 0, [1], 1))
+    self.assertTrue(scheduler.should_dispatch(closure, 1, [0], 1))
+
+  def testPreferWorkersWithReadyInputs(self):
+    scheduler = closure_scheduler.LoadAwareClosureScheduler()
+    scheduler.record_closure_latency(0, 10.)
+    scheduler.record_closure_latency(1, 1.)
+    closure = FakeClosure(ready_worker_indices=[0])
+
+    self.assertTrue(scheduler.should_dispatch(closure, 0, [1], 1))
+    self.assertFalse(scheduler.should_dispatch(closure, 1, [0], 1))
+
+  def testInvalidLatencyDecay(self):
+    with self.assertRaisesRegex(ValueError, "latency_decay"):
+      closure_scheduler.LoadAwareClosureScheduler(latency_decay=1.)
+
+
+if __name__ == "__main__":
+  test.main()
@@ -27,6 +27,7 @@ import weakref
 
 from six.moves import queue
 
+from tensorflow.python.distribute.coordinator import closure_scheduler as closure_scheduler_lib
 from tensorflow.python.distribute.coordinator import coordinator_context
 from tensorflow.python.distribute.coordinator import metric_utils
 from tensorflow.python.distribute.coordinator import remote_value
@@ -176,6 +177,29 @@ def _select_worker_slice(worker_id, structured):
   return nest.map_structure(_get, structured)
 
 
+# Caches the `tf.function`s executing a scheduled function for several steps,
+# keyed by the scheduled function and then by the number of steps.
+_steps_functions = weakref.WeakKeyDictionary()
+
+
+def _get_steps_function(function, steps):
+  """Returns a `tf.function` calling `function` `steps` times in a row."""
+  steps_functions = _steps_functions.setdefault(function, {})
+  if steps not in steps_functions:
+    # A weak reference is used so that the cache does not keep `function`
+    # alive.
+    function_ref = weakref.ref(function)
+
+    def steps_function(*args, **kwargs):
+      fn = function_ref()
+      # Automatic control dependencies run the calls in order.
+      return [fn(*args, **kwargs) for _ in range(steps)]
+
+    steps_functions[steps] = def_function.function(
+        steps_function, autograph=False)
+  return steps_functions[steps]
+
+
 def _disallow_remote_value_as_input(structured):
   """Raises if any element of `structured` is a RemoteValue."""
 
@@ -201,6 +225,10 @@ class Closure(object):
 
     _disallow_remote_value_as_input(self._args)
     _disallow_remote_value_as_input(self._kwargs)
+    self._per_worker_inputs = [
+        x for x in nest.flatten((self._args, self._kwargs))
+        if isinstance(x, PerWorkerValues)
+    ]
 
     if isinstance(function, def_function.Function):
       replica_args = _select_worker_slice(0, self._args)
@@ -237,6 +265,8 @@ class Closure(object):
       self._function = function
 
     self._output_remote_value_ref = None
+    # The time at which the closure was last put into the closure queue.
+    self.queued_time = None
 
   def build_output_remote_value(self):
     if self._output_remote_value_ref is None:
@@ -255,6 +285,15 @@ class Closure(object):
       return method(output_remote_value)
     return None
 
+  def inputs_ready_on(self, worker_index):
+    """Returns whether the per-worker inputs are built on the given worker."""
+    for per_worker_input in self._per_worker_inputs:
+      value = per_worker_input._values[worker_index]  # pylint: disable=protected-access
+      if (isinstance(value, RemoteValueImpl) and
+          value._status is not RemoteValueStatus.READY):  # pylint: disable=protected-access
+        return False
+    return True
+
   def mark_cancelled(self):
     e = errors.CancelledError(
         None, None, "The corresponding function is "
@@ -287,10 +326,61 @@ class Closure(object):
                                     replica_args),
                 **nest.map_structure(coordinator_context.maybe_get_remote_value,
                                      replica_kwargs))
+    self._set_output_values(output_values)
+
+  def _set_output_values(self, output_values):
     self.maybe_call_with_output_remote_value(
         lambda r: r._set_values(output_values))  # pylint: disable=protected-access
 
 
+class StepsClosure(Closure):
+  """Holds a function to be executed for several steps in one remote call.
+
+  The function is called `steps` times in a row by a single `tf.function`, so
+  that the steps only cost the coordinator one closure and one remote function
+  execution. Each step still gets its own output `RemoteValue`. If the closure
+  fails, all of its steps are executed again.
+  """
+
+  def __init__(self, function, steps, cancellation_mgr, args=None,
+               kwargs=None):
+    super(StepsClosure, self).__init__(
+        _get_steps_function(function, steps),
+        cancellation_mgr,
+        args=args,
+        kwargs=kwargs)
+    self._steps = steps
+
+  def build_output_remote_value(self):
+    """Returns a list with the output `RemoteValue` of each step."""
+    if self._output_remote_value_ref is None:
+      ret = [
+          RemoteValueImpl(None, type_spec)
+          for type_spec in self._output_type_spec
+      ]
+      self._output_remote_value_ref = [weakref.ref(r) for r in ret]
+      return ret
+    else:
+      raise ValueError(
+          "The output of the Closure cannot be built more than once.")
+
+  def maybe_call_with_output_remote_value(self, method):
+    if self._output_remote_value_ref is None:
+      return None
+    for output_remote_value_ref in self._output_remote_value_ref:
+      output_remote_value = output_remote_value_ref()
+      if output_remote_value is not None:
+        method(output_remote_value)
+    return None
+
+  def _set_output_values(self, output_values):
+    for output_remote_value_ref, step_output_values in zip(
+        self._output_remote_value_ref, output_values):
+      output_remote_value = output_remote_value_ref()
+      if output_remote_value is not None:
+        output_remote_value._set_values(step_output_values)  # pylint: disable=protected-access
+
+
 class ResourceClosure(Closure):
 
   def build_output_remote_value(self):
@@ -309,7 +399,14 @@ class _CoordinatedClosureQueue(object):
   This class is thread-safe.
   """
 
-  def __init__(self):
+  def __init__(self, scheduler=None):
+    """Creates a _CoordinatedClosureQueue.
+
+    Args:
+      scheduler: an optional `ClosureScheduler` deciding which worker takes each
+        closure of the global queue. If None, closures are handed out in FIFO
+        order to the first worker asking for one.
+    """
     # `self._inflight_closure_count` only tracks the number of inflight closures
     # that are "in generation". Once an error occurs, error generation is
     # incremented and all subsequent arriving closures (from inflight) are
@@ -346,6 +443,11 @@ class _CoordinatedClosureQueue(object):
     self._tagged_queue = collections.defaultdict(queue.Queue)
     self._error = None
 
+    self._scheduler = scheduler
+    # The tags of the workers waiting in `get`, which the scheduler can hand
+    # the next closure to.
+    self._idle_worker_tags = set()
+
     # The following is a lock to make sure when `wait` is called and before it
     # returns no `put` can be executed during this period. It is because `wait`
     # won't know what to do with newly put closures. This lock adds an cutoff
@@ -391,6 +493,7 @@ class _CoordinatedClosureQueue(object):
         closure.mark_cancelled()
       except queue.Empty:
         break
+    self._record_queue_depth()
     # The cancellation manager cannot be reused once cancelled. After all
     # closures (queued or inflight) are cleaned up, recreate the cancellation
     # manager with clean state.
@@ -417,6 +520,34 @@ class _CoordinatedClosureQueue(object):
       finally:
         self._error = None
 
+  def _record_queue_depth(self):
+    metric_utils.set_gauge("closure_queue_depth", self._queue.qsize())
+
+  def _notify_closures_queued(self):
+    """Wakes up workers waiting for a closure of the global queue.
+
+    This method expects self._queue_lock to be held prior to entry.
+    """
+    if self._scheduler is None:
+      self._closures_queued_condition.notify()
+    else:
+      # The scheduler may not let the worker woken up take the closure, so all
+      # waiting workers are woken up.
+      self._closures_queued_condition.notify_all()
+
+  def _should_take_queued_closure(self, tag):
+    """Returns whether the worker of `tag` should take a queued closure.
+
+    This method expects self._queue_lock to be held prior to entry.
+    """
+    if self._queue.empty():
+      return False
+    if self._scheduler is None or tag is None:
+      return True
+    return self._scheduler.should_dispatch(
+        self._queue.queue[0], tag,
+        [t for t in self._idle_worker_tags if t != tag], self._queue.qsize())
+
   def put(self, closure, tag=None):
     """Put a closure into the queue for later execution.
 
@@ -435,15 +566,19 @@ class _CoordinatedClosureQueue(object):
     else:
       with self._put_wait_lock, self._queue_lock:
         self._queue_free_slot_condition.wait_for(lambda: not self._queue.full())
+        closure.queued_time = time.time()
         self._queue.put(closure, block=False)
+        self._record_queue_depth()
         self._raise_if_error()
-        self._closures_queued_condition.notify()
+        self._notify_closures_queued()
 
   def get(self, timeout=None, tag=None):
     """Return a closure from the queue to be executed.
 
     It will try to fetch an item from the queue with the given tag. If this
-    queue is empty, it will then check the global queue.
+    queue is empty, it will then check the global queue. If the queue has a
+    scheduler, a closure of the global queue is only returned once the
+    scheduler lets the worker of `tag` take it.
 
     Args:
       timeout: timeout when waiting for a closure to be put.
@@ -454,21 +589,41 @@ class _CoordinatedClosureQueue(object):
       a closure or None after timeout.
     """
     with self._queue_lock:
-      while (self._should_process_closures and self._queue.empty() and
-             (tag is None or self._tagged_queue[tag].empty())):
-        if not self._closures_queued_condition.wait(timeout=timeout):
+      if tag is not None:
+        self._idle_worker_tags.add(tag)
+      try:
+        while (self._should_process_closures and
+               (tag is None or self._tagged_queue[tag].empty()) and
+               not self._should_take_queued_closure(tag)):
+          if not self._closures_queued_condition.wait(timeout=timeout):
+            return None
+        if not self._should_process_closures:
           return None
-      if not self._should_process_closures:
-        return None
-      if tag is not None and not self._tagged_queue[tag].empty():
-        closure = self._tagged_queue[tag].get(block=False)
+        if tag is not None and not self._tagged_queue[tag].empty():
+          closure = self._tagged_queue[tag].get(block=False)
+          return closure
+        closure = self._queue.get(block=False)
+        assert closure.tag is None
+        assert tag is None or self._tagged_queue[tag].empty()
+        self._queue_free_slot_condition.notify()
+        self._record_queue_depth()
+        metric_utils.add_sample("closure_queuing",
+                                time.time() - closure.queued_time)
+        self._inflight_closure_count += 1
         return closure
-      closure = self._queue.get(block=False)
-      assert closure.tag is None
-      assert tag is None or self._tagged_queue[tag].empty()
-      self._queue_free_slot_condition.notify()
-      self._inflight_closure_count += 1
-      return closure
+      finally:
+        if tag is not None:
+          self._idle_worker_tags.discard(tag)
+          # Other waiting workers may have been held back in favor of this one.
+          if self._scheduler is not None and not self._queue.empty():
+            self._closures_queued_condition.notify_all()
+
+  def record_closure_latency(self, tag, duration_sec):
+    """Records the time the worker of `tag` took to execute a closure."""
+    if self._scheduler is None:
+      return
+    with self._queue_lock:
+      self._scheduler.record_closure_latency(tag, duration_sec)
 
   def mark_finished(self):
     """Let the queue know that a closure has been successfully executed."""
@@ -492,8 +647,10 @@ class _CoordinatedClosureQueue(object):
         closure.mark_cancelled()
       else:
         self._queue_free_slot_condition.wait_for(lambda: not self._queue.full())
+        closure.queued_time = time.time()
         self._queue.put(closure, block=False)
-        self._closures_queued_condition.notify()
+        self._record_queue_depth()
+        self._notify_closures_queued()
       self._inflight_closure_count -= 1
       if self._inflight_closure_count == 0:
         self._no_inflight_closure_condition.notify_all()
@@ -1081,11 +1238,14 @@ class Worker(object):
               lambda: self._cluster.closure_queue.put_back(closure)),
           on_recovery_fn=self._on_worker_recovery,
           worker_device_name=self.device_name):
+        start_time = time.time()
         closure.execute_on(self)
         with metric_utils.monitored_timer("remote_value_fetch"):
           # Copy the remote tensor to local (the coordinator) in case worker
           # becomes unavailable at a later time.
           closure.maybe_call_with_output_remote_value(lambda r: r.get())
+        self._cluster.closure_queue.record_closure_latency(
+            self.worker_index, time.time() - start_time)
         self._cluster.closure_queue.mark_finished()
     except Exception as e:  # pylint: disable=broad-except
       # Avoid logging the derived cancellation error
@@ -1218,8 +1378,17 @@ class Cluster(object):
       closures.
   """
 
-  def __init__(self, strategy):
-    """Initializes the cluster instance."""
+  def __init__(self, strategy, closure_scheduler=None):
+    """Initializes the cluster instance.
+
+    Args:
+      strategy: the `ParameterServerStrategyV2` of the cluster.
+      closure_scheduler: an optional `ClosureScheduler` deciding which worker
+        executes each scheduled closure. If None, a `LoadAwareClosureScheduler`
+        is used when the `TF_COORDINATOR_LOAD_AWARE_SCHEDULING` environment
+        variable is set, and closures are executed in FIFO order by the first
+        available worker otherwise.
+    """
 
     self._num_workers = strategy._num_workers
     self._num_ps = strategy._num_ps
@@ -1252,7 +1421,10 @@ class Cluster(object):
     self._transient_timeouts_lock = threading.Lock()
     self._transient_timeouts_count = 0
 
-    self.closure_queue = _CoordinatedClosureQueue()
+    if (closure_scheduler is None and
+        os.getenv("TF_COORDINATOR_LOAD_AWARE_SCHEDULING")):
+      closure_scheduler = closure_scheduler_lib.LoadAwareClosureScheduler()
+    self.closure_queue = _CoordinatedClosureQueue(closure_scheduler)
     # Set this environment variable to use an experimental
     # integration with the runtime coordination service to aid in failure
     # detection and handling. This will not affect the functionality of
@@ -1336,6 +1508,29 @@ class Cluster(object):
     self.closure_queue.put(closure)
     return ret
 
+  def schedule_steps(self, function, steps, args, kwargs):
+    """Schedules `function` to be executed `steps` times by a worker.
+
+    Args:
+      function: The function to be dispatched to a worker for execution
+        asynchronously.
+      steps: The number of times `function` is executed.
+      args: Positional arguments for `fn`.
+      kwargs: Keyword arguments for `fn`.
+
+    Returns:
+      A list of `steps` `RemoteValue` objects.
+    """
+    closure = StepsClosure(
+        function,
+        steps,
+        self.closure_queue._cancellation_mgr,  # pylint: disable=protected-access
+        args=args,
+        kwargs=kwargs)
+    ret = closure.build_output_remote_value()
+    self.closure_queue.put(closure)
+    return ret
+
   def join(self):
     """Blocks until all scheduled functions are executed."""
     self.closure_queue.wait()
@@ -1513,6 +1708,66 @@ class ClusterCoordinator(object):
       self.strategy.extended._being_scheduled = False  # pylint: disable=protected-access
       return schedule_remote_value
 
+  def schedule_steps(self, fn, steps, args=None, kwargs=None):
+    """Schedules `fn` to be executed `steps` times in a row on a worker.
+
+    This is equivalent to calling `schedule` `steps` times with the same
+    arguments, except that all the steps are executed by a single remote
+    function call on one worker. When `fn` is a small step function, this
+    amortizes the overhead of the coordinator, which otherwise has to dispatch
+    each step to a worker separately.
+
+    ```python
+    per_worker_iterator = iter(coordinator.create_per_worker_dataset(...))
+
+    @tf.function
+    def train_step(iterator):
+      ...
+
+    losses = coordinator.schedule_steps(
+        train_step, steps=10, args=(per_worker_iterator,))
+    ```
+
+    Steps are scheduled and retried together: if the worker fails while
+    executing them, all of them are executed again on an available worker.
+    If any step raises an error, the error is set on the `RemoteValue` of every
+    step and reported by `schedule`, `join` or `done` like the errors of other
+    scheduled functions.
+
+    Args:
+      fn: A `tf.function`; the function to be dispatched to a worker for
+        execution asynchronously.
+      steps: A positive integer, the number of times `fn` is executed.
+      args: Positional arguments for `fn`.
+      kwargs: Keyword arguments for `fn`.
+
+    Returns:
+      A list of `steps` `tf.distribute.experimental.coordinator.RemoteValue`
+      objects, which represent the output of each step.
+
+    Raises:
+      TypeError: if `fn` is not a `tf.function`.
+      ValueError: if `steps` is not a positive integer.
+      Exception: one of the exceptions caught by the coordinator from any
+        previously scheduled function, since the last time an error was thrown
+        or since the beginning of the program.
+    """
+    if not isinstance(fn,
+                      (def_function.Function, tf_function.ConcreteFunction)):
+      raise TypeError(
+          "`tf.distribute.experimental.coordinator.ClusterCoordinator."
+          "schedule_steps` only accepts a `tf.function` or a concrete "
+          "function.")
+    if not isinstance(steps, int) or steps < 1:
+      raise ValueError("Argument `steps` must be a positive integer. "
+                       f"Received {steps}.")
+    with self.strategy.scope():
+      self.strategy.extended._being_scheduled = True  # pylint: disable=protected-access
+      schedule_remote_values = self._cluster.schedule_steps(
+          fn, steps, args=args, kwargs=kwargs)
+      self.strategy.extended._being_scheduled = False  # pylint: disable=protected-access
+      return schedule_remote_values
+
   def join(self):
     """Blocks until all the scheduled functions have finished execution.
 
@@ -34,6 +34,7 @@ from tensorflow.python.distribute import input_lib
 from tensorflow.python.distribute import multi_worker_test_base
 from tensorflow.python.distribute import parameter_server_strategy_v2
 from tensorflow.python.distribute.cluster_resolver import SimpleClusterResolver
+from tensorflow.python.distribute.coordinator import closure_scheduler
 from tensorflow.python.distribute.coordinator import cluster_coordinator as coordinator_lib
 from tensorflow.python.distribute.coordinator import coordinator_context
 from tensorflow.python.distribute.coordinator import remote_value
@@ -438,6 +439,43 @@ class CoordinatedClosureQueueTest(test.TestCase):
     self.assertTrue(queue.done())
     queue.wait()
 
+  def testGetWithScheduler(self):
+    queue = coordinator_lib._CoordinatedClosureQueue(
+        closure_scheduler.LoadAwareClosureScheduler())
+    queue.record_closure_latency(0, 10.)
+    queue.record_closure_latency(1, 1.)
+    closure1 = self._create_closure(queue._cancellation_mgr)
+    closure2 = self._create_closure(queue._cancellation_mgr)
+    closures = {}
+
+    def start_get_thread(tag):
+
+      def get_fn():
+        closures[tag] = queue.get(tag=tag)
+
+      t = threading.Thread(target=get_fn, daemon=True)
+      t.start()
+      while tag not in queue._idle_worker_tags:
+        time.sleep(0.01)
+      return t
+
+    slow_thread = start_get_thread(0)
+    fast_thread = start_get_thread(1)
+
+    queue.put(closure1)
+    fast_thread.join()
+    self.assertIs(closures[1], closure1)
+    # The slow worker waits for a closure that no faster worker can take.
+    self.assertTrue(slow_thread.is_alive())
+
+    queue.put(closure2)
+    slow_thread.join()
+    self.assertIs(closures[0], closure2)
+
+    queue.mark_finished()
+    queue.mark_finished()
+    self.assertTrue(queue.done())
+
 
 class ErrorReportingThread(threading.Thread):
 
@@ -618,6 +656,37 @@ class ClusterCoordinatorTest(
     self.assertEqual(result, (1,))
     self.assertAlmostEqual(v.read_value(), 2, delta=1e-6)
 
+  def testScheduleSteps(self):
+
+    def input_fn():
+      return dataset_ops.DatasetV2.range(1, 10)
+
+    with self.strategy.scope():
+      v = variables.Variable(initial_value=0, dtype=dtypes.int64)
+
+    @def_function.function
+    def worker_fn(iterator):
+      x = next(iterator)
+      v.assign_add(x)
+      return x
+
+    distributed_dataset = self.coordinator.create_per_worker_dataset(input_fn)
+    results = self.coordinator.schedule_steps(
+        worker_fn, steps=3, args=(iter(distributed_dataset),))
+    self.assertLen(results, 3)
+    # All the steps are executed in order by the same worker.
+    self.assertEqual(self.coordinator.fetch(results), [1, 2, 3])
+    self.assertEqual(v.read_value().numpy(), 6)
+
+  def testScheduleStepsInvalidSteps(self):
+
+    @def_function.function
+    def worker_fn():
+      return 1
+
+    with self.assertRaisesRegex(ValueError, '`steps` must be a positive'):
+      self.coordinator.schedule_steps(worker_fn, steps=0)
+
   def testAsyncScheduleAndJoin(self):
     if test_util.is_xla_enabled():
       self.skipTest('Assign_add is not deterministic across threads in XLA')
@@ -987,6 +1056,15 @@ class ErrorReportingTest(TestCaseWithErrorReportingThread):
         self.coordinator.schedule(self._error_function)
     self.coordinator.join()
 
+  def testScheduleStepsRaiseError(self):
+    results = self.coordinator.schedule_steps(self._error_function, steps=2)
+    with self.assertRaises(errors.InvalidArgumentError):
+      self.coordinator.join()
+    # The error is set on the output of every step.
+    for result in results:
+      with self.assertRaises(errors.InvalidArgumentError):
+        result.fetch()
+
   def testErrorWillbeCleared(self):
     self.coordinator.schedule(self._error_function)
     with self.assertRaises(errors.InvalidArgumentError):
@@ -50,11 +50,22 @@ def _init():
       'Sample to track the time (in seconds) for updating the server def upon '
       'worker recovery.')
 
+  closure_queuing_sampler = monitoring.Sampler(
+      '/tensorflow/api/ps_strategy/coordinator/closure_queuing', time_buckets,
+      'Sampler to track the time (in seconds) closures wait in the queue '
+      'before a worker takes them.')
+
+  closure_queue_depth_gauge = monitoring.IntGauge(
+      '/tensorflow/api/ps_strategy/coordinator/closure_queue_depth',
+      'Gauge to track the number of closures waiting in the queue.')
+
   _METRICS_MAPPING = {
       'function_tracing': function_tracing_sampler,
       'closure_execution': closure_execution_sampler,
       'remote_value_fetch': remote_value_fetch_sampler,
       'server_def_update': server_def_update_sampler,
+      'closure_queuing': closure_queuing_sampler,
+      'closure_queue_depth': closure_queue_depth_gauge,
   }
 
 
@@ -77,6 +88,31 @@ def monitored_timer(metric_name, state_tracker=None):
       metric.get_cell().add(duration_sec)
 
 
+def add_sample(metric_name, value):
+  """Add a sample to the specified sampler metric."""
+  if not enable_metrics:
+    return
+  if not _METRICS_MAPPING:
+    _init()
+  _METRICS_MAPPING[metric_name].get_cell().add(value)
+
+
+def set_gauge(metric_name, value):
+  """Set the value of the specified gauge metric."""
+  if not enable_metrics:
+    return
+  if not _METRICS_MAPPING:
+    _init()
+  _METRICS_MAPPING[metric_name].get_cell().set(value)
+
+
+def get_gauge_value(metric_name):
+  """Get the value of the specified gauge metric."""
+  if not _METRICS_MAPPING:
+    _init()
+  return _METRICS_MAPPING[metric_name].get_cell().value()
+
+
 def get_metric_summary(metric_name):
   """Get summary for the specified metric."""
   metric = _METRICS_MAPPING[metric_name]
@@ -65,6 +65,9 @@ class MetricUtilsTest(test.TestCase):
     self.assertEqual(metric_closure['num'], 2)
     metric_remote_value = metric_utils.get_metric_summary('remote_value_fetch')
     self.assertEqual(metric_remote_value['num'], 2)
+    metric_queuing = metric_utils.get_metric_summary('closure_queuing')
+    self.assertEqual(metric_queuing['num'], 2)
+    self.assertEqual(metric_utils.get_gauge_value('closure_queue_depth'), 0)
 
 
 if __name__ == '__main__':
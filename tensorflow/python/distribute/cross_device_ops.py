@@ -47,6 +47,11 @@ from tensorflow.python.util.tf_export import tf_export
 from tensorflow.tools.docs import doc_controls
 
 
+# The size of all-reduce buckets when overlapping them with backprop, and
+# bytes_per_pack is not set.
+_DEFAULT_BYTES_PER_BUCKET = 25 * 1024 * 1024
+
+
 def check_destinations(destinations):
   """Checks whether `destinations` is not empty.
 
@@ -314,9 +319,51 @@ class CrossDeviceOps(object):
 
     if options is None:
       options = collective_util.Options()
+    if options.compression is not None and _devices_match(
+        per_replica_value, destinations, self._canonicalize_devices):
+      return self._compressed_batch_all_reduce(reduce_op, [per_replica_value],
+                                               options)[0]
     return self.reduce_implementation(reduce_op, per_replica_value,
                                       destinations, options)
 
+  def _compressed_batch_all_reduce(self, reduce_op, per_replica_values,
+                                   options):
+    """All-reduces `per_replica_values` with `options.compression`.
+
+    The codec compresses the values, and all-reduces them with
+    `batch_reduce_implementation`.
+
+    Args:
+      reduce_op: a `tf.distribute.ReduceOp` specifying how values should be
+        combined.
+      per_replica_values: a list of `tf.distribute.DistributedValues`.
+      options: a `tf.distribute.experimental.CommunicationOptions` with a
+        compression codec.
+
+    Returns:
+      A list of `tf.Tensor` or `tf.distribute.DistributedValues`, one per value
+      in `per_replica_values`.
+    """
+    uncompressed_options = copy.copy(options)
+    uncompressed_options.compression = None
+
+    def all_reduce_fn(reduce_op, values):
+      values = [value_lib.PerReplica(value) for value in values]
+      reduced = self.batch_reduce_implementation(
+          reduce_op, [(value, value) for value in values],
+          uncompressed_options)
+      return [
+          r.values if isinstance(r, value_lib.DistributedValues) else (r,)
+          for r in reduced
+      ]
+
+    results = options.compression.batch_all_reduce(
+        reduce_op, [v.values for v in per_replica_values], all_reduce_fn)
+    return [
+        distribute_utils.regroup(result, wrap_class=value_lib.Mirrored)
+        for result in results
+    ]
+
   def _gather(self, per_replica_value, destinations, axis, options=None):
     """Gather `per_replica_value` to `destinations`.
 
@@ -440,6 +487,10 @@ class CrossDeviceOps(object):
 
     if options is None:
       options = collective_util.Options()
+    if options.compression is not None and _all_devices_match(
+        value_destination_pairs, self._canonicalize_devices):
+      return self._compressed_batch_all_reduce(
+          reduce_op, [v for v, _ in value_destination_pairs], options)
     return self.batch_reduce_implementation(reduce_op, value_destination_pairs,
                                             options)
 
@@ -1115,6 +1166,19 @@ class CollectiveAllReduce(CrossDeviceOps):
     # TODO(b/122840926): reuse this method in _batch_all_reduce.
     flat_values = nest.flatten(value)
 
+    if options.compression is not None:
+      uncompressed_options = copy.copy(options)
+      uncompressed_options.compression = None
+
+      def all_reduce_fn(reduce_op, values):
+        reduced = self._all_reduce(reduce_op, [v[0] for v in values],
+                                   replica_id, uncompressed_options)
+        return [[r] for r in reduced]
+
+      flat_results = options.compression.batch_all_reduce(
+          reduce_op, [[v] for v in flat_values], all_reduce_fn)
+      return nest.pack_sequence_as(value, [r[0] for r in flat_results])
+
     # If NCCL launches can't be ordered (self._limited_nccl == True), we only
     # use NCCL when batch_size > 1, hoping that there's only one batched
     # all-reduce, which is the gradient aggregation in optimizer. For TF 2.x,
@@ -1144,8 +1208,15 @@ class CollectiveAllReduce(CrossDeviceOps):
       #
       # TODO(b/147393503): explore solutions for optimal ordering.
       dense_values.reverse()
-      packs = cross_device_utils.group_by_size(dense_values,
-                                               options.bytes_per_pack)
+      if options.overlap_backward:
+        # Each bucket is reduced by its own collective, which inside a
+        # tf.function starts as soon as the gradients in the bucket are
+        # computed, while backprop carries on with earlier layers.
+        packs = cross_device_utils.group_into_buckets(
+            dense_values, options.bytes_per_pack or _DEFAULT_BYTES_PER_BUCKET)
+      else:
+        packs = cross_device_utils.group_by_size(dense_values,
+                                                 options.bytes_per_pack)
 
       if not context.executing_eagerly() and replica_id == 0:
         logging.info(
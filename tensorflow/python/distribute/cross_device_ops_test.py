@@ -34,6 +34,7 @@ from tensorflow.python.distribute import multi_worker_test_base
 from tensorflow.python.distribute import reduce_util
 from tensorflow.python.distribute import test_util
 from tensorflow.python.distribute import values as value_lib
+from tensorflow.python.eager import backprop
 from tensorflow.python.eager import context
 from tensorflow.python.eager import def_function
 from tensorflow.python.eager import test
@@ -696,6 +697,123 @@ class CollectiveOpsTest(test.TestCase, parameterized.TestCase):
 
     get_global_mpr(num_processes).run(replica_fn)
 
+  @combinations.generate(
+      combinations.combine(
+          num_processes=[1, 2],
+          required_gpus=[0, 1, 2],
+          bytes_per_pack=[0, 1],
+      ))
+  def testAllReduceOverlapBackward(self, num_processes, required_gpus,
+                                   bytes_per_pack):
+
+    def replica_fn():
+      collective, devices, _ = self.make_collective(num_processes,
+                                                    required_gpus)
+      options = collective_util.Options(
+          bytes_per_pack=bytes_per_pack,
+          implementation=CommunicationImplementation.RING,
+          overlap_backward=True)
+      group_size = num_processes * (required_gpus or 1)
+
+      @def_function.function
+      def collective_all_reduce_gradients():
+        results = []
+        for replica_id, device in enumerate(devices):
+          with ops.device(device):
+            w1 = constant_op.constant([1.0, 2.0])
+            w2 = constant_op.constant(3.0)
+            with backprop.GradientTape() as tape:
+              tape.watch([w1, w2])
+              loss = math_ops.reduce_sum(w1 * 2.0) * w2
+            grads = tape.gradient(loss, [w1, w2])
+            results.append(
+                collective._all_reduce(ReduceOp.SUM, grads, replica_id,
+                                       options))
+        return results
+
+      got = collective_all_reduce_gradients()
+      expect = [[[6.0 * group_size, 6.0 * group_size], 6.0 * group_size]
+               ] * len(devices)
+      self.assertAllClose(got, expect)
+
+      # Each gradient is reduced by its own collective when the buckets are
+      # small enough, so that the reduction of w2's gradient doesn't wait for
+      # the one of w1.
+      graph = collective_all_reduce_gradients.get_concrete_function().graph
+      num_collectives = len([
+          op for op in graph.get_operations()
+          if op.type == "CollectiveReduceV2"
+      ])
+      self.assertEqual(num_collectives,
+                       len(devices) * (2 if bytes_per_pack else 1))
+
+    get_global_mpr(num_processes).run(replica_fn)
+
+  @combinations.generate(
+      combinations.combine(
+          num_processes=[1, 2],
+          required_gpus=[0, 1, 2],
+          compression=["float16", "top_k"],
+          reduce_op=[ReduceOp.SUM, ReduceOp.MEAN],
+      ))
+  def testBatchReduceCompressed(self, num_processes, required_gpus,
+                                compression, reduce_op):
+    options = self.RunOptions(
+        num_processes=num_processes,
+        gpus_per_process=required_gpus,
+        reduce_op=reduce_op,
+        communication_options=collective_util.Options(
+            implementation=CommunicationImplementation.RING,
+            compression=compression))
+    group_size = options.num_processes * (options.gpus_per_process or 1)
+
+    inputs_data = [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0], [7.0, 8.0]]
+    inputs = inputs_data[0:group_size]
+
+    if group_size == 1:
+      expect = [1.0, 2.0]
+    if group_size == 2:
+      expect = [4.0, 6.0] if reduce_op == ReduceOp.SUM else [2.0, 3.0]
+    elif group_size == 4:
+      expect = [16.0, 20.0] if reduce_op == ReduceOp.SUM else [4.0, 5.0]
+
+    self.batch_reduce_and_verify(inputs, expect, options)
+
+  @combinations.generate(
+      combinations.combine(
+          num_processes=[1, 2],
+          required_gpus=[0, 1, 2],
+      ))
+  def testAllReducePowerSGD(self, num_processes, required_gpus):
+
+    def replica_fn():
+      collective, devices, _ = self.make_collective(num_processes,
+                                                    required_gpus)
+      options = collective_util.Options(
+          implementation=CommunicationImplementation.RING,
+          compression="power_sgd")
+      group_size = num_processes * (required_gpus or 1)
+      # The approximation of matrices of rank 1 is exact.
+      matrix = [[1.0, 2.0, 3.0], [2.0, 4.0, 6.0], [3.0, 6.0, 9.0]]
+
+      @def_function.function
+      def collective_all_reduce():
+        results = []
+        for replica_id, device in enumerate(devices):
+          with ops.device(device):
+            value = (constant_op.constant(matrix), constant_op.constant(1.0))
+            results.append(
+                collective._all_reduce(ReduceOp.SUM, value, replica_id,
+                                       options))
+        return results
+
+      got = collective_all_reduce()
+      expect = [([[group_size * x for x in row] for row in matrix],
+                 1.0 * group_size)] * len(devices)
+      self.assertAllClose(got, expect, rtol=1e-5)
+
+    get_global_mpr(num_processes).run(replica_fn)
+
   @combinations.generate(
       combinations.combine(
           num_processes=[1, 2],
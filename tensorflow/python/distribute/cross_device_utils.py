@@ -716,6 +716,40 @@ def group_by_size(input_tensors, bytes_per_pack):
   return packs
 
 
+def group_into_buckets(input_tensors, bytes_per_bucket):
+  """Groups `input_tensors` into buckets for overlapped all-reduce.
+
+  Unlike `group_by_size`, each bucket is closed as soon as it holds at least
+  `bytes_per_bucket` bytes, so that its all-reduce doesn't wait for later
+  values. The method preserves the original order of `input_tensors`. Values
+  of different dtypes are never put in the same bucket, and values with unknown
+  shape are put in buckets of their own instead of disabling bucketing.
+
+  Args:
+    input_tensors: a list of Tensor.
+    bytes_per_bucket: a positive integer.
+
+  Returns:
+    A list of buckets of Tensor.
+  """
+  buckets = []
+  last_bucket_size = 0
+  last_bucket_closed = True
+  for value in input_tensors:
+    num_elements = value.shape.num_elements()
+    if (last_bucket_closed or num_elements is None or
+        value.dtype != buckets[-1][-1].dtype):
+      buckets.append([])
+      last_bucket_size = 0
+    buckets[-1].append(value)
+    if num_elements is None:
+      last_bucket_closed = True
+      continue
+    last_bucket_size += num_elements * value.dtype.size
+    last_bucket_closed = last_bucket_size >= bytes_per_bucket
+  return buckets
+
+
 def _pad_util(input_tensor, full_axis_dim):
   """Pad the `input_tensor`'s first dimension to be `full_axis_dim`."""
   missing_axis_dim = full_axis_dim - array_ops.shape_v2(input_tensor)[0]
@@ -175,5 +175,54 @@ class GroupBySizeTest(test.TestCase):
     self.assertEqual(packs[0], values)
 
 
+class GroupIntoBucketsTest(test.TestCase):
+
+  def testClosesBucketWhenFull(self):
+    values = [
+        # size = 10 * 4 = 40
+        array_ops.ones([10], dtype=dtypes.float32),
+        # size = 20 * 4 = 80
+        array_ops.ones([20], dtype=dtypes.float32),
+        # size = 5 * 4 = 20
+        array_ops.ones([5], dtype=dtypes.float32),
+        # size = 30 * 4 = 120
+        array_ops.ones([30], dtype=dtypes.float32),
+        # size = 1 * 4 = 4
+        array_ops.ones([1], dtype=dtypes.float32),
+    ]
+    buckets = cross_device_utils.group_into_buckets(
+        values, bytes_per_bucket=100)
+    self.assertEqual([[v.shape for v in b] for b in buckets],
+                     [[[10], [20]], [[5], [30]], [[1]]])
+
+  def testSplitsOnDtype(self):
+    values = [
+        array_ops.ones([1], dtype=dtypes.float32),
+        array_ops.ones([1], dtype=dtypes.float16),
+        array_ops.ones([1], dtype=dtypes.float16),
+        array_ops.ones([1], dtype=dtypes.float32),
+    ]
+    buckets = cross_device_utils.group_into_buckets(
+        values, bytes_per_bucket=100)
+    self.assertEqual([[v.dtype for v in b] for b in buckets],
+                     [[dtypes.float32], [dtypes.float16, dtypes.float16],
+                      [dtypes.float32]])
+
+  def testUnknownShape(self):
+    def create_placeholder(shape, dtype):
+      with ops.Graph().as_default():
+        return array_ops.placeholder(dtype=dtype, shape=shape)
+
+    values = [
+        array_ops.ones([10], dtype=dtypes.float32),
+        create_placeholder([None, 10], dtype=dtypes.float32),
+        array_ops.ones([10], dtype=dtypes.float32),
+        array_ops.ones([10], dtype=dtypes.float32),
+    ]
+    buckets = cross_device_utils.group_into_buckets(
+        values, bytes_per_bucket=100)
+    self.assertEqual(buckets, [values[:1], values[1:2], values[2:]])
+
+
 if __name__ == "__main__":
   test.main()
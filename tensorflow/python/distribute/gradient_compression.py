@@ -0,0 +1,400 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Codecs which compress values before they are all-reduced.
+
+A codec is passed to cross device ops through the `compression` argument of
+`tf.distribute.experimental.CommunicationOptions`. It all-reduces a batch of
+values by compressing them, all-reducing the compressed values with the
+underlying cross device ops, and decompressing the result.
+
+All methods of a codec take the values to all-reduce as a list with one element
+per value, where each element is a list with the components of the value on
+each local replica. A codec only compresses the dense floating point tensors
+with a fully defined shape it supports, and all-reduces the other values as is.
+
+Codecs can keep the compression error of each replica in variables, and add it
+to the value of the next step, which is known as error feedback. This state is
+keyed by the position of a value in the batch, so a codec with error feedback
+should only be used to all-reduce the same values, typically the gradients, at
+each step.
+"""
+
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import indexed_slices
+from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import nn_ops
+from tensorflow.python.ops import resource_variable_ops
+from tensorflow.python.ops import stateless_random_ops
+
+
+class Codec(object):
+  """Base class of compression codecs.
+
+  Subclasses either implement `encode` and `decode`, in which case the values
+  are all-reduced in their encoded form, or override `batch_all_reduce`.
+  """
+
+  def __init__(self, error_feedback):
+    self._error_feedback = error_feedback
+    self._variables = {}
+
+  def __deepcopy__(self, memo):
+    # Options are deep copied when they are merged, while the state of a codec
+    # must be shared by all the options which use it.
+    del memo
+    return self
+
+  @property
+  def error_feedback(self):
+    return self._error_feedback
+
+  def should_compress(self, tensor):
+    """Returns whether `tensor` is compressed, or all-reduced as is."""
+    return (isinstance(tensor, ops.Tensor) and tensor.dtype.is_floating and
+            tensor.shape.is_fully_defined())
+
+  def encode(self, tensor):
+    """Returns the compressed form of `tensor`, which is all-reduced."""
+    raise NotImplementedError("encode must be implemented in descendants.")
+
+  def decode(self, encoded, tensor):
+    """Decompresses the all-reduced `encoded` form of `tensor`."""
+    raise NotImplementedError("decode must be implemented in descendants.")
+
+  def batch_all_reduce(self, reduce_op, values, all_reduce_fn):
+    """All-reduces `values`, compressing those the codec supports.
+
+    Args:
+      reduce_op: a `tf.distribute.ReduceOp`.
+      values: a list of values, each being a list of its components on the
+        local replicas.
+      all_reduce_fn: a function which takes `reduce_op` and a list of values
+        with the same structure as `values`, and returns the all-reduced values
+        with the same structure.
+
+    Returns:
+      The all-reduced values, with the same structure as `values`.
+    """
+    compress = [self.should_compress(value[0]) for value in values]
+    inputs = []
+    error_updates = {}
+    for i, value in enumerate(values):
+      if not compress[i]:
+        inputs.append(value)
+        continue
+      encoded_value = []
+      for replica, tensor in enumerate(value):
+        with ops.device(tensor.device):
+          compensated, error = self._compensate(i, replica, tensor)
+          encoded = self.encode(compensated)
+          if error is not None:
+            error_updates.setdefault(replica, []).append(
+                error.assign(compensated - self.decode(encoded, tensor)))
+        encoded_value.append(encoded)
+      inputs.append(encoded_value)
+
+    reduced = all_reduce_fn(reduce_op, inputs)
+
+    results = []
+    for i, (value, reduced_value) in enumerate(zip(values, reduced)):
+      if not compress[i]:
+        results.append(reduced_value)
+        continue
+      result = []
+      for replica, (tensor, encoded) in enumerate(zip(value, reduced_value)):
+        with ops.device(tensor.device), ops.control_dependencies(
+            error_updates.get(replica, [])):
+          result.append(self.decode(encoded, tensor))
+      results.append(result)
+    return results
+
+  def _get_variable(self, name, key, tensor, initial_value_fn):
+    """Returns the state variable `name` of a replica, creating it if needed."""
+    key = (name, tensor.device) + key
+    if key not in self._variables:
+      with ops.init_scope(), ops.device(tensor.device):
+        self._variables[key] = resource_variable_ops.ResourceVariable(
+            initial_value_fn(), trainable=False)
+    return self._variables[key]
+
+  def _compensate(self, index, replica, tensor):
+    """Adds the error of the previous step to `tensor` of a replica.
+
+    Args:
+      index: the position of the value in the batch.
+      replica: the position of the local replica.
+      tensor: the component of the value on the local replica.
+
+    Returns:
+      A tuple of the compensated tensor and the variable holding the error,
+      which is None if the codec doesn't use error feedback.
+    """
+    if not self._error_feedback:
+      return tensor, None
+    shape = tensor.shape.as_list()
+    error = self._get_variable(
+        "error", (index, replica, tuple(shape), tensor.dtype), tensor,
+        lambda: array_ops.zeros(shape, tensor.dtype))
+    return tensor + error, error
+
+
+class CastCodec(Codec):
+  """Casts values to a lower precision floating point dtype.
+
+  This halves the traffic of float32 values with the default `float16` dtype.
+  The dtype must be supported by the cross device ops, e.g. `bfloat16` is not
+  supported by all collective implementations.
+  """
+
+  def __init__(self, dtype=dtypes.float16, error_feedback=False):
+    """Creates a CastCodec.
+
+    Args:
+      dtype: a floating point `tf.DType` to cast values to.
+      error_feedback: whether to add the rounding error of each step to the
+        value of the next one.
+
+    Raises:
+      ValueError: if `dtype` is not a floating point dtype.
+    """
+    super(CastCodec, self).__init__(error_feedback)
+    dtype = dtypes.as_dtype(dtype)
+    if not dtype.is_floating:
+      raise ValueError(
+          f"Argument `dtype` must be a floating point dtype, received {dtype}.")
+    self._dtype = dtype
+
+  def should_compress(self, tensor):
+    return (super(CastCodec, self).should_compress(tensor) and
+            tensor.dtype.size > self._dtype.size)
+
+  def encode(self, tensor):
+    return math_ops.cast(tensor, self._dtype)
+
+  def decode(self, encoded, tensor):
+    return math_ops.cast(encoded, tensor.dtype)
+
+
+class TopKCodec(Codec):
+  """Only all-reduces the elements of each value with the largest magnitude.
+
+  The elements are all-reduced as `tf.IndexedSlices`, so each replica sends a
+  `ratio` of the elements of a value along with their indices.
+  """
+
+  def __init__(self, ratio=0.01, error_feedback=True):
+    """Creates a TopKCodec.
+
+    Args:
+      ratio: a float in (0, 1], the fraction of the elements of each value to
+        all-reduce. At least one element is all-reduced.
+      error_feedback: whether to add the elements which were not all-reduced
+        to the value of the next step.
+
+    Raises:
+      ValueError: if `ratio` is not in (0, 1].
+    """
+    super(TopKCodec, self).__init__(error_feedback)
+    if not 0 < ratio <= 1:
+      raise ValueError(
+          f"Argument `ratio` must be in (0, 1], received {ratio}.")
+    self._ratio = ratio
+
+  def encode(self, tensor):
+    flat = array_ops.reshape(tensor, [-1])
+    k = max(1, int(tensor.shape.num_elements() * self._ratio))
+    _, indices = nn_ops.top_k(math_ops.abs(flat), k, sorted=False)
+    return indexed_slices.IndexedSlices(
+        values=array_ops.gather(flat, indices),
+        indices=indices,
+        dense_shape=array_ops.shape(flat))
+
+  def decode(self, encoded, tensor):
+    # All-reduced slices may have duplicate indices, which are summed.
+    flat = math_ops.unsorted_segment_sum(encoded.values, encoded.indices,
+                                         tensor.shape.num_elements())
+    return array_ops.reshape(flat, tensor.shape)
+
+
+class PowerSGDCodec(Codec):
+  """Approximates values with a low rank matrix, as in PowerSGD.
+
+  Each value is reshaped into a matrix `M` of shape `[n, m]`, where `n` is its
+  first dimension, and all-reduced as the product of two matrices `P` and `Q`
+  of shapes `[n, rank]` and `[m, rank]`. This takes two all-reduces: one of
+  `M @ Q`, where `Q` is the result of the previous step, and one of `M^T @ P`
+  once `P` is orthogonalized. See https://arxiv.org/abs/1905.13727.
+
+  Values of rank lower than 2, or which are smaller than their approximation,
+  are all-reduced as is.
+  """
+
+  def __init__(self, rank=1, error_feedback=True):
+    """Creates a PowerSGDCodec.
+
+    Args:
+      rank: a positive integer, the rank of the approximation.
+      error_feedback: whether to add the approximation error of each step to
+        the value of the next one. PowerSGD needs error feedback to converge
+        to the same accuracy as uncompressed all-reduces.
+
+    Raises:
+      ValueError: if `rank` is not positive.
+    """
+    super(PowerSGDCodec, self).__init__(error_feedback)
+    if rank < 1:
+      raise ValueError(f"Argument `rank` must be positive, received {rank}.")
+    self._rank = rank
+
+  def should_compress(self, tensor):
+    if (not super(PowerSGDCodec, self).should_compress(tensor) or
+        tensor.shape.rank < 2):
+      return False
+    n, m = self._matrix_shape(tensor)
+    return (n + m) * self._rank < n * m
+
+  def _matrix_shape(self, tensor):
+    n = tensor.shape.as_list()[0]
+    return n, tensor.shape.num_elements() // n
+
+  def _orthogonalize(self, p):
+    """Orthonormalizes the columns of `p` with the Gram-Schmidt process."""
+    # Unlike QR decompositions, Gram-Schmidt gives the same result on all
+    # replicas, which is required for their Q matrices to stay the same.
+    columns = []
+    for i in range(self._rank):
+      column = p[:, i:i + 1]
+      for previous in columns:
+        column -= math_ops.reduce_sum(previous * column) * previous
+      columns.append(column / (math_ops.norm(column) + 1e-8))
+    return array_ops.concat(columns, axis=1)
+
+  def _get_q(self, index, replica, tensor, m):
+    """Returns the Q matrix of a value on a replica, creating it if needed."""
+    # Q is initialized with the same seed on all replicas.
+    return self._get_variable(
+        "q", (index, replica, m, tensor.dtype), tensor,
+        lambda: stateless_random_ops.stateless_random_normal(
+            [m, self._rank], seed=[index, 0], dtype=tensor.dtype))
+
+  def batch_all_reduce(self, reduce_op, values, all_reduce_fn):
+    compress = [self.should_compress(value[0]) for value in values]
+
+    # First all-reduce: P = M @ Q, along with the uncompressed values.
+    matrices = []
+    qs = []
+    errors = []
+    inputs = []
+    for i, value in enumerate(values):
+      if not compress[i]:
+        inputs.append(value)
+        continue
+      n, m = self._matrix_shape(value[0])
+      value_matrices = []
+      value_qs = []
+      value_errors = []
+      ps = []
+      for replica, tensor in enumerate(value):
+        with ops.device(tensor.device):
+          compensated, error = self._compensate(i, replica, tensor)
+          q = self._get_q(i, replica, tensor, m)
+          matrix = array_ops.reshape(compensated, [n, m])
+          ps.append(math_ops.matmul(matrix, q))
+        value_matrices.append(matrix)
+        value_qs.append(q)
+        value_errors.append(error)
+      matrices.append(value_matrices)
+      qs.append(value_qs)
+      errors.append(value_errors)
+      inputs.append(ps)
+    reduced = all_reduce_fn(reduce_op, inputs)
+
+    # Second all-reduce: Q = M^T @ P, with P orthogonalized.
+    reduced_ps = [r for r, c in zip(reduced, compress) if c]
+    orthogonal_ps = []
+    inputs = []
+    for value_matrices, value_ps in zip(matrices, reduced_ps):
+      value_orthogonal_ps = []
+      new_qs = []
+      for matrix, p in zip(value_matrices, value_ps):
+        with ops.device(matrix.device):
+          p = self._orthogonalize(p)
+          new_qs.append(math_ops.matmul(matrix, p, transpose_a=True))
+        value_orthogonal_ps.append(p)
+      orthogonal_ps.append(value_orthogonal_ps)
+      inputs.append(new_qs)
+    reduced_qs = all_reduce_fn(reduce_op, inputs) if inputs else []
+
+    results = []
+    compressed_index = 0
+    for i, value in enumerate(values):
+      if not compress[i]:
+        results.append(reduced[i])
+        continue
+      result = []
+      for replica, tensor in enumerate(value):
+        p = orthogonal_ps[compressed_index][replica]
+        local_q = inputs[compressed_index][replica]
+        q = reduced_qs[compressed_index][replica]
+        error = errors[compressed_index][replica]
+        with ops.device(tensor.device):
+          updates = [qs[compressed_index][replica].assign(q)]
+          if error is not None:
+            approximation = math_ops.matmul(p, local_q, transpose_b=True)
+            updates.append(
+                error.assign(
+                    array_ops.reshape(
+                        matrices[compressed_index][replica] - approximation,
+                        tensor.shape)))
+          with ops.control_dependencies(updates):
+            result.append(
+                array_ops.reshape(
+                    math_ops.matmul(p, q, transpose_b=True), tensor.shape))
+      results.append(result)
+      compressed_index += 1
+    return results
+
+
+_CODECS = {
+    "float16": lambda: CastCodec(dtypes.float16),
+    "bfloat16": lambda: CastCodec(dtypes.bfloat16),
+    "top_k": TopKCodec,
+    "power_sgd": PowerSGDCodec,
+}
+
+
+def get(identifier):
+  """Returns a codec given a codec or the name of a built-in codec.
+
+  Args:
+    identifier: a `Codec`, one of "float16", "bfloat16", "top_k" and
+      "power_sgd", or None.
+
+  Returns:
+    A `Codec`, or None if `identifier` is None. Names return a new codec with
+    the default arguments.
+
+  Raises:
+    ValueError: if `identifier` is not a codec or a known name.
+  """
+  if identifier is None or isinstance(identifier, Codec):
+    return identifier
+  if isinstance(identifier, str) and identifier.lower() in _CODECS:
+    return _CODECS[identifier.lower()]()
+  raise ValueError(
+      "Argument `compression` must be a codec or one of "
+      f"{sorted(_CODECS)}, received {identifier}.")
@@ -0,0 +1,143 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for gradient compression codecs."""
+
+from tensorflow.python.distribute import gradient_compression
+from tensorflow.python.distribute import reduce_util
+from tensorflow.python.eager import test
+from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import indexed_slices
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import math_ops
+
+ReduceOp = reduce_util.ReduceOp
+
+
+class FakeAllReduce(object):
+  """Sums the components of each value, and records the values it reduces."""
+
+  def __init__(self):
+    self.inputs = []
+
+  def __call__(self, reduce_op, values):
+    self.inputs.append(values)
+    results = []
+    for value in values:
+      if isinstance(value[0], indexed_slices.IndexedSlices):
+        reduced = indexed_slices.IndexedSlices(
+            values=array_ops.concat([v.values for v in value], axis=0),
+            indices=array_ops.concat([v.indices for v in value], axis=0),
+            dense_shape=value[0].dense_shape)
+      else:
+        reduced = math_ops.add_n(value)
+      if reduce_op == ReduceOp.MEAN:
+        reduced = reduced / len(value)
+      results.append([reduced] * len(value))
+    return results
+
+
+class CodecTest(test.TestCase):
+
+  def testCastCodec(self):
+    codec = gradient_compression.CastCodec(dtypes.float16)
+    all_reduce = FakeAllReduce()
+    values = [
+        [constant_op.constant([1., 2.]), constant_op.constant([3., 4.])],
+        [constant_op.constant([1, 2]), constant_op.constant([3, 4])],
+    ]
+
+    results = codec.batch_all_reduce(ReduceOp.SUM, values, all_reduce)
+
+    self.assertEqual(all_reduce.inputs[0][0][0].dtype, dtypes.float16)
+    self.assertEqual(all_reduce.inputs[0][1][0].dtype, dtypes.int32)
+    self.assertEqual(results[0][0].dtype, dtypes.float32)
+    self.assertAllClose(results, [[[4., 6.]] * 2, [[4, 6]] * 2])
+
+  def testTopKCodec(self):
+    codec = gradient_compression.TopKCodec(ratio=0.5)
+    all_reduce = FakeAllReduce()
+    values = [[
+        constant_op.constant([[1., -4.], [2., 3.]]),
+        constant_op.constant([[3., 0.], [0., 1.]]),
+    ]]
+
+    results = codec.batch_all_reduce(ReduceOp.SUM, values, all_reduce)
+
+    self.assertIsInstance(all_reduce.inputs[0][0][0],
+                          indexed_slices.IndexedSlices)
+    self.assertAllClose(results, [[[[3., -4.], [0., 4.]]] * 2])
+
+    # The elements which were not all-reduced are added to the next step.
+    values = [[array_ops.zeros([2, 2]), array_ops.zeros([2, 2])]]
+    results = codec.batch_all_reduce(ReduceOp.SUM, values, all_reduce)
+
+    self.assertAllClose(results, [[[[1., 0.], [2., 0.]]] * 2])
+
+  def testTopKCodecWithoutErrorFeedback(self):
+    codec = gradient_compression.TopKCodec(ratio=0.5, error_feedback=False)
+    values = [[constant_op.constant([1., 2.])]]
+    codec.batch_all_reduce(ReduceOp.SUM, values, FakeAllReduce())
+
+    values = [[array_ops.zeros([2])]]
+    results = codec.batch_all_reduce(ReduceOp.SUM, values, FakeAllReduce())
+
+    self.assertAllClose(results, [[[0., 0.]]])
+
+  def testPowerSGDCodec(self):
+    codec = gradient_compression.PowerSGDCodec(rank=1)
+    all_reduce = FakeAllReduce()
+    # The sum of these values has rank 1, so its approximation is exact.
+    x = constant_op.constant([[1., 2., 3.], [2., 4., 6.], [3., 6., 9.]])
+    values = [[x, 2. * x], [constant_op.constant([1., 2.])] * 2]
+
+    results = codec.batch_all_reduce(ReduceOp.MEAN, values, all_reduce)
+
+    self.assertLen(all_reduce.inputs, 2)
+    self.assertEqual(all_reduce.inputs[0][0][0].shape, [3, 1])
+    self.assertEqual(all_reduce.inputs[1][0][0].shape, [3, 1])
+    self.assertAllClose(results[0], [1.5 * x] * 2)
+    self.assertAllClose(results[1], [[1., 2.]] * 2)
+
+  def testPowerSGDCodecSkipsSmallValues(self):
+    codec = gradient_compression.PowerSGDCodec(rank=1)
+    self.assertFalse(codec.should_compress(array_ops.zeros([2, 2])))
+    self.assertFalse(codec.should_compress(array_ops.zeros([10])))
+    self.assertTrue(codec.should_compress(array_ops.zeros([3, 3])))
+    self.assertTrue(codec.should_compress(array_ops.zeros([10, 2, 2])))
+
+  def testGet(self):
+    self.assertIsNone(gradient_compression.get(None))
+    codec = gradient_compression.TopKCodec()
+    self.assertIs(gradient_compression.get(codec), codec)
+    self.assertIsInstance(
+        gradient_compression.get("bfloat16"), gradient_compression.CastCodec)
+    self.assertIsInstance(
+        gradient_compression.get("power_sgd"),
+        gradient_compression.PowerSGDCodec)
+    with self.assertRaisesRegex(ValueError, "must be a codec"):
+      gradient_compression.get("zip")
+
+  def testInvalidArguments(self):
+    with self.assertRaisesRegex(ValueError, "floating point"):
+      gradient_compression.CastCodec(dtypes.int8)
+    with self.assertRaisesRegex(ValueError, "ratio"):
+      gradient_compression.TopKCodec(ratio=0)
+    with self.assertRaisesRegex(ValueError, "rank"):
+      gradient_compression.PowerSGDCodec(rank=0)
+
+
+if __name__ == "__main__":
+  test.main()
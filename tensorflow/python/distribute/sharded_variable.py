@@ -29,6 +29,8 @@ from tensorflow.python.framework import tensor_conversion_registry
 from tensorflow.python.framework import tensor_shape
 from tensorflow.python.framework import type_spec
 from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import cond
+from tensorflow.python.ops import custom_gradient
 from tensorflow.python.ops import data_flow_ops
 from tensorflow.python.ops import embedding_ops
 from tensorflow.python.ops import math_ops
@@ -252,6 +254,42 @@ class ShardedVariableSpec(type_spec.TypeSpec):
     return ShardedVariable(variables)
 
 
+def _deduplicate_indexed_slices(indexed_slices):
+  """Sums the values of `indexed_slices` with the same index."""
+  unique_indices, new_index_positions = array_ops.unique(
+      indexed_slices.indices)
+  summed_values = math_ops.unsorted_segment_sum(
+      indexed_slices.values, new_index_positions,
+      array_ops.shape(unique_indices)[0])
+  return indexed_slices_lib.IndexedSlices(
+      values=summed_values,
+      indices=unique_indices,
+      dense_shape=indexed_slices.dense_shape)
+
+
+def _lookup_unique(params, ids, lookup_fn):
+  """Looks up `ids` by looking up each unique id once.
+
+  Args:
+    params: a `ShardedVariable`.
+    ids: a `Tensor` with the ids to look up.
+    lookup_fn: a function which takes 1-D unique ids and returns their rows.
+
+  Returns:
+    A `Tensor` with the rows of `ids`, of shape `ids.shape + params.shape[1:]`.
+  """
+  ids = ops.convert_to_tensor(ids, name='ids')
+  unique_ids, idx = array_ops.unique(array_ops.reshape(ids, [-1]))
+  unique_rows = lookup_fn(unique_ids)
+  rows = array_ops.gather(unique_rows, idx)
+  rows = array_ops.reshape(
+      rows,
+      array_ops.concat(
+          [array_ops.shape(ids), array_ops.shape(unique_rows)[1:]], axis=0))
+  rows.set_shape(ids.shape.concatenate(params.shape[1:]))
+  return rows
+
+
 class ShardedVariableMixin(trackable.Trackable):
   """Mixin for ShardedVariable."""
 
@@ -613,7 +651,9 @@ class ShardedVariableMixin(trackable.Trackable):
 
   def scatter_add(self, sparse_delta, use_locking=False, name=None):
     """Implements tf.Variable.scatter_add."""
-    per_var_sparse_delta = self._decompose_indexed_slices(sparse_delta)
+    # Duplicate indices are summed first, so that each row is updated once.
+    per_var_sparse_delta = self._decompose_indexed_slices(
+        _deduplicate_indexed_slices(sparse_delta))
     for i, v in enumerate(self._variables):
       new_name = None
       if name is not None:
@@ -663,7 +703,9 @@ class ShardedVariableMixin(trackable.Trackable):
 
   def scatter_sub(self, sparse_delta, use_locking=False, name=None):
     """Implements tf.Variable.scatter_sub."""
-    per_var_sparse_delta = self._decompose_indexed_slices(sparse_delta)
+    # Duplicate indices are summed first, so that each row is updated once.
+    per_var_sparse_delta = self._decompose_indexed_slices(
+        _deduplicate_indexed_slices(sparse_delta))
     for i, v in enumerate(self._variables):
       new_name = None
       if name is not None:
@@ -905,9 +947,23 @@ def embedding_lookup(params,
                      max_norm=None):
   if isinstance(params, list):
     params = params[0]
-  return embedding_ops.embedding_lookup(params.variables, ids,
-                                        partition_strategy, name,
-                                        validate_indices, max_norm)
+  if isinstance(ids, composite_tensor.CompositeTensor):
+    return embedding_ops.embedding_lookup(params.variables, ids,
+                                          partition_strategy, name,
+                                          validate_indices, max_norm)
+  # Each unique id is only fetched once from the shards, which saves reads from
+  # parameter servers when ids repeat. The gradient of each shard then has
+  # unique indices too.
+  def lookup_fn(unique_ids):
+    return embedding_ops.embedding_lookup(
+        params.variables,
+        unique_ids,
+        partition_strategy,
+        validate_indices=validate_indices,
+        max_norm=max_norm)
+
+  with ops.name_scope(name, 'embedding_lookup_unique', [ids]):
+    return _lookup_unique(params, ids, lookup_fn)
 
 
 # Separately override safe_embedding_lookup_sparse, to avoid conversion of
@@ -935,3 +991,153 @@ def safe_embedding_lookup_sparse(
       partition_strategy=partition_strategy,
       max_norm=max_norm,
       allow_fast_lookup=allow_fast_lookup)
+
+
+class HotRowCache(object):
+  """Caches the rows of a `ShardedVariable` for a fixed set of hot ids.
+
+  In parameter server training, embedding lookups read rows from parameter
+  servers at every step. With skewed id distributions, most lookups hit a small
+  set of hot ids. This cache keeps the rows of these ids in a local variable,
+  and only reads them again from the shards once they have served
+  `max_staleness` lookups. Other ids are read from the shards, once per unique
+  id.
+
+  Lookups through the cache return rows which may miss the updates of up to
+  `max_staleness - 1` previous lookups. Gradients flow to the shards of the
+  `ShardedVariable` as if the rows had been read from them.
+
+  The cached rows and the lookup counter are variables placed on the device
+  that is current when the cache is created. Under
+  `tf.distribute.experimental.ParameterServerStrategy`, creating the cache
+  outside of a scheduled function places them on the coordinator, and lookups
+  in functions scheduled on workers then read the rows from the coordinator
+  and share one staleness counter. Per-worker caches are not supported yet.
+
+  >>> sharded_variable = ShardedVariable([
+  ...     tf.Variable([[1.0], [2.0]]),
+  ...     tf.Variable([[3.0], [4.0]]),
+  ... ])
+  >>> cache = HotRowCache(sharded_variable, hot_ids=[0, 3], max_staleness=10)
+  >>> cache.lookup([3, 1, 3]).numpy().tolist()
+  [[4.0], [2.0], [4.0]]
+  """
+
+  def __init__(self, sharded_variable, hot_ids, max_staleness):
+    """Creates a HotRowCache.
+
+    Args:
+      sharded_variable: a `ShardedVariable` partitioned along its first axis
+        with "div" sharding.
+      hot_ids: a list or 1-D numpy array of the ids to cache.
+      max_staleness: a positive integer, the number of lookups after which the
+        cached rows are read again from the shards.
+
+    Raises:
+      ValueError: if `hot_ids` is empty, or `max_staleness` is not positive.
+    """
+    hot_ids = np.unique(np.asarray(hot_ids, dtype=np.int64))
+    if hot_ids.ndim != 1 or not hot_ids.size:
+      raise ValueError('Argument `hot_ids` must be a non-empty list of ids. '
+                       f'Received {hot_ids}.')
+    if max_staleness < 1:
+      raise ValueError('Argument `max_staleness` must be positive. '
+                       f'Received {max_staleness}.')
+    self._sharded_variable = sharded_variable
+    self._hot_ids = hot_ids
+    self._max_staleness = max_staleness
+    with ops.init_scope():
+      self._rows = resource_variable_ops.ResourceVariable(
+          array_ops.zeros([hot_ids.size] + sharded_variable.shape.as_list()[1:],
+                          dtype=sharded_variable.dtype),
+          trainable=False,
+          name='hot_rows')
+      # Starts stale so that the first lookup reads the rows.
+      self._lookups_since_refresh = resource_variable_ops.ResourceVariable(
+          max_staleness,
+          dtype=dtypes.int64,
+          trainable=False,
+          name='lookups_since_refresh')
+
+  def _maybe_refresh(self):
+    """Reads the hot rows from the shards if they are stale."""
+
+    def refresh():
+      rows = embedding_ops.embedding_lookup(self._sharded_variable.variables,
+                                            self._hot_ids, 'div')
+      self._rows.assign(rows)
+      self._lookups_since_refresh.assign(0)
+
+    cond.cond(self._lookups_since_refresh >= self._max_staleness, refresh,
+              lambda: None)
+    self._lookups_since_refresh.assign_add(1)
+
+  def _read_hot_rows(self, ids, positions):
+    """Reads the cached rows of `ids`, at `positions` in the cache."""
+    shards = self._sharded_variable.variables
+
+    @custom_gradient.custom_gradient
+    def read_rows(rows, *shard_handles):
+      del shard_handles  # Only used to receive the gradients of the shards.
+
+      def grad_fn(rows_grad):
+        # pylint: disable=protected-access
+        per_shard_grads = self._sharded_variable._decompose_indexed_slices(
+            indexed_slices_lib.IndexedSlices(values=rows_grad, indices=ids))
+        # pylint: enable=protected-access
+        return [None] + [
+            indexed_slices_lib.IndexedSlices(
+                values=grad.values,
+                indices=grad.indices,
+                dense_shape=constant_op.constant(
+                    shard.shape.as_list(), dtype=dtypes.int64))
+            for grad, shard in zip(per_shard_grads, shards)
+        ]
+
+      return array_ops.identity(rows), grad_fn
+
+    # Cached rows are not read from the shards, so their gradients are defined
+    # with respect to the shard handles, the same way as if they were gathered
+    # from the shards. Marking the shards as accessed makes tapes watch them,
+    # also when the lookup runs in a tf.function called under the tape.
+    for shard in shards:
+      resource_variable_ops.variable_accessed(shard)
+    return read_rows(
+        array_ops.gather(self._rows, positions),
+        *[shard.handle for shard in shards])
+
+  def lookup(self, ids, name=None):
+    """Looks up the rows of `ids`.
+
+    Args:
+      ids: a `Tensor` of ids.
+      name: a name for the operation.
+
+    Returns:
+      A `Tensor` with the rows of `ids`, of shape
+      `ids.shape + sharded_variable.shape[1:]`.
+    """
+
+    def lookup_fn(unique_ids):
+      hot_ids = math_ops.cast(self._hot_ids, unique_ids.dtype)
+      positions = math_ops.minimum(
+          array_ops.searchsorted(hot_ids, unique_ids),
+          self._hot_ids.size - 1)
+      is_hot = math_ops.cast(
+          math_ops.equal(array_ops.gather(hot_ids, positions), unique_ids),
+          dtypes.int32)
+      cold_ids, hot_unique_ids = data_flow_ops.dynamic_partition(
+          unique_ids, is_hot, 2)
+      _, hot_positions = data_flow_ops.dynamic_partition(positions, is_hot, 2)
+      cold_indices, hot_indices = data_flow_ops.dynamic_partition(
+          math_ops.range(array_ops.size(unique_ids)), is_hot, 2)
+
+      self._maybe_refresh()
+      hot_rows = self._read_hot_rows(hot_unique_ids, hot_positions)
+      cold_rows = embedding_ops.embedding_lookup(
+          self._sharded_variable.variables, cold_ids, 'div')
+      return data_flow_ops.dynamic_stitch([cold_indices, hot_indices],
+                                          [cold_rows, hot_rows])
+
+    with ops.name_scope(name, 'hot_row_cache_lookup', [ids]):
+      return _lookup_unique(self._sharded_variable, ids, lookup_fn)
@@ -28,6 +28,7 @@ from tensorflow.python.distribute import sharded_variable
 from tensorflow.python.distribute.cluster_resolver import SimpleClusterResolver
 from tensorflow.python.distribute.test_util import get_cluster_def
 from tensorflow.python.distribute.test_util import TestClusterParams
+from tensorflow.python.eager import backprop
 from tensorflow.python.eager import context
 from tensorflow.python.eager import def_function
 from tensorflow.python.framework import constant_op
@@ -568,6 +569,124 @@ class ShardedVariableTest(test.TestCase, parameterized.TestCase):
     self.assertAllClose(sparse_lookup(), [[4., 5.], [9., 10.], [3., 4.]])
     self.assertAllClose(safe_sparse_lookup(), [[1., 2.], [0., 0.], [3., 4.]])
 
+  def test_embedding_lookup_duplicate_ids(self):
+    v = [
+        variables_lib.Variable([[1., 2.], [3., 4.]]),
+        variables_lib.Variable([[5., 6.], [7., 8.]]),
+        variables_lib.Variable([[9., 10.]])
+    ]
+    sv = sharded_variable.ShardedVariable(v)
+    ids = constant_op.constant([[0, 3, 0], [4, 3, 3]])
+
+    with backprop.GradientTape() as tape:
+      rows = embedding_ops.embedding_lookup_v2(sv, ids)
+    grads = tape.gradient(rows, sv.variables)
+
+    self.assertAllEqual(
+        rows, [[[1., 2.], [7., 8.], [1., 2.]], [[9., 10.], [7., 8.], [7., 8.]]])
+    # Each unique id is read once, so gradients have no duplicate indices.
+    self.assertAllEqual(grads[0].indices, [0])
+    self.assertAllEqual(grads[0].values, [[2., 2.]])
+    self.assertAllEqual(grads[1].indices, [1])
+    self.assertAllEqual(grads[1].values, [[3., 3.]])
+    self.assertAllEqual(grads[2].indices, [0])
+    self.assertAllEqual(grads[2].values, [[1., 1.]])
+
+  def test_scatter_add_duplicate_indices(self):
+    v = variables_lib.Variable(array_ops.zeros((6, 1)))
+    sv = sharded_variable.ShardedVariable([
+        variables_lib.Variable(array_ops.zeros((3, 1))),
+        variables_lib.Variable(array_ops.zeros((3, 1)))
+    ])
+    sparse_delta = indexed_slices.IndexedSlices(
+        values=constant_op.constant([[1.], [2.], [3.], [4.]]),
+        indices=constant_op.constant([4, 1, 4, 4]))
+
+    v.scatter_add(sparse_delta)
+    sv.scatter_add(sparse_delta)
+    self.assertAllEqual(v, ops.convert_to_tensor(sv))
+
+    v.scatter_sub(sparse_delta)
+    sv.scatter_sub(sparse_delta)
+    self.assertAllEqual(v, ops.convert_to_tensor(sv))
+
+  def test_hot_row_cache(self):
+    sv = sharded_variable.ShardedVariable([
+        variables_lib.Variable([[1.], [2.]]),
+        variables_lib.Variable([[3.], [4.]]),
+        variables_lib.Variable([[5.]])
+    ])
+    cache = sharded_variable.HotRowCache(
+        sv, hot_ids=[3, 0], max_staleness=2)
+
+    @def_function.function
+    def lookup(ids):
+      return cache.lookup(ids)
+
+    ids = constant_op.constant([[3, 4], [1, 3]])
+    self.assertAllEqual(lookup(ids), [[[4.], [5.]], [[2.], [4.]]])
+
+    # Hot rows are read from the cache until they become stale, other rows are
+    # always read from the shards.
+    sv.assign([[10.], [20.], [30.], [40.], [50.]])
+    self.assertAllEqual(lookup(ids), [[[4.], [50.]], [[20.], [4.]]])
+    self.assertAllEqual(lookup(ids), [[[40.], [50.]], [[20.], [40.]]])
+
+  def test_hot_row_cache_gradient(self):
+    sv = sharded_variable.ShardedVariable([
+        variables_lib.Variable([[1., 2.], [3., 4.]]),
+        variables_lib.Variable([[5., 6.], [7., 8.]])
+    ])
+    cache = sharded_variable.HotRowCache(sv, hot_ids=[1, 2], max_staleness=5)
+    ids = constant_op.constant([1, 3, 1, 2])
+    weights = constant_op.constant([[1.], [2.], [3.], [4.]])
+
+    with backprop.GradientTape(persistent=True) as tape:
+      cached_loss = math_ops.reduce_sum(cache.lookup(ids) * weights)
+      loss = math_ops.reduce_sum(
+          embedding_ops.embedding_lookup_v2(sv, ids) * weights)
+    cached_grads = tape.gradient(cached_loss, sv.variables)
+    grads = tape.gradient(loss, sv.variables)
+
+    self.assertAllClose(cached_loss, loss)
+    for cached_grad, grad in zip(cached_grads, grads):
+      self.assertAllEqual(
+          ops.convert_to_tensor(cached_grad), ops.convert_to_tensor(grad))
+
+  def test_hot_row_cache_gradient_in_function(self):
+    sv = sharded_variable.ShardedVariable([
+        variables_lib.Variable([[1., 2.], [3., 4.]]),
+        variables_lib.Variable([[5., 6.], [7., 8.]])
+    ])
+    cache = sharded_variable.HotRowCache(sv, hot_ids=[1, 2], max_staleness=5)
+    ids = constant_op.constant([1, 3, 1, 2])
+    weights = constant_op.constant([[1.], [2.], [3.], [4.]])
+
+    @def_function.function
+    def cached_lookup(ids):
+      return cache.lookup(ids)
+
+    with backprop.GradientTape() as tape:
+      cached_loss = math_ops.reduce_sum(cached_lookup(ids) * weights)
+    cached_grads = tape.gradient(cached_loss, sv.variables)
+    with backprop.GradientTape() as tape:
+      loss = math_ops.reduce_sum(
+          embedding_ops.embedding_lookup_v2(sv, ids) * weights)
+    grads = tape.gradient(loss, sv.variables)
+
+    self.assertAllClose(cached_loss, loss)
+    for cached_grad, grad in zip(cached_grads, grads):
+      self.assertIsNotNone(cached_grad)
+      self.assertAllEqual(
+          ops.convert_to_tensor(cached_grad), ops.convert_to_tensor(grad))
+
+  def test_hot_row_cache_invalid_arguments(self):
+    sv = sharded_variable.ShardedVariable([variables_lib.Variable([[1.]])])
+    with self.assertRaisesRegex(ValueError, 'hot_ids'):
+      sharded_variable.HotRowCache(sv, hot_ids=[], max_staleness=1)
+    with self.assertRaisesRegex(ValueError, 'max_staleness'):
+      sharded_variable.HotRowCache(sv, hot_ids=[0], max_staleness=0)
+
   def test_slicing(self):
     v = [
         variables_lib.Variable([[1, 2], [3, 4], [5, 6]]),
@@ -0,0 +1,252 @@
+# Copyright 2023 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+r"""Benchmarks for the Python overhead of dispatching eager ops.
+
+Each benchmark calls a common op on tiny inputs, so that its time is dominated
+by the dispatch overhead: device resolution in context.py, type-based dispatch
+in util/dispatch.py, execute.py and tape recording. Every op is benchmarked in
+each of the following configurations:
+
+  * default: no other setup.
+  * tape: under a GradientTape which watches the inputs.
+  * dispatch: with type-based dispatchers registered for the op, which do not
+    match its inputs.
+  * device: under a tf.device scope.
+
+To run the benchmarks:
+  bazel run -c opt dispatch_benchmark_test -- --benchmark_filter=.
+
+To track regressions between TensorFlow builds, write the results of a build
+to a JSON file with --dispatch_results_file, and pass that file to the run of
+another build with --dispatch_baseline_file. Each benchmark then reports its
+change relative to the baseline, and logs a warning if it is slower by more
+than --dispatch_regression_tolerance.
+"""
+import contextlib
+import gc
+import json
+import statistics
+import time
+
+import tensorflow as tf
+
+from tensorflow.python.platform import flags
+from tensorflow.python.platform import tf_logging as logging
+
+flags.DEFINE_string("dispatch_results_file", None,
+                    "JSON file to write the benchmark results to.")
+flags.DEFINE_string("dispatch_baseline_file", None,
+                    "JSON file of results to compare the benchmarks to.")
+flags.DEFINE_float(
+    "dispatch_regression_tolerance", 0.1,
+    "Relative slowdown over the baseline above which a benchmark is reported "
+    "as a regression.")
+
+FLAGS = flags.FLAGS
+
+NUM_ITERATIONS = 10000
+NUM_REPETITIONS = 5
+NUM_WARMUP_ITERATIONS = 100
+
+# Maps op names to the API benchmarked and a function returning the positional
+# arguments it is called with, given a small input tensor.
+_OPS = {
+    "add": (tf.math.add, lambda x: (x, x)),
+    "multiply": (tf.math.multiply, lambda x: (x, x)),
+    "matmul": (tf.linalg.matmul, lambda x: (x, x)),
+    "reduce_sum": (tf.math.reduce_sum, lambda x: (x,)),
+    "reshape": (tf.reshape, lambda x: (x, [4])),
+    "concat": (tf.concat, lambda x: ([x, x], 0)),
+    "identity": (tf.identity, lambda x: (x,)),
+    "cast": (tf.cast, lambda x: (x, tf.int32)),
+    "relu": (tf.nn.relu, lambda x: (x,)),
+    "convert_to_tensor": (tf.convert_to_tensor, lambda x: ([[1., 2.],
+                                                            [3., 4.]],)),
+}
+
+_CONFIGS = ("default", "tape", "dispatch", "device")
+
+
+class _UnusedTensor(tf.experimental.ExtensionType):
+  """A type with registered dispatchers, which ops are never called on."""
+  values: tf.Tensor
+
+
+def _unused_dispatch_target(*args, **kwargs):
+  del args, kwargs
+  raise AssertionError("Dispatched a benchmarked op to _UnusedTensor.")
+
+
+@contextlib.contextmanager
+def _registered_dispatchers(api):
+  """Registers a dispatcher for `api` that never matches plain tensors."""
+  try:
+    target = tf.experimental.dispatch_for_api(api, {0: _UnusedTensor})(
+        _unused_dispatch_target)
+  except ValueError:
+    # The API does not support dispatch.
+    target = None
+  try:
+    yield
+  finally:
+    if target is not None:
+      tf.experimental.unregister_dispatch_for(target)
+
+
+@contextlib.contextmanager
+def _watching_tape(x):
+  with tf.GradientTape() as tape:
+    tape.watch(x)
+    yield
+
+
+def _config_context(config, api, x):
+  if config == "tape":
+    return _watching_tape(x)
+  if config == "dispatch":
+    return _registered_dispatchers(api)
+  if config == "device":
+    return tf.device("/device:CPU:0")
+  return contextlib.nullcontext()
+
+
+def compare_results(baseline, current, tolerance):
+  """Finds the benchmarks which regressed relative to a baseline.
+
+  Args:
+    baseline: The results of the baseline run, as written to
+      --dispatch_results_file.
+    current: The results of the current run, in the same format.
+    tolerance: The relative slowdown above which a benchmark regressed.
+
+  Returns:
+    A dict mapping the names of the benchmarks which regressed to their
+    relative change in time per call. Benchmarks missing from either run are
+    ignored.
+  """
+  regressions = {}
+  for name, result in current["results"].items():
+    baseline_result = baseline["results"].get(name)
+    if baseline_result is None:
+      continue
+    change = (result["us_per_call"] / baseline_result["us_per_call"]) - 1
+    if change > tolerance:
+      regressions[name] = change
+  return regressions
+
+
+class EagerDispatchBenchmarks(
+    tf.test.Benchmark, metaclass=tf.__internal__.test.ParameterizedBenchmark):
+  """Benchmarks the dispatch of common ops in each configuration."""
+
+  _benchmark_parameters = [("%s_%s" % (op_name, config), op_name, config)
+                           for op_name in _OPS
+                           for config in _CONFIGS]
+
+  def __init__(self):
+    super().__init__()
+    self._results = {
+        "tf_version": tf.version.VERSION,
+        "tf_git_version": tf.version.GIT_VERSION,
+        "results": {},
+    }
+    self._baseline = None
+    if FLAGS.dispatch_baseline_file:
+      with open(FLAGS.dispatch_baseline_file) as f:
+        self._baseline = json.load(f)
+
+  def _time_per_call(self, fn):
+    """Returns the time per call of `fn` in each repetition, in us."""
+    for _ in range(NUM_WARMUP_ITERATIONS):
+      fn()
+    times = []
+    gc.disable()
+    gc.collect()
+    try:
+      for _ in range(NUM_REPETITIONS):
+        start = time.perf_counter()
+        for _ in range(NUM_ITERATIONS):
+          fn()
+        times.append((time.perf_counter() - start) * 1e6 / NUM_ITERATIONS)
+    finally:
+      gc.enable()
+    return times
+
+  def _report(self, times):
+    """Reports the median time per call, and records it in the results."""
+    name = self._get_name()
+    result = {
+        "us_per_call": statistics.median(times),
+        "us_per_call_min": min(times),
+        "us_per_call_stdev": statistics.stdev(times),
+        "iters": NUM_ITERATIONS,
+        "repetitions": NUM_REPETITIONS,
+    }
+    extras = dict(result)
+    if self._baseline is not None:
+      regressions = compare_results(
+          self._baseline, {"results": {name: result}},
+          FLAGS.dispatch_regression_tolerance)
+      baseline_result = self._baseline["results"].get(name)
+      if baseline_result is not None:
+        extras["baseline_us_per_call"] = baseline_result["us_per_call"]
+        extras["change_percent"] = 100 * (
+            result["us_per_call"] / baseline_result["us_per_call"] - 1)
+      if name in regressions:
+        result["regression"] = True
+        logging.warning("%s regressed by %.1f%% over the baseline.", name,
+                        100 * regressions[name])
+
+    self._results["results"][name] = result
+    if FLAGS.dispatch_results_file:
+      with open(FLAGS.dispatch_results_file, "w") as f:
+        json.dump(self._results, f, indent=2, sort_keys=True)
+
+    self.report_benchmark(
+        iters=NUM_ITERATIONS * NUM_REPETITIONS,
+        wall_time=result["us_per_call"] / 1e6,
+        extras=extras)
+
+  def benchmark_dispatch(self, op_name, config):
+    api, make_args = _OPS[op_name]
+    x = tf.constant([[1., 2.], [3., 4.]])
+    args = make_args(x)
+
+    def fn():
+      api(*args)
+
+    with _config_context(config, api, x):
+      times = self._time_per_call(fn)
+    self._report(times)
+
+
+class CompareResultsTest(tf.test.TestCase):
+
+  def testCompareResults(self):
+    baseline = {"results": {"a": {"us_per_call": 10.},
+                            "b": {"us_per_call": 10.},
+                            "c": {"us_per_call": 10.}}}
+    current = {"results": {"a": {"us_per_call": 10.5},
+                           "b": {"us_per_call": 12.},
+                           "d": {"us_per_call": 100.}}}
+
+    regressions = compare_results(baseline, current, tolerance=0.1)
+
+    self.assertEqual(list(regressions), ["b"])
+    self.assertAlmostEqual(regressions["b"], 0.2)
+
+
+if __name__ == "__main__":
+  tf.test.main()
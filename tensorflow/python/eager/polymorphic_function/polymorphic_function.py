@@ -60,6 +60,7 @@ ops above and associated assignment operations), tf.function traces a second
 time if it sees variables on the first call.
 """
 
+from concurrent import futures
 import functools
 import os
 import threading
@@ -80,10 +81,12 @@ from tensorflow.python.eager.polymorphic_function import eager_function_run
 from tensorflow.python.eager.polymorphic_function import function_spec as function_spec_lib
 from tensorflow.python.eager.polymorphic_function import tracing_compiler
 from tensorflow.python.framework import composite_tensor
+from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import errors
 from tensorflow.python.framework import func_graph as func_graph_module
 from tensorflow.python.framework import ops
 from tensorflow.python.framework import tensor_spec
+from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import array_ops_stack
 from tensorflow.python.ops import cond
 from tensorflow.python.ops import control_flow_ops
@@ -722,6 +725,7 @@ class Function(core.GenericFunction, trackable.Trackable):
     self._no_variable_creation_fn = self._compiler_with_scope(
         invalid_creator_scope)
     self._no_variable_creation_fn._name = self._name  # pylint: disable=protected-access
+    self._no_variable_creation_fn._first_trace_cause = "variable_creation"  # pylint: disable=protected-access
 
   def _clone(self, python_function):
     """Clone the function with different python function."""
@@ -805,6 +809,41 @@ class Function(core.GenericFunction, trackable.Trackable):
     result += self._variable_creation_fn.tracing_count if self._variable_creation_fn else 0
     return result
 
+  def experimental_get_trace_records(self):
+    """Returns a record of each time the function has been traced.
+
+    Each record holds the `FunctionType` of the trace, the cause of the trace,
+    a description of how the call differed from the closest existing trace,
+    and the time spent tracing and converting the function with AutoGraph. The
+    records help find out which argument makes a function retrace:
+
+    >>> @tf.function
+    ... def scale(x, factor):
+    ...   return x * factor
+    >>> _ = scale(tf.constant(1.0), 2)
+    >>> _ = scale(tf.constant(1.0), 3)
+    >>> [record.cause for record in scale.experimental_get_trace_records()]
+    ['first_trace', 'arguments']
+    >>> scale.experimental_get_trace_records()[1].differences
+    ('factor: Literal(value=2) -> Literal(value=3)',)
+
+    The number of traces by function name and cause is also exported to the
+    TensorFlow monitoring metric `/tensorflow/core/tf_function/trace_count`.
+
+    Only the records of the traces which have not been evicted from the cache
+    of traces are kept, see `tf.config.experimental.set_function_cache_limits`.
+
+    Returns:
+      A list of `TraceRecord`s, in the order of tracing.
+    """
+    records = []
+    if self._variable_creation_fn:
+      records.extend(self._variable_creation_fn.trace_records())
+    if self._no_variable_creation_fn:
+      records.extend(self._no_variable_creation_fn.trace_records())
+    records.sort(key=lambda entry: entry[0])
+    return [record for _, record in records]
+
   @property
   def _run_functions_eagerly(self):
     return eager_function_run.RUN_FUNCTIONS_EAGERLY
@@ -1205,6 +1244,78 @@ class Function(core.GenericFunction, trackable.Trackable):
     concrete._garbage_collector.release()  # pylint: disable=protected-access
     return concrete
 
+  def experimental_trace_in_background(self, signatures, max_workers=None):
+    """Traces this function for `signatures` on background threads.
+
+    Use this method to trace a function ahead of time when the input
+    signatures it will be called with are known in advance, e.g. one per
+    bucket of sequence lengths, without blocking the calling thread:
+
+    >>> @tf.function
+    ... def double(x):
+    ...   return x * 2
+    >>> traces = double.experimental_trace_in_background(
+    ...     [(tf.TensorSpec([n], tf.float32),) for n in (8, 16, 32)])
+    >>> _ = [trace.result() for trace in traces]
+    >>> double.experimental_get_tracing_count()
+    3
+
+    Calls with inputs matching one of the signatures then use its trace, or
+    wait for it if it is still being traced, instead of tracing the function
+    again. Signatures are traced outside of any device scope or distribution
+    strategy, since these are not shared with the background threads.
+
+    Concrete functions without stateful ops are also run once with inputs
+    filled with zeros (using 1 for the unknown dimensions), so that they are
+    instantiated by the runtime before they are called. Stateful functions are
+    only traced.
+
+    Args:
+      signatures: A list of signatures, each a sequence of the positional
+        arguments to trace the function with, as passed to
+        `get_concrete_function`, e.g. `tf.TensorSpec`s.
+      max_workers: The maximum number of threads tracing the signatures.
+        Defaults to the `concurrent.futures.ThreadPoolExecutor` default.
+
+    Returns:
+      A list of `concurrent.futures.Future`s, one per signature, which resolve
+      to the `ConcreteFunction` traced for the signature, or to the exception
+      raised when tracing it.
+    """
+    signatures = [tuple(signature) for signature in signatures]
+    executor = futures.ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix=f"trace_{self._name}")
+    try:
+      return [
+          executor.submit(self._trace_and_instantiate, signature)
+          for signature in signatures
+      ]
+    finally:
+      # The threads exit once all signatures are traced.
+      executor.shutdown(wait=False)
+
+  def _trace_and_instantiate(self, signature):
+    """Traces `signature` and instantiates the trace if it is stateless."""
+    concrete = self.get_concrete_function(*signature)
+    if concrete._inference_function.stateful_ops:  # pylint: disable=protected-access
+      return concrete
+    handle = concrete.experimental_get_flat_call_handle()
+    inputs = []
+    for spec in handle.input_specs:
+      if spec.dtype in (dtypes.resource, dtypes.variant):
+        # Values of these dtypes can not be made up.
+        return concrete
+      shape = [] if spec.shape.rank is None else [
+          1 if dim is None else dim for dim in spec.shape.as_list()
+      ]
+      inputs.append(array_ops.zeros(shape, spec.dtype))
+    try:
+      handle(*inputs)
+    except errors.OpError:
+      # The function is instantiated even if it fails on the made up inputs.
+      pass
+    return concrete
+
   def __tf_tracing_type__(self, _):
     return trace_type.Weakref(weakref.ref(self))
 
@@ -15,6 +15,7 @@
 
 import collections
 import functools
+import gc
 import itertools
 import multiprocessing.pool
 import pickle
@@ -164,6 +165,28 @@ class FunctionBenchmark(test.Benchmark):
 
     self.report_benchmark(iters=n_iters, wall_time=duration / float(n_iters))
 
+  def benchmark_flat_call_handle(self):
+    n_iters = 10000
+
+    @polymorphic_function.function
+    def f(x, y):
+      return {'sum': x + y}
+
+    x = constant_op.constant(1.)
+    cf = f.get_concrete_function(x, x)
+    handle = cf.experimental_get_flat_call_handle()
+
+    for name, call in (('concrete_function', cf), ('flat_call_handle', handle)):
+      call(x, x)
+      start_time = time.time()
+      for _ in range(n_iters):
+        call(x, x)
+      duration = time.time() - start_time
+      self.report_benchmark(
+          name=f'benchmark_flat_call_handle_{name}',
+          iters=n_iters,
+          wall_time=duration / float(n_iters))
+
 
 # TODO(mdan): Organize these tests.
 class FunctionTest(test.TestCase, parameterized.TestCase):
@@ -4442,6 +4465,188 @@ class FunctionTest(test.TestCase, parameterized.TestCase):
 
       self.assertLen(logs.output, 2)
 
+  def testFlatCallHandle(self):
+    v = variables.Variable(1.)
+
+    @polymorphic_function.function
+    def f(x, y):
+      return {'sum': x + y + v, 'diff': (x - y,)}
+
+    cf = f.get_concrete_function(
+        tensor_spec.TensorSpec([], dtypes.float32, name='x'),
+        tensor_spec.TensorSpec(None, dtypes.float32))
+    handle = cf.experimental_get_flat_call_handle()
+    self.assertIs(handle.function, cf)
+    self.assertEqual(handle.input_specs, (
+        tensor_spec.TensorSpec([], dtypes.float32, name='x'),
+        tensor_spec.TensorSpec(None, dtypes.float32, name='y'),
+    ))
+
+    x = constant_op.constant(3.)
+    y = constant_op.constant(2.)
+    # The outputs are in the order of the flattened structured outputs.
+    self.assertAllEqual(handle(x, y), [1., 6.])
+    v.assign(2.)
+    self.assertAllEqual(handle(x, y), [1., 7.])
+
+    with self.assertRaisesRegex(TypeError, 'takes 2 flat inputs, got 1'):
+      handle(x)
+
+  def testFlatCallHandleRecordsGradients(self):
+
+    @polymorphic_function.function
+    def f(x):
+      return x * x
+
+    handle = f.get_concrete_function(
+        tensor_spec.TensorSpec([], dtypes.float32)
+    ).experimental_get_flat_call_handle()
+    x = constant_op.constant(3.)
+    with backprop.GradientTape() as tape:
+      tape.watch(x)
+      (y,) = handle(x)
+    self.assertAllEqual(tape.gradient(y, x), 6.)
+
+  def testFlatCallHandleInFunction(self):
+
+    @polymorphic_function.function
+    def f(x):
+      return x + 1
+
+    handle = f.get_concrete_function(
+        tensor_spec.TensorSpec([None], dtypes.int32)
+    ).experimental_get_flat_call_handle()
+
+    @polymorphic_function.function
+    def g(x):
+      return handle(x)
+
+    self.assertAllEqual(g(constant_op.constant([1, 2])), [[2, 3]])
+
+  def testFlatCallHandleDeferredCapture(self):
+    value = variables.Variable(1)
+
+    @polymorphic_function.function
+    def f(x):
+      y = ops.get_default_graph().capture_call_time_value(
+          value.read_value, tensor_spec.TensorSpec([], dtypes.int32))
+      return x + y
+
+    handle = f.get_concrete_function(
+        tensor_spec.TensorSpec([], dtypes.int32)
+    ).experimental_get_flat_call_handle()
+    self.assertAllEqual(handle(constant_op.constant(1)), [2])
+    value.assign(2)
+    self.assertAllEqual(handle(constant_op.constant(1)), [3])
+
+  def testTraceRecords(self):
+
+    @polymorphic_function.function
+    def f(x, factor):
+      return x * factor
+
+    f(constant_op.constant([1.0]), 2.0)
+    f(constant_op.constant([1.0]), 2.0)
+    f(constant_op.constant([1.0, 2.0]), 2.0)
+
+    @polymorphic_function.function
+    def g(x):
+      return f(x, 2.0)
+
+    g(constant_op.constant([1.0]))
+
+    records = f.experimental_get_trace_records()
+    self.assertLen(records, f.experimental_get_tracing_count())
+    self.assertEqual([record.cause for record in records],
+                     ['first_trace', 'arguments', 'new_context'])
+    self.assertEmpty(records[0].differences)
+    self.assertLen(records[1].differences, 1)
+    self.assertStartsWith(records[1].differences[0], 'x: ')
+    self.assertIn('(1,)', records[1].differences[0])
+    self.assertIn('(2,)', records[1].differences[0])
+    for record in records:
+      self.assertGreater(record.graph_building_time_usecs, 0)
+      self.assertBetween(record.autograph_time_usecs, 0,
+                         record.graph_building_time_usecs)
+
+  def testTraceRecordsWithoutAutograph(self):
+
+    @polymorphic_function.function(autograph=False)
+    def f(x):
+      return x
+
+    f(1)
+    f(2)
+    records = f.experimental_get_trace_records()
+    self.assertEqual([record.cause for record in records],
+                     ['first_trace', 'arguments'])
+    self.assertEqual(records[1].differences,
+                     ('x: Literal(value=1) -> Literal(value=2)',))
+    self.assertEqual(records[1].autograph_time_usecs, 0)
+
+  def testTraceRecordsOfFunctionCreatingVariables(self):
+    created_variables = []
+
+    @polymorphic_function.function
+    def f(x):
+      if not created_variables:
+        created_variables.append(variables.Variable(2.0))
+      return x * created_variables[0]
+
+    f(constant_op.constant(1.0))
+    f(constant_op.constant([1.0]))
+    records = f.experimental_get_trace_records()
+    self.assertLen(records, f.experimental_get_tracing_count())
+    self.assertEqual([record.cause for record in records],
+                     ['first_trace', 'variable_creation', 'arguments'])
+
+  def testTraceInBackground(self):
+
+    @polymorphic_function.function
+    def f(x):
+      return x * 2
+
+    lengths = [1, 2, 4]
+    traces = f.experimental_trace_in_background(
+        [(tensor_spec.TensorSpec([n], dtypes.float32),) for n in lengths],
+        max_workers=2)
+    concrete_functions = [trace.result() for trace in traces]
+    self.assertEqual(f.experimental_get_tracing_count(), 3)
+    for n, concrete in zip(lengths, concrete_functions):
+      self.assertEqual(concrete.inputs[0].shape, [n])
+
+    self.assertAllEqual(f(array_ops.ones([2])), [2., 2.])
+    self.assertEqual(f.experimental_get_tracing_count(), 3)
+
+  def testTraceInBackgroundDoesNotRunStatefulFunctions(self):
+    v = variables.Variable(0)
+
+    @polymorphic_function.function
+    def f(x):
+      v.assign_add(1)
+      return x
+
+    (trace,) = f.experimental_trace_in_background(
+        [(tensor_spec.TensorSpec([], dtypes.int32),)])
+    trace.result()
+    self.assertEqual(v.numpy(), 0)
+
+  def testTraceInBackgroundError(self):
+
+    @polymorphic_function.function
+    def f(x):
+      if x.shape.rank != 1:
+        raise ValueError('x must be a vector')
+      return x
+
+    good, bad = f.experimental_trace_in_background([
+        (tensor_spec.TensorSpec([None], dtypes.float32),),
+        (tensor_spec.TensorSpec([], dtypes.float32),),
+    ])
+    self.assertEqual(good.result().inputs[0].shape.as_list(), [None])
+    with self.assertRaisesRegex(ValueError, 'x must be a vector'):
+      bad.result()
+
   def test_experimental_get_tracing_count_function(self):
 
     @polymorphic_function.function
@@ -5002,6 +5207,173 @@ class MultiDeviceTest(test.TestCase, parameterized.TestCase):
     with self.assertRaisesRegex(ValueError, 'not found'):
       graph._remove_function(func_name)
 
+
+class PersistentFunctionCacheTest(test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    tracing_compiler.enable_persistent_function_cache(self.get_temp_dir())
+    self.addCleanup(tracing_compiler.disable_persistent_function_cache)
+
+  def testLoadedInsteadOfTraced(self):
+    x = constant_op.constant(2.)
+    traced = polymorphic_function.function(undecorated_function)
+    self.assertAllEqual(traced(x), 6.)
+    self.assertEqual(traced.experimental_get_tracing_count(), 1)
+
+    # A new tf.function wrapping the same code loads the traced graph.
+    loaded = polymorphic_function.function(undecorated_function)
+    self.assertAllEqual(loaded(x), 6.)
+    self.assertAllEqual(loaded(constant_op.constant(3.)), 9.)
+    self.assertEqual(loaded.experimental_get_tracing_count(), 0)
+
+    # Other input types are traced as usual.
+    self.assertAllEqual(loaded(constant_op.constant(2)), 6)
+    self.assertEqual(loaded.experimental_get_tracing_count(), 1)
+
+  def testLoadedFunctionOwnsItsGraph(self):
+    x = constant_op.constant(2.)
+    polymorphic_function.function(undecorated_function)(x)
+    loaded = polymorphic_function.function(undecorated_function)
+    concrete = loaded.get_concrete_function(x)
+    self.assertEqual(loaded.experimental_get_tracing_count(), 0)
+    # pylint: disable=protected-access
+    self.assertIsNotNone(concrete._garbage_collector)
+    self.assertIs(concrete._delayed_rewrite_functions._func_graph_deleter,
+                  concrete._garbage_collector)
+    # pylint: enable=protected-access
+
+  def testTracingOptionsAreNotShared(self):
+    polymorphic_function.function(undecorated_function)(
+        constant_op.constant(2.))
+    other = polymorphic_function.function(
+        undecorated_function, jit_compile=False)
+    other(constant_op.constant(2.))
+    self.assertEqual(other.experimental_get_tracing_count(), 1)
+
+  def testClosuresAreNotCached(self):
+    v = variables.Variable(2.)
+
+    def f(x):
+      return x * v
+
+    polymorphic_function.function(f)(constant_op.constant(2.))
+    traced = polymorphic_function.function(f)
+    self.assertAllEqual(traced(constant_op.constant(2.)), 4.)
+    self.assertEqual(traced.experimental_get_tracing_count(), 1)
+
+  def testDisable(self):
+    polymorphic_function.function(undecorated_function)(
+        constant_op.constant(2.))
+    tracing_compiler.disable_persistent_function_cache()
+    traced = polymorphic_function.function(undecorated_function)
+    traced(constant_op.constant(2.))
+    self.assertEqual(traced.experimental_get_tracing_count(), 1)
+
+
+class FunctionCacheLimitsTest(test.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.addCleanup(tracing_compiler.set_function_cache_limits)
+
+  def testMaxEntries(self):
+    tracing_compiler.set_function_cache_limits(max_entries=2)
+
+    @polymorphic_function.function
+    def f(x):
+      return x * 2
+
+    f(array_ops.ones([1]))
+    f(array_ops.ones([2]))
+    f(array_ops.ones([1]))
+    f(array_ops.ones([3]))
+    self.assertLen(f._list_all_concrete_functions(), 2)
+    self.assertEqual(f.experimental_get_tracing_count(), 3)
+
+    # The trace for shape [2] was the least recently used one.
+    f(array_ops.ones([1]))
+    self.assertEqual(f.experimental_get_tracing_count(), 3)
+    f(array_ops.ones([2]))
+    self.assertEqual(f.experimental_get_tracing_count(), 4)
+
+  def testLfuPolicy(self):
+    tracing_compiler.set_function_cache_limits(
+        max_entries=2, eviction_policy='lfu')
+
+    @polymorphic_function.function
+    def f(x):
+      return x * 2
+
+    for _ in range(3):
+      f(array_ops.ones([1]))
+    f(array_ops.ones([2]))
+    f(array_ops.ones([3]))
+    f(array_ops.ones([1]))
+    self.assertEqual(f.experimental_get_tracing_count(), 3)
+
+  def testMaxBytes(self):
+    tracing_compiler.set_function_cache_limits(max_bytes=1)
+
+    @polymorphic_function.function
+    def f(x):
+      return x * 2
+
+    f(array_ops.ones([1]))
+    f(array_ops.ones([2]))
+    self.assertLen(f._list_all_concrete_functions(), 1)
+
+  def testReduceRetracing(self):
+    tracing_compiler.set_function_cache_limits(max_entries=1)
+
+    @polymorphic_function.function(reduce_retracing=True)
+    def f(x):
+      return x * 2
+
+    f(array_ops.ones([1]))
+    # Generalizes the shape to [None], evicting the trace for shape [1].
+    f(array_ops.ones([2]))
+    f(array_ops.ones([3]))
+    self.assertLen(f._list_all_concrete_functions(), 1)
+    self.assertEqual(f.experimental_get_tracing_count(), 2)
+
+  def testTraceRecordsOfEvictedTraces(self):
+    tracing_compiler.set_function_cache_limits(max_entries=1)
+
+    @polymorphic_function.function
+    def f(x):
+      return x * 2
+
+    f(array_ops.ones([1]))
+    f(array_ops.ones([2]))
+    records = f.experimental_get_trace_records()
+    self.assertEqual([record.cause for record in records], ['arguments'])
+
+  def testEvictedFunctionsAreRemovedFromContext(self):
+    tracing_compiler.set_function_cache_limits(max_entries=1)
+
+    @polymorphic_function.function
+    def f(x):
+      return x * 2
+
+    f(array_ops.ones([1]))
+    f(array_ops.ones([2]))
+    (evicted,) = f._list_all_concrete_functions()
+    name = evicted.function_def.signature.name
+    del evicted
+    self.assertTrue(context.context().has_function(name))
+
+    f(array_ops.ones([3]))
+    gc.collect()
+    self.assertFalse(context.context().has_function(name))
+
+  def testInvalidLimits(self):
+    with self.assertRaisesRegex(ValueError, 'max_entries'):
+      tracing_compiler.set_function_cache_limits(max_entries=0)
+    with self.assertRaises(ValueError):
+      tracing_compiler.set_function_cache_limits(eviction_policy='fifo')
+
+
 if __name__ == '__main__':
   ops.enable_eager_execution()
   test.main()
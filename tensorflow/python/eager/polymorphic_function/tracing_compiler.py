@@ -16,15 +16,20 @@
 
 import collections
 import contextlib
+import hashlib
+import inspect
+import itertools
 import threading
+import time
 import types as types_lib
-from typing import List
+from typing import List, NamedTuple, Sequence, Tuple
 import weakref
 
 from tensorflow.core.function import trace_type
 from tensorflow.core.function.capture import capture_container
 from tensorflow.core.function.polymorphism import function_cache
 from tensorflow.core.function.polymorphism import function_type as function_type_lib
+from tensorflow.core.protobuf import meta_graph_pb2
 from tensorflow.python.autograph.core import converter
 from tensorflow.python.autograph.impl import api
 from tensorflow.python.eager import monitoring
@@ -35,11 +40,13 @@ from tensorflow.python.eager.polymorphic_function import monomorphic_function
 from tensorflow.python.eager.polymorphic_function import tf_method_target
 from tensorflow.python.framework import func_graph as func_graph_module
 from tensorflow.python.framework import ops
+from tensorflow.python.framework import versions
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.profiler import trace
 from tensorflow.python.util import compat
 from tensorflow.python.util import lazy_loader
 from tensorflow.python.util import tf_decorator
+from tensorflow.python.util.tf_export import tf_export
 
 # Loaded lazily due to a circular dependency (roughly
 # tf.function->autograph->->dataset->tf.function).
@@ -47,11 +54,207 @@ from tensorflow.python.util import tf_decorator
 ag_ctx = lazy_loader.LazyLoader(
     "ag_ctx", globals(),
     "tensorflow.python.autograph.core.ag_ctx")
+# Loaded lazily due to a circular dependency (saved_model->tf.function).
+function_deserialization = lazy_loader.LazyLoader(
+    "function_deserialization", globals(),
+    "tensorflow.python.saved_model.function_deserialization")
+function_serialization = lazy_loader.LazyLoader(
+    "function_serialization", globals(),
+    "tensorflow.python.saved_model.function_serialization")
 
 _graph_building_time_counter = monitoring.Counter(
     "/tensorflow/core/tf_function/graph_building_time_usecs",
     "Time for tf.function to build a graph (us).")
 
+_trace_counter = monitoring.Counter(
+    "/tensorflow/core/tf_function/trace_count",
+    "Number of times tf.functions were traced, by function name and cause.",
+    "function_name", "cause")
+
+
+class TraceRecord(NamedTuple):
+  """Describes a trace of a `tf.function`.
+
+  Attributes:
+    function_type: The FunctionType of the traced ConcreteFunction.
+    cause: Why the function was traced. "first_trace" for the first trace,
+      "variable_creation" when the first trace created variables, and the
+      function is traced again so that later calls do not create variables,
+      "new_context" when the function had no trace for the calling context
+      (e.g. a new graph or device scope), "arguments" or "captures" when the
+      types of the arguments or captures differ from every existing trace,
+      and "unknown" when no difference could be described.
+    differences: Descriptions of how the call differs from the closest
+      existing trace in the calling context. See
+      `function_type.describe_differences`.
+    graph_building_time_usecs: The time spent tracing (us).
+    autograph_time_usecs: The part of the tracing time spent converting
+      Python functions with AutoGraph (us).
+  """
+  function_type: function_type_lib.FunctionType
+  cause: str
+  differences: Sequence[str]
+  graph_building_time_usecs: int
+  autograph_time_usecs: int
+
+# Numbers the traces of all TracingCompilers in the order of tracing.
+_trace_sequence_numbers = itertools.count()
+
+# The keyword arguments of the FunctionCache of each TracingCompiler, as set
+# by set_function_cache_limits.
+_function_cache_limits = {}
+
+# The persistent cache of traced functions, or None if it is disabled.
+_persistent_function_cache = None
+_UNSET = object()
+
+# The persistent cache only holds functions traced in this context, i.e. when
+# the function is called eagerly outside of any graph, device scope or
+# distribution strategy.
+_PERSISTENT_FUNCTION_CONTEXT = function_cache.FunctionContext(
+    function_context.EagerContext(
+        parent_graph=None,
+        device_functions=(),
+        colocation_stack=(),
+        in_cross_replica_context=False,
+        variable_policy=None,
+        xla_context_id=0))
+
+
+@tf_export("config.experimental.enable_persistent_function_cache")
+def enable_persistent_function_cache(directory):
+  """Enables caching traced `tf.function`s on disk across processes.
+
+  When the persistent function cache is enabled, every graph traced by a
+  `tf.function` is also stored in `directory`. When a later process calls a
+  `tf.function` with the same source code and an input signature traced
+  before, the graph is loaded from `directory` instead of being traced again,
+  which removes the graph building time from the startup of the process.
+
+  ```
+  tf.config.experimental.enable_persistent_function_cache("/tmp/traces")
+
+  @tf.function
+  def double(a):
+    return a + a
+
+  double(tf.constant(1))  # Traced, or loaded from a previous process.
+  ```
+
+  Entries are keyed by a fingerprint of the source code of the module defining
+  the Python function, the types of the function inputs and captures, and the
+  TensorFlow version, so that they are not reused after the code or TensorFlow
+  changes. The Python function is not executed when its graph is loaded, so
+  its side effects do not happen, just like when it is called again in the
+  same process.
+
+  Only traces which can be identified across processes are cached: functions
+  which are called eagerly outside of any device scope or distribution
+  strategy, whose Python function is not a closure or a method, whose inputs
+  have serializable types, and whose graph captures no tensors or variables and
+  uses no custom gradients. Other traces are traced as usual.
+
+  Note: the cache can not detect changes to Python values read by the function
+  while tracing, such as flags or the contents of other modules. Use a new
+  `directory` whenever these change.
+
+  Args:
+    directory: The directory which holds the cached functions. It can be shared
+      by processes running concurrently.
+  """
+  global _persistent_function_cache
+  _persistent_function_cache = function_cache.PersistentFunctionCache(
+      directory,
+      "/".join((versions.__version__, versions.__git_version__,
+                versions.__compiler_version__)))
+
+
+@tf_export("config.experimental.disable_persistent_function_cache")
+def disable_persistent_function_cache():
+  """Disables the cache enabled by `enable_persistent_function_cache`."""
+  global _persistent_function_cache
+  _persistent_function_cache = None
+
+
+@tf_export("config.experimental.set_function_cache_limits")
+def set_function_cache_limits(max_entries=None,
+                              max_bytes=None,
+                              eviction_policy="lru"):
+  """Bounds the number of traces each `tf.function` keeps.
+
+  By default, a `tf.function` keeps every graph it traces, so a long-running
+  program calling it with ever new input shapes or Python values uses more and
+  more memory. With limits set, each `tf.function` evicts traces once it holds
+  more than `max_entries` of them, or once their estimated size exceeds
+  `max_bytes`. An evicted trace is traced again if it is needed later.
+
+  ```
+  tf.config.experimental.set_function_cache_limits(max_entries=2)
+
+  @tf.function
+  def double(a):
+    return a + a
+
+  double(tf.constant([1]))
+  double(tf.constant([1, 2]))
+  double(tf.constant([1, 2, 3]))  # Evicts the trace for shape [1].
+  ```
+
+  The runtime functions of an evicted trace are removed from the eager context
+  once the trace is no longer referenced, e.g. by a `ConcreteFunction`
+  returned by `get_concrete_function`.
+
+  The limits apply to the `tf.function`s first called after this call.
+  Evicted traces are not saved by `tf.saved_model.save`.
+
+  Args:
+    max_entries: The maximum number of traces kept by each `tf.function`, or
+      None for no limit.
+    max_bytes: The maximum size of the traces kept by each `tf.function`, as
+      estimated by the size of their `FunctionDef`s, or None for no limit.
+    eviction_policy: "lru" to evict the least recently used trace, or "lfu"
+      to evict the least frequently used trace.
+
+  Raises:
+    ValueError: If a limit is not positive or `eviction_policy` is invalid.
+  """
+  global _function_cache_limits
+  limits = dict(
+      max_entries=max_entries,
+      max_bytes=max_bytes,
+      eviction_policy=function_cache.EvictionPolicy(eviction_policy))
+  # Validates the limits before they are used by any function.
+  function_cache.FunctionCache(**limits)
+  _function_cache_limits = limits
+
+
+def _source_fingerprint(python_function):
+  """Returns a fingerprint of the source code of `python_function`.
+
+  Args:
+    python_function: The function to fingerprint.
+
+  Returns:
+    A string, or None if the source code is not available or the function
+    depends on objects other than its module, i.e. it is a closure or a method.
+  """
+  _, original_function = tf_decorator.unwrap(python_function)
+  if (not inspect.isfunction(original_function) or
+      original_function.__closure__):
+    return None
+  module = inspect.getmodule(original_function)
+  if module is None:
+    return None
+  try:
+    source = inspect.getsource(module)
+  except (OSError, TypeError):
+    return None
+  hasher = hashlib.sha256()
+  hasher.update(module.__name__.encode("utf-8"))
+  hasher.update(original_function.__qualname__.encode("utf-8"))
+  hasher.update(source.encode("utf-8"))
+  return hasher.hexdigest()
+
 
 def _py_func_from_autograph(
     python_func,
@@ -160,7 +363,8 @@ class TracingCompiler:
     self._autograph = autograph
     self._autograph_options = autograph_options
     self._reduce_retracing = reduce_retracing
-    self._function_cache = function_cache.FunctionCache()
+    self._function_cache = function_cache.FunctionCache(
+        **_function_cache_limits)
 
     self._function_attributes = attributes or {}
     for attribute in self._function_attributes:
@@ -171,6 +375,11 @@ class TracingCompiler:
 
     self._capture_by_value = capture_by_value
     self.tracing_count = 0
+    # The cause recorded for the first trace, see TraceRecord.
+    self._first_trace_cause = "first_trace"
+    # A (sequence number, ConcreteFunction, TraceRecord) tuple for each trace
+    # held by the function cache, in the order of tracing.
+    self._trace_records = []
     # Maintein a dict of all captures: identifier -> lambda function. It's used
     # to get runtime values for all captures during ConcreteFunction dispatch,
     self._func_captures = capture_container.FunctionCaptures()
@@ -180,6 +389,9 @@ class TracingCompiler:
     # create different functions for each instance.
     self._descriptor_cache = weakref.WeakKeyDictionary()
     self._jit_compile = jit_compile
+    # Fingerprint used to key the persistent function cache, computed on first
+    # use. Set to None if this function can not be cached persistently.
+    self._persistent_fingerprint = _UNSET
 
   def __call__(self, *args, **kwargs):
     """Calls a graph function specialized to the inputs."""
@@ -284,6 +496,52 @@ class TracingCompiler:
       self) -> List[monomorphic_function.ConcreteFunction]:
     return self._function_cache.values()
 
+  def trace_records(self) -> List[Tuple[int, TraceRecord]]:
+    """Returns the records of the cached traces, in the order of tracing.
+
+    Returns:
+      A list of (sequence number, TraceRecord) pairs. Sequence numbers increase
+      in the order of tracing across all `TracingCompiler`s.
+    """
+    with self._lock:
+      return [(sequence_number, record)
+              for sequence_number, _, record in self._trace_records]
+
+  def _retracing_cause(self, func_context, func_type):
+    """Returns the cause and type differences of a new trace of `func_type`."""
+    previous_types = self._function_cache.function_types(func_context)
+    if not previous_types:
+      if self._function_cache.values():
+        return "new_context", ()
+      return self._first_trace_cause, ()
+    closest_type, differences = min(
+        ((previous_type,
+          function_type_lib.describe_differences(previous_type, func_type))
+         for previous_type in previous_types),
+        key=lambda entry: len(entry[1]))
+    if not differences:
+      return "unknown", ()
+    if closest_type.parameters != func_type.parameters:
+      return "arguments", tuple(differences)
+    return "captures", tuple(differences)
+
+  def _record_trace(self, concrete_function, func_type, cause, differences,
+                    start_time, start_autograph_usecs):
+    """Records a trace which started at `start_time`."""
+    record = TraceRecord(
+        function_type=func_type,
+        cause=cause,
+        differences=differences,
+        graph_building_time_usecs=int((time.time() - start_time) * 1000000),
+        autograph_time_usecs=(api.conversion_time_usecs() -
+                              start_autograph_usecs))
+    self._trace_records.append(
+        (next(_trace_sequence_numbers), concrete_function, record))
+    _trace_counter.get_cell(self._name, cause).increase_by(1)
+    if cause != "first_trace":
+      logging.vlog(1, "Traced %r again, cause: %s %s", self._python_function,
+                   cause, list(differences))
+
   def __get__(self, instance, owner):
     """Makes it possible to decorate instance methods."""
     del owner
@@ -408,6 +666,11 @@ class TracingCompiler:
     if concrete_function is not None:
       return concrete_function, filtered_flat_args
 
+    cause, differences = self._retracing_cause(current_func_context,
+                                               lookup_func_type)
+    start_time = time.time()
+    start_autograph_usecs = api.conversion_time_usecs()
+
     # Use a timer for graph building only if not already inside a function. This
     # avoids double counting graph building time for nested functions.
     with monitoring.MonitoredTimer(
@@ -431,6 +694,15 @@ class TracingCompiler:
                 current_func_context, lookup_func_type)
           else:
             target_func_type = lookup_func_type
+
+          persistent_key = self._persistent_cache_key(current_func_context,
+                                                      target_func_type)
+          concrete_function = self._load_persistent_function(persistent_key)
+          if concrete_function is not None:
+            self._add_to_function_cache(current_func_context,
+                                        target_func_type, concrete_function)
+            return concrete_function, filtered_flat_args
+
           handledata_mapping = lookup_func_context.get_handledata_mapping()
           placeholder_mapping = lookup_func_context.get_placeholder_mapping()
           placeholder_context = trace_type.InternalPlaceholderContext(
@@ -455,11 +727,114 @@ class TracingCompiler:
           traced_func_type = _insert_capture_type(
               target_func_type, captures, lookup_func_context)
 
-          self._function_cache.add(current_func_context, traced_func_type,
-                                   concrete_function)
+          self._add_to_function_cache(current_func_context, traced_func_type,
+                                      concrete_function)
+          self._record_trace(concrete_function, traced_func_type, cause,
+                             differences, start_time, start_autograph_usecs)
+          self._save_persistent_function(persistent_key, concrete_function)
 
           return concrete_function, filtered_flat_args
 
+  def _add_to_function_cache(self, func_context, func_type,
+                             concrete_function):
+    """Adds a trace to the function cache, which may evict other traces."""
+    size_bytes = 0
+    if self._function_cache.max_bytes is not None:
+      # The FunctionDef of the forward function approximates the memory held
+      # by the trace in the runtime.
+      size_bytes = concrete_function.function_def.ByteSize()
+    evictions = self._function_cache.evictions
+    self._function_cache.add(func_context, func_type, concrete_function,
+                             size_bytes)
+    if self._function_cache.evictions != evictions:
+      # Drops the records of the evicted traces, so that the records are
+      # bounded like the function cache.
+      cached_ids = set(map(id, self._function_cache.values()))
+      self._trace_records = [
+          entry for entry in self._trace_records if id(entry[1]) in cached_ids
+      ]
+
+  def _persistent_cache_key(self, func_context, func_type):
+    """Returns the persistent cache key of a trace, or None."""
+    if (_persistent_function_cache is None or
+        func_context != _PERSISTENT_FUNCTION_CONTEXT):
+      return None
+    if self._persistent_fingerprint is _UNSET:
+      source_fingerprint = _source_fingerprint(self._python_function)
+      if source_fingerprint is None:
+        self._persistent_fingerprint = None
+      else:
+        # The tracing options change the traced graph, so they are part of the
+        # fingerprint.
+        self._persistent_fingerprint = repr(
+            (source_fingerprint, self._name, self._autograph,
+             self._autograph_options, self._capture_by_value,
+             self._jit_compile, sorted(self._function_attributes.items())))
+    if self._persistent_fingerprint is None:
+      return None
+    return _persistent_function_cache.make_key(self._persistent_fingerprint,
+                                               func_type)
+
+  def _load_persistent_function(self, key):
+    """Loads the function stored under `key` in the persistent cache."""
+    if key is None:
+      return None
+    serialized = _persistent_function_cache.lookup(key)
+    if serialized is None:
+      return None
+    try:
+      meta_graph = meta_graph_pb2.MetaGraphDef.FromString(serialized)
+      if (meta_graph.meta_info_def.tensorflow_version != versions.__version__
+          or meta_graph.meta_info_def.tensorflow_git_version !=
+          versions.__git_version__):
+        return None
+      (name,) = meta_graph.object_graph_def.concrete_functions.keys()
+      functions = function_deserialization.load_function_def_library(
+          meta_graph.graph_def.library, meta_graph.object_graph_def,
+          shared_func_graph=False)
+      concrete_function = functions[name]
+    except Exception as e:  # pylint: disable=broad-except
+      logging.warning(
+          "Failed to load function %r from the persistent function cache in "
+          "%s; tracing it instead. Error: %s", self._name,
+          _persistent_function_cache.directory, e)
+      return None
+    concrete_function._set_function_spec(self.function_spec)  # pylint: disable=protected-access
+    logging.vlog(1, "Loaded function %r from the persistent function cache.",
+                 self._name)
+    return concrete_function
+
+  def _save_persistent_function(self, key, concrete_function):
+    """Stores `concrete_function` under `key` in the persistent cache."""
+    if key is None or concrete_function.captured_inputs:
+      return
+    graph = ops.Graph()
+    concrete_function.add_to_graph(graph)
+    library = graph.as_graph_def().library
+    for fdef in library.function:
+      for node in fdef.node_def:
+        if "_gradient_op_type" in node.attr:
+          # Custom gradients are registered in this process only.
+          return
+    try:
+      saved_function = function_serialization.serialize_concrete_function(
+          concrete_function, node_ids={})
+    except Exception:  # pylint: disable=broad-except
+      # The structure of the inputs or outputs can not be serialized.
+      return
+    meta_graph = meta_graph_pb2.MetaGraphDef()
+    meta_graph.meta_info_def.tensorflow_version = versions.__version__
+    meta_graph.meta_info_def.tensorflow_git_version = versions.__git_version__
+    meta_graph.graph_def.library.CopyFrom(library)
+    meta_graph.object_graph_def.concrete_functions[
+        concrete_function.name].CopyFrom(saved_function)
+    try:
+      _persistent_function_cache.add(key, meta_graph.SerializeToString())
+    except OSError as e:
+      logging.warning(
+          "Failed to store function %r in the persistent function cache in "
+          "%s. Error: %s", self._name, _persistent_function_cache.directory, e)
+
 
 def class_method_to_instance_method(original_function, instance):
   """Constructs a new `TracingCompiler` with `self` bound."""
@@ -20,6 +20,7 @@ import numpy as np
 
 from tensorflow.core.framework import attr_value_pb2
 from tensorflow.core.function import trace_type
+from tensorflow.core.function.polymorphism import type_dispatch
 from tensorflow.core.protobuf import struct_pb2
 from tensorflow.python.framework import common_shapes
 from tensorflow.python.framework import constant_op
@@ -721,6 +722,26 @@ class _BoundedTensorSpecCodec:
 nested_structure_coder.register_codec(_BoundedTensorSpecCodec())
 
 trace_type.register_serializable(BoundedTensorSpec)
+
+
+def _append_tensor_spec_dispatch_key(spec, key):
+  """Appends the dispatch key of a TensorSpec, see `type_dispatch`."""
+  # Unnamed specs are subtypes of specs with any name, so the name is not part
+  # of the key. Subtyping does not distinguish TensorSpecs from
+  # BoundedTensorSpecs, so they share the key.
+  key.append((TensorSpec, spec.dtype))
+  if spec.shape.rank is None:
+    return False
+  key.append(spec.shape.rank)
+  key.extend(type_dispatch.WILDCARD if dim is None else dim
+             for dim in spec.shape.as_list())
+  return True
+
+
+type_dispatch.register_dispatch_key_fn(TensorSpec,
+                                       _append_tensor_spec_dispatch_key)
+type_dispatch.register_dispatch_key_fn(BoundedTensorSpec,
+                                       _append_tensor_spec_dispatch_key)
 _pywrap_utils.RegisterType("TensorSpec", TensorSpec)
 
 # Note: we do not include Tensor names when constructing TypeSpecs.
@@ -325,7 +325,8 @@ def recreate_function(saved_function, concrete_functions):
 def load_function_def_library(library,
                               saved_object_graph=None,
                               load_shared_name_suffix=None,
-                              wrapper_function=None):
+                              wrapper_function=None,
+                              shared_func_graph=True):
   """Load a set of functions as concrete functions without captured inputs.
 
   Functions names are manipulated during load such that they do not overlap
@@ -341,6 +342,8 @@ def load_function_def_library(library,
     load_shared_name_suffix: If specified, used to uniquify shared names.
       Otherwise, a unique name is generated.
     wrapper_function: An object that will be wrapped on newly created functions.
+    shared_func_graph: If False, each `ConcreteFunction` takes ownership of its
+      graph, which is dismantled when the function is deleted.
 
   Returns:
     Map of original function names in the library to instances of
@@ -440,7 +443,8 @@ def load_function_def_library(library,
     # initialization at a later stage.
     if "_input_shapes" in fdef.attr:
       del fdef.attr["_input_shapes"]
-    func = function_lib.ConcreteFunction(func_graph, attrs=fdef.attr)
+    func = function_lib.ConcreteFunction(
+        func_graph, attrs=fdef.attr, shared_func_graph=shared_func_graph)
     if wrapper_function:
       func = wrapper_function(func)
     func.add_to_graph(graph)